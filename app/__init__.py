@@ -11,7 +11,9 @@ Core Components:
     - Flask-Migrate for database migrations
     - Flask-Login for authentication
     - Configuration manager for AI settings
+    - Background job manager for imports and exports
     - Blueprint registration for modular routing
+    - Maintenance CLI commands
 
 Application Structure:
     The application uses the factory pattern to create Flask instances with
@@ -20,11 +22,14 @@ Application Structure:
 
 Database:
     Uses SQLite by default with automatic database creation if missing.
+    SQLite connections are tuned on connect (see database.py); deployments
+    can switch to PostgreSQL by setting DATABASE_URL.
     Supports migrations through Flask-Migrate for schema updates.
 
 Authentication:
     Flask-Login manages user sessions with redirect to login page for
-    protected routes. User loader callback fetches user objects from database.
+    protected routes. User loader callback serves identities from a TTL cache
+    and falls back to the database on a miss.
 
 Configuration:
     AI configuration managed through thread-safe ConfigManager class.
@@ -36,6 +41,8 @@ Attributes:
     migrate: Flask-Migrate instance for database migrations
     login_manager: Flask-Login manager for authentication
     config_manager: Thread-safe AI configuration manager
+    job_manager: Background job runner for imports and exports
+    user_cache: Per-process cache of logged-in user identities
 
 Functions:
     load_user: Callback to load user objects for Flask-Login
@@ -50,12 +57,17 @@ from .config import DevelopmentConfig, TestingConfig
 from werkzeug.security import generate_password_hash
 import os
 from .ai_handler import ConfigManager
+from .jobs import JobManager
+from .database import init_database, ensure_database
+from .user_cache import user_cache
+from .assets import assets
 
 # Initialize Flask extensions
 # These are initialized here and attached to app in create_app()
 db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
+job_manager = JobManager()
 
 # Set the login view for authentication redirects
 # When @login_required is used, redirect here if not authenticated
@@ -73,19 +85,20 @@ def load_user(user_id):
 
     This callback is used by Flask-Login to reload the user object from
     the user ID stored in the session. It runs before every request when
-    a user is logged in.
+    a user is logged in, so identities are served from a per-process TTL
+    cache and only hit the database on a miss.
 
     Args:
         user_id (str): User ID from session (converted to int internally)
 
     Returns:
-        User: User object if found, None otherwise
+        CachedUser: Identity snapshot (id, username, role) if found,
+                    None otherwise
 
     Note:
         Returning None will treat the user as logged out
     """
-    from .models import User
-    return User.query.get(int(user_id))
+    return user_cache.get(int(user_id))
 
 
 def create_app(config=DevelopmentConfig):
@@ -94,8 +107,8 @@ def create_app(config=DevelopmentConfig):
 
     Creates and configures a Flask application instance with the specified
     configuration. Sets up database, migrations, authentication, and
-    registers blueprints. Ensures database exists and adds cache control
-    headers to prevent browser caching issues.
+    registers blueprints. Ensures database exists and installs the HTTP
+    caching policy.
 
     Args:
         config: Configuration class (DevelopmentConfig, TestingConfig, 
@@ -115,8 +128,11 @@ def create_app(config=DevelopmentConfig):
         the database file.
 
     Cache Control:
-        Adds headers to all responses to prevent aggressive browser caching
-        which can cause issues during development when files change frequently.
+        Responses get a Cache-Control policy by route (see http_cache.py):
+        fingerprinted static files are cached long-term (built and
+        precompressed by assets.py), public pages are
+        revalidated with ETags, and logged-in pages are not stored.
+        Dynamic responses are compressed by compression.py.
 
     Blueprints:
         - main: All application routes except authentication
@@ -129,11 +145,40 @@ def create_app(config=DevelopmentConfig):
         flaskApp.config.from_object(TestingConfig)
     else:
         flaskApp.config.from_object(config)
-    db.init_app(flaskApp)  
+    db.init_app(flaskApp)
+    # Per-connection SQLite tuning (WAL, busy timeout, foreign keys)
+    init_database(flaskApp, db)
+
+    # Per-request query counts, Server-Timing and N+1 warnings
+    from .sql_profiler import sql_profiler
+    sql_profiler.init_app(flaskApp)
+
     migrate.init_app(flaskApp, db, render_as_batch=True)
 
-    # Initialize login manager
+    # Initialize login manager and the cache behind its user loader
     login_manager.init_app(flaskApp)
+    user_cache.init_app(flaskApp)
+
+    # Initialize background job manager (spool directory for imports/exports)
+    job_manager.init_app(flaskApp)
+
+    # Limit on concurrent AI model calls per process, and the shared client
+    from .ai_evaluate import llm_limiter, rules_cache, shared_client
+    llm_limiter.init_app(flaskApp)
+    shared_client.init_app(flaskApp)
+    rules_cache.init_app(flaskApp)
+
+    # Rendered public pages (help, Bloom's guide) for anonymous visitors
+    from .page_cache import page_cache
+    page_cache.init_app(flaskApp)
+
+    # Sampled Server-Timing spans and request ids (see timing.py)
+    from .timing import timing
+    timing.init_app(flaskApp)
+
+    # Request, AI and cache metrics served at /metrics
+    from .metrics import registry
+    registry.init_app(flaskApp)
 
     # Register blueprints for modular routing
     # Main blueprint: unit management, learning outcomes, admin functions
@@ -144,20 +189,15 @@ def create_app(config=DevelopmentConfig):
     flaskApp.register_blueprint(main)
     flaskApp.register_blueprint(auth)
 
+    # Maintenance CLI commands (flask renormalize-order, flask build-assets)
+    from .commands import register_commands
+    register_commands(flaskApp)
+
     # Database initialization check
     # app.db can get corrupted in git merges so it's in .gitignore
-    # This code checks if app.db exists and creates it if missing
-    appdbPath = os.path.join(
-        os.path.abspath(os.path.dirname(__file__)),
-        'app.db'
-    )
-
-    if os.path.exists(appdbPath) == False:
-        # Create all tables if database doesn't exist
-        with flaskApp.app_context():
-            db.create_all()
-            db.session.commit()
-    
+    # This creates the configured SQLite file's tables if the file is missing
+    ensure_database(flaskApp, db)
+
     if config_name == 'testing':
         with flaskApp.app_context():
             from app.models import User, Unit, UserType
@@ -182,29 +222,16 @@ def create_app(config=DevelopmentConfig):
             db.session.commit()
     
             
-    @flaskApp.after_request
-    def add_header(response):
-        """
-        Add cache control headers to prevent browser caching.
-
-        Prevents browsers from caching responses which can cause
-        issues during development when files change frequently.
-        Especially important for JavaScript and CSS files.
-
-        Args:
-            response: Flask response object
-
-        Returns:
-            response: Modified response with no-cache headers
-
-        Headers Added:
-            - Cache-Control: Prevents all caching
-            - Pragma: HTTP/1.0 backward compatibility
-            - Expires: Sets expiry to past date
-        """
-        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response
+    # Fingerprinted, precompressed static assets (before http_cache, whose
+    # url_defaults hook leaves the already fingerprinted names alone)
+    assets.init_app(flaskApp)
+
+    # Route-aware Cache-Control, ETags and fingerprinted static URLs
+    from . import http_cache
+    http_cache.init_app(flaskApp)
+
+    # gzip/brotli for HTML, JSON and CSV responses, including streamed ones
+    from . import compression
+    compression.init_app(flaskApp)
 
     return flaskApp
\ No newline at end of file
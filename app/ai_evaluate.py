@@ -3,42 +3,32 @@ from typing import List
 from . import config_manager
 
 import os, json
-import google.genai as genai
-from google.genai import types
+import hashlib
+import math
+import threading
+from contextlib import contextmanager
+import time
+from .lazy import LazyModule
+from .metrics import LLM_CACHED_TOKENS, LLM_LATENCY, LLM_PROMPT_TOKENS, LLM_RESPONSE_TOKENS
+from .prefork import reset_after_fork
+from .timing import add_span, span
 
+# The GenAI SDK is slow to import; load it on the first evaluation
+genai = LazyModule('google.genai')
+types = LazyModule('google.genai.types')
 
-def build_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[str],
-                 config) -> str:
+
+def build_rules(config) -> str:
     """
-    Build a prompt for Learning Outcome evaluation using configuration from JSON file.
+    Build the evaluation rules shared by every prompt format.
 
     Args:
-        level: Unit level (1-6)
-        unit_name: Name of the unit
-        credit_points: Credit points for the unit
-        outcomes: List of learning outcomes to evaluate
-        config_path: Config file from runeval
+        config: AI settings (Bloom's verbs, level rules, outcome counts,
+                banned phrases)
 
     Returns:
-        str: Formatted prompt string
+        str: Rules text, ending with the banned phrases
     """
-
-    # Build LEVEL_NAME mapping from config
-    LEVEL_NAME = {
-        1: config["Level 1"],
-        2: config["Level 2"],
-        3: config["Level 3"],
-        4: config["Level 4"],
-        5: config["Level 5"],
-        6: config["Level 6"]
-    }
-
-    # Validate level
-    if level not in LEVEL_NAME:
-        raise ValueError("level must be an integer 1–6")
-
-    lo_level = LEVEL_NAME[level]
-
     # Build Bloom's verbs string from config
     BLOOMS_VERBS = (
         f"KNOWLEDGE: {', '.join(config['KNOWLEDGE'])}.\n"
@@ -69,6 +59,58 @@ def build_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[
     # Build banned phrases string from config
     BANNED_PHRASES = ', '.join(config['BANNED'])
 
+    return (
+            "You are a Learning Outcome Evaluation tool for Units in a University. "
+            "You must follow the following rules and respond with a SPECIFIC FORMAT.\n\n"
+            "RULE-- Every Learning Outcome must adhere to Bloom's Taxonomy. The best verbs for each class of Bloom's Taxonomy are:\n"
+            + BLOOMS_VERBS
+            + "RULE-- Units have 6 levels and they should ONLY focus on specific Bloom's classes:\n"
+            + LEVEL_RULES
+            + "RULE-- Units are also measured by their Credit Points and will have an acceptable range for how many Learning Outcomes there should be:\n"
+            + COUNT_RULES
+            + "RULE-- The following words and phrases should never be used in Learning Outcomes:\n"
+            + BANNED_PHRASES
+    )
+
+
+def _level_name(level, config):
+    """Bloom's classes for a unit level; raises ValueError outside 1-6."""
+    # Build LEVEL_NAME mapping from config
+    LEVEL_NAME = {
+        1: config["Level 1"],
+        2: config["Level 2"],
+        3: config["Level 3"],
+        4: config["Level 4"],
+        5: config["Level 5"],
+        6: config["Level 6"]
+    }
+
+    # Validate level
+    if level not in LEVEL_NAME:
+        raise ValueError("level must be an integer 1–6")
+
+    return LEVEL_NAME[level]
+
+
+def build_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[str],
+                 config, include_rules: bool = True) -> str:
+    """
+    Build a prompt for Learning Outcome evaluation using configuration from JSON file.
+
+    Args:
+        level: Unit level (1-6)
+        unit_name: Name of the unit
+        credit_points: Credit points for the unit
+        outcomes: List of learning outcomes to evaluate
+        config_path: Config file from runeval
+        include_rules: Start with build_rules(); False when the rules are
+                       sent as a (cached) system instruction instead
+
+    Returns:
+        str: Formatted prompt string
+    """
+    lo_level = _level_name(level, config)
+
     # Quote outcomes one-per-line
     formatted_outcomes = []
     for o in outcomes:
@@ -81,19 +123,9 @@ def build_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[
 
     outcomes_block = "\n".join(formatted_outcomes) if formatted_outcomes else "'(no outcomes provided)'"
 
-    # Build the complete system rules with structured format
-    system_rules = (
-            "You are a Learning Outcome Evaluation tool for Units in a University. "
-            "You must follow the following rules and respond with a SPECIFIC FORMAT.\n\n"
-            "RULE-- Every Learning Outcome must adhere to Bloom's Taxonomy. The best verbs for each class of Bloom's Taxonomy are:\n"
-            + BLOOMS_VERBS
-            + "RULE-- Units have 6 levels and they should ONLY focus on specific Bloom's classes:\n"
-            + LEVEL_RULES
-            + "RULE-- Units are also measured by their Credit Points and will have an acceptable range for how many Learning Outcomes there should be:\n"
-            + COUNT_RULES
-            + "RULE-- The following words and phrases should never be used in Learning Outcomes:\n"
-            + BANNED_PHRASES
-            + "\n\n**CRITICAL OUTPUT FORMAT INSTRUCTIONS**\n"
+    # Build the structured format instructions for this unit
+    instructions = (
+              "**CRITICAL OUTPUT FORMAT INSTRUCTIONS**\n"
               "You MUST structure your response EXACTLY as follows:\n\n"
               "**LO Analysis**\n\n"
               f"Check all Learning Outcomes are appropriate for {lo_level} Level (Level {level}).\n"
@@ -113,10 +145,526 @@ def build_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[
               "and if they align with the expected Bloom's level.\n"
     )
 
-    return system_rules
+    if not include_rules:
+        return instructions
+    return build_rules(config) + "\n\n" + instructions
+
+
+# ==================== STRUCTURED (JSON) OUTPUT ====================
+
+STATUSES = ('GOOD', 'NEEDS_REVISION', 'COULD_IMPROVE')
 
+# Response schema for models with JSON output; outcomes are keyed by their
+# index in the prompt so the text never has to be echoed back
+EVALUATION_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'outcomes': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'i': {'type': 'INTEGER'},
+                    'status': {'type': 'STRING', 'enum': list(STATUSES)},
+                    'feedback': {'type': 'STRING'},
+                    'suggestion': {'type': 'STRING'},
+                },
+                'required': ['i', 'status', 'feedback'],
+            },
+        },
+        'summary': {'type': 'STRING'},
+    },
+    'required': ['outcomes', 'summary'],
+}
 
-def run_eval(level, unit_name, credit_points, outcomes_text):
+
+class EvaluationFormatError(ValueError):
+    """Raised when a JSON evaluation does not match EVALUATION_SCHEMA."""
+
+
+def build_json_prompt(level: int, unit_name: str, credit_points: int, outcomes: List[str],
+                      config, include_rules: bool = True) -> str:
+    """
+    Build a prompt asking for the evaluation as compact JSON.
+
+    Same rules as build_prompt(), but outcomes are numbered and the model
+    answers with one short object per outcome index instead of repeating
+    each outcome in a paragraph, so responses are much shorter.
+
+    Args:
+        level: Unit level (1-6)
+        unit_name: Name of the unit
+        credit_points: Credit points for the unit
+        outcomes: List of learning outcomes to evaluate (blank ones are skipped)
+        config: AI settings
+        include_rules: Start with build_rules(), as in build_prompt()
+
+    Returns:
+        str: Formatted prompt string
+    """
+    lo_level = _level_name(level, config)
+    outcomes = [o.strip() for o in outcomes if o.strip()]
+    outcomes_block = "\n".join(f"{i}: '{o}'" for i, o in enumerate(outcomes)) or "(no outcomes provided)"
+    low, high = config[f'{credit_points} Points']
+
+    instructions = (
+              "**OUTPUT FORMAT**\n"
+              f"Check all Learning Outcomes are appropriate for {lo_level} Level (Level {level}).\n"
+              "Respond with JSON only, in this format:\n"
+              '{"outcomes": [{"i": <outcome index>, "status": "GOOD" | "NEEDS_REVISION" | "COULD_IMPROVE", '
+              '"feedback": "<one sentence>", "suggestion": "<revised outcome, or empty if GOOD>"}], '
+              '"summary": "<one or two sentences>"}\n'
+              "Include every outcome index exactly once.\n"
+              "- GOOD: appropriate for the level, no changes needed\n"
+              "- NEEDS_REVISION: wrong Bloom's level or serious issues\n"
+              "- COULD_IMPROVE: acceptable but could be strengthened\n"
+              f"The summary notes if the quantity is appropriate for a {credit_points}-point unit "
+              f"(should have {low} to {high} outcomes) and if they align with the expected Bloom's level.\n\n"
+              f"Learning Outcomes to evaluate for Level {level} Unit called {unit_name} worth {credit_points} points:\n\n"
+              f"{outcomes_block}\n"
+    )
+
+    if not include_rules:
+        return instructions
+    return build_rules(config) + "\n\n" + instructions
+
+
+def parse_json_evaluation(text: str, count: int) -> dict:
+    """
+    Parse and check a JSON evaluation.
+
+    Args:
+        text: Model response (JSON, possibly inside a ``` code fence)
+        count: Number of outcomes in the prompt
+
+    Returns:
+        dict: {'outcomes': [{'status', 'feedback', 'suggestion'}] in prompt
+              order, 'summary': str}
+
+    Raises:
+        EvaluationFormatError: If the response is not valid JSON, has an
+                               unknown status, or misses or repeats an index
+    """
+    body = text.strip()
+    if body.startswith('```'):
+        # Models without a JSON mode often wrap the answer in a code fence
+        body = body.split('\n', 1)[1] if '\n' in body else ''
+        body = body.rsplit('```', 1)[0]
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise EvaluationFormatError(f"response is not JSON ({e})") from None
+    if not isinstance(data, dict) or not isinstance(data.get('outcomes'), list):
+        raise EvaluationFormatError("response has no outcomes list")
+
+    results = [None] * count
+    for item in data['outcomes']:
+        if not isinstance(item, dict):
+            raise EvaluationFormatError("outcome entry is not an object")
+        index, status = item.get('i'), str(item.get('status', '')).upper()
+        if not isinstance(index, int) or not 0 <= index < count:
+            raise EvaluationFormatError(f"outcome index {index!r} is out of range")
+        if results[index] is not None:
+            raise EvaluationFormatError(f"outcome {index} is evaluated twice")
+        if status not in STATUSES:
+            raise EvaluationFormatError(f"outcome {index} has unknown status {status!r}")
+        results[index] = {
+            'status': status,
+            'feedback': str(item.get('feedback') or '').strip(),
+            'suggestion': str(item.get('suggestion') or '').strip() or None,
+        }
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        raise EvaluationFormatError(f"outcomes {missing} are missing")
+    return {'outcomes': results, 'summary': str(data.get('summary') or '').strip()}
+
+
+def render_evaluation_text(evaluation: dict, outcomes: List[str]) -> str:
+    """
+    Render a parsed JSON evaluation in the free-text format.
+
+    The evaluation page parses that format, so both modes display the same.
+
+    Args:
+        evaluation: From parse_json_evaluation()
+        outcomes: Outcome texts, in prompt order
+
+    Returns:
+        str: "**LO Analysis**" paragraphs and "**SUMMARY**"
+    """
+    lines = ["**LO Analysis**", ""]
+    for outcome, result in zip(outcomes, evaluation['outcomes']):
+        line = f"'{outcome}' - STATUS:{result['status']} - {result['feedback']}"
+        if result['suggestion'] and result['status'] != 'GOOD':
+            line += f" SUGGESTION: '{result['suggestion']}'"
+        lines += [line, ""]
+    lines += ["**SUMMARY**", "", evaluation['summary']]
+    return "\n".join(lines)
+
+
+def generation_config(model_name: str, output_format: str = 'text'):
+    """
+    Generation settings for an evaluation call.
+
+    Args:
+        model_name: Model the request goes to
+        output_format: 'text' or 'json'
+
+    Returns:
+        types.GenerateContentConfig; in JSON mode Gemini models also get
+        the response schema (Gemma models have no JSON mode and follow
+        the format given in the prompt)
+    """
+    if output_format == 'json' and model_name.startswith('gemini'):
+        return types.GenerateContentConfig(
+            temperature=0.0,
+            response_mime_type='application/json',
+            response_schema=EVALUATION_SCHEMA
+        )
+    return types.GenerateContentConfig(temperature=0.0)
+
+
+class LLMBusy(Exception):
+    """Raised when no model call slot frees up within the queue timeout."""
+
+
+class LLMLimiter:
+    """
+    Per-process limit on concurrent model calls.
+
+    Evaluations spend most of their time waiting on the model, so a
+    threaded worker can run many at once. A request waiting for a slot
+    still occupies a worker thread, so waiting is limited too: beyond
+    max_waiting queued requests, evaluations are turned away at once. The
+    remaining threads (threads - max_concurrency - max_waiting) always serve
+    ordinary page and API requests, however many evaluations arrive.
+
+    Attributes:
+        max_concurrency: Model calls allowed at once in this process
+        max_waiting: Requests allowed to wait for a slot
+        queue_timeout: Seconds a request waits for a free slot
+    """
+
+    def __init__(self, max_concurrency=16, max_waiting=4, queue_timeout=30):
+        self.configure(max_concurrency, max_waiting, queue_timeout)
+        reset_after_fork(self)
+
+    def configure(self, max_concurrency, max_waiting, queue_timeout):
+        """
+        Set the limits; in-flight calls keep the slot they already hold.
+
+        Args:
+            max_concurrency: Model calls allowed at once
+            max_waiting: Requests allowed to wait for a slot
+            queue_timeout: Seconds to wait for a free slot
+        """
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._admitted = threading.BoundedSemaphore(max_concurrency + max_waiting)
+
+    def _after_fork_in_child(self):
+        # Slots held by the parent's threads are never released in a child
+        self.configure(self.max_concurrency, self.max_waiting, self.queue_timeout)
+
+    def init_app(self, app):
+        """
+        Bind the limiter to a Flask application.
+
+        Args:
+            app: Flask application; reads LLM_MAX_CONCURRENCY, LLM_MAX_WAITING
+                 and LLM_QUEUE_TIMEOUT
+        """
+        self.configure(
+            app.config.get('LLM_MAX_CONCURRENCY', self.max_concurrency),
+            app.config.get('LLM_MAX_WAITING', self.max_waiting),
+            app.config.get('LLM_QUEUE_TIMEOUT', self.queue_timeout)
+        )
+        app.extensions['llm_limiter'] = self
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one model call slot for the duration of the block.
+
+        Raises:
+            LLMBusy: If the wait queue is full, or no slot frees up
+                     within queue_timeout
+        """
+        admitted, slots = self._admitted, self._slots
+        if not admitted.acquire(blocking=False):
+            raise LLMBusy()
+        try:
+            if not slots.acquire(timeout=self.queue_timeout):
+                raise LLMBusy()
+            try:
+                yield
+            finally:
+                slots.release()
+        finally:
+            admitted.release()
+
+
+class SharedClient:
+    """
+    One GenAI client per process, reused across requests.
+
+    The client keeps an HTTP connection pool, so reusing it saves a TLS
+    handshake per evaluation. A new client is made when the API key, the
+    base URL or cassette (or the genai.Client factory, e.g. a test double)
+    changes, and after a fork.
+
+    Attributes:
+        base_url: API endpoint to use instead of Google's, e.g. the fake
+                  Gemini server in benchmarks/fake_gemini.py (None = default)
+        cassette: (path, mode, replay_latency) to record or replay model
+                  calls (see llm_cassette.py), or None
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._entry = None
+        self.base_url = None
+        self.cassette = None
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # The parent's connections must not be shared
+        self.lock = threading.Lock()
+        self._entry = None
+
+    def init_app(self, app):
+        """
+        Bind the client to a Flask application.
+
+        Args:
+            app: Flask application; reads GENAI_BASE_URL, LLM_CASSETTE,
+                 LLM_CASSETTE_MODE and LLM_CASSETTE_REPLAY_LATENCY
+        """
+        self.base_url = app.config.get('GENAI_BASE_URL') or None
+        path = app.config.get('LLM_CASSETTE')
+        self.cassette = (
+            path,
+            app.config.get('LLM_CASSETTE_MODE', 'replay'),
+            app.config.get('LLM_CASSETTE_REPLAY_LATENCY', False)
+        ) if path else None
+        app.extensions['genai_client'] = self
+
+    def get(self, api_key):
+        """
+        Get the shared client for an API key.
+
+        Args:
+            api_key: GenAI API key
+
+        Returns:
+            genai.Client instance
+        """
+        factory = genai.Client
+        settings = (factory, api_key, self.base_url, self.cassette)
+        with self.lock:
+            entry = self._entry
+            if entry is None or entry[0] != settings:
+                entry = self._entry = (settings, self._make(*settings))
+            return entry[1]
+
+    @staticmethod
+    def _make(factory, api_key, base_url, cassette):
+        if base_url:
+            client = factory(api_key=api_key, http_options=types.HttpOptions(base_url=base_url))
+        else:
+            client = factory(api_key=api_key)
+        if cassette:
+            from .llm_cassette import wrap_client
+            path, mode, replay_latency = cassette
+            client = wrap_client(client, path, mode=mode, replay_latency=replay_latency)
+        return client
+
+
+class RulesCache:
+    """
+    Provider-side context cache of the evaluation rules.
+
+    The rules (Bloom's verbs, level and count rules, banned phrases) are the
+    same for every evaluation and make up most of the prompt. For models
+    with explicit context caching (Gemini), they are stored once as a
+    cached system instruction and each call only sends the unit's outcomes
+    with a reference to the cache, so the rules' input tokens are neither
+    resent nor billed at the full rate.
+
+    One cache is kept per model and version of the rules text, so changed
+    AI settings get a new cache on the next evaluation (the superseded one
+    is deleted). A cache is replaced refresh_margin seconds before its ttl
+    runs out; meanwhile other calls keep using the old one. Where caching is
+    refused (Gemma models, or rules below the model's minimum cache size),
+    Gemini models get the rules as an uncached system instruction and other
+    models keep them in the prompt, as before.
+
+    Attributes:
+        enabled: Use context caching at all
+        ttl: Lifetime of a cache in seconds
+        refresh_margin: Seconds before expiry a cache is replaced
+    """
+
+    def __init__(self, enabled=True, ttl=3600):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.refresh_margin = min(300, ttl // 10)
+        self.lock = threading.Lock()
+        self._entries = {}
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # The caches themselves live at the provider and stay usable
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Bind the cache to a Flask application.
+
+        Args:
+            app: Flask application; reads LLM_CONTEXT_CACHE and
+                 LLM_CONTEXT_CACHE_TTL
+        """
+        self.enabled = app.config.get('LLM_CONTEXT_CACHE', self.enabled)
+        self.ttl = app.config.get('LLM_CONTEXT_CACHE_TTL', self.ttl)
+        self.refresh_margin = min(300, self.ttl // 10)
+        app.extensions['llm_rules_cache'] = self
+
+    def applies(self, model_name):
+        """True if calls to this model send the rules as a system instruction."""
+        return self.enabled and model_name.startswith('gemini')
+
+    def attach(self, client, model_name, config, gen_config):
+        """
+        Point a generation config at the cached rules.
+
+        Args:
+            client: genai.Client the call is made with
+            model_name: Model the call goes to
+            config: AI settings the rules are built from
+            gen_config: types.GenerateContentConfig to update
+
+        Returns:
+            str: Name of the cache used, or None when the rules were set as
+                 an uncached system instruction
+        """
+        rules = build_rules(config)
+        name = self._name_for(client, model_name, rules)
+        if name:
+            gen_config.cached_content = name
+        else:
+            gen_config.system_instruction = rules
+        return name
+
+    def _name_for(self, client, model_name, rules):
+        digest = hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+        entry = self._entries.get(model_name)
+        now = time.monotonic()
+        if self._current(entry, client, digest) and now < entry['refresh_at']:
+            return entry['name']
+
+        usable = self._current(entry, client, digest) and now < entry['expires_at']
+        # Only one thread replaces a cache; while it does, the others keep
+        # using the one still valid instead of waiting
+        if not self.lock.acquire(blocking=not usable):
+            return entry['name']
+        try:
+            entry = self._entries.get(model_name)
+            if self._current(entry, client, digest) and time.monotonic() < entry['refresh_at']:
+                return entry['name']
+            fresh = self._create(client, model_name, rules, digest)
+            if fresh is None:
+                # Keep using the old cache until it runs out
+                return entry['name'] if usable else None
+            if entry is not None and entry['name'] and entry['digest'] != digest:
+                # The settings changed; the old rules are no longer used
+                self._delete(entry)
+            self._entries[model_name] = fresh
+            return fresh['name']
+        finally:
+            self.lock.release()
+
+    @staticmethod
+    def _current(entry, client, digest):
+        return entry is not None and entry['client'] is client and entry['digest'] == digest
+
+    def _create(self, client, model_name, rules, digest):
+        """Create a cache; None if this call should go uncached."""
+        start = time.monotonic()
+        try:
+            cached = client.caches.create(
+                model=model_name,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=rules,
+                    ttl=f'{self.ttl}s',
+                    display_name=f'lo-rules-{digest}'
+                )
+            )
+        except genai.errors.APIError as e:
+            if e.code >= 500 or e.code == 429:
+                # Passing trouble: go uncached and try again on the next call
+                return None
+            # Refused for this model or these rules: stay uncached until they change
+            return {'client': client, 'digest': digest, 'name': None,
+                    'refresh_at': math.inf, 'expires_at': math.inf}
+        return {'client': client, 'digest': digest, 'name': cached.name,
+                'refresh_at': start + self.ttl - self.refresh_margin,
+                'expires_at': start + self.ttl}
+
+    @staticmethod
+    def _delete(entry):
+        try:
+            entry['client'].caches.delete(name=entry['name'])
+        except Exception:
+            # It expires on its own
+            pass
+
+    def invalidate(self, model_name, name):
+        """
+        Forget a cache the provider no longer has.
+
+        Args:
+            model_name: Model the cache belongs to
+            name: Cache name a call failed with
+        """
+        with self.lock:
+            entry = self._entries.get(model_name)
+            if entry is not None and entry['name'] == name:
+                del self._entries[model_name]
+
+
+llm_limiter = LLMLimiter()
+shared_client = SharedClient()
+rules_cache = RulesCache()
+
+
+def record_token_usage(model_name, resp):
+    """
+    Add a response's token counts to the LLM token metrics.
+
+    Args:
+        model_name: Model the request was sent to
+        resp: GenerateContentResponse; responses without usage_metadata
+              (e.g. test doubles) are ignored. Prompt tokens include those
+              served from a context cache, which are also counted apart
+    """
+    usage = getattr(resp, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    response_tokens = getattr(usage, "candidates_token_count", None)
+    cached_tokens = getattr(usage, "cached_content_token_count", None)
+    if isinstance(prompt_tokens, int):
+        LLM_PROMPT_TOKENS.inc(model_name, amount=prompt_tokens)
+    if isinstance(response_tokens, int):
+        LLM_RESPONSE_TOKENS.inc(model_name, amount=response_tokens)
+    if isinstance(cached_tokens, int):
+        LLM_CACHED_TOKENS.inc(model_name, amount=cached_tokens)
+
+
+def run_eval(level, unit_name, credit_points, outcomes_text, output_format='text'):
     """
     Run evaluation of learning outcomes using GenAI API.
 
@@ -125,7 +673,8 @@ def run_eval(level, unit_name, credit_points, outcomes_text):
         unit_name: Name of the unit
         credit_points: Credit points for the unit
         outcomes_text: List of learning outcomes to evaluate
-        config_path: Config file
+        output_format: 'text' (free-text prompt) or 'json' (structured
+                       response, rendered back into the same text format)
 
     Returns:
         str: Outcome of evaluation or error message
@@ -148,20 +697,62 @@ def run_eval(level, unit_name, credit_points, outcomes_text):
     except Exception:
         return "❌ERROR: Level and Credit Points must be integers."
 
+    # Gemini models get the rules as a cached system instruction (see RulesCache)
+    cache_rules = rules_cache.applies(model_name)
+
     outcomes = outcomes_text.splitlines()
-    prompt = build_prompt(level, unit_name, credit_points, outcomes, config)
+    with span('prompt'):
+        if output_format == 'json':
+            outcomes = [o.strip() for o in outcomes if o.strip()]
+            prompt = build_json_prompt(level, unit_name, credit_points, outcomes, config,
+                                       include_rules=not cache_rules)
+        else:
+            prompt = build_prompt(level, unit_name, credit_points, outcomes, config,
+                                  include_rules=not cache_rules)
     # print(prompt)
 
-    # configure SDK
-    client = genai.Client(api_key=api_key)
+    # configure SDK (one client per process, see SharedClient)
+    client = shared_client.get(api_key)
 
-    resp = client.models.generate_content(
-        model=model_name,
-        contents=prompt,
-        config=types.GenerateContentConfig(
-            temperature=0.0
-        )
-    )
+    start = time.perf_counter()
+    try:
+        # Wait for one of this process's model call slots
+        with llm_limiter.slot(), span('llm'):
+            add_span('llm_queue', time.perf_counter() - start)
+            gen_config = generation_config(model_name, output_format)
+            cache_name = rules_cache.attach(client, model_name, config, gen_config) if cache_rules else None
+            try:
+                resp = client.models.generate_content(model=model_name, contents=prompt, config=gen_config)
+            except genai.errors.ClientError as e:
+                if not cache_name or e.code not in (400, 403, 404):
+                    raise
+                # The cache expired or was deleted early; send the rules uncached this once
+                rules_cache.invalidate(model_name, cache_name)
+                gen_config.cached_content = None
+                gen_config.system_instruction = build_rules(config)
+                resp = client.models.generate_content(model=model_name, contents=prompt, config=gen_config)
+    except LLMBusy:
+        LLM_LATENCY.observe(time.perf_counter() - start, model_name, 'busy')
+        return "❌ERROR: The AI service is busy with other evaluations. Try again in 1 minute."
+    except genai.errors.APIError as e:
+        if e.code != 429:
+            LLM_LATENCY.observe(time.perf_counter() - start, model_name, 'error')
+            raise
+        # Quota or rate limit reached at the API; the user can simply retry
+        LLM_LATENCY.observe(time.perf_counter() - start, model_name, 'rate_limited')
+        return "❌ERROR: The AI service rate limit was reached. Try again in 1 minute."
+    except Exception:
+        LLM_LATENCY.observe(time.perf_counter() - start, model_name, 'error')
+        raise
+    LLM_LATENCY.observe(time.perf_counter() - start, model_name, 'ok')
+    record_token_usage(model_name, resp)
+
+    if output_format == 'json':
+        try:
+            evaluation = parse_json_evaluation(getattr(resp, "text", "") or "", len(outcomes))
+        except EvaluationFormatError as e:
+            return f"❌ERROR: The AI response could not be read ({e}). Try again in 1 minute."
+        return render_evaluation_text(evaluation, outcomes)
 
     try:
         return getattr(resp, "text", "") or "⚠️ No text returned."
@@ -10,6 +10,8 @@ Flask's multi-threaded environment.
 import json
 import threading
 
+from .prefork import reset_after_fork
+
 
 class ConfigManager:
     """
@@ -28,6 +30,8 @@ class ConfigManager:
     Attributes:
         path: File path to the configuration JSON file
         lock: Threading lock for synchronization
+        version: Counter bumped on every change, used to key caches of
+                 pages derived from the configuration
         _AIParams: Private dictionary storing current configuration
     """
 
@@ -40,7 +44,13 @@ class ConfigManager:
         """
         self.path = path
         self.lock = threading.Lock()
+        self.version = 0
         self._AIParams = self._retrieveAIParams()
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        """Give a forked worker its own lock (the settings are shared)."""
+        self.lock = threading.Lock()
 
     def _retrieveAIParams(self):
         """
@@ -90,6 +100,7 @@ class ConfigManager:
         with self.lock:
             # Update in-memory configuration
             self._AIParams.update({key: newValue})
+            self.version += 1
 
             # Persist changes to disk
             with open(self.path, 'w') as file:
@@ -107,4 +118,7 @@ class ConfigManager:
         """
         # Load default configuration
         with open('app/AIConfigDefault.json') as file:
-            self._AIParams = json.load(file)
\ No newline at end of file
+            defaults = json.load(file)
+        with self.lock:
+            self._AIParams = defaults
+            self.version += 1
\ No newline at end of file
@@ -0,0 +1,384 @@
+"""
+Precompressed, fingerprinted static asset pipeline.
+
+At startup (or with "flask build-assets") every file in the static folder is
+copied to a dist directory under a content-hashed name, e.g.
+
+    js/create_lo.js  ->  js/create_lo.3f9a1c0b7e2d.js
+                         js/create_lo.3f9a1c0b7e2d.js.gz
+                         js/create_lo.3f9a1c0b7e2d.js.br
+
+Text assets are minified first with rjsmin/rcssmin, and gzip and brotli
+variants are written when they are smaller than the original. A manifest
+maps each source name to its built name so unchanged files are not
+rebuilt.
+
+Serving:
+    url_for('static', filename='js/create_lo.js') is rewritten to the built
+    name by a url_defaults hook, so templates need no changes. The static
+    view serves built files by picking the best precompressed variant for
+    the request's Accept-Encoding; nothing is compressed per request. Built
+    names change whenever content changes, so they are cached as immutable.
+
+Retired builds:
+    Pages rendered before a rebuild keep linking to the old names (cached
+    by browsers or the page cache, or rendered by workers still holding the
+    old manifest), so replaced files stay on disk and are still served for
+    ASSET_RETAIN_SECONDS after they leave the manifest.
+
+Dependencies (in requirements.txt; without them the build still works,
+skipping that step):
+    rjsmin, rcssmin   JavaScript/CSS minification
+    brotli            .br variants
+
+Attributes:
+    assets: Shared AssetPipeline instance
+    COMPRESSIBLE_EXTENSIONS: File types given gzip/brotli variants
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+
+from flask import request, send_from_directory, url_for, abort
+
+from .prefork import reset_after_fork
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - optional dependency
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - optional dependency
+    rcssmin = None
+
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.svg', '.json', '.txt', '.html', '.map')
+
+# Precompressed variants in order of preference: (encoding, file suffix)
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Bump to force a rebuild when the build steps change
+_BUILD_FORMAT = 1
+
+# Files of at most this size are not worth compressing
+_MIN_COMPRESS_SIZE = 256
+
+
+def minify(filename, data):
+    """
+    Minify JavaScript or CSS if the optional minifier is installed.
+
+    Args:
+        filename: Source file name (used to pick the minifier)
+        data: File content as bytes
+
+    Returns:
+        bytes: Minified content, or the input unchanged
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.js' and rjsmin is not None:
+        return rjsmin.jsmin(data.decode('utf-8')).encode('utf-8')
+    if ext == '.css' and rcssmin is not None:
+        return rcssmin.cssmin(data.decode('utf-8')).encode('utf-8')
+    return data
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as file:
+        file.write(data)
+    os.replace(tmpPath, path)
+
+
+def _fingerprinted_name(filename, digest):
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest}{ext}"
+
+
+class AssetPipeline:
+    """
+    Builds and serves fingerprinted, precompressed static assets.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+
+    Attributes:
+        source_dir: Static folder the assets are read from
+        dist_dir: Directory the built assets are written to
+        manifest: Source name -> {'path', 'source', 'encodings'} entries
+        build_id: Short digest of the built names in the manifest
+        retired: Built name -> entry (with 'retired_at') of replaced assets
+                 still kept on disk
+        retain_seconds: How long a replaced asset is kept
+    """
+
+    def __init__(self):
+        self.source_dir = None
+        self.dist_dir = None
+        self._set_manifest({})
+        self.retain_seconds = 7 * 24 * 60 * 60
+        self.lock = threading.Lock()
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Bind the pipeline to a Flask application.
+
+        Builds the assets if ASSET_BUILD_ON_STARTUP is set (otherwise loads
+        the manifest written by "flask build-assets"), takes over the static
+        view and rewrites static URLs to built names.
+
+        Args:
+            app: Flask application; reads ASSET_DIST_DIR, ASSET_BUILD_ON_STARTUP,
+                 ASSET_MAX_AGE and ASSET_RETAIN_SECONDS
+        """
+        self.source_dir = app.static_folder
+        self.dist_dir = app.config.get('ASSET_DIST_DIR') or os.path.join(app.static_folder, 'dist')
+        self.max_age = app.config.get('ASSET_MAX_AGE', 365 * 24 * 60 * 60)
+        self.retain_seconds = app.config.get('ASSET_RETAIN_SECONDS', self.retain_seconds)
+        if app.config.get('ASSET_BUILD_ON_STARTUP', True):
+            self.build()
+        else:
+            self.load_manifest()
+        app.extensions['assets'] = self
+
+        # Built files are served from the dist directory; everything else
+        # falls through to Flask's normal static file view
+        staticView = app.view_functions['static']
+
+        def static(filename):
+            if filename in self.built_names:
+                return self.serve(filename)
+            return staticView(filename=filename)
+
+        app.view_functions['static'] = static
+
+        @app.url_defaults
+        def rewrite_static_urls(endpoint, values):
+            """Point url_for('static', ...) at the built asset."""
+            if endpoint == 'static' and 'filename' in values:
+                entry = self.manifest.get(values['filename'])
+                if entry:
+                    values['filename'] = entry['path']
+
+        app.jinja_env.globals['asset_url'] = asset_url
+
+    # ==================== BUILD ====================
+
+    @property
+    def manifest_path(self):
+        """Path of the manifest file in the dist directory."""
+        return os.path.join(self.dist_dir, 'manifest.json')
+
+    def load_manifest(self):
+        """
+        Load the manifest written by the last build.
+
+        Returns:
+            dict: Manifest entries (empty if there has been no build)
+        """
+        try:
+            with open(self.manifest_path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('format') != _BUILD_FORMAT:
+            data = {}
+        self._set_manifest(data.get('assets', {}), data.get('retired', {}))
+        return self.manifest
+
+    def _set_manifest(self, manifest, retired=None):
+        self.manifest = manifest
+        self.retired = retired or {}
+        # Retired names stay servable for pages that still link to them
+        self.built_names = dict(self.retired)
+        self.built_names.update((entry['path'], entry) for entry in manifest.values())
+        # Changes whenever any built name does, i.e. whenever any asset changes
+        current = sorted(entry['path'] for entry in manifest.values())
+        self.build_id = hashlib.sha1(' '.join(current).encode()).hexdigest()[:12]
+
+    def _sources(self):
+        distDir = os.path.abspath(self.dist_dir)
+        for root, dirs, files in os.walk(self.source_dir):
+            # Never treat earlier build output or hidden files as sources
+            dirs[:] = sorted(
+                d for d in dirs
+                if not d.startswith('.') and os.path.abspath(os.path.join(root, d)) != distDir
+            )
+            for name in sorted(files):
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, self.source_dir).replace(os.sep, '/'), path
+
+    def build(self):
+        """
+        Build every static asset that changed since the last build.
+
+        Returns:
+            dict: The new manifest entries
+        """
+        with self.lock:
+            previous = self.load_manifest()
+            manifest = {}
+            for name, path in self._sources():
+                with open(path, 'rb') as file:
+                    data = file.read()
+                sourceHash = hashlib.sha256(data).hexdigest()
+
+                entry = previous.get(name)
+                if entry and entry['source'] == sourceHash and os.path.exists(
+                    os.path.join(self.dist_dir, entry['path'])
+                ):
+                    manifest[name] = entry
+                    continue
+                manifest[name] = self._build_file(name, data, sourceHash)
+
+            retired = self._retire_stale(previous, manifest)
+            _write_atomic(
+                self.manifest_path,
+                json.dumps({'format': _BUILD_FORMAT, 'assets': manifest, 'retired': retired},
+                           indent=1, sort_keys=True).encode()
+            )
+            self._set_manifest(manifest, retired)
+            return manifest
+
+    def _build_file(self, name, data, sourceHash):
+        output = minify(name, data)
+        builtName = _fingerprinted_name(name, hashlib.sha256(output).hexdigest()[:12])
+        builtPath = os.path.join(self.dist_dir, builtName)
+        _write_atomic(builtPath, output)
+
+        encodings = []
+        if name.lower().endswith(COMPRESSIBLE_EXTENSIONS) and len(output) > _MIN_COMPRESS_SIZE:
+            variants = {'gzip': gzip.compress(output, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['br'] = brotli.compress(output, quality=11)
+            for encoding, suffix in _ENCODINGS:
+                compressed = variants.get(encoding)
+                # Keep a variant only if it actually saves bytes
+                if compressed is not None and len(compressed) < len(output):
+                    _write_atomic(builtPath + suffix, compressed)
+                    encodings.append(encoding)
+        return {'path': builtName, 'source': sourceHash, 'encodings': encodings}
+
+    def _retire_stale(self, previous, manifest):
+        """
+        Retire assets replaced by this build and delete expired ones.
+
+        Args:
+            previous: Manifest entries of the last build
+            manifest: Manifest entries of this build
+
+        Returns:
+            dict: Built name -> entry of retired assets still kept
+        """
+        now = time.time()
+        current = {entry['path'] for entry in manifest.values()}
+        retired = {path: entry for path, entry in self.retired.items() if path not in current}
+        for entry in previous.values():
+            if entry['path'] not in current and entry['path'] not in retired:
+                retired[entry['path']] = dict(entry, retired_at=now)
+
+        for path, entry in list(retired.items()):
+            if now - entry['retired_at'] < self.retain_seconds:
+                continue
+            del retired[path]
+            for suffix in ('',) + tuple(s for _, s in _ENCODINGS):
+                try:
+                    os.remove(os.path.join(self.dist_dir, path + suffix))
+                except OSError:
+                    pass
+        return retired
+
+    # ==================== SERVING ====================
+
+    def choose_encoding(self, entry):
+        """
+        Pick the best precompressed variant the client accepts.
+
+        Args:
+            entry: Manifest entry of the requested asset
+
+        Returns:
+            tuple: (Content-Encoding value or None, file suffix)
+        """
+        accepted = request.accept_encodings
+        for encoding, suffix in _ENCODINGS:
+            if encoding in entry['encodings'] and accepted[encoding] > 0:
+                return encoding, suffix
+        return None, ''
+
+    def serve(self, builtName):
+        """
+        Send a built asset, precompressed if the client accepts it.
+
+        Args:
+            builtName: Fingerprinted name relative to the dist directory
+
+        Returns:
+            Response with long-lived caching headers
+        """
+        entry = self.built_names.get(builtName)
+        if entry is None:
+            abort(404)
+        encoding, suffix = self.choose_encoding(entry)
+        mimetype = mimetypes.guess_type(builtName)[0] or 'application/octet-stream'
+        response = send_from_directory(
+            self.dist_dir, builtName + suffix, mimetype=mimetype, max_age=self.max_age
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry['encodings']:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def is_built(self, filename):
+        """
+        Check whether a static filename is a fingerprinted build output.
+
+        Args:
+            filename: Path relative to the static folder
+
+        Returns:
+            bool: True for built (content-addressed) names
+        """
+        return filename in self.built_names
+
+
+assets = AssetPipeline()
+
+
+def asset_url(filename, **values):
+    """
+    URL of a static asset, using its fingerprinted name if built.
+
+    Same as url_for('static', filename=filename); also available in
+    templates as asset_url().
+
+    Args:
+        filename: Path relative to the static folder
+        **values: Extra url_for arguments (e.g. _external=True)
+
+    Returns:
+        str: URL of the asset
+    """
+    return url_for('static', filename=filename, **values)
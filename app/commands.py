@@ -0,0 +1,100 @@
+"""
+Flask CLI commands for maintenance tasks.
+
+Commands are registered on the application in create_app() and run with
+the flask command, e.g.:
+
+    flask --app webServer renormalize-order
+    flask --app webServer renormalize-order --unit-id 12 --force
+    flask --app webServer build-assets
+    flask --app webServer seed-synthetic --units 20000 --outcomes 8-12 --seed 1
+"""
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+@click.command('renormalize-order')
+@click.option('--unit-id', type=int, default=None, help='Only renormalize this unit.')
+@click.option('--force', is_flag=True, help='Rewrite keys even if none are too long.')
+@with_appcontext
+def renormalize_order_command(unit_id, force):
+    """Rewrite learning outcome order keys as short, evenly spaced keys."""
+    from . import db
+    from .models import Unit
+    from .ordering import renormalize_unit_outcomes
+
+    limit = None if force else current_app.config.get('ORDER_KEY_RENORMALIZE_LENGTH', 32)
+    if unit_id is not None:
+        unitIDs = [unit_id]
+    else:
+        unitIDs = db.session.scalars(db.select(Unit.id).order_by(Unit.id)).all()
+
+    total = 0
+    for uid in unitIDs:
+        count = renormalize_unit_outcomes(uid, limit)
+        if count:
+            click.echo(f"Unit {uid}: {count} outcome order keys rewritten")
+        total += count
+    click.echo(f"Done: {total} outcome order keys rewritten")
+
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Build fingerprinted, precompressed static assets."""
+    from .assets import assets, brotli
+
+    manifest = assets.build()
+    variants = sum(len(entry['encodings']) for entry in manifest.values())
+    click.echo(f"Built {len(manifest)} assets ({variants} precompressed variants) in {assets.dist_dir}")
+    if brotli is None:
+        click.echo("brotli is not installed; only gzip variants were written")
+
+
+def _outcome_range(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        low, high = (int(part) for part in value.split('-', 1))
+    except ValueError:
+        raise click.BadParameter("use MIN-MAX, e.g. 8-12")
+    if not 0 <= low <= high:
+        raise click.BadParameter("MIN must be between 0 and MAX")
+    return low, high
+
+
+@click.command('seed-synthetic')
+@click.option('--units', type=click.IntRange(min=0), default=1000, show_default=True,
+              help='Number of units to generate.')
+@click.option('--outcomes', callback=_outcome_range, default=None, metavar='MIN-MAX',
+              help='Outcomes per unit (default: the ranges in the AI settings).')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed.')
+@click.option('--clear', is_flag=True, help='Delete previously generated units first.')
+@with_appcontext
+def seed_synthetic_command(units, outcomes, seed, clear):
+    """Fill the database with a synthetic catalogue for scaling tests."""
+    import time
+    from .synthetic import SYNTHETIC_OWNER, clear_synthetic, seed_synthetic
+
+    if clear:
+        click.echo(f"Deleted {clear_synthetic()} synthetic units")
+    start = time.perf_counter()
+    unitCount, outcomeCount = seed_synthetic(units, seed=seed, outcome_range=outcomes)
+    click.echo(
+        f"Added {unitCount} units with {outcomeCount} outcomes (owner {SYNTHETIC_OWNER}) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+def register_commands(app):
+    """
+    Register the CLI commands on a Flask application.
+
+    Args:
+        app: Flask application
+    """
+    app.cli.add_command(renormalize_order_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(seed_synthetic_command)
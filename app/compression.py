@@ -0,0 +1,299 @@
+"""
+Response compression middleware.
+
+Compresses dynamic responses (HTML pages, JSON, CSV exports) with brotli or
+gzip, whichever the client prefers, at the WSGI layer so it also covers
+streamed responses such as the CSV exports.
+
+Rules:
+    - Only text-like content types (see COMPRESSIBLE_TYPES) are compressed.
+    - Responses that already have a Content-Encoding (e.g. precompressed
+      static assets), partial content, 204/304 responses, HEAD requests and
+      "Cache-Control: no-transform" responses pass through untouched.
+    - Bodies smaller than the threshold are sent as they are. For streamed
+      bodies without a Content-Length, chunks are held back only until the
+      threshold is reached, then compression starts.
+    - Streamed output is flushed every COMPRESS_FLUSH_SIZE input bytes, so a
+      long export keeps reaching the client while it is generated.
+    - Vary: Accept-Encoding is added to every compressible response, and a
+      strong ETag becomes weak once the body is re-encoded.
+
+brotli is in requirements.txt; if it is missing, only gzip is offered.
+
+Classes:
+    CompressionMiddleware: WSGI middleware wrapping the Flask application
+
+Functions:
+    compress_bytes: Encode a complete body once (for cached responses)
+    init_app: Wrap an application's WSGI callable using its configuration
+"""
+
+import zlib
+from itertools import chain
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset((
+    'text/html',
+    'text/css',
+    'text/csv',
+    'text/plain',
+    'text/javascript',
+    'text/xml',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+))
+
+
+class _GzipEncoder:
+    """Incremental gzip encoder (zlib with a gzip header)."""
+
+    name = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    """Incremental brotli encoder."""
+
+    name = 'br'
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    WSGI middleware compressing eligible responses with brotli or gzip.
+
+    Attributes:
+        app: Wrapped WSGI application
+        minimum_size: Bodies smaller than this many bytes are not compressed
+        level: gzip compression level (1-9)
+        brotli_quality: brotli quality (0-11); low values suit dynamic pages
+        flush_size: Input bytes between flushes of a compressed stream
+    """
+
+    def __init__(self, app, minimum_size=500, level=6, brotli_quality=4, flush_size=64 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.flush_size = flush_size
+
+    def choose_encoding(self, accept_encoding):
+        """
+        Pick the encoding to use from an Accept-Encoding header.
+
+        Args:
+            accept_encoding: Raw Accept-Encoding header value
+
+        Returns:
+            str: 'br', 'gzip' or None if the client accepts neither
+        """
+        return parse_accept_header(accept_encoding).best_match(available_encodings())
+
+    def make_encoder(self, encoding):
+        """
+        Create an incremental encoder.
+
+        Args:
+            encoding: 'br' or 'gzip'
+
+        Returns:
+            Encoder with compress(), flush() and finish() methods
+        """
+        if encoding == 'br':
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.level)
+
+    def is_compressible(self, status, headers, environ):
+        """
+        Check whether a response may be re-encoded at all.
+
+        Args:
+            status: WSGI status string
+            headers: Response Headers
+            environ: WSGI environment
+
+        Returns:
+            bool: True if the content type is compressible and nothing
+                  forbids changing the encoding
+        """
+        code = int(status.split(' ', 1)[0])
+        mimetype = headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        return (
+            mimetype in COMPRESSIBLE_TYPES
+            and code >= 200 and code not in (204, 206, 304)
+            and 'Content-Encoding' not in headers
+            and 'Content-Range' not in headers
+            and 'no-transform' not in headers.get('Cache-Control', '')
+            and environ.get('REQUEST_METHOD') != 'HEAD'
+        )
+
+    def __call__(self, environ, start_response):
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            # Writes through the legacy write() callable are buffered into the body
+            return captured.setdefault('written', []).append
+
+        body = self.app(environ, capture_start_response)
+        try:
+            iterator = iter(body)
+            buffered = list(captured.get('written', ()))
+
+            # Some applications only call start_response on the first iteration
+            while 'status' not in captured:
+                try:
+                    buffered.append(next(iterator))
+                except StopIteration:
+                    break
+
+            status = captured['status']
+            headers = Headers(captured['headers'])
+            exc_info = captured.get('exc_info')
+
+            def passthrough(chunks):
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                return ClosingIterator(chain(chunks, iterator), getattr(body, 'close', None))
+
+            if not self.is_compressible(status, headers, environ):
+                return passthrough(buffered)
+
+            # The body depends on Accept-Encoding whether or not it is compressed
+            vary = headers.get('Vary')
+            if not vary:
+                headers['Vary'] = 'Accept-Encoding'
+            elif 'accept-encoding' not in vary.lower():
+                headers['Vary'] = vary + ', Accept-Encoding'
+
+            encoding = self.choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+            if encoding is None:
+                return passthrough(buffered)
+
+            length = headers.get('Content-Length', type=int)
+            if length is not None and length < self.minimum_size:
+                return passthrough(buffered)
+
+            if length is None:
+                # Streamed body: hold chunks back until the threshold is reached
+                size = sum(len(chunk) for chunk in buffered)
+                while size < self.minimum_size:
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        # Ended below the threshold; send it as it is
+                        headers['Content-Length'] = str(size)
+                        return passthrough(buffered)
+                    buffered.append(chunk)
+                    size += len(chunk)
+
+            headers['Content-Encoding'] = encoding
+            headers.remove('Content-Length')
+            etag = headers.get('ETag')
+            if etag and not etag.startswith('W/'):
+                headers['ETag'] = 'W/' + etag
+
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return ClosingIterator(
+                self._encode(chain(buffered, iterator), self.make_encoder(encoding)),
+                getattr(body, 'close', None)
+            )
+        except BaseException:
+            # Release the application's resources if deciding failed
+            if hasattr(body, 'close'):
+                body.close()
+            raise
+
+    def _encode(self, chunks, encoder):
+        sinceFlush = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            data = encoder.compress(chunk)
+            sinceFlush += len(chunk)
+            if sinceFlush >= self.flush_size:
+                data += encoder.flush()
+                sinceFlush = 0
+            if data:
+                yield data
+        yield encoder.finish()
+
+
+def compress_bytes(data, encoding):
+    """
+    Compress a complete body at the highest setting.
+
+    For bodies that are compressed once and served many times, such as
+    cached pages; dynamic responses use the middleware's faster settings.
+
+    Args:
+        data: Body bytes
+        encoding: 'br' or 'gzip'
+
+    Returns:
+        bytes: Encoded body
+    """
+    encoder = _BrotliEncoder(11) if encoding == 'br' else _GzipEncoder(9)
+    return encoder.compress(data) + encoder.finish()
+
+
+def available_encodings():
+    """
+    Encodings this process can produce, in order of preference.
+
+    Returns:
+        list: ['br', 'gzip'] or ['gzip'] without the brotli package
+    """
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def init_app(app):
+    """
+    Wrap an application's WSGI callable with response compression.
+
+    Args:
+        app: Flask application; reads COMPRESS_ENABLED, COMPRESS_MIN_SIZE,
+             COMPRESS_LEVEL, COMPRESS_BROTLI_QUALITY and COMPRESS_FLUSH_SIZE
+    """
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        minimum_size=app.config.get('COMPRESS_MIN_SIZE', 500),
+        level=app.config.get('COMPRESS_LEVEL', 6),
+        brotli_quality=app.config.get('COMPRESS_BROTLI_QUALITY', 4),
+        flush_size=app.config.get('COMPRESS_FLUSH_SIZE', 64 * 1024)
+    )
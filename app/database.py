@@ -0,0 +1,94 @@
+"""
+Database engine tuning for the AI Learning Outcome Builder.
+
+SQLite keeps most of its tuning in per-connection PRAGMA settings rather
+than in the connection URL, so they have to be applied every time the pool
+opens a new connection. This module registers a connect listener on each of
+the application's SQLite engines that applies the SQLITE_PRAGMAS profile
+from the active configuration class.
+
+Other databases (e.g. PostgreSQL selected through DATABASE_URL) are left
+untouched; their pooling is configured with SQLALCHEMY_ENGINE_OPTIONS.
+
+Functions:
+    apply_sqlite_pragmas: Apply a pragma profile to a raw DBAPI connection
+    init_database: Register the pragma listener on the app's engines
+    ensure_database: Create a missing SQLite database file's tables
+"""
+
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Apply PRAGMA settings to a raw SQLite connection.
+
+    Args:
+        dbapi_connection: sqlite3 connection object
+        pragmas: Mapping of pragma name to value, applied in order
+
+    Note:
+        journal_mode=WAL is stored in the database file itself, but is
+        re-applied on every connection as it is cheap once already set.
+        In-memory databases silently keep their "memory" journal mode.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def init_database(app, db):
+    """
+    Register the SQLite pragma profile on every engine of an application.
+
+    Must be called after db.init_app(app), which creates the engines.
+
+    Args:
+        app: Flask application; reads SQLITE_PRAGMAS
+        db: Flask-SQLAlchemy instance bound to the app
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if not pragmas:
+        return
+
+    def on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', on_connect)
+
+
+def ensure_database(app, db):
+    """
+    Create the tables if the configured SQLite database file is missing.
+
+    Only the configured file is checked, with a single stat call and
+    without opening a connection. In-memory databases (set up by the
+    testing seed) and server databases (created with "flask db upgrade")
+    are left alone.
+
+    Args:
+        app: Flask application; reads SQLALCHEMY_DATABASE_URI
+        db: Flask-SQLAlchemy instance bound to the app
+
+    Returns:
+        bool: True if the tables were created
+    """
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return False
+    if os.path.exists(url.database):
+        return False
+
+    with app.app_context():
+        db.create_all()
+        db.session.commit()
+    return True
@@ -0,0 +1,305 @@
+"""
+Route-aware HTTP caching policy.
+
+Replaces the old blanket "no-store" header with a policy chosen per
+response, so browsers and reverse proxies can reuse what is safe to reuse:
+
+    Static files        Built assets have content-hashed names (see
+                        assets.py) and are immutable. Other links carry a
+                        content hash (?v=...) added by a url_defaults hook;
+                        a request with the current hash is cached for a
+                        year as immutable. Anything else is revalidated
+                        with the ETag Flask already sends.
+    Conditional views   Views marked @cache_policy('conditional') compute
+                        their own ETag/Last-Modified from a version stamp
+                        and answer 304 before doing any work (see unit view).
+    Anonymous pages     "public, no-cache" with an ETag of the body, so a
+                        repeat visit gets a 304 instead of the page.
+    Everything else     Pages for a logged-in user (editor pages, XHR
+                        APIs) and any response while flash messages are
+                        pending are "no-store".
+
+Functions:
+    cache_policy: Decorator choosing the policy for a view
+    init_app: Register the hooks on an application
+"""
+
+import hashlib
+import os
+from functools import wraps
+
+from flask import request, session, current_app, g
+from flask_login import current_user
+
+# Seconds a fingerprinted static file may be cached
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+POLICIES = ('no-store', 'conditional')
+
+
+def cache_policy(name):
+    """
+    Choose the caching policy for a view function.
+
+    Args:
+        name: 'no-store' (never cache, even for anonymous visitors) or
+              'conditional' (the view sets its own validators and is
+              revalidated on every use, also for logged-in users)
+
+    Returns:
+        Decorator recording the policy on the view function
+    """
+    if name not in POLICIES:
+        raise ValueError(f"unknown cache policy {name!r}")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapper.cache_policy = name
+        return wrapper
+    return decorator
+
+
+def has_pending_flashes():
+    """
+    Check whether flash messages are waiting to be shown.
+
+    A page rendered while messages are pending displays them once, so it
+    must neither be answered with a 304 nor stored. Rendering consumes the
+    messages, so this also reports messages that were pending when the
+    request started.
+
+    Returns:
+        bool: True if flash messages were or are pending in this request
+    """
+    return g.get('had_flashes', False) or bool(session.get('_flashes'))
+
+
+def viewer_key():
+    """
+    Identify what the current viewer sees on a shared page.
+
+    Pages show the username and role-specific buttons, so validators for
+    the same content differ between anonymous visitors and each user.
+
+    Returns:
+        str: 'anon' or 'u<id>-<role>'
+    """
+    if current_user.is_anonymous:
+        return 'anon'
+    return f"u{current_user.id}-{current_user.userType.name}"
+
+
+def make_etag(*parts):
+    """
+    Build an ETag value from version parts and the application build.
+
+    The build id changes when templates or static assets change, so a
+    deploy invalidates every validator without bumping database stamps.
+
+    Args:
+        *parts: Values identifying the content version
+
+    Returns:
+        str: ETag value (unquoted)
+    """
+    raw = '-'.join(str(part) for part in (current_app.extensions['http_cache_build'],) + parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Check a conditional request against a view's validators.
+
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    Never matches while flash messages are pending.
+
+    Args:
+        etag: Current ETag value (unquoted)
+        last_modified: Current modification time (aware datetime) or None
+
+    Returns:
+        bool: True if the client's copy is current and 304 can be sent
+    """
+    if request.method not in ('GET', 'HEAD') or has_pending_flashes():
+        return False
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Attach an ETag and Last-Modified to a response.
+
+    Args:
+        response: Flask response
+        etag: ETag value (unquoted)
+        last_modified: Modification time (aware datetime) or None
+
+    Returns:
+        response: The same response
+    """
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+# ==================== STATIC FINGERPRINTS ====================
+
+class StaticFingerprints:
+    """
+    Content hashes of static files, recomputed when a file changes.
+
+    Attributes:
+        folder: Static folder path
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._hashes = {}
+
+    def get(self, filename):
+        """
+        Short content hash of a static file.
+
+        Args:
+            filename: Path relative to the static folder
+
+        Returns:
+            str: 12 hex characters, or None if the file does not exist
+        """
+        path = os.path.join(self.folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._hashes.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(64 * 1024), b''):
+                digest.update(chunk)
+        value = digest.hexdigest()[:12]
+        self._hashes[filename] = (mtime, value)
+        return value
+
+
+def _build_id(app):
+    # Pages link to the built asset names, so a cached page is only valid
+    # while both its template and the assets it links to are unchanged
+    assets = app.extensions.get('assets')
+    if assets is None:
+        return _template_build_id(app)
+    return f"{_template_build_id(app)}-{assets.build_id}"
+
+
+def _template_build_id(app):
+    # Derived from template names and mtimes so every worker on a host
+    # computes the same id, and editing a template changes it
+    digest = hashlib.sha1()
+    folder = os.path.join(app.root_path, app.template_folder or 'templates')
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(f"{os.path.relpath(path, folder)}:{os.stat(path).st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+# ==================== HOOKS ====================
+
+def init_app(app):
+    """
+    Register the caching hooks on an application.
+
+    Args:
+        app: Flask application
+    """
+    fingerprints = StaticFingerprints(app.static_folder)
+    app.extensions['static_fingerprints'] = fingerprints
+    app.extensions['http_cache_build'] = _build_id(app)
+    assets = app.extensions.get('assets')
+
+    def is_built(filename):
+        # Names from the asset pipeline already carry their content hash
+        return assets is not None and assets.is_built(filename)
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        """Add ?v=<content hash> to url_for('static', ...) links."""
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            if is_built(values['filename']):
+                return
+            version = fingerprints.get(values['filename'])
+            if version:
+                values['v'] = version
+
+    @app.before_request
+    def note_pending_flashes():
+        """Remember whether flashes were pending before the view reads them."""
+        if request.endpoint != 'static':
+            g.had_flashes = bool(session.get('_flashes'))
+
+    @app.after_request
+    def apply_cache_policy(response):
+        """
+        Set Cache-Control for a response according to its route.
+
+        Args:
+            response: Flask response object
+
+        Returns:
+            response: Response with caching headers
+        """
+        if request.endpoint == 'static':
+            filename = (request.view_args or {}).get('filename')
+            if is_built(filename):
+                # The asset pipeline set immutable caching itself
+                return response
+            version = request.args.get('v')
+            if response.status_code == 200 and version and version == fingerprints.get(filename):
+                response.cache_control.public = True
+                response.cache_control.max_age = STATIC_MAX_AGE
+                response.cache_control.immutable = True
+            return response
+
+        # Everything below depends on the session cookie
+        response.vary.add('Cookie')
+
+        view = current_app.view_functions.get(request.endpoint)
+        policy = getattr(view, 'cache_policy', None)
+
+        cacheable = (
+            request.method in ('GET', 'HEAD')
+            and response.status_code in (200, 304)
+            and not has_pending_flashes()
+            and policy != 'no-store'
+        )
+        if not cacheable or (policy is None and not current_user.is_anonymous):
+            # Logged-in pages, API calls and one-off flash pages
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        # Revalidate on every use; only shared caches may keep pages that
+        # look the same to every anonymous visitor and set no cookie
+        response.cache_control.no_cache = True
+        if current_user.is_anonymous and 'Set-Cookie' not in response.headers:
+            response.cache_control.public = True
+        else:
+            response.cache_control.private = True
+
+        if policy == 'conditional':
+            # The view set its own validators
+            return response
+
+        # Anonymous page: validate by a hash of the body
+        if response.status_code == 200 and not response.is_streamed and 'ETag' not in response.headers:
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+        return response
@@ -0,0 +1,346 @@
+"""
+Background job manager for long-running import and export operations.
+
+Imports and exports of the full unit catalogue can take long enough to tie up
+a web worker and time out behind the reverse proxy. This module runs them on a
+small thread pool instead and records their progress on disk so that any
+worker process can answer status requests for any job.
+
+Spool Directory Layout:
+    <job_id>.json        Job state (status, row counts, result message)
+    <job_id>.out         Output file for finished export jobs
+    uploads/<sha256>.*   Spooled upload, named by content hash
+    hashes/<owner>-<sha256>
+                         Pointer from a user's upload hash to the job importing it
+
+Job Lifecycle:
+    queued -> running -> finished | failed
+
+Attributes:
+    JOB_STATUSES: Valid values for a job's status field
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import JOB_DURATION, ROWS_PROCESSED
+from .prefork import reset_after_fork
+
+JOB_STATUSES = ('queued', 'running', 'finished', 'failed')
+
+# Job ids are uuid4 hex strings; anything else is rejected before touching disk
+_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class JobHandle:
+    """
+    Handle passed to a running job function for reporting progress.
+
+    Progress writes are throttled so that a job processing thousands of rows
+    does not rewrite its state file for every single row.
+
+    Attributes:
+        job_id: Identifier of the job being run
+        manager: JobManager that owns the job
+    """
+
+    def __init__(self, manager, job_id):
+        self.manager = manager
+        self.job_id = job_id
+        self._lastWrite = 0.0
+
+    def progress(self, rows_done, rows_total=None, force=False):
+        """
+        Record the number of rows processed so far.
+
+        Args:
+            rows_done: Rows processed so far
+            rows_total: Total rows expected, if known
+            force: Write immediately even if the throttle interval has not passed
+        """
+        now = time.monotonic()
+        if not force and now - self._lastWrite < self.manager.progress_interval:
+            return
+        self._lastWrite = now
+        changes = {'rows_done': rows_done}
+        if rows_total is not None:
+            changes['rows_total'] = rows_total
+        self.manager._update(self.job_id, **changes)
+
+    @property
+    def output_path(self):
+        """Path the job should write its downloadable output to."""
+        return self.manager.output_path(self.job_id)
+
+
+class JobManager:
+    """
+    Runs import/export jobs on a bounded thread pool with on-disk state.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app(). The thread pool is created
+    lazily on first submit so that no threads exist before a server forks.
+
+    Attributes:
+        max_workers: Maximum number of jobs run concurrently per process
+        progress_interval: Minimum seconds between progress writes
+        retention: Seconds job files are kept before being purged
+        spool_dir: Directory holding job state, uploads and outputs
+    """
+
+    def __init__(self, max_workers=2, progress_interval=0.5, retention=24 * 60 * 60):
+        self.max_workers = max_workers
+        self.progress_interval = progress_interval
+        self.retention = retention
+        self.spool_dir = None
+        self.lock = threading.Lock()
+        self._executor = None
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # The parent's pool threads do not exist in a forked child
+        self.lock = threading.Lock()
+        self._executor = None
+
+    def init_app(self, app):
+        """
+        Bind the manager to a Flask application.
+
+        Args:
+            app: Flask application; reads JOB_SPOOL_DIR, JOB_MAX_WORKERS
+                 and JOB_RETENTION_SECONDS
+        """
+        self.spool_dir = app.config.get(
+            'JOB_SPOOL_DIR',
+            os.path.join(tempfile.gettempdir(), 'lo_builder_jobs')
+        )
+        self.max_workers = app.config.get('JOB_MAX_WORKERS', self.max_workers)
+        self.retention = app.config.get('JOB_RETENTION_SECONDS', self.retention)
+        for sub in ('', 'uploads', 'hashes'):
+            os.makedirs(os.path.join(self.spool_dir, sub), exist_ok=True)
+        app.extensions['job_manager'] = self
+
+    # ==================== SPOOLING ====================
+
+    def spool_upload(self, fileStorage, chunk_size=64 * 1024):
+        """
+        Stream an uploaded file to disk while hashing its content.
+
+        The upload is copied in fixed-size chunks so large files never have
+        to fit in memory, then renamed to its SHA-256 digest so identical
+        uploads share one spooled copy.
+
+        Args:
+            fileStorage: Werkzeug FileStorage from request.files
+            chunk_size: Bytes read per chunk
+
+        Returns:
+            tuple: (spooled file path, hex SHA-256 digest of the content)
+        """
+        ext = os.path.splitext(fileStorage.filename or '')[1].lower()
+        uploadDir = os.path.join(self.spool_dir, 'uploads')
+        digest = hashlib.sha256()
+        fd, tmpPath = tempfile.mkstemp(dir=uploadDir, suffix='.part')
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = fileStorage.stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        contentHash = digest.hexdigest()
+        finalPath = os.path.join(uploadDir, contentHash + ext)
+        os.replace(tmpPath, finalPath)
+        return finalPath, contentHash
+
+    def _hash_pointer(self, owner_id, content_hash):
+        """Path of the pointer from a user's upload hash to its job."""
+        return os.path.join(self.spool_dir, 'hashes', f'{owner_id}-{content_hash}')
+
+    def find_by_hash(self, owner_id, content_hash):
+        """
+        Find an earlier successful import of the same content by the same user.
+
+        Only finished jobs of that user count: another user's upload of the
+        same file is imported for them, and a failed or unfinished job does
+        not block a retry.
+
+        Args:
+            owner_id: ID of the user uploading the file
+            content_hash: Hex SHA-256 digest of the upload
+
+        Returns:
+            dict: State of the matching job, or None
+        """
+        try:
+            with open(self._hash_pointer(owner_id, content_hash)) as file:
+                jobId = file.read().strip()
+        except OSError:
+            return None
+        state = self.get(jobId)
+        if state is None or state['status'] != 'finished' or state['owner_id'] != owner_id:
+            return None
+        return state
+
+    # ==================== JOB STATE ====================
+
+    def state_path(self, job_id):
+        """Path of the JSON state file for a job."""
+        return os.path.join(self.spool_dir, f'{job_id}.json')
+
+    def output_path(self, job_id):
+        """Path of the output file for a job."""
+        return os.path.join(self.spool_dir, f'{job_id}.out')
+
+    def get(self, job_id):
+        """
+        Read the current state of a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            dict: Job state, or None if the id is invalid or unknown
+        """
+        if not job_id or not _JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self.state_path(job_id)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, state):
+        # Write to a temp file and rename so readers never see a partial file
+        path = self.state_path(state['id'])
+        fd, tmpPath = tempfile.mkstemp(dir=self.spool_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(state, file)
+        os.replace(tmpPath, path)
+
+    def _update(self, job_id, **changes):
+        with self.lock:
+            state = self.get(job_id)
+            if state is None:
+                return None
+            state.update(changes)
+            state['updated'] = time.time()
+            self._write(state)
+            return state
+
+    def purge_expired(self):
+        """
+        Delete job files, uploads and hash pointers older than the retention.
+
+        Called opportunistically when a job is submitted so the spool
+        directory does not grow without bound.
+
+        Returns:
+            int: Number of files removed
+        """
+        cutoff = time.time() - self.retention
+        removed = 0
+        for sub in ('', 'uploads', 'hashes'):
+            folder = os.path.join(self.spool_dir, sub)
+            for entry in os.scandir(folder):
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    # Another worker removed it first
+                    continue
+        return removed
+
+    # ==================== EXECUTION ====================
+
+    def _get_executor(self):
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='lo-job'
+                )
+            return self._executor
+
+    def submit(self, app, kind, owner_id, func, *args, content_hash=None, **meta):
+        """
+        Queue a job to run in the background.
+
+        The job function is called as func(handle, *args) inside an
+        application context and must return a result dict, which is merged
+        into the job state when it finishes. Exceptions mark the job failed.
+
+        Args:
+            app: Flask application to push a context for
+            kind: Job type, e.g. 'import' or 'export'
+            owner_id: ID of the user who started the job
+            func: Callable doing the work
+            *args: Extra positional arguments for func
+            content_hash: Upload digest to register for duplicate detection
+            **meta: Extra fields stored in the job state
+
+        Returns:
+            dict: Initial job state
+        """
+        self.purge_expired()
+
+        jobId = uuid.uuid4().hex
+        now = time.time()
+        state = {
+            'id': jobId,
+            'kind': kind,
+            'owner_id': owner_id,
+            'status': 'queued',
+            'rows_done': 0,
+            'rows_total': None,
+            'message': '',
+            'result': None,
+            'has_output': False,
+            'content_hash': content_hash,
+            'created': now,
+            'updated': now,
+        }
+        state.update(meta)
+        with self.lock:
+            self._write(state)
+        if content_hash:
+            with open(self._hash_pointer(owner_id, content_hash), 'w') as file:
+                file.write(jobId)
+
+        self._get_executor().submit(self._run, app, jobId, kind, func, args)
+        return state
+
+    def _run(self, app, job_id, kind, func, args):
+        handle = JobHandle(self, job_id)
+        self._update(job_id, status='running', started=time.time())
+        start = time.perf_counter()
+        with app.app_context():
+            try:
+                result = func(handle, *args) or {}
+            except Exception as e:
+                JOB_DURATION.observe(time.perf_counter() - start, kind, 'failed')
+                self._update(job_id, status='failed', message=str(e), finished=time.time())
+                return
+
+        # Final row counts and the message are stored at the top level
+        message = result.pop('message', '')
+        counts = {k: result.pop(k) for k in ('rows_done', 'rows_total') if k in result}
+        JOB_DURATION.observe(time.perf_counter() - start, kind, 'finished')
+        ROWS_PROCESSED.inc(kind, amount=counts.get('rows_done') or 0)
+        self._update(
+            job_id,
+            status='finished',
+            finished=time.time(),
+            message=message,
+            result=result,
+            has_output=os.path.exists(self.output_path(job_id)),
+            **counts
+        )
@@ -0,0 +1,75 @@
+"""
+Deferred imports for heavy optional-path dependencies.
+
+pandas (with numpy) and the Google GenAI SDK together take over a second
+and tens of MB per process to import, but only the import/export routes and
+AI evaluation use them. Binding them as LazyModule proxies at module level
+keeps the usual "pd.read_csv(...)" / "genai.Client(...)" call sites while
+the real import happens on first attribute access, so a gunicorn worker
+that never serves those routes never loads them.
+
+Example:
+    pd = LazyModule('pandas')
+    ...
+    df = pd.read_csv(path)   # pandas is imported here, once
+
+Classes:
+    LazyModule: Module proxy importing its target on first use
+"""
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Proxy for a module that is imported on first attribute access.
+
+    Attribute writes and deletes are forwarded to the real module, so tests
+    can monkeypatch e.g. genai.Client through the proxy.
+
+    Args:
+        name: Dotted module name to import
+    """
+
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def load(self):
+        """
+        Import the module if that has not happened yet.
+
+        Returns:
+            module: The real module
+        """
+        module = object.__getattribute__(self, '_module')
+        if module is None:
+            with object.__getattribute__(self, '_lock'):
+                module = object.__getattribute__(self, '_module')
+                if module is None:
+                    module = importlib.import_module(object.__getattribute__(self, '_name'))
+                    object.__setattr__(self, '_module', module)
+        return module
+
+    @property
+    def is_loaded(self):
+        """True once the real module has been imported."""
+        return object.__getattribute__(self, '_module') is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self.load(), attr)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<LazyModule {object.__getattribute__(self, '_name')!r} ({state})>"
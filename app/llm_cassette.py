@@ -0,0 +1,345 @@
+"""
+Record/replay of model calls for reproducible, offline evaluation runs.
+
+A cassette sits at the LLM backend boundary: it wraps a genai.Client so
+that client.models.generate_content() is answered from a file of recorded
+responses instead of the API. Each request is keyed by a SHA-256 hash of
+the model name, the prompt and the generation config, and each record
+holds only what callers read back:
+
+    {"key": "<sha256>", "model": "gemma-3-27b-it", "text": "...",
+     "latency": 2.31, "prompt_tokens": 1210, "response_tokens": 388,
+     "recorded": "2026-10-19T10:00:00"}
+
+Records are appended as JSON lines, so the file stays compact (prompts are
+not stored), diffs well and survives an interrupted recording. When a key
+is recorded twice the later record wins.
+
+Modes:
+    record      Always call the API and store the response
+    replay      Only answer from the cassette; an unrecorded request
+                raises CassetteMiss (never touches the network)
+    auto        Replay recorded requests, record the others
+
+Context caches (client.caches.create) get a stable name derived from
+their model and contents, and requests referencing one are keyed by that
+name, so a recording made with the cached rules replays in a later run
+without the API. Outside replay mode the real cache is created as well
+and live calls are sent to it.
+
+Replay answers at once unless replay_latency is set, in which case it
+sleeps for the recorded latency (times the factor), so load and timing
+comparisons see the real model's latency distribution.
+
+Example:
+    client = wrap_client(genai.Client(api_key=key), 'runs/eval.jsonl', mode='auto')
+    resp = client.models.generate_content(model=..., contents=prompt, config=...)
+
+In the app, set LLM_CASSETTE (and LLM_CASSETTE_MODE) to wrap the shared
+client used by AI evaluation.
+
+Classes:
+    Cassette: Store of recorded responses
+    CassetteClient: genai.Client stand-in answering from a cassette
+    CassetteMiss: Raised for an unrecorded request in replay mode
+
+Functions:
+    request_key: Hash identifying a generate_content request
+    wrap_client: Put a client behind a cassette file
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+MODES = ('record', 'replay', 'auto')
+
+
+class CassetteMiss(LookupError):
+    """Raised when replay mode meets a request that was never recorded."""
+
+
+def _canonical(value):
+    # Pydantic models in the SDK (GenerateContentConfig, Content, ...)
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json', exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    return value
+
+
+def request_key(model, contents, config=None):
+    """
+    Hash identifying a generate_content request.
+
+    Args:
+        model: Model name
+        contents: Prompt text (or SDK contents)
+        config: GenerateContentConfig or dict, or None
+
+    Returns:
+        str: Hex SHA-256 of the canonical request
+    """
+    canonical = json.dumps(
+        {'model': model, 'contents': _canonical(contents), 'config': _canonical(config)},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ReplayedResponse(SimpleNamespace):
+    """
+    Response served from a cassette.
+
+    Has the attributes callers of generate_content read: text and
+    usage_metadata (prompt_token_count, candidates_token_count,
+    total_token_count).
+    """
+
+
+class Cassette:
+    """
+    Store of recorded responses backed by a JSON lines file.
+
+    Args:
+        path: Cassette file (created on the first recording)
+        replay_latency: Sleep for the recorded latency when replaying
+        latency_factor: Multiplier for replayed latency (e.g. 0.5)
+
+    Attributes:
+        hits: Requests answered from the cassette
+        misses: Requests not found in it
+        recorded: Responses recorded by this instance
+    """
+
+    def __init__(self, path, replay_latency=False, latency_factor=1.0):
+        self.path = path
+        self.replay_latency = replay_latency
+        self.latency_factor = latency_factor
+        self.lock = threading.Lock()
+        self.records = {}
+        self.hits = self.misses = self.recorded = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted recording
+                    continue
+                self.records[record['key']] = record
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, key):
+        return key in self.records
+
+    def get(self, key):
+        """
+        Look up a recording.
+
+        Args:
+            key: request_key() of the request
+
+        Returns:
+            dict: The record, or None
+        """
+        with self.lock:
+            record = self.records.get(key)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return record
+
+    def put(self, key, model, resp, latency):
+        """
+        Record a response and append it to the file.
+
+        Args:
+            key: request_key() of the request
+            model: Model name
+            resp: GenerateContentResponse (or anything with .text)
+            latency: Seconds the call took
+
+        Returns:
+            dict: The stored record
+        """
+        usage = getattr(resp, 'usage_metadata', None)
+        record = {
+            'key': key,
+            'model': model,
+            'text': getattr(resp, 'text', None) or '',
+            'latency': round(latency, 4),
+            'prompt_tokens': getattr(usage, 'prompt_token_count', None),
+            'response_tokens': getattr(usage, 'candidates_token_count', None),
+            'recorded': datetime.now().isoformat(timespec='seconds'),
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(line)
+            self.records[key] = record
+            self.recorded += 1
+        return record
+
+    def response(self, record):
+        """
+        Build the response for a record, sleeping for its latency if asked.
+
+        Args:
+            record: Record from get()
+
+        Returns:
+            ReplayedResponse
+        """
+        if self.replay_latency and record.get('latency'):
+            time.sleep(record['latency'] * self.latency_factor)
+        promptTokens, responseTokens = record.get('prompt_tokens'), record.get('response_tokens')
+        totalTokens = None
+        if promptTokens is not None or responseTokens is not None:
+            totalTokens = (promptTokens or 0) + (responseTokens or 0)
+        return ReplayedResponse(
+            text=record['text'],
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=promptTokens,
+                candidates_token_count=responseTokens,
+                total_token_count=totalTokens,
+            ),
+            model_version=record.get('model'),
+        )
+
+
+class _CassetteCaches:
+    """client.caches stand-in: caches get names that are the same in every run."""
+
+    def __init__(self, client, mode):
+        self._client = client
+        self._mode = mode
+        self._live = {}
+
+    def create(self, *, model, config=None):
+        name = 'cachedContents/cassette-' + request_key(model, None, config)[:16]
+        if self._mode != 'replay' and self._client is not None:
+            # Errors (e.g. a model without caching) surface as with the real client
+            self._live[name] = self._client.caches.create(model=model, config=config).name
+        return SimpleNamespace(name=name, model=model, expire_time=None)
+
+    def delete(self, *, name, config=None):
+        live = self._live.pop(name, None)
+        if live is not None:
+            self._client.caches.delete(name=live)
+
+    def live_name(self, name):
+        """Name of the real cache behind a stable name (unchanged if none)."""
+        return self._live.get(name, name)
+
+    def __getattr__(self, name):
+        return getattr(self._client.caches, name)
+
+
+class _CassetteModels:
+    """client.models stand-in: generate_content goes through the cassette."""
+
+    def __init__(self, client, cassette, mode, caches=None):
+        self._client = client
+        self._cassette = cassette
+        self._mode = mode
+        self._caches = caches
+
+    def generate_content(self, *, model, contents, config=None, **kwargs):
+        key = request_key(model, contents, config)
+        if self._mode != 'record':
+            record = self._cassette.get(key)
+            if record is not None:
+                return self._cassette.response(record)
+            if self._mode == 'replay':
+                raise CassetteMiss(f"No recording for this {model} request in {self._cassette.path}")
+        if self._client is None:
+            raise CassetteMiss(f"No client to record this {model} request with")
+
+        cached = getattr(config, 'cached_content', None)
+        if cached and self._caches is not None:
+            config = config.model_copy(update={'cached_content': self._caches.live_name(cached)})
+
+        start = time.perf_counter()
+        resp = self._client.models.generate_content(model=model, contents=contents, config=config, **kwargs)
+        self._cassette.put(key, model, resp, time.perf_counter() - start)
+        return resp
+
+    def __getattr__(self, name):
+        # Everything else (count_tokens, ...) goes to the real client
+        return getattr(self._client.models, name)
+
+
+class CassetteClient:
+    """
+    genai.Client stand-in answering generate_content from a cassette.
+
+    Args:
+        client: Real genai.Client used for recording (may be None in
+                replay mode)
+        cassette: Cassette instance
+        mode: 'record', 'replay' or 'auto'
+
+    Raises:
+        ValueError: For an unknown mode
+    """
+
+    def __init__(self, client, cassette, mode='auto'):
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {', '.join(MODES)}, not {mode!r}")
+        self.client = client
+        self.cassette = cassette
+        self.mode = mode
+        self.caches = _CassetteCaches(client, mode)
+        self.models = _CassetteModels(client, cassette, mode, self.caches)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+# Cassettes by path, so every client in a process shares one store and lock
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def wrap_client(client, path, mode='auto', replay_latency=False, latency_factor=1.0):
+    """
+    Put a client behind a cassette file.
+
+    Args:
+        client: genai.Client (None is fine for replay mode)
+        path: Cassette file
+        mode: 'record', 'replay' or 'auto'
+        replay_latency: Sleep for the recorded latency when replaying
+        latency_factor: Multiplier for replayed latency
+
+    Returns:
+        CassetteClient
+    """
+    path = os.path.abspath(path)
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(path)
+    cassette.replay_latency = replay_latency
+    cassette.latency_factor = latency_factor
+    return CassetteClient(client, cassette, mode)
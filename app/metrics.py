@@ -0,0 +1,483 @@
+"""
+Application metrics in the Prometheus text format.
+
+A small, dependency-free registry of counters, gauges and histograms with
+a /metrics endpoint, cheap enough to leave on in production: recording a
+value is a dict update under a lock.
+
+Metrics:
+    http_requests_total                 Requests by endpoint, method, status
+    http_request_duration_seconds       Request latency histogram by endpoint
+    http_requests_in_flight             Requests being served, by endpoint
+    llm_request_duration_seconds        Model call latency by model, outcome
+    llm_prompt_tokens_total             Prompt tokens sent, by model
+    llm_response_tokens_total           Response tokens received, by model
+    llm_cached_prompt_tokens_total      Prompt tokens served from a context
+                                        cache, by model
+    cache_requests_total                Cache lookups by cache and result
+                                        (hit ratio = hit / all)
+    rows_processed_total                Import/export rows by operation
+    job_duration_seconds                Background job run time by kind, status
+
+Multiple processes:
+    With METRICS_DIR set (gunicorn.conf.py sets it), a thread in every
+    worker writes its values to <METRICS_DIR>/<pid>-<start time>.json once
+    per METRICS_FLUSH_INTERVAL seconds, and a scrape served by any worker
+    adds up the files of all workers (its own values are always current).
+    Counters and histograms of workers that have exited are kept; their
+    gauges are dropped. The start time keeps a new worker that reuses the
+    PID of an exited one from overwriting its file.
+
+Access:
+    /metrics answers direct requests from localhost (not forwarded by a
+    proxy) and logged-in admins only; everyone else gets 404.
+
+Attributes:
+    registry: Shared Registry all metrics below are registered in
+"""
+
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+from flask import Response, abort, g, request
+from flask_login import current_user
+
+from .prefork import reset_after_fork
+
+# Latency buckets in seconds: page/API requests and model calls
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0)
+
+_LOOPBACK = ('127.0.0.1', '::1', 'localhost')
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class for a named metric with label values.
+
+    Attributes:
+        name: Metric name
+        documentation: HELP text
+        labelnames: Names of the labels, in order
+    """
+
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = registry.lock
+        self._values = {}
+        registry.register(self)
+
+    def samples(self):
+        """
+        Current values for every label combination.
+
+        Returns:
+            dict: Label values tuple -> value (JSON-serialisable)
+        """
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    def _copy(self, value):
+        return value
+
+    def reset(self):
+        """Forget every recorded value."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def inc(self, *labelvalues, amount=1):
+        """
+        Increase the count.
+
+        Args:
+            *labelvalues: One value per label name
+            amount: Increment (must not be negative)
+        """
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    kind = 'gauge'
+
+    def inc(self, *labelvalues, amount=1):
+        """Increase the value."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount=1):
+        """Decrease the value."""
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Attributes:
+        buckets: Upper bounds, ascending (+Inf is implied)
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=REQUEST_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value, *labelvalues):
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value (e.g. seconds)
+            *labelvalues: One value per label name
+        """
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                # Per-bucket (not cumulative) counts, then sum and count
+                entry = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _copy(self, value):
+        return [list(value[0]), value[1], value[2]]
+
+
+class Registry:
+    """
+    Collection of metrics with optional multi-process aggregation.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+
+    Attributes:
+        directory: Shared directory for per-process files, or None
+        flush_interval: Seconds between writes of this process's file
+        started: Start time of this process (ns), part of its file name
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.directory = None
+        self.flush_interval = 1.0
+        self.started = time.time_ns()
+        self._flusher = None
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # A forked worker starts from zero; the master's values are its own,
+        # and its flusher thread does not exist in the child
+        self.lock = threading.Lock()
+        for metric in self.metrics.values():
+            metric._lock = self.lock
+            metric._values = {}
+        self.started = time.time_ns()
+        self._flusher = None
+
+    def register(self, metric):
+        """
+        Add a metric to the registry.
+
+        Args:
+            metric: Metric instance
+
+        Raises:
+            ValueError: If a metric with the same name exists
+        """
+        if metric.name in self.metrics:
+            raise ValueError(f"duplicate metric {metric.name}")
+        self.metrics[metric.name] = metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Create and register a Counter."""
+        return Counter(self, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Create and register a Gauge."""
+        return Gauge(self, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=REQUEST_BUCKETS):
+        """Create and register a Histogram."""
+        return Histogram(self, name, documentation, labelnames, buckets)
+
+    # ==================== MULTI-PROCESS FILES ====================
+
+    def snapshot(self):
+        """
+        Values of every metric in this process.
+
+        Returns:
+            dict: name -> list of [label values, value]
+        """
+        return {
+            name: [[list(key), value] for key, value in metric.samples().items()]
+            for name, metric in self.metrics.items()
+        }
+
+    def flush(self):
+        """Write this process's values to the shared directory."""
+        if self.directory is None:
+            return
+        data = json.dumps({'pid': os.getpid(), 'started': self.started, 'metrics': self.snapshot()})
+        fd, tmpPath = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            file.write(data)
+        os.replace(tmpPath, self.path)
+
+    @property
+    def path(self):
+        """Path of this process's file in the shared directory."""
+        return os.path.join(self.directory, f'{os.getpid()}-{self.started}.json')
+
+    def start_flusher(self):
+        """
+        Flush this process's file every flush_interval from a daemon thread.
+
+        Request hooks only flush when a request ends, so without it the
+        last values of a worker that goes idle would never be written.
+        """
+        if self.directory is None or self._flusher is not None:
+            return
+        with self.lock:
+            if self._flusher is not None:
+                return
+
+            def loop():
+                while True:
+                    time.sleep(self.flush_interval)
+                    try:
+                        self.flush()
+                    except OSError:
+                        pass
+
+            self._flusher = threading.Thread(target=loop, name='metrics-flush', daemon=True)
+            self._flusher.start()
+
+    def collect(self):
+        """
+        Values of every metric, added up over all worker processes.
+
+        Returns:
+            dict: name -> {label values tuple: value}
+        """
+        if self.directory is None:
+            return {name: metric.samples() for name, metric in self.metrics.items()}
+
+        self.flush()
+        files = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as file:
+                    files.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+
+        # Only the latest process with a given PID can still be running
+        latest = {}
+        for data in files:
+            pid = data.get('pid')
+            latest[pid] = max(latest.get(pid, 0), data.get('started', 0))
+
+        merged = {name: {} for name in self.metrics}
+        for data in files:
+            pid = data.get('pid')
+            alive = data.get('started', 0) == latest[pid] and _pid_alive(pid)
+            for name, samples in data.get('metrics', {}).items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == 'gauge' and not alive):
+                    continue
+                target = merged[name]
+                for labels, value in samples:
+                    key = tuple(labels)
+                    target[key] = _add(metric.kind, target.get(key), value)
+        return merged
+
+    # ==================== EXPOSITION ====================
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text format (version 0.0.4).
+
+        Returns:
+            str: Exposition text
+        """
+        collected = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(collected.get(name, {}).items()):
+                if metric.kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucketCount in zip(metric.buckets + (math.inf,), counts):
+                    cumulative += bucketCount
+                    labels = _format_labels(metric.labelnames, key, [('le', _format_value(bound))])
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{name}_count{labels} {count}")
+        return '\n'.join(lines) + '\n'
+
+    # ==================== FLASK INTEGRATION ====================
+
+    def init_app(self, app):
+        """
+        Bind the registry to a Flask application.
+
+        Registers the request hooks and the /metrics endpoint.
+
+        Args:
+            app: Flask application; reads METRICS_ENABLED, METRICS_DIR and
+                 METRICS_FLUSH_INTERVAL
+        """
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        self.directory = app.config.get('METRICS_DIR') or None
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', self.flush_interval)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.extensions['metrics'] = self
+
+        @app.before_request
+        def start_request_timer():
+            g.metrics_start = time.perf_counter()
+            g.metrics_endpoint = request.endpoint or 'unmatched'
+            REQUESTS_IN_FLIGHT.inc(g.metrics_endpoint)
+
+        @app.after_request
+        def note_status(response):
+            g.metrics_status = response.status_code
+            return response
+
+        @app.teardown_request
+        def record_request(exc):
+            start = g.pop('metrics_start', None)
+            if start is None:
+                return
+            endpoint = g.pop('metrics_endpoint')
+            status = g.pop('metrics_status', 500)
+            REQUESTS_IN_FLIGHT.dec(endpoint)
+            REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint, request.method)
+            REQUESTS.inc(endpoint, request.method, str(status))
+            self.start_flusher()
+
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def metrics_view(self):
+        """
+        Serve the metrics to localhost and admins.
+
+        Returns:
+            Prometheus text response
+
+        Raises:
+            404: For anyone else, so the endpoint is not advertised
+        """
+        from .models import UserType
+        # Behind a reverse proxy every request comes from localhost; only
+        # direct local requests (no forwarding header) count as local
+        local = request.remote_addr in _LOOPBACK and 'X-Forwarded-For' not in request.headers
+        admin = current_user.is_authenticated and current_user.role == UserType.ADMIN
+        if not (local or admin):
+            abort(404)
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _add(kind, current, value):
+    if current is None:
+        return value if kind != 'histogram' else [list(value[0]), value[1], value[2]]
+    if kind == 'histogram':
+        return [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1], current[2] + value[2]]
+    return current + value
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+REQUESTS = registry.counter(
+    'http_requests_total', 'HTTP requests by endpoint, method and status.',
+    ('endpoint', 'method', 'status'))
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by endpoint.',
+    ('endpoint', 'method'), REQUEST_BUCKETS)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    'http_requests_in_flight', 'HTTP requests currently being served.', ('endpoint',))
+LLM_LATENCY = registry.histogram(
+    'llm_request_duration_seconds', 'AI model call latency by model and outcome.',
+    ('model', 'outcome'), LLM_BUCKETS)
+LLM_PROMPT_TOKENS = registry.counter(
+    'llm_prompt_tokens_total', 'Prompt tokens sent to the AI model.', ('model',))
+LLM_RESPONSE_TOKENS = registry.counter(
+    'llm_response_tokens_total', 'Response tokens received from the AI model.', ('model',))
+LLM_CACHED_TOKENS = registry.counter(
+    'llm_cached_prompt_tokens_total', 'Prompt tokens served from a context cache.', ('model',))
+CACHE_REQUESTS = registry.counter(
+    'cache_requests_total', 'Cache lookups by cache and result (hit or miss).',
+    ('cache', 'result'))
+ROWS_PROCESSED = registry.counter(
+    'rows_processed_total', 'Units imported or exported, by operation.', ('operation',))
+JOB_DURATION = registry.histogram(
+    'job_duration_seconds', 'Background job run time by kind and final status.',
+    ('kind', 'status'), JOB_BUCKETS)
@@ -8,24 +8,13 @@ and LearningOutcome model for individual learning objectives.
 
 from flask_login import UserMixin
 from app import db
-from app import login_manager
 import enum
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-
-
-@login_manager.user_loader
-def load_user(id):
-    """
-    Flask-Login user loader callback.
-
-    Args:
-        id: User ID to load
-
-    Returns:
-        User object if found, None otherwise
-    """
-    return User.query.get(id)
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .ordering import DIGITS, ORDER_KEY_LENGTH
+from .user_cache import register_user_events
 
 
 class UserType(enum.Enum):
@@ -76,6 +65,10 @@ class User(UserMixin, db.Model):
         return self.userType
 
 
+# Drop cached logins when a user's identity or role changes
+register_user_events(User)
+
+
 class Unit(db.Model):
     """
     Unit model representing a course/subject unit.
@@ -88,6 +81,8 @@ class Unit(db.Model):
         creditpoints: Number of credit points (6, 12, or 24)
         description: Optional detailed description
         creatorid: Foreign key to User who created this unit
+        revision: Counter bumped whenever the unit or its outcomes change
+        updated_at: UTC time of the last change to the unit or its outcomes
         learning_outcomes: Related learning outcomes for this unit
     """
     __tablename__ = "unit"
@@ -106,21 +101,32 @@ class Unit(db.Model):
     # Optional description
     description = db.Column(db.String(512), nullable=True)
 
+    # Version stamp for HTTP caching of the unit page; kept current by the
+    # before_flush listener below and by touchUnit() for bulk updates
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+
     # Foreign key to user who created this unit
     creatorid = db.Column(
         db.Integer,
         db.ForeignKey("user.id", ondelete="CASCADE", name='fk_unit_creatorid'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # Relationship to learning outcomes
     # Cascade delete ensures outcomes are deleted when unit is deleted
-    # Order by position ensures outcomes maintain their sequence
+    # Order by fractional order key ensures outcomes maintain their sequence
     learning_outcomes = db.relationship(
         "LearningOutcome",
         back_populates="unit",
         cascade="all, delete-orphan",
-        order_by="LearningOutcome.position.asc()"
+        order_by="[LearningOutcome.order_key.asc(), LearningOutcome.id.asc()]"
+    )
+
+    # Case-insensitive lookups and prefix searches on the unit code
+    __table_args__ = (
+        db.Index("ix_unit_unitcode_lower", db.func.lower(unitcode)),
     )
 
 
@@ -133,11 +139,17 @@ class LearningOutcome(db.Model):
         unit_id: Foreign key to parent unit
         description: The actual learning outcome text
         assessment: Optional assessment method for this outcome
-        position: Order position within the unit (for maintaining sequence)
+        order_key: Fractional sort key within the unit (see app/ordering.py)
+        version: Edit counter used to reject stale concurrent writes
         unit: Relationship back to parent unit
     """
     __tablename__ = "learning_outcomes"
 
+    # Every outcome list is loaded by unit in order key order
+    __table_args__ = (
+        db.Index("ix_learning_outcomes_unit_id_order_key", "unit_id", "order_key"),
+    )
+
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
 
@@ -154,12 +166,79 @@ class LearningOutcome(db.Model):
     # Optional assessment method
     assessment = db.Column(db.String(255), nullable=True)
 
-    # Position for ordering (0-based index)
-    position = db.Column(db.Integer, nullable=False, default=0)
+    # Fractional key for ordering; an outcome can be placed between two
+    # others by changing only its own key. Compared byte-wise, so PostgreSQL
+    # needs the "C" collation to sort it the same way SQLite does.
+    order_key = db.Column(
+        db.String(ORDER_KEY_LENGTH).with_variant(
+            db.String(ORDER_KEY_LENGTH, collation="C"), "postgresql"
+        ),
+        nullable=False,
+        default=DIGITS[len(DIGITS) // 2]
+    )
+
+    # Incremented on every content edit; clients send the version they
+    # last saw so a stale autosave is rejected instead of clobbering
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Relationship back to parent unit
     unit = db.relationship(
         "Unit",
         back_populates="learning_outcomes",
         foreign_keys=[unit_id]
-    )
\ No newline at end of file
+    )
+
+
+# ==================== UNIT VERSION STAMPS ====================
+
+def touchUnit(unit_id):
+    """
+    Bump a unit's version stamp after a bulk UPDATE of its outcomes.
+
+    Bulk UPDATE statements bypass the ORM flush, so routes that change
+    outcomes that way call this in the same transaction.
+
+    Args:
+        unit_id: ID of the changed unit
+    """
+    db.session.execute(
+        db.update(Unit)
+        .where(Unit.id == unit_id)
+        .values(revision=Unit.revision + 1, updated_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def bumpUnitRevisions(session, flush_context, instances):
+    """
+    Bump the version stamp of every unit changed in this flush.
+
+    A unit counts as changed if any of its own columns changed or one of
+    its learning outcomes was added, edited or deleted.
+
+    Args:
+        session: Session being flushed
+        flush_context: Unused
+        instances: Unused
+    """
+    units = set()
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Unit):
+                if obj not in session.new and session.is_modified(obj, include_collections=False):
+                    units.add(obj)
+            elif isinstance(obj, LearningOutcome):
+                if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                    continue
+                unit = obj.unit
+                if unit is None and obj.unit_id is not None:
+                    unit = session.get(Unit, obj.unit_id)
+                if unit is not None:
+                    units.add(unit)
+
+    now = datetime.utcnow()
+    for unit in units:
+        if unit in session.deleted or unit in session.new:
+            continue
+        unit.revision = (unit.revision or 0) + 1
+        unit.updated_at = now
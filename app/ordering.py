@@ -0,0 +1,252 @@
+"""
+Fractional order keys for learning outcomes.
+
+Outcomes are ordered by a string key instead of an integer position. A key
+can always be generated that sorts between any two neighbouring keys, so
+inserting or moving an outcome writes only that outcome's row rather than
+renumbering every outcome after it.
+
+Keys are strings of base-62 digits compared byte-wise ("0" < "9" < "A" <
+"Z" < "a" < "z"), which is how SQLite compares text by default. Keys never
+end in "0", which guarantees there is always room between two of them.
+
+Repeatedly inserting into the same gap makes keys grow by roughly one
+character per six inserts, so units whose keys get long are renormalized
+back to short, evenly spaced keys (see renormalize_unit_outcomes).
+
+Attributes:
+    DIGITS: Base-62 digit alphabet in sort order
+    ORDER_KEY_LENGTH: Maximum stored key length (column size)
+"""
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+ORDER_KEY_LENGTH = 128
+
+_BASE = len(DIGITS)
+_DIGIT_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+
+def _validate(key):
+    if not key or key[-1] == '0' or any(c not in _DIGIT_VALUES for c in key):
+        raise ValueError(f"invalid order key {key!r}")
+
+
+def _midpoint(before, after):
+    """
+    Find a digit string strictly between two others.
+
+    Args:
+        before: Lower bound digit string ('' for no lower bound)
+        after: Upper bound digit string, or None for no upper bound
+
+    Returns:
+        str: Digit string sorting strictly between the bounds
+    """
+    if after is not None:
+        # Copy the shared prefix, treating missing digits of before as '0'
+        n = 0
+        while n < len(after) and (before[n] if n < len(before) else '0') == after[n]:
+            n += 1
+        if n > 0:
+            return after[:n] + _midpoint(before[n:], after[n:])
+
+    low = _DIGIT_VALUES[before[0]] if before else 0
+    high = _DIGIT_VALUES[after[0]] if after is not None else _BASE
+
+    # Room for a single digit in between
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+
+    # Adjacent first digits; the upper bound's first digit alone sorts
+    # between them when the upper bound has more digits after it
+    if after is not None and len(after) > 1:
+        return after[0]
+
+    return DIGITS[low] + _midpoint(before[1:], None)
+
+
+def key_between(before, after):
+    """
+    Generate an order key sorting strictly between two keys.
+
+    Appending after the last key or prepending before the first one steps
+    the first digit, so keys stay one character long for the first few
+    dozen appends instead of growing on every append.
+
+    Args:
+        before: Key of the item before the gap, or None for the start
+        after: Key of the item after the gap, or None for the end
+
+    Returns:
+        str: New order key
+
+    Raises:
+        ValueError: If a key is malformed or before does not sort before after
+    """
+    if before is not None:
+        _validate(before)
+    if after is not None:
+        _validate(after)
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"order key {before!r} is not before {after!r}")
+
+    if before is None and after is None:
+        return DIGITS[_BASE // 2]
+
+    if after is None:
+        # Append: bump the first digit, or extend past 'z'
+        first = _DIGIT_VALUES[before[0]]
+        if first < _BASE - 1:
+            return DIGITS[first + 1]
+        return before[0] + key_between(before[1:] or None, None)
+
+    if before is None:
+        # Prepend: lower the first digit, or extend below it
+        first = _DIGIT_VALUES[after[0]]
+        if first > 1:
+            return DIGITS[first - 1]
+        if first == 1:
+            return DIGITS[0] + DIGITS[_BASE // 2]
+        return DIGITS[0] + key_between(None, after[1:])
+
+    return _midpoint(before, after)
+
+
+def keys_between(before, after, n):
+    """
+    Generate n ordered keys sorting strictly between two keys.
+
+    Bisects the gap rather than chaining key_between, so the keys grow
+    logarithmically rather than linearly with n.
+
+    Args:
+        before: Key of the item before the gap, or None for the start
+        after: Key of the item after the gap, or None for the end
+        n: Number of keys to generate
+
+    Returns:
+        list: n keys in ascending order
+    """
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(before, after)]
+    middle = n // 2
+    key = key_between(before, after)
+    return keys_between(before, key, middle) + [key] + keys_between(key, after, n - middle - 1)
+
+
+def rekey_for_order(keys):
+    """
+    Find the fewest key changes that put a list into the given order.
+
+    Keeps the longest run of items whose current keys already ascend in the
+    new order (a longest increasing subsequence) and generates new keys for
+    the rest, so moving one item in a drag-and-drop rewrites one key.
+
+    Args:
+        keys: Current keys of the items, listed in the desired new order
+
+    Returns:
+        dict: New key for each index of keys that has to change
+    """
+    # Patience sort: tails[k] is the index ending the best run of length k+1
+    tails = []
+    previous = [None] * len(keys)
+    for i, key in enumerate(keys):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if keys[tails[mid]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        previous[i] = tails[lo - 1] if lo > 0 else None
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+
+    stable = []
+    i = tails[-1] if tails else None
+    while i is not None:
+        stable.append(i)
+        i = previous[i]
+    stable.reverse()
+
+    # Fill each gap between kept items with keys between their keys
+    changes = {}
+    before = None
+    start = 0
+    for end in stable + [len(keys)]:
+        after = keys[end] if end < len(keys) else None
+        for offset, key in enumerate(keys_between(before, after, end - start)):
+            changes[start + offset] = key
+        before = after
+        start = end + 1
+    return changes
+
+
+def spread_keys(n):
+    """
+    Generate n short, evenly spaced keys for a freshly ordered list.
+
+    All keys have the shortest length that leaves at least one free slot
+    between neighbours, with trailing zeros trimmed (which keeps their order).
+
+    Args:
+        n: Number of keys to generate
+
+    Returns:
+        list: n keys in ascending order
+    """
+    if n <= 0:
+        return []
+    width = 1
+    while _BASE ** width < 2 * (n + 1):
+        width += 1
+    span = _BASE ** width
+
+    keys = []
+    for i in range(1, n + 1):
+        value = i * span // (n + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, _BASE)
+            digits.append(DIGITS[digit])
+        keys.append(''.join(reversed(digits)).rstrip('0'))
+    return keys
+
+
+def renormalize_unit_outcomes(unit_id, max_length=None):
+    """
+    Rewrite a unit's outcome keys as short, evenly spaced keys.
+
+    The current order is kept. Rows are locked while being rewritten on
+    databases that support it, so a concurrent move is not lost.
+
+    Args:
+        unit_id: ID of the unit to renormalize
+        max_length: Only renormalize if some key is longer than this
+
+    Returns:
+        int: Number of outcomes rewritten (0 if skipped)
+    """
+    from . import db
+    from .models import LearningOutcome
+
+    outcomes = (
+        LearningOutcome.query
+        .filter_by(unit_id=unit_id)
+        .order_by(LearningOutcome.order_key, LearningOutcome.id)
+        .with_for_update()
+        .all()
+    )
+    if max_length is not None and all(len(lo.order_key) <= max_length for lo in outcomes):
+        db.session.rollback()
+        return 0
+
+    for lo, key in zip(outcomes, spread_keys(len(outcomes))):
+        lo.order_key = key
+    db.session.commit()
+    return len(outcomes)
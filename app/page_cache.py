@@ -0,0 +1,198 @@
+"""
+Rendered-page cache for public pages.
+
+The help page and the Bloom's Taxonomy guide look the same to every
+anonymous visitor and only change when an admin saves new AI settings, yet
+they were rendered from large templates on every hit. Views decorated with
+@page_cache.cached(template) keep the rendered HTML (and, when response
+compression is on, its gzip/brotli encodings) in a per-process LRU cache.
+
+Keys:
+    (template name, view arguments, ConfigManager.version, build id)
+    Saving or resetting the AI settings bumps ConfigManager.version, so
+    pages derived from the old settings are never served again and age
+    out of the LRU. The build id changes when templates change.
+
+Only GET/HEAD requests from anonymous visitors with no pending flash
+messages are cached; the pages show the username and flashes otherwise.
+Caching is skipped outside a request (views called directly) and while
+templates auto-reload.
+
+Attributes:
+    page_cache: Shared PageCache instance
+"""
+
+import hashlib
+import threading
+from functools import wraps
+
+from cachetools import LRUCache
+from flask import current_app, has_request_context, make_response, request
+from flask_login import current_user
+
+from . import config_manager
+from .compression import available_encodings, compress_bytes
+from .http_cache import has_pending_flashes
+from .metrics import CACHE_REQUESTS
+from .prefork import reset_after_fork
+
+
+class CachedPage:
+    """
+    A rendered page and its lazily computed encodings.
+
+    Attributes:
+        body: Rendered HTML as bytes
+        mimetype: Response mimetype
+        etag: Weak validator for the body
+        encoded: Content-Encoding -> compressed body
+    """
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.encoded = {}
+
+    def variant(self, encoding):
+        """
+        Body for a Content-Encoding, compressing it on first use.
+
+        Args:
+            encoding: 'br', 'gzip' or None for the plain body
+
+        Returns:
+            bytes: Body in the requested encoding
+        """
+        if encoding is None:
+            return self.body
+        data = self.encoded.get(encoding)
+        if data is None:
+            # Racing threads compute the same bytes; either result is kept
+            data = self.encoded[encoding] = compress_bytes(self.body, encoding)
+        return data
+
+
+class PageCache:
+    """
+    Thread-safe LRU cache of rendered public pages.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+
+    Attributes:
+        maxsize: Maximum number of pages kept per process
+        enabled: False turns caching off (views always render)
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.enabled = True
+        self.lock = threading.Lock()
+        self._pages = LRUCache(maxsize=maxsize)
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # Pages rendered before the fork stay shared copy-on-write
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Bind the cache to a Flask application.
+
+        Args:
+            app: Flask application; reads PAGE_CACHE_ENABLED and PAGE_CACHE_SIZE
+        """
+        self.enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+        self.maxsize = app.config.get('PAGE_CACHE_SIZE', self.maxsize)
+        with self.lock:
+            self._pages = LRUCache(maxsize=self.maxsize)
+        app.extensions['page_cache'] = self
+
+    def clear(self):
+        """Drop every cached page."""
+        with self.lock:
+            self._pages.clear()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def can_cache(self):
+        """
+        Check whether the current request may use the cache.
+
+        Returns:
+            bool: True for anonymous GET/HEAD requests without pending flashes
+        """
+        return (
+            self.enabled
+            and has_request_context()
+            and not current_app.jinja_env.auto_reload
+            and request.method in ('GET', 'HEAD')
+            and current_user.is_anonymous
+            and not has_pending_flashes()
+        )
+
+    def cached(self, template_name):
+        """
+        Cache a view's rendered page for anonymous visitors.
+
+        Args:
+            template_name: Template the view renders (part of the key)
+
+        Returns:
+            Decorator for the view function
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.can_cache():
+                    return view(*args, **kwargs)
+
+                key = (
+                    template_name,
+                    tuple(sorted(kwargs.items())),
+                    config_manager.version,
+                    current_app.extensions.get('http_cache_build')
+                )
+                with self.lock:
+                    page = self._pages.get(key)
+
+                CACHE_REQUESTS.inc('page_cache', 'miss' if page is None else 'hit')
+                if page is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    page = CachedPage(response.get_data(), response.mimetype)
+                    with self.lock:
+                        self._pages[key] = page
+                return self.respond(page)
+            return wrapper
+        return decorator
+
+    def respond(self, page):
+        """
+        Build a response for a cached page.
+
+        Sends a stored encoding the client accepts (if response compression
+        is enabled) and answers If-None-Match with 304.
+
+        Args:
+            page: CachedPage
+
+        Returns:
+            Flask response
+        """
+        encoding = None
+        if current_app.config.get('COMPRESS_ENABLED', True):
+            encoding = request.accept_encodings.best_match(available_encodings())
+
+        response = current_app.response_class(page.variant(encoding), mimetype=page.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(page.etag, weak=True)
+        return response.make_conditional(request)
+
+
+page_cache = PageCache()
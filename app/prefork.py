@@ -0,0 +1,116 @@
+"""
+Support for running under a pre-forking server with the app preloaded.
+
+With "gunicorn --preload" (see gunicorn.conf.py) the application is created
+once in the master process and the workers are forked from it. That saves
+startup time and memory, because the children share the master's pages
+copy-on-write, but only if state that must not be shared is reset in each
+child:
+
+    Database engines    Pooled connections (sockets) would be shared by
+                        every worker. warm_up() closes them in the master
+                        and after_fork() makes each child drop the pool
+                        without touching the parent's connections.
+    Locks and threads   Locks held by another thread at fork time would
+                        stay locked forever in the child, and thread pools
+                        have no threads after a fork. Objects holding them
+                        call reset_after_fork(self) in their constructor and
+                        get fresh ones in every child (os.register_at_fork).
+
+Heavy immutable data (compiled templates, the URL map and, optionally,
+pandas and the GenAI SDK) is loaded by warm_up() before the fork, next to
+the AI settings and Bloom's verb lists read at import time. gc.freeze()
+then keeps the garbage collector from touching those objects' pages in
+the children.
+
+Functions:
+    reset_after_fork: Register an object to be reset in forked children
+    warm_up: Load shared data in the master before workers are forked
+    after_fork: Reset per-process state in a newly forked worker
+"""
+
+import gc
+import os
+import weakref
+
+
+def reset_after_fork(obj, method_name='_after_fork_in_child'):
+    """
+    Call a reset method on an object in every forked child process.
+
+    Only a weak reference is kept, so registering does not keep the
+    object alive.
+
+    Args:
+        obj: Object owning locks, threads or other per-process state
+        method_name: Method called with no arguments in the child
+    """
+    if not hasattr(os, 'register_at_fork'):
+        return
+    ref = weakref.ref(obj)
+
+    def reset():
+        target = ref()
+        if target is not None:
+            getattr(target, method_name)()
+
+    os.register_at_fork(after_in_child=reset)
+
+
+def warm_up(app, import_heavy=False):
+    """
+    Load shared, immutable data in the master before workers are forked.
+
+    Args:
+        app: Flask application
+        import_heavy: Also import pandas and the GenAI SDK so every worker
+                      shares one copy instead of importing its own on first use
+
+    Returns:
+        dict: Counts of what was loaded
+    """
+    from . import db
+    from .routes import pd
+    from .ai_evaluate import genai, types
+
+    with app.app_context():
+        # Compile every template once
+        templates = app.jinja_env.list_templates()
+        for name in templates:
+            app.jinja_env.get_template(name)
+
+        # Sort the URL rules now rather than on the first request
+        app.url_map.update()
+
+        if import_heavy:
+            for module in (pd, genai, types):
+                module.load()
+
+        # Close connections opened by startup (e.g. creating tables) so
+        # no socket or file handle is inherited by the workers
+        for engine in db.engines.values():
+            engine.dispose()
+
+    # Move everything loaded so far out of the collector's reach, so
+    # collections in the workers do not write to (and copy) shared pages
+    gc.collect()
+    gc.freeze()
+    return {'templates': len(templates), 'heavy_imports': import_heavy}
+
+
+def after_fork(app):
+    """
+    Reset per-process state in a newly forked worker.
+
+    Locks and thread pools are already reset by the os.register_at_fork
+    hooks; this drops the inherited database pools. close=False leaves any
+    connection the parent still has open alone.
+
+    Args:
+        app: Flask application
+    """
+    from . import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
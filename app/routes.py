@@ -9,25 +9,34 @@ authentication and authorization checks.
 Blueprint: 'main' - Contains all non-authentication routes
 """
 
-from flask import render_template, redirect, url_for, flash, request, session, Blueprint, jsonify, current_app, abort
+from flask import render_template, redirect, url_for, flash, request, session, Blueprint, jsonify, current_app, abort, send_file, stream_with_context
 from flask_login import current_user, login_required
 from .forms import NewUnitForm, AdminForm, EditUnitForm
 from . import db
-from .models import db, Unit, LearningOutcome, UserType
-from . import create_app, config_manager
-from sqlalchemy import case, update
+from .models import db, Unit, LearningOutcome, UserType, touchUnit
+from .http_cache import cache_policy, make_etag, not_modified, set_validators, viewer_key
+from .page_cache import page_cache
+from .metrics import ROWS_PROCESSED
+from . import create_app, config_manager, job_manager
+from sqlalchemy import case, update, func
+from sqlalchemy.orm import selectinload
 import csv
-import pandas as pd
+from .lazy import LazyModule
 import io
 from sqlalchemy.exc import IntegrityError
 from .ai_evaluate import run_eval
+from .ordering import key_between, rekey_for_order, spread_keys, renormalize_unit_outcomes
 import os
 import json
 import random
+from datetime import timezone
 
 # Create main blueprint for all non-auth routes
 main = Blueprint('main', __name__)
 
+# pandas (and numpy) are only needed by imports/exports; load on first use
+pd = LazyModule('pandas')
+
 
 # ==================== NAVIGATION ROUTES ====================
 
@@ -179,59 +188,116 @@ def updateAIParams(data):
     config_manager.replaceCurrentParameter("24 Points", intStringToListByDash(data["cp24"]))
 
 
-def createCSVofLOs(userID=-1):
+def iterUnitsCSV(units):
     """
-    Generate CSV export of units and learning outcomes.
+    Generate CSV text for units and their learning outcomes row by row.
 
-    Creates a pandas DataFrame containing all units and their associated
-    learning outcomes, formatted for CSV export. Can filter by user ID
-    for personalized exports.
+    Produces the same layout as the original pandas export (a leading
+    unnamed column holding the unit id) without building the whole file
+    in memory, so it can back both string and streamed exports.
 
     Args:
-        userID (int): User ID to filter units (-1 for all units)
+        units: Iterable of Unit objects
 
-    Returns:
-        str: CSV-formatted string of units and outcomes
+    Yields:
+        str: CSV text, the header first and then one chunk per unit
     """
-    # Filter units based on user ID
-    if userID != -1:
-        units = Unit.query.filter_by(creatorid=current_user.id).all()
-    else:
-        units = Unit.query.all()
-
-    # Create DataFrame with expected column structure
-    df = pd.DataFrame(
-        columns=[
-            expectedIOFormatting["code"],
-            expectedIOFormatting["title"],
-            expectedIOFormatting["level"],
-            expectedIOFormatting["CreditPoints"],
-            expectedIOFormatting["Content"],
-            expectedIOFormatting["Outcomes"]
-        ])
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+
+    def drain():
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    writer.writerow([
+        '',
+        expectedIOFormatting["code"],
+        expectedIOFormatting["title"],
+        expectedIOFormatting["level"],
+        expectedIOFormatting["CreditPoints"],
+        expectedIOFormatting["Content"],
+        expectedIOFormatting["Outcomes"]
+    ])
+    yield drain()
 
-    # Populate DataFrame with unit data
     for unit in units:
         # Concatenate learning outcomes with delimiters
         loString = ''
         for lo in unit.learning_outcomes:
             loString += lo.description + expectedIOFormatting["loAssessmentDelimiter"] + \
-                        lo.assessment + expectedIOFormatting["loDelimiter"]
+                        (lo.assessment or '') + expectedIOFormatting["loDelimiter"]
 
-        # Add unit row to DataFrame
-        df.loc[unit.id] = [
+        writer.writerow([
+            unit.id,
             unit.unitcode,
             unit.unitname,
             unit.level,
             unit.creditpoints,
             unit.description,
             loString
-        ]
+        ])
+        yield drain()
 
-    # Convert to CSV string
-    buf = io.StringIO()
-    df.to_csv(buf)
-    return buf.getvalue()
+
+def createCSVofLOs(userID=-1):
+    """
+    Generate CSV export of units and learning outcomes.
+
+    Creates a CSV string containing all units and their associated
+    learning outcomes. Can filter by user ID for personalized exports.
+
+    Args:
+        userID (int): User ID to filter units (-1 for all units)
+
+    Returns:
+        str: CSV-formatted string of units and outcomes
+    """
+    # Filter units based on user ID
+    if userID != -1:
+        units = Unit.query.filter_by(creatorid=userID).all()
+    else:
+        units = Unit.query.all()
+
+    return ''.join(iterUnitsCSV(units))
+
+
+def streamUnitsCSV(query, filename):
+    """
+    Stream a CSV download of units and their learning outcomes.
+
+    Rows are generated while the response is sent, with outcomes loaded
+    by one extra query per batch of units, so the whole file is never held
+    in memory and the compression middleware can encode it as it streams.
+
+    Args:
+        query: Unit query selecting the units to export
+        filename: Download file name
+
+    Returns:
+        Streamed CSV response
+    """
+    units = (
+        query.options(selectinload(Unit.learning_outcomes))
+        .order_by(Unit.id)
+        .yield_per(IMPORT_CHUNK_SIZE)
+    )
+    def countedRows():
+        # The first chunk is the header row, then one chunk per unit
+        done = -1
+        try:
+            for text in iterUnitsCSV(units):
+                done += 1
+                yield text
+        finally:
+            ROWS_PROCESSED.inc('export', amount=max(done, 0))
+
+    return current_app.response_class(
+        stream_with_context(countedRows()),
+        mimetype='text/csv',
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 # ==================== LEARNING OUTCOME ROUTES ====================
@@ -276,6 +342,55 @@ def create_lo(unit_id):
     )
 
 
+def runRenormalizeJob(job, unit_id, max_length):
+    """
+    Background job rewriting a unit's order keys once they grow too long.
+
+    Args:
+        job: JobHandle for reporting progress
+        unit_id: ID of the unit to renormalize
+        max_length: Key length above which the unit is renormalized
+
+    Returns:
+        dict: Result with the number of outcomes re-keyed
+    """
+    count = renormalize_unit_outcomes(unit_id, max_length)
+    return {
+        'message': f"{count} outcome order keys rewritten",
+        'rows_done': count,
+        'rows_total': count
+    }
+
+
+def scheduleRenormalize(unit_id, keys):
+    """
+    Queue background renormalization if any of the given keys is too long.
+
+    Inserting into the same gap over and over makes order keys longer.
+    Once one passes ORDER_KEY_RENORMALIZE_LENGTH the unit's keys are
+    rewritten off the request path; the order itself never changes.
+
+    Args:
+        unit_id: ID of the unit the keys belong to
+        keys: Order keys just written for the unit
+
+    Returns:
+        dict: Queued job state, or None if no renormalization was needed
+    """
+    limit = current_app.config.get('ORDER_KEY_RENORMALIZE_LENGTH', 32)
+    if all(len(key) <= limit for key in keys):
+        return None
+    return job_manager.submit(
+        current_app._get_current_object(),
+        'renormalize',
+        current_user.id,
+        runRenormalizeJob,
+        unit_id,
+        limit,
+        unit_id=unit_id
+    )
+
+
 @main.delete("/lo_api/delete/<int:unit_id>/<int:lo_id>")
 @login_required
 def lo_delete(unit_id, lo_id):
@@ -308,8 +423,8 @@ def lo_add(unit_id):
     """
     API endpoint to add a new blank learning outcome.
 
-    Creates a new empty learning outcome at the next available position
-    for the specified unit. The outcome can then be edited inline.
+    Creates a new empty learning outcome after the last one in the
+    specified unit. The outcome can then be edited inline.
 
     Args:
         unit_id: ID of the unit to add outcome to
@@ -317,18 +432,22 @@ def lo_add(unit_id):
     Returns:
         JSON response indicating success
     """
-    unit = Unit.query.filter_by(id=unit_id).first()
-    existing_los = LearningOutcome.query.filter_by(unit_id=unit_id).all()
+    # Only the highest order key is needed, not every outcome
+    lastKey = db.session.scalar(
+        db.select(func.max(LearningOutcome.order_key))
+        .where(LearningOutcome.unit_id == unit_id)
+    )
 
-    # Create blank outcome at next position
+    # Create blank outcome after the last one
     blank_lo = LearningOutcome(
         unit_id=unit_id,
-        position=len(existing_los) + 1,
+        order_key=key_between(lastKey, None),
         description=''
     )
 
     db.session.add(blank_lo)
     db.session.commit()
+    scheduleRenormalize(unit_id, [blank_lo.order_key])
     flash("Outcome Added and Saved", "success")
     return jsonify({"ok": True})
 
@@ -339,8 +458,9 @@ def lo_reorder(unit_id):
     """
     API endpoint to reorder learning outcomes via drag-and-drop.
 
-    Updates the position field for multiple learning outcomes based on
-    the new order provided by the client. Uses bulk update for efficiency.
+    Gives new order keys to the fewest outcomes needed to produce the new
+    order, so dragging one outcome to a new place writes one row. Uses a
+    single bulk update and leaves the other outcomes untouched.
 
     Args:
         unit_id: ID of the unit containing the outcomes
@@ -356,7 +476,7 @@ def lo_reorder(unit_id):
     """
     data = request.get_json(force=True)
     order = data.get("order", [])
-    unit_id = data.get("unit_id")
+    unit_id = data.get("unit_id", unit_id)
 
     # Validate order data
     if not order:
@@ -371,19 +491,26 @@ def lo_reorder(unit_id):
         if count != len(order):
             return jsonify({"ok": False, "error": "ids mismatch for unit"}), 400
 
-    # Create position mapping
+    # Current keys listed in the requested order
     order = [int(x) for x in order]
-    order_map = {lo_id: pos for pos, lo_id in enumerate(order, start=1)}
-
-    # Bulk update positions
-    stmt = (
-        update(LearningOutcome)
-        .where(LearningOutcome.id.in_(order))
-        .values(position=case(order_map, value=LearningOutcome.id))
+    current = dict(
+        db.session.query(LearningOutcome.id, LearningOutcome.order_key)
+        .filter(LearningOutcome.id.in_(order))
     )
-
-    db.session.execute(stmt)
-    db.session.commit()
+    newKeys = rekey_for_order([current[lo_id] for lo_id in order])
+    changed = {order[index]: key for index, key in newKeys.items()}
+
+    if changed:
+        # Bulk update the moved outcomes' keys
+        stmt = (
+            update(LearningOutcome)
+            .where(LearningOutcome.id.in_(changed))
+            .values(order_key=case(changed, value=LearningOutcome.id))
+        )
+        db.session.execute(stmt)
+        touchUnit(unit_id)
+        db.session.commit()
+        scheduleRenormalize(unit_id, changed.values())
     return jsonify({"ok": True})
 
 
@@ -394,32 +521,395 @@ def lo_save(unit_id):
     API endpoint to save all learning outcome edits.
 
     Batch saves changes to learning outcome descriptions and assessments.
-    Expects data in position order matching existing outcomes.
+    Expects data in display order matching existing outcomes. Superseded
+    by the lo_patch delta endpoint, which the editor now uses.
 
     Args:
         unit_id: ID of the unit containing the outcomes
 
     Request Body:
-        JSON object with position keys and [description, assessment] values
+        JSON object with display-order keys and [description, assessment] values
 
     Returns:
         JSON response indicating success
     """
-    # Get existing outcomes in position order
-    loList = LearningOutcome.query.filter_by(unit_id=unit_id).all()
+    # Get existing outcomes in display order
+    loList = (
+        LearningOutcome.query
+        .filter_by(unit_id=unit_id)
+        .order_by(LearningOutcome.order_key, LearningOutcome.id)
+        .all()
+    )
     newLoDict = json.loads(request.data)
 
     # Update each outcome with new data
-    # Assumes order received matches position order
+    # Assumes order received matches display order
     for lo, newLOData in zip(loList, newLoDict.values()):
+        # Skip rows that did not change so they are not rewritten
+        if lo.description == newLOData[0] and (lo.assessment or '') == newLOData[1]:
+            continue
         lo.description = newLOData[0]
         lo.assessment = newLOData[1]
-        db.session.add(lo)
+        lo.version += 1
 
     db.session.commit()
     return jsonify({'status': 'ok'})
 
 
+# Fields of a learning outcome the autosave API may change
+editableOutcomeFields = ('description', 'assessment')
+
+
+@main.patch("/lo_api/outcomes/<int:unit_id>")
+@login_required
+def lo_patch(unit_id):
+    """
+    API endpoint to save only the edited fields of learning outcomes.
+
+    Each outcome is updated with a conditional UPDATE that only matches
+    the version the client last saw, so a write based on stale data is
+    rejected instead of silently overwriting another editor's change.
+    Outcomes that did not conflict are saved even if others did.
+
+    The editor page saves through lo_batch; this endpoint remains for
+    scripts and integrations that only change outcome text.
+
+    Args:
+        unit_id: ID of the unit containing the outcomes
+
+    Request Body:
+        JSON object keyed by outcome ID, each value holding the client's
+        'version' plus any changed 'description' and/or 'assessment'
+
+    Returns:
+        200 JSON with the new version of every saved outcome
+        409 JSON with the saved versions plus the current server state of
+            each conflicting outcome (null if it was deleted)
+
+    Raises:
+        400: If the payload is malformed
+    """
+    changes = request.get_json(force=True, silent=True)
+    if not isinstance(changes, dict) or not changes:
+        return jsonify({"ok": False, "error": "no changes"}), 400
+
+    # Check every change before writing any of them
+    updates = []
+    for loKey, fields in changes.items():
+        if not isinstance(fields, dict):
+            return jsonify({"ok": False, "error": f"change for outcome {loKey} is not an object"}), 400
+        try:
+            loID = int(loKey)
+            version = int(fields["version"])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"ok": False, "error": f"invalid change for outcome {loKey}"}), 400
+        values = {k: fields[k] for k in editableOutcomeFields if k in fields}
+        if not values:
+            return jsonify({"ok": False, "error": f"no fields to update for outcome {loKey}"}), 400
+        for field, value in values.items():
+            if not isinstance(value, str):
+                return jsonify({"ok": False, "error": f"{field} of outcome {loKey} must be a string"}), 400
+        updates.append((loKey, loID, version, values))
+
+    versions = {}
+    conflictIDs = []
+
+    for loKey, loID, version, values in updates:
+        # Only matches if nobody saved this outcome since the client loaded it
+        stmt = (
+            update(LearningOutcome)
+            .where(
+                LearningOutcome.id == loID,
+                LearningOutcome.unit_id == unit_id,
+                LearningOutcome.version == version
+            )
+            .values(version=LearningOutcome.version + 1, **values)
+        )
+        if db.session.execute(stmt).rowcount == 1:
+            versions[loKey] = version + 1
+        else:
+            conflictIDs.append(loID)
+
+    if versions:
+        # The bulk updates above bypass the ORM flush that bumps the stamp
+        touchUnit(unit_id)
+
+    conflicts = {}
+    if conflictIDs:
+        current = LearningOutcome.query.filter(
+            LearningOutcome.id.in_(conflictIDs),
+            LearningOutcome.unit_id == unit_id
+        ).all()
+        conflicts = {str(loID): None for loID in conflictIDs}
+        for lo in current:
+            conflicts[str(lo.id)] = {
+                "description": lo.description,
+                "assessment": lo.assessment or "",
+                "version": lo.version
+            }
+
+    db.session.commit()
+
+    if conflicts:
+        return jsonify({"ok": False, "versions": versions, "conflicts": conflicts}), 409
+    return jsonify({"ok": True, "versions": versions})
+
+
+# Upper bound on operations accepted in one batch request
+maxBatchOperations = 500
+
+
+class BatchConflict(Exception):
+    """
+    Raised while applying a batch when an operation hits stale data.
+
+    Attributes:
+        index: Position of the failing operation in the batch
+        conflicts: Current server state of the conflicting outcome keyed
+                   by ID (None if it was deleted)
+    """
+
+    def __init__(self, index, conflicts):
+        super().__init__(f"operation {index} conflicts with a newer save")
+        self.index = index
+        self.conflicts = conflicts
+
+
+def outcomeState(lo, position):
+    """
+    Canonical client-facing representation of a learning outcome.
+
+    Args:
+        lo: LearningOutcome instance
+        position: 1-based display position of the outcome in its unit
+
+    Returns:
+        dict: id, position, order key, version, description and assessment
+    """
+    return {
+        "id": lo.id,
+        "position": position,
+        "order_key": lo.order_key,
+        "version": lo.version,
+        "description": lo.description,
+        "assessment": lo.assessment or ""
+    }
+
+
+def applyOutcomeBatch(unit_id, ops):
+    """
+    Apply an ordered list of editor operations to a unit's outcomes.
+
+    Outcomes are loaded once and the operations are applied to that list in
+    memory. An added or moved outcome gets an order key between its new
+    neighbours, so only that row is written. Rows added in the batch may be
+    referred to by later operations using their client_id.
+
+    Supported operations:
+        {"op": "add", "client_id": str, "description"?, "assessment"?, "index"?}
+        {"op": "update", "id": int|client_id, "version"?: int, "description"?, "assessment"?}
+        {"op": "delete", "id": int|client_id}
+        {"op": "move", "id": int|client_id, "index": int}
+
+    Deleting or moving an outcome that no longer exists is a no-op, since
+    there is nothing left for it to conflict with. Updating one is not.
+    Updates of existing outcomes are written with a conditional UPDATE on
+    the version, as in lo_patch, so a concurrent save cannot be overwritten.
+
+    Args:
+        unit_id: ID of the unit being edited
+        ops: List of operation dicts
+
+    Returns:
+        tuple: (outcomes in order, {client_id: new outcome}) - the new
+               outcomes have no ID until the session is flushed
+
+    Raises:
+        ValueError: If an operation is malformed
+        BatchConflict: If an update was based on a stale version or
+                       targets a deleted outcome
+    """
+    outcomes = (
+        LearningOutcome.query
+        .filter_by(unit_id=unit_id)
+        .order_by(LearningOutcome.order_key, LearningOutcome.id)
+        .all()
+    )
+    byID = {lo.id: lo for lo in outcomes}
+    added = {}
+
+    def resolve(ref):
+        if isinstance(ref, str) and ref in added:
+            return added[ref]
+        try:
+            return byID.get(int(ref))
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid outcome id {ref!r}")
+
+    def place(lo, op):
+        index = op.get("index", len(outcomes))
+        if not isinstance(index, int):
+            raise ValueError(f"invalid index {index!r}")
+        index = max(0, min(index, len(outcomes)))
+        outcomes.insert(index, lo)
+
+        before = outcomes[index - 1].order_key if index > 0 else None
+        after = outcomes[index + 1].order_key if index + 1 < len(outcomes) else None
+        try:
+            lo.order_key = key_between(before, after)
+        except ValueError:
+            # Neighbours share a key or have a malformed one; re-key the
+            # whole unit rather than fail the edit
+            for outcome, key in zip(outcomes, spread_keys(len(outcomes))):
+                outcome.order_key = key
+
+    updated = False
+
+    for index, op in enumerate(ops):
+        if not isinstance(op, dict):
+            raise ValueError(f"operation {index} is not an object")
+        kind = op.get("op")
+        values = {k: op[k] for k in editableOutcomeFields if k in op}
+        for field, value in values.items():
+            if not isinstance(value, str):
+                raise ValueError(f"{field} of operation {index} must be a string")
+
+        if kind == "add":
+            clientID = op.get("client_id")
+            if not isinstance(clientID, str) or not clientID or clientID in added:
+                raise ValueError(f"operation {index} needs a unique client_id")
+            lo = LearningOutcome(
+                unit_id=unit_id,
+                description=values.get("description", ""),
+                assessment=values.get("assessment", ""),
+                version=1
+            )
+            db.session.add(lo)
+            place(lo, op)
+            added[clientID] = lo
+
+        elif kind == "update":
+            lo = resolve(op.get("id"))
+            if lo is None:
+                raise BatchConflict(index, {str(op.get("id")): None})
+            if not values:
+                raise ValueError(f"operation {index} has no fields to update")
+            # Rows added in this batch have no earlier version to check
+            if lo.id is None:
+                for field, value in values.items():
+                    setattr(lo, field, value)
+                continue
+            try:
+                version = int(op["version"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"operation {index} needs a version")
+            # Only matches if nobody saved this outcome since the client
+            # loaded it, even if another batch is running concurrently
+            stmt = (
+                update(LearningOutcome)
+                .where(LearningOutcome.id == lo.id, LearningOutcome.version == version)
+                .values(version=version + 1, **values)
+            )
+            if db.session.execute(stmt).rowcount != 1:
+                current = LearningOutcome.query.filter_by(id=lo.id).populate_existing().first()
+                state = outcomeState(current, outcomes.index(lo) + 1) if current else None
+                raise BatchConflict(index, {str(lo.id): state})
+            updated = True
+
+        elif kind == "delete":
+            lo = resolve(op.get("id"))
+            if lo is None:
+                continue
+            outcomes.remove(lo)
+            if lo.id is None:
+                db.session.expunge(lo)
+            else:
+                db.session.delete(lo)
+
+        elif kind == "move":
+            lo = resolve(op.get("id"))
+            if lo is None:
+                continue
+            outcomes.remove(lo)
+            place(lo, op)
+
+        else:
+            raise ValueError(f"unknown operation {kind!r}")
+
+    if updated:
+        # The conditional updates above bypass the ORM flush that bumps the stamp
+        touchUnit(unit_id)
+
+    return outcomes, added
+
+
+@main.post("/lo_api/batch/<int:unit_id>")
+@login_required
+def lo_batch(unit_id):
+    """
+    API endpoint applying queued editor operations in one transaction.
+
+    The editor queues adds, deletes, text updates and moves and flushes them
+    together, replacing a request and commit per action. Either every
+    operation is applied or, on any error, none are.
+
+    Args:
+        unit_id: ID of the unit containing the outcomes
+
+    Request Body:
+        JSON with an 'ops' array; see applyOutcomeBatch for the format
+
+    Returns:
+        200 JSON with the unit's outcomes in order ('outcomes') and the IDs
+            assigned to added rows keyed by client_id ('ids')
+        409 JSON with the index of the failing operation ('failed_op'), the
+            server state of the conflicting outcome ('conflicts') and the
+            unchanged outcomes
+
+    Raises:
+        400: If the payload or an operation is malformed
+        404: If the unit does not exist
+    """
+    Unit.query.get_or_404(unit_id)
+    data = request.get_json(force=True, silent=True) or {}
+    ops = data.get("ops")
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"ok": False, "error": "no operations"}), 400
+    if len(ops) > maxBatchOperations:
+        return jsonify({"ok": False, "error": f"at most {maxBatchOperations} operations per batch"}), 400
+
+    try:
+        outcomes, added = applyOutcomeBatch(unit_id, ops)
+        db.session.flush()
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"ok": False, "error": str(e)}), 400
+    except BatchConflict as e:
+        db.session.rollback()
+        current = (
+            LearningOutcome.query
+            .filter_by(unit_id=unit_id)
+            .order_by(LearningOutcome.order_key, LearningOutcome.id)
+            .all()
+        )
+        return jsonify({
+            "ok": False,
+            "error": str(e),
+            "failed_op": e.index,
+            "conflicts": e.conflicts,
+            "outcomes": [outcomeState(lo, i) for i, lo in enumerate(current, start=1)]
+        }), 409
+
+    response = {
+        "ok": True,
+        "outcomes": [outcomeState(lo, i) for i, lo in enumerate(outcomes, start=1)],
+        "ids": {clientID: lo.id for clientID, lo in added.items()}
+    }
+    db.session.commit()
+    scheduleRenormalize(unit_id, [state["order_key"] for state in response["outcomes"]])
+    return jsonify(response)
+
+
 @main.get("/lo_api/export.csv/<int:unit_id>")
 @login_required
 def lo_export_csv(unit_id):
@@ -452,7 +942,7 @@ def lo_export_csv(unit_id):
 
     # Write outcome rows
     for i, lo in enumerate(rows, start=1):
-        writer.writerow([i, lo.description, lo.assessment or "", lo.position])
+        writer.writerow([i, lo.description, lo.assessment or "", i])
 
     # Return as downloadable file
     out = buf.getvalue()
@@ -470,7 +960,9 @@ def ai_evaluate(unit_id):
 
     Sends unit learning outcomes to the AI evaluation service for
     quality assessment based on Bloom's Taxonomy and best practices.
-    Returns formatted evaluation results for display.
+    Returns formatted evaluation results for display. The model call runs
+    without a database connection and within the per-process limit on
+    concurrent model calls (see LLMLimiter).
 
     Args:
         unit_id: ID of the unit to evaluate
@@ -487,14 +979,20 @@ def ai_evaluate(unit_id):
 
     # Concatenate all outcome descriptions
     outcomes_text = "\n".join(lo.description for lo in rows)
+    level, unitname, creditpoints = unit.level, unit.unitname, unit.creditpoints
+
+    # Return the database connection to the pool before the (slow) model
+    # call, so waiting evaluations cannot starve other requests of it
+    db.session.close()
 
     try:
         # Run AI evaluation
         result = run_eval(
-            unit.level,
-            unit.unitname,
-            unit.creditpoints,
-            outcomes_text
+            level,
+            unitname,
+            creditpoints,
+            outcomes_text,
+            output_format=current_app.config.get('LLM_OUTPUT_FORMAT', 'text')
         )
         return jsonify({"ok": True, "html": result})
     except Exception as e:
@@ -503,6 +1001,48 @@ def ai_evaluate(unit_id):
 
 # ==================== UNIT MANAGEMENT ROUTES ====================
 
+def findUnitByCode(unitcode):
+    """
+    Find a unit by code, ignoring case and surrounding whitespace.
+
+    Compares lower(unitcode) so the lookup is served by the
+    ix_unit_unitcode_lower expression index.
+
+    Args:
+        unitcode: Unit code to look for
+
+    Returns:
+        Unit: Matching unit, or None
+    """
+    return Unit.query.filter(
+        func.lower(Unit.unitcode) == unitcode.strip().lower()
+    ).first()
+
+
+def searchUnitsByCode(term):
+    """
+    Search units by unit code prefix.
+
+    Codes are searched by prefix ("CITS", "CITS32"), answered by a range
+    scan on the lower(unitcode) index instead of a scan of every unit, so
+    a term from the middle of a code ("3200") does not match.
+
+    Args:
+        term: Search term (case-insensitive)
+
+    Returns:
+        list: Units whose code starts with the term
+    """
+    term = term.strip().lower()
+    if not term:
+        return []
+
+    # All strings starting with term sort in [term, next string after term)
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    codeKey = func.lower(Unit.unitcode)
+    return Unit.query.filter(codeKey >= term, codeKey < upper).all()
+
+
 @main.route('/search_unit', methods=['GET', 'POST'])
 def search_unit():
     """
@@ -530,7 +1070,7 @@ def search_unit():
         if query:
             # Search by code or name
             if filter_type == "code":
-                results = Unit.query.filter(Unit.unitcode.ilike(f"%{query}%")).all()
+                results = searchUnitsByCode(query)
             else:
                 results = Unit.query.filter(Unit.unitname.ilike(f"%{query}%")).all()
         else:
@@ -556,6 +1096,7 @@ def search_unit():
 
 
 @main.route('/view/<int:unit_id>', methods=['GET'])
+@cache_policy('conditional')
 def view(unit_id):
     """
     View detailed information for a specific unit.
@@ -563,25 +1104,40 @@ def view(unit_id):
     Displays unit details and learning outcomes. Provides navigation to
     edit functions for authorized users. Public route accessible to all.
 
+    The page is validated by the unit's version stamp: a conditional
+    request for an unchanged unit is answered with 304 Not Modified
+    after a single-row lookup, without loading outcomes or rendering.
+
     Args:
         unit_id: ID of the unit to view
 
     Returns:
-        Rendered unit detail template
+        Rendered unit detail template, or 304 if the client's copy is current
 
     Raises:
         404: If unit not found
     """
     if request.method == "GET":
-        unit = Unit.query.filter_by(id=unit_id).first()
-        if not unit:
+        stamp = db.session.execute(
+            db.select(Unit.revision, Unit.updated_at).where(Unit.id == unit_id)
+        ).first()
+        if not stamp:
             abort(404)
-        return render_template(
+
+        # The page differs per viewer (navbar, edit buttons)
+        etag = make_etag('unit', unit_id, stamp.revision, viewer_key())
+        lastModified = stamp.updated_at.replace(tzinfo=timezone.utc) if stamp.updated_at else None
+        if not_modified(etag, lastModified):
+            return set_validators(current_app.response_class(status=304), etag, lastModified)
+
+        unit = Unit.query.filter_by(id=unit_id).first()
+        response = current_app.make_response(render_template(
             "view.html",
             title="Unit Details",
             unit=unit,
             UserType=UserType
-        )
+        ))
+        return set_validators(response, etag, lastModified)
 
 
 @main.route('/unit/<int:unit_id>/edit_unit', methods=['GET', 'POST'])
@@ -629,10 +1185,8 @@ def edit_unit(unit_id):
     if request.method == "POST":
         data = request.form
 
-        # Check unit code uniqueness
-        unitcodeCheck = Unit.query.filter_by(
-            unitcode=data["unitcode"].strip().upper()
-        ).first()
+        # Check unit code uniqueness (case-insensitive)
+        unitcodeCheck = findUnitByCode(data["unitcode"])
 
         if unitcodeCheck != None and unitcodeCheck.id != unit.id:
             flash("That unit code already exists. Please choose a different one.", "danger")
@@ -698,10 +1252,8 @@ def new_unit():
 
         data = request.form
 
-        # Check unit code uniqueness
-        unitcodeCheck = db.session.query(Unit).filter_by(
-            unitcode=data["unitcode"]
-        ).first()
+        # Check unit code uniqueness (case-insensitive)
+        unitcodeCheck = findUnitByCode(data["unitcode"])
 
         if unitcodeCheck != None:
             flash("Unit already Exists", 'error')
@@ -780,6 +1332,366 @@ expectedIOFormatting = {
 }
 
 
+# Rows read per chunk when importing, and units per commit
+IMPORT_CHUNK_SIZE = 500
+
+# Columns an import file must contain
+requiredImportHeaders = [
+    expectedIOFormatting['code'],
+    expectedIOFormatting['title'],
+    expectedIOFormatting['level'],
+    expectedIOFormatting['Outcomes']
+]
+
+
+def _isBlankCell(value):
+    """Return True for empty spreadsheet cells (None, NaN or whitespace)."""
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:
+        return True
+    return isinstance(value, str) and value.strip() == ''
+
+
+def _intCell(value, default):
+    """Convert a spreadsheet cell to int, using default for blank cells."""
+    return default if _isBlankCell(value) else int(value)
+
+
+def parseOutcomeString(outcomes):
+    """
+    Split an imported Outcomes cell into learning outcomes.
+
+    Outcomes are separated by the loDelimiter and each outcome may carry
+    an assessment after the loAssessmentDelimiter.
+
+    Args:
+        outcomes: Raw Outcomes cell value
+
+    Returns:
+        list: (description, assessment) tuples in file order
+    """
+    if _isBlankCell(outcomes):
+        return []
+
+    parsed = []
+    for lo in str(outcomes).split(expectedIOFormatting['loDelimiter']):
+        loAsm = lo.split(expectedIOFormatting['loAssessmentDelimiter'])
+        lo = loAsm[0]
+        asm = loAsm[1] if len(loAsm) == 2 else ''
+
+        if lo == '':
+            continue
+        parsed.append((lo, asm))
+    return parsed
+
+
+def missingImportHeaders(columns):
+    """
+    List required import columns that are absent.
+
+    Args:
+        columns: Column names read from the import file
+
+    Returns:
+        list: Missing column names (empty if the file is valid)
+    """
+    return [h for h in requiredImportHeaders if h not in columns]
+
+
+def importUnitFrame(df, creatorid, seenCodes):
+    """
+    Add the units in one chunk of an import file to the session.
+
+    Unit codes already in the database are looked up with one query per
+    chunk rather than one query per row. Codes repeated within the file
+    are tracked in seenCodes so only their first occurrence is imported.
+    The caller is responsible for committing.
+
+    Args:
+        df: DataFrame chunk of the import file
+        creatorid: ID of the user who owns the imported units
+        seenCodes: Set of unit codes (lower case) already imported from this file
+
+    Returns:
+        dict: Counts of 'added', 'duplicates' and 'missing_code' rows
+    """
+    counts = {'added': 0, 'duplicates': 0, 'missing_code': 0}
+    records = df.to_dict('records')
+
+    # Look up existing unit codes for the whole chunk at once, ignoring
+    # case like findUnitByCode (served by the lower(unitcode) index)
+    codes = {
+        str(row[expectedIOFormatting['code']]).strip().lower()
+        for row in records
+        if not _isBlankCell(row[expectedIOFormatting['code']])
+    }
+    existing = set()
+    if codes:
+        codeKey = func.lower(Unit.unitcode)
+        existing = {
+            code for (code,) in db.session.query(codeKey).filter(codeKey.in_(codes))
+        }
+
+    for row in records:
+        # Skip units without code
+        if _isBlankCell(row[expectedIOFormatting['code']]):
+            counts['missing_code'] += 1
+            continue
+
+        # Skip duplicates of existing units or earlier rows in the file
+        code = str(row[expectedIOFormatting['code']]).strip()
+        if code.lower() in existing or code.lower() in seenCodes:
+            counts['duplicates'] += 1
+            continue
+        seenCodes.add(code.lower())
+
+        # Create unit with its learning outcomes
+        description = row.get(expectedIOFormatting['Content'])
+        dbUnit = Unit(
+            unitcode=code,
+            unitname=str(row[expectedIOFormatting['title']]).strip(),
+            level=_intCell(row[expectedIOFormatting['level']], 1),
+            creditpoints=_intCell(row.get(expectedIOFormatting['CreditPoints']), 6),
+            description=None if _isBlankCell(description) else str(description),
+            creatorid=creatorid
+        )
+        outcomes = parseOutcomeString(row[expectedIOFormatting['Outcomes']])
+        for loKey, (lo, asm) in zip(spread_keys(len(outcomes)), outcomes):
+            dbUnit.learning_outcomes.append(
+                LearningOutcome(order_key=loKey, description=lo, assessment=asm)
+            )
+        db.session.add(dbUnit)
+        counts['added'] += 1
+
+    return counts
+
+
+def importSummary(counts):
+    """
+    Build the user-facing result message for an import.
+
+    Args:
+        counts: Totals of 'added', 'duplicates' and 'missing_code' rows
+
+    Returns:
+        str: Summary message
+    """
+    msg = f"{counts['added']} units added successfully from file. "
+    if counts['missing_code']:
+        msg += f"{counts['missing_code']} units lacked a unitcode and were skipped. "
+    if counts['duplicates']:
+        msg += f"{counts['duplicates']} units were duplicates and were skipped. "
+    return msg
+
+
+def isExcelFile(filename):
+    """Return True if the filename has an Excel extension."""
+    return filename.lower().endswith(('xlsx', 'xls'))
+
+
+def iterImportFrames(path, chunksize=IMPORT_CHUNK_SIZE):
+    """
+    Read a spooled import file in chunks.
+
+    CSV files are read with pandas' chunked reader. XLSX files are read
+    with openpyxl in read-only (streaming) mode. Legacy XLS files have no
+    streaming reader and are loaded whole.
+
+    Args:
+        path: Path of the spooled upload
+        chunksize: Rows per chunk
+
+    Yields:
+        DataFrame: Consecutive chunks of the file
+    """
+    if path.lower().endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = ['' if h is None else str(h) for h in next(rows, ())]
+            batch = []
+            yielded = False
+            for row in rows:
+                if all(_isBlankCell(cell) for cell in row):
+                    continue
+                batch.append(row[:len(header)])
+                if len(batch) >= chunksize:
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+                    yielded = True
+            if batch or not yielded:
+                yield pd.DataFrame(batch, columns=header)
+        finally:
+            workbook.close()
+    elif isExcelFile(path):
+        yield pd.read_excel(path)
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def countImportRows(path):
+    """
+    Count the data rows in a spooled import file for progress reporting.
+
+    Args:
+        path: Path of the spooled upload
+
+    Returns:
+        int: Number of data rows, or None if it cannot be determined cheaply
+    """
+    if path.lower().endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    if isExcelFile(path):
+        return None
+    with open(path, newline='', encoding='utf-8', errors='replace') as file:
+        return max(sum(1 for row in csv.reader(file) if row) - 1, 0)
+
+
+def runImportJob(job, path, creatorid):
+    """
+    Background job: import units from a spooled upload.
+
+    Commits after every chunk so progress reflects rows actually saved and
+    write locks are only held briefly.
+
+    Args:
+        job: JobHandle for progress reporting
+        path: Path of the spooled upload
+        creatorid: ID of the user who owns the imported units
+
+    Returns:
+        dict: Result message, row counts and import totals
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    total = countImportRows(path)
+    job.progress(0, total, force=True)
+
+    counts = {'added': 0, 'duplicates': 0, 'missing_code': 0}
+    seenCodes = set()
+    done = 0
+
+    for chunkIndex, frame in enumerate(iterImportFrames(path)):
+        if chunkIndex == 0:
+            missing = missingImportHeaders(frame.columns)
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}. Please try again.")
+
+        frameCounts = importUnitFrame(frame, creatorid, seenCodes)
+        db.session.commit()
+
+        for key, value in frameCounts.items():
+            counts[key] += value
+        done += len(frame)
+        job.progress(done, total)
+
+    return dict(counts, message=importSummary(counts), rows_done=done, rows_total=done)
+
+
+def runExportJob(job, userID=-1):
+    """
+    Background job: write a CSV export of units to the job's output file.
+
+    Units are streamed in batches with their outcomes loaded by one extra
+    query per batch, so memory stays flat for large catalogues.
+
+    Args:
+        job: JobHandle for progress reporting
+        userID: User ID to filter units (-1 for all units)
+
+    Returns:
+        dict: Result message and row counts
+    """
+    query = Unit.query if userID == -1 else Unit.query.filter_by(creatorid=userID)
+    total = query.count()
+    job.progress(0, total, force=True)
+
+    units = (
+        query.options(selectinload(Unit.learning_outcomes))
+        .order_by(Unit.id)
+        .yield_per(IMPORT_CHUNK_SIZE)
+    )
+
+    done = 0
+    with open(job.output_path, 'w', newline='', encoding='utf-8') as out:
+        for chunkIndex, text in enumerate(iterUnitsCSV(units)):
+            out.write(text)
+            # The first chunk is the header row
+            if chunkIndex:
+                done += 1
+                job.progress(done, total)
+
+    return {'message': f"{done} units exported.", 'rows_done': done, 'rows_total': done}
+
+
+def jobStatusPayload(state):
+    """
+    Convert a job state into the JSON payload returned to the browser.
+
+    Args:
+        state: Job state dict from the job manager
+
+    Returns:
+        dict: Status, progress and the URLs for polling and downloading
+    """
+    total = state.get('rows_total')
+    done = state.get('rows_done') or 0
+    if state['status'] == 'finished':
+        percent = 100
+    elif total:
+        percent = min(100, round(done * 100 / total))
+    else:
+        percent = 0
+
+    payload = {
+        'id': state['id'],
+        'kind': state['kind'],
+        'status': state['status'],
+        'rows_done': done,
+        'rows_total': total,
+        'percent': percent,
+        'message': state.get('message', ''),
+        'result': state.get('result'),
+        'status_url': url_for('main.job_status', job_id=state['id']),
+        'progress_url': url_for('main.job_progress', job_id=state['id']),
+    }
+    if state.get('has_output'):
+        payload['download_url'] = url_for('main.job_download', job_id=state['id'])
+    return payload
+
+
+def getOwnedJob(job_id):
+    """
+    Load a job visible to the current user.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        dict: Job state
+
+    Raises:
+        401: If the job belongs to another user and the user is not an admin
+        404: If the job does not exist
+    """
+    state = job_manager.get(job_id)
+    if state is None:
+        abort(404)
+    if state['owner_id'] != current_user.id and current_user.userType != UserType.ADMIN:
+        abort(401)
+    return state
+
+
 @main.route('/import-units', methods=['POST'])
 @login_required
 def import_units():
@@ -789,6 +1701,8 @@ def import_units():
     Processes uploaded file containing unit data and learning outcomes.
     Validates data format, checks for duplicates, and creates units with
     their associated outcomes. Supports both AJAX and standard requests.
+    This is the synchronous fallback for browsers without JavaScript;
+    the dashboard uses the background job endpoint instead.
 
     File Format:
         CSV or XLSX with columns: code, title, level, Outcomes
@@ -817,7 +1731,7 @@ def import_units():
 
     # Process file based on type
     try:
-        if file.filename.endswith(('xlsx', 'xls')):
+        if isExcelFile(file.filename):
             df = pd.read_excel(file)
         else:
             df = pd.read_csv(file)
@@ -829,14 +1743,7 @@ def import_units():
         return redirect(url_for("main.main_page"))
 
     # Validate required columns
-    required_headers = [
-        expectedIOFormatting['code'],
-        expectedIOFormatting['title'],
-        expectedIOFormatting['level'],
-        expectedIOFormatting['Outcomes']
-    ]
-
-    missing_headers = [h for h in required_headers if h not in df.columns]
+    missing_headers = missingImportHeaders(df.columns)
     if missing_headers:
         error_msg = f"Missing required columns: {', '.join(missing_headers)}. Please try again."
         if is_ajax:
@@ -844,72 +1751,21 @@ def import_units():
         flash(error_msg, "danger")
         return redirect(url_for("main.main_page"))
 
-    # Process data
-    unitcount = 0
-    hasDuplicates = False
-    dupCount = 0
-    hasLacksUnitCode = False
-    codeCount = 0
-
-    for _, newUnit in df.iterrows():
-        # Skip units without code
-        if pd.isna(newUnit[expectedIOFormatting['code']]):
-            hasLacksUnitCode = True
-            codeCount += 1
-            continue
-
-        # Check for duplicates
-        unitcodeCheck = db.session.query(Unit).filter_by(
-            unitcode=str(newUnit[expectedIOFormatting['code']]).strip()
-        ).first()
-
-        if unitcodeCheck != None:
-            hasDuplicates = True
-            dupCount += 1
-            continue
-
-        # Create unit
-        dbUnit = Unit(
-            unitcode=str(newUnit[expectedIOFormatting['code']]).strip(),
-            unitname=newUnit[expectedIOFormatting['title']],
-            level=newUnit[expectedIOFormatting['level']],
-            description=newUnit[expectedIOFormatting['Content']],
-            creatorid=current_user.id
-        )
-        db.session.add(dbUnit)
-        db.session.flush()
-        unitcount += 1
-
-        # Process learning outcomes
-        loPos = 1
-        for lo in str(newUnit.Outcomes).split(expectedIOFormatting['loDelimiter']):
-            loAsm = lo.split(expectedIOFormatting['loAssessmentDelimiter'])
-            lo = loAsm[0]
-            asm = loAsm[1] if len(loAsm) == 2 else ''
-
-            if lo == '':
-                continue
-
-            dbLO = LearningOutcome(
-                unit_id=dbUnit.id,
-                position=loPos,
-                description=lo,
-                assessment=asm
-            )
-            db.session.add(dbLO)
-            loPos += 1
+    # Process data in chunks
+    counts = {'added': 0, 'duplicates': 0, 'missing_code': 0}
+    seenCodes = set()
+    for start in range(0, len(df), IMPORT_CHUNK_SIZE):
+        frameCounts = importUnitFrame(df.iloc[start:start + IMPORT_CHUNK_SIZE], current_user.id, seenCodes)
+        for key, value in frameCounts.items():
+            counts[key] += value
 
     db.session.commit()
 
     # Build result message
-    msg = f"{unitcount} units added successfully from file. "
-    if hasLacksUnitCode:
-        msg += f"{codeCount} units lacked a unitcode and were skipped. "
-    if hasDuplicates:
-        msg += f"{dupCount} units were duplicates and were skipped. "
+    msg = importSummary(counts)
 
     if is_ajax:
-        return jsonify({'success': True, 'message': msg, 'units_added': unitcount})
+        return jsonify({'success': True, 'message': msg, 'units_added': counts['added']})
 
     flash(msg, "success")
     return redirect(url_for("main.main_page"))
@@ -925,13 +1781,9 @@ def export_my_units():
     current user, including learning outcomes and assessments.
 
     Returns:
-        CSV file download response
+        Streamed CSV file download response
     """
-    out = createCSVofLOs(current_user.id)
-    return (out, 200, {
-        "Content-Type": "text/csv; charset=utf-8",
-        "Content-Disposition": 'attachment; filename="units_and_outcomes.csv"'
-    })
+    return streamUnitsCSV(Unit.query.filter_by(creatorid=current_user.id), "units_and_outcomes.csv")
 
 
 @main.route('/export_all_units')
@@ -943,14 +1795,146 @@ def export_all_units():
     Admin function to export all units regardless of creator.
     Useful for backups and system-wide analysis.
 
+    Returns:
+        Streamed CSV file download response
+    """
+    return streamUnitsCSV(Unit.query, "units_and_outcomes.csv")
+
+
+# ==================== BACKGROUND JOB ROUTES ====================
+
+@main.post('/jobs/import')
+@login_required
+def start_import_job():
+    """
+    Start a background import of units from an uploaded file.
+
+    The upload is spooled to disk and hashed. If the current user already
+    imported the same file content successfully, that job is returned
+    instead of importing it twice, unless the form sets force=1 (e.g. to
+    re-import after deleting the units).
+
+    Returns:
+        202 JSON with the new job's status payload
+        200 JSON with the earlier job if the upload is a duplicate
+        400 JSON if no file was uploaded
+    """
+    file = request.files.get("import_file")
+    if not file or not file.filename:
+        return jsonify({'success': False, 'message': 'No file uploaded'}), 400
+
+    path, contentHash = job_manager.spool_upload(file)
+
+    existing = None
+    if request.form.get('force') != '1':
+        existing = job_manager.find_by_hash(current_user.id, contentHash)
+    if existing is not None:
+        return jsonify({
+            'success': True,
+            'duplicate': True,
+            'message': 'You have already imported this file.',
+            'job': jobStatusPayload(existing)
+        })
+
+    state = job_manager.submit(
+        current_app._get_current_object(),
+        'import',
+        current_user.id,
+        runImportJob,
+        path,
+        current_user.id,
+        content_hash=contentHash,
+        filename=file.filename
+    )
+    return jsonify({'success': True, 'duplicate': False, 'job': jobStatusPayload(state)}), 202
+
+
+@main.post('/jobs/export/<scope>')
+@login_required
+def start_export_job(scope):
+    """
+    Start a background CSV export.
+
+    Args:
+        scope: 'my' for the current user's units, 'all' for every unit
+
+    Returns:
+        202 JSON with the new job's status payload
+
+    Raises:
+        404: If scope is not recognised
+    """
+    if scope not in ('my', 'all'):
+        abort(404)
+
+    state = job_manager.submit(
+        current_app._get_current_object(),
+        'export',
+        current_user.id,
+        runExportJob,
+        current_user.id if scope == 'my' else -1,
+        scope=scope
+    )
+    return jsonify({'success': True, 'job': jobStatusPayload(state)}), 202
+
+
+@main.get('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """
+    Report the status of a background job.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        JSON status payload including row-count progress
+    """
+    return jsonify(jobStatusPayload(getOwnedJob(job_id)))
+
+
+@main.get('/jobs/<job_id>/progress')
+@login_required
+def job_progress(job_id):
+    """
+    Report only the row-count progress of a background job.
+
+    A lighter alternative to the status endpoint for frequent polling.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        JSON with status, rows_done, rows_total and percent
+    """
+    payload = jobStatusPayload(getOwnedJob(job_id))
+    return jsonify({key: payload[key] for key in ('status', 'rows_done', 'rows_total', 'percent')})
+
+
+@main.get('/jobs/<job_id>/download')
+@login_required
+def job_download(job_id):
+    """
+    Download the output of a finished export job.
+
+    Args:
+        job_id: Job identifier
+
     Returns:
         CSV file download response
+
+    Raises:
+        404: If the job has no output (not finished or not an export)
     """
-    out = createCSVofLOs()
-    return (out, 200, {
-        "Content-Type": "text/csv; charset=utf-8",
-        "Content-Disposition": 'attachment; filename="units_and_outcomes.csv"'
-    })
+    state = getOwnedJob(job_id)
+    if state['status'] != 'finished' or not state.get('has_output'):
+        abort(404)
+    return send_file(
+        job_manager.output_path(job_id),
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name='units_and_outcomes.csv'
+    )
 
 
 # ==================== ADMIN ROUTES ====================
@@ -1055,12 +2039,14 @@ def AI_reset():
 # ==================== INFORMATIONAL ROUTES ====================
 
 @main.route('/help')
+@page_cache.cached('help_page.html')
 def help_page():
     """
     Display help and documentation page.
 
     Provides comprehensive user documentation for all features
-    and user types. Includes tutorials and FAQs.
+    and user types. Includes tutorials and FAQs. The rendered page is
+    cached for anonymous visitors (see page_cache.py).
 
     Returns:
         Rendered help page template
@@ -1069,13 +2055,15 @@ def help_page():
 
 
 @main.route('/bloom-guide')
+@page_cache.cached('bloom_guide.html')
 def bloom_guide():
     """
     Display Bloom's Taxonomy guide with current configuration.
 
     Shows the taxonomy levels, associated verbs, and credit point
     mappings currently configured in the system. Interactive guide
-    for understanding learning outcome requirements.
+    for understanding learning outcome requirements. The rendered page
+    is cached for anonymous visitors until the AI settings change.
 
     Returns:
         Rendered Bloom's guide template with configuration
@@ -0,0 +1,236 @@
+"""
+Per-request SQL profiling with N+1 detection.
+
+Lazy relationships (User.units, Unit.learning_outcomes) make it easy for a
+page to issue one query per row without anyone noticing. The profiler
+counts and times every statement executed while a request is handled:
+
+    - the totals go out in a Server-Timing header
+      (e.g. 'db;dur=3.2;desc="7 queries"'), visible in the browser's
+      network panel
+    - the same SELECT run SQL_N_PLUS_ONE_THRESHOLD or more times in one
+      request is logged as a probable N+1 pattern, with the endpoint and
+      the statement
+
+Statements are told apart by their SQL text, which has placeholders for
+the parameters, so "SELECT ... WHERE unit_id = ?" run once per unit counts
+as one statement repeated.
+
+Queries run while a streamed response is being sent happen after the
+headers are out; they are logged but not in Server-Timing.
+
+Test helper:
+    with query_budget(max_queries=4, max_repeats=1) as log:
+        client.get(f'/view/{unit_id}')
+
+    fails the test if the block runs more than 4 statements or any
+    statement more than once, listing the statements.
+
+Attributes:
+    sql_profiler: Shared SQLProfiler instance
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+# Query logs collecting statements in the current thread/context
+_active_logs = ContextVar('sql_profiler_logs', default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget() when a block runs too many statements."""
+
+
+class QueryLog:
+    """
+    Statements executed during one request or query_budget() block.
+
+    Attributes:
+        count: Number of statements executed
+        duration: Total time spent executing them, in seconds
+        statements: SQL text -> number of times it was executed
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        """
+        Add one executed statement.
+
+        Args:
+            statement: SQL text (with parameter placeholders)
+            seconds: Execution time
+        """
+        self.count += 1
+        self.duration += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold, reads_only=False):
+        """
+        Statements executed at least threshold times.
+
+        Args:
+            threshold: Minimum number of executions
+            reads_only: Only consider SELECT statements
+
+        Returns:
+            list: (statement, count) pairs, most repeated first
+        """
+        return [
+            (sql, n) for sql, n in self.statements.most_common()
+            if n >= threshold and (not reads_only or sql.lstrip()[:6].upper() == 'SELECT')
+        ]
+
+    def summary(self):
+        """
+        Describe the statements for an error or log message.
+
+        Returns:
+            str: One line per distinct statement, most repeated first
+        """
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms:"]
+        for sql, n in self.statements.most_common():
+            lines.append(f"  {n} x {' '.join(sql.split())}")
+        return '\n'.join(lines)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_logs.get():
+        conn.info.setdefault('sql_profiler_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('sql_profiler_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    logs = _active_logs.get()
+    for log in logs:
+        log.record(statement, elapsed)
+
+
+def _listen(engine):
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextmanager
+def collect_queries():
+    """
+    Record the statements executed in the block.
+
+    Yields:
+        QueryLog: Filled in as statements run
+    """
+    log = QueryLog()
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries=None, max_repeats=None):
+    """
+    Fail if the block executes more statements than allowed.
+
+    Meant for tests: requests made with the Flask test client run in the
+    same thread, so their statements are counted too. The engines must
+    belong to an app set up with sql_profiler.init_app().
+
+    Args:
+        max_queries: Maximum number of statements in total (None = any)
+        max_repeats: Maximum executions of any one statement (None = any);
+                     1 catches N+1 loops however few rows the test has
+
+    Yields:
+        QueryLog: Statements executed so far
+
+    Raises:
+        QueryBudgetExceeded: If a limit is exceeded
+    """
+    with collect_queries() as log:
+        yield log
+
+    if max_queries is not None and log.count > max_queries:
+        raise QueryBudgetExceeded(f"Query budget of {max_queries} exceeded.\n{log.summary()}")
+    if max_repeats is not None and log.repeated(max_repeats + 1):
+        raise QueryBudgetExceeded(
+            f"A statement ran more than {max_repeats} time(s) (probable N+1).\n{log.summary()}")
+
+
+class SQLProfiler:
+    """
+    Counts, times and checks the statements of every request.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+    """
+
+    def init_app(self, app):
+        """
+        Bind the profiler to a Flask application.
+
+        Must be called after db.init_app(app), which creates the engines.
+
+        Args:
+            app: Flask application; reads SQL_PROFILER_ENABLED,
+                 SQL_N_PLUS_ONE_THRESHOLD and SQL_SERVER_TIMING
+        """
+        from . import db
+
+        with app.app_context():
+            for engine in db.engines.values():
+                _listen(engine)
+        app.extensions['sql_profiler'] = self
+
+        if not app.config.get('SQL_PROFILER_ENABLED', True):
+            return
+
+        @app.before_request
+        def start_query_log():
+            log = QueryLog()
+            g.sql_queries = log
+            g.sql_profiler_token = _active_logs.set(_active_logs.get() + (log,))
+
+        @app.after_request
+        def report_queries(response):
+            log = g.get('sql_queries')
+            if log is not None and log.count and current_app.config.get('SQL_SERVER_TIMING', True):
+                response.headers.add(
+                    'Server-Timing',
+                    f'db;dur={log.duration * 1000:.2f};desc="{log.count} queries"'
+                )
+            return response
+
+        @app.teardown_request
+        def finish_query_log(exc):
+            token = g.pop('sql_profiler_token', None)
+            log = g.pop('sql_queries', None)
+            if token is None:
+                return
+            try:
+                _active_logs.reset(token)
+            except ValueError:
+                # Torn down in another context (e.g. a server's own threads)
+                _active_logs.set(())
+            threshold = current_app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 5)
+            # Row-by-row INSERTs from the ORM's unit of work are not N+1 reads
+            for statement, count in log.repeated(threshold, reads_only=True):
+                current_app.logger.warning(
+                    "Probable N+1 query in %s: statement ran %d times: %s",
+                    request.endpoint, count, ' '.join(statement.split())
+                )
+
+
+sql_profiler = SQLProfiler()
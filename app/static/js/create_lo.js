@@ -7,25 +7,32 @@ document.addEventListener("DOMContentLoaded", function () {
       animation: 150,
       handle: '.drag-handle',
       ghostClass: 'table-active',
-      onEnd: function() {
-        const ids = Array.from(tbody.querySelectorAll('tr')).map(tr => tr.dataset.id);
-        fetch(LO_REORDER_URL, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ order: ids, unit_id: UNIT_ID })
-        }).then(r => r.json()).then(data => {
-          if (!data.ok) {
-            console.error('Reorder failed:', data.error);
-            return;
-          }
-          Array.from(tbody.querySelectorAll('tr')).forEach((tr, idx) => {
-            const firstCell = tr.querySelector('td');
-            if (firstCell) firstCell.textContent = (idx + 1).toString();
-          });
-        }).catch(err => console.error(err));
+      onEnd: function(evt) {
+        if (evt.oldIndex === evt.newIndex) return;
+        // Queue the move; it is saved with the next batch
+        queueOperation({ op: 'move', id: evt.item.dataset.id, index: evt.newIndex });
+        renumberOutcomes();
       }
     });
 
+    // Remember what the server has so only edited outcomes are saved
+    snapshotSavedOutcomes();
+
+    // Manual save button: immediate save + simple feedback
+    document.getElementById('saveBtn')?.addEventListener('click', function() {
+      sendSaveRequest()
+        .then(saved => {
+          // A conflict has already been reported by resolveSaveConflicts
+          if (saved) alert("Your edits have been saved successfully!");
+        })
+        .catch(err => console.error('Save error:', err));
+    });
+
+    // Save on blur for each contenteditable field
+    document.querySelectorAll('#LOTable [contenteditable]').forEach(div => {
+      div.addEventListener('blur', () => sendSaveRequest().catch(err => console.error('Save error:', err)));
+    });
+
     // Fixed evaluate button event listener
     document.getElementById('evaluateBtn')?.addEventListener('click', async function() {
       console.log('Evaluate button clicked'); // Debug log
@@ -79,40 +86,236 @@ document.addEventListener("DOMContentLoaded", function () {
   })();
 });
 
-// Convert autoSave to return a Promise for better error handling
-function autoSavePromise() {
-  return new Promise((resolve, reject) => {
-    const loDict = {};
-    const rows = document.getElementById("LOTable")?.rows;
+// ==================== SAVING ====================
+// Structural edits (add, delete, move) are queued as operations and text
+// edits are found by diffing each row against what the server last
+// acknowledged. Both are flushed together as one batch request per debounce
+// window, which the server applies in a single transaction. Each row carries
+// the version it was loaded at so the server can reject stale text writes.
+
+// Last saved text per outcome id: {description, assessment}
+const savedOutcomes = new Map();
+// Add/delete/move operations waiting for the next flush, in order
+let pendingOps = [];
+let saveTimeout;
+// Saves run one after another so each one sends up-to-date versions and ids
+let saveChain = Promise.resolve();
+// Rows added locally get a temporary id until the server assigns one
+let nextClientId = 1;
+
+function readOutcomeRow(row) {
+  return {
+    description: row.querySelector('.loDesc div[contenteditable]')?.textContent?.trim() || '',
+    assessment: row.querySelector('.loAss div[contenteditable]')?.textContent?.trim() || ''
+  };
+}
 
-    if (!rows || rows.length <= 1) {
-      resolve(); // No data to save
-      return;
-    }
+function findOutcomeRow(id) {
+  return document.querySelector(`#lo-tbody tr[data-id="${id}"]`);
+}
 
-    for (let i = 1; i < rows.length; i++) {
-      let pos = rows[i].cells[0]?.textContent?.trim();
-      let desc = rows[i].cells[1]?.textContent?.trim() || '';
-      let assessment = rows[i].cells[2]?.textContent?.trim() || '';
-      if (pos) {
-        loDict[pos] = [desc, assessment];
-      }
-    }
+function snapshotSavedOutcomes() {
+  document.querySelectorAll('#lo-tbody tr[data-id]').forEach(row => {
+    savedOutcomes.set(row.dataset.id, readOutcomeRow(row));
+  });
+}
 
-    fetch(LO_SAVE_URL, {
+function renumberOutcomes() {
+  document.querySelectorAll('#lo-tbody tr[data-id]').forEach((row, idx) => {
+    const cell = row.querySelector('.loPos');
+    if (cell) cell.textContent = (idx + 1).toString();
+  });
+}
+
+function queueOperation(op) {
+  pendingOps.push(op);
+  autoSave();
+}
+
+// Build update operations for rows whose text differs from the last save
+function collectDirtyOutcomes() {
+  const updates = [];
+  document.querySelectorAll('#lo-tbody tr[data-id]').forEach(row => {
+    const current = readOutcomeRow(row);
+    const saved = savedOutcomes.get(row.dataset.id) || {};
+    const op = { op: 'update', id: row.dataset.id, version: parseInt(row.dataset.version, 10) };
+
+    if (current.description !== saved.description) op.description = current.description;
+    if (current.assessment !== saved.assessment) op.assessment = current.assessment;
+
+    if ('description' in op || 'assessment' in op) updates.push(op);
+  });
+  return updates;
+}
+
+// Swap a temporary id for the one the server assigned, everywhere it is used
+function replaceClientId(clientId, id) {
+  id = id.toString();
+  const row = findOutcomeRow(clientId);
+  if (row) row.dataset.id = id;
+  if (savedOutcomes.has(clientId)) {
+    savedOutcomes.set(id, savedOutcomes.get(clientId));
+    savedOutcomes.delete(clientId);
+  }
+  pendingOps.forEach(op => { if (op.id === clientId) op.id = id; });
+}
+
+async function flushOperations() {
+  const queued = pendingOps;
+  pendingOps = [];
+  const updates = collectDirtyOutcomes();
+  const ops = queued.concat(updates);
+  if (ops.length === 0) return true;
+
+  let response, data;
+  try {
+    response = await fetch(LO_BATCH_URL, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify(loDict)
-    })
-    .then(response => {
-      if (response.ok) {
-        resolve();
-      } else {
-        reject(new Error('Auto-save failed'));
-      }
-    })
-    .catch(reject);
+      body: JSON.stringify({ ops: ops })
+    });
+    data = await response.json();
+  } catch (err) {
+    // Nothing was applied; keep the operations for the next attempt
+    pendingOps = queued.concat(pendingOps);
+    throw err;
+  }
+
+  if (response.status === 409) {
+    // The whole batch was rolled back; reload the conflicting outcomes and retry the rest
+    pendingOps = queued.concat(pendingOps);
+    resolveSaveConflicts(data.conflicts || {});
+    return false;
+  }
+  if (!response.ok) {
+    throw new Error(data.error || 'Save failed');
+  }
+
+  Object.entries(data.ids || {}).forEach(([clientId, id]) => replaceClientId(clientId, id));
+
+  // Record the text that was saved so it is not sent again
+  updates.forEach(op => {
+    const id = (data.ids && data.ids[op.id]) ? data.ids[op.id].toString() : op.id;
+    const { op: _kind, id: _id, version: _version, ...fields } = op;
+    savedOutcomes.set(id, { ...savedOutcomes.get(id), ...fields });
+  });
+
+  // Take versions from the server's canonical state
+  (data.outcomes || []).forEach(outcome => {
+    const row = findOutcomeRow(outcome.id);
+    if (row) row.dataset.version = outcome.version;
+  });
+  return true;
+}
+
+// Another editor saved these outcomes first; load their version and tell the user
+function resolveSaveConflicts(conflicts) {
+  const changed = [];
+  const deleted = [];
+
+  Object.entries(conflicts).forEach(([id, server]) => {
+    const row = findOutcomeRow(id);
+    if (!row) return;
+
+    const displayNumber = row.querySelector('.loPos')?.textContent?.trim();
+
+    if (server === null) {
+      deleted.push(displayNumber);
+      savedOutcomes.delete(id);
+      pendingOps = pendingOps.filter(op => op.id !== id);
+      row.remove();
+      return;
+    }
+
+    changed.push(displayNumber);
+    row.dataset.version = server.version;
+    savedOutcomes.set(id, { description: server.description, assessment: server.assessment });
+    row.querySelector('.loDesc div[contenteditable]').textContent = server.description;
+    row.querySelector('.loAss div[contenteditable]').textContent = server.assessment;
+  });
+
+  renumberOutcomes();
+  const lines = ['Your edits were not saved because someone else changed these outcomes first.'];
+  if (changed.length) lines.push(`Reloaded with their version: #${changed.join(', #')}`);
+  if (deleted.length) lines.push(`Deleted by someone else: #${deleted.join(', #')}`);
+  lines.push('Review them and save again.');
+  alert(lines.join('\n\n'));
+
+  // Save the remaining edits, which no longer conflict
+  autoSave();
+}
+
+// Save queued operations and edited outcomes now; resolves to false on a conflict
+function sendSaveRequest() {
+  clearTimeout(saveTimeout);
+  saveChain = saveChain.catch(() => {}).then(flushOperations);
+  return saveChain;
+}
+
+// Debounced autosave while editing (fires 750ms after the last change)
+function autoSave() {
+  clearTimeout(saveTimeout);
+  saveTimeout = setTimeout(() => {
+    sendSaveRequest().catch(err => console.error('Save error:', err));
+  }, 750);
+}
+
+// ==================== ADD / DELETE ====================
+
+// Build a table row matching the server-rendered markup
+function buildOutcomeRow(id) {
+  const row = document.createElement('tr');
+  row.dataset.id = id;
+  row.dataset.version = 1;
+  row.innerHTML = `
+    <td class="text-center loPos"></td>
+    <td class="loDesc editable"><div contenteditable list="wordlist" oninput="autoSave()"></div></td>
+    <td class="loAss"><div contenteditable oninput="autoSave()"></div></td>
+    <td class="text-center">
+      <button type="button" class="btn btn-danger rounded-circle btn-sm" onclick="deleteOutcome(this)">&minus;</button>
+    </td>
+    <td class="text-center">
+      <i class="bi bi-arrows-move drag-handle" title="Drag to reorder" style="cursor: move;"></i>
+    </td>`;
+  row.querySelectorAll('[contenteditable]').forEach(div => {
+    div.addEventListener('blur', () => sendSaveRequest().catch(err => console.error('Save error:', err)));
   });
+  return row;
+}
+
+// Add a blank outcome locally; it is created with the next batch
+function addBlankOutcome() {
+  const tbody = document.getElementById('lo-tbody');
+  document.getElementById('lo-empty')?.remove();
+
+  const clientId = `new-${nextClientId++}`;
+  const row = buildOutcomeRow(clientId);
+  tbody.appendChild(row);
+  savedOutcomes.set(clientId, { description: '', assessment: '' });
+  renumberOutcomes();
+
+  if (typeof attachSuggestionListeners === 'function') attachSuggestionListeners(row);
+  queueOperation({ op: 'add', client_id: clientId });
+  row.querySelector('.loDesc div[contenteditable]').focus();
+}
+
+// Remove an outcome locally; it is deleted with the next batch
+function deleteOutcome(button) {
+  if (!confirm('Are you sure you want to delete this learning outcome?')) {
+    return;
+  }
+  const row = button.closest('tr');
+  const id = row.dataset.id;
+
+  row.remove();
+  savedOutcomes.delete(id);
+  renumberOutcomes();
+  queueOperation({ op: 'delete', id: id });
+}
+
+// Flush pending edits before actions that read outcomes from the server
+function autoSavePromise() {
+  return sendSaveRequest();
 }
 
 function formatAIResponse(responseText) {
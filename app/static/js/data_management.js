@@ -5,15 +5,16 @@
  * Uses the Module Pattern for encapsulation and provides a clean public API.
  *
  * Features:
- * - File import with progress tracking
- * - CSV export for user's units or all units
+ * - File import as a background job with real row-count progress
+ * - CSV export for user's units or all units as a background job
  * - Modal management for user feedback
- * - Progress bar animation for long operations
+ * - Progress bar driven by polling the job status endpoint
  * - AJAX-based operations to prevent page reloads
  *
  * Dependencies:
  * - Bootstrap 5 for modals and UI components
- * - Server endpoints set via global variables (EXPORT_MY_URL, EXPORT_ALL_URL)
+ * - Server endpoints set via global variables
+ *   (IMPORT_JOB_URL, EXPORT_MY_JOB_URL, EXPORT_ALL_JOB_URL)
  *
  * @module DataManager
  */
@@ -26,9 +27,11 @@ const DataManager = (function() {
     let loadingModal, successModal, errorModal;
 
     // Progress tracking
-    let progressInterval = null;  // Interval for progress animation
     let currentProgress = 0;       // Current progress percentage
 
+    // How often to poll a running job's progress (ms)
+    const POLL_INTERVAL = 500;
+
     // ==================== INITIALIZATION ====================
 
     /**
@@ -84,29 +87,69 @@ const DataManager = (function() {
 
     /**
      * Handle file import process
-     * Shows loading modal with file info and submits form
+     * Uploads the file to start a background import job, then polls the
+     * job until it finishes. Falls back to a normal form submit if the
+     * job endpoint is not available.
      *
      * @param {File} file - Selected file object
      * @param {HTMLFormElement} form - Form element to submit
+     * @async
      */
-    function handleFileImport(file, form) {
+    async function handleFileImport(file, form) {
         const fileName = file.name;
         const fileSize = (file.size / 1024).toFixed(2); // Convert to KB
 
+        if (!window.IMPORT_JOB_URL) {
+            form.submit();
+            return;
+        }
+
         // Update loading modal with file information
         updateLoadingModal(
             'Importing Units...',
-            `Processing ${fileName} (${fileSize} KB)`
+            `Uploading ${fileName} (${fileSize} KB)`
         );
-
-        // Show modal and start progress animation
         showLoadingModal();
-        startProgress(85); // Progress to 85% during processing
 
-        // Submit form after small delay to ensure modal is visible
-        setTimeout(() => {
-            form.submit();
-        }, 100);
+        try {
+            const body = new FormData(form);
+            let response = await fetch(window.IMPORT_JOB_URL, { method: 'POST', body: body });
+            let data = await response.json();
+
+            if (data.success && data.duplicate) {
+                // Importing again is harmless (existing units are skipped),
+                // e.g. after deleting some of the imported units
+                if (!confirm(`${data.message} Import it again?`)) {
+                    completeProgressAndHide(() => {
+                        showSuccessMessage('Already Imported', data.message);
+                    });
+                    return;
+                }
+                body.append('force', '1');
+                response = await fetch(window.IMPORT_JOB_URL, { method: 'POST', body: body });
+                data = await response.json();
+            }
+
+            if (!data.success) {
+                throw new Error(data.message || 'Import failed');
+            }
+
+            updateLoadingModal('Importing Units...', `Processing ${fileName}`);
+            const job = await pollJob(data.job);
+
+            completeProgressAndHide(() => {
+                showSuccessMessage('Import Successful', job.message);
+            });
+
+        } catch (error) {
+            console.error('Import error:', error);
+            completeProgressAndHide(() => {
+                showErrorMessage(error.message || 'Import failed. Please try again.');
+            });
+        } finally {
+            // Allow the same file to be selected again
+            form.reset();
+        }
     }
 
     // ==================== FILE EXPORT ====================
@@ -130,7 +173,8 @@ const DataManager = (function() {
 
     /**
      * Export units as CSV file
-     * Fetches CSV data from server and triggers download
+     * Starts a background export job, polls it to completion and then
+     * downloads the finished file
      *
      * @param {string} type - Export type: 'my' for user's units, 'all' for all units
      * @async
@@ -150,13 +194,19 @@ const DataManager = (function() {
             // Show loading modal
             updateLoadingModal('Exporting Units...', `Preparing ${exportTypeText} for download`);
             showLoadingModal();
-            startProgress(90);
 
-            // Get appropriate export URL
-            const url = getExportUrl(type);
+            // Start the export job and wait for it to finish
+            const startResponse = await fetch(getExportUrl(type), { method: 'POST' });
+            const startData = await startResponse.json();
+
+            if (!startData.success) {
+                throw new Error('Export failed');
+            }
 
-            // Fetch CSV data from server
-            const response = await fetch(url);
+            const job = await pollJob(startData.job);
+
+            // Fetch the finished CSV file
+            const response = await fetch(job.download_url);
 
             if (!response.ok) {
                 throw new Error('Export failed');
@@ -192,6 +242,53 @@ const DataManager = (function() {
         }
     }
 
+    // ==================== JOB POLLING ====================
+
+    /**
+     * Poll a background job until it finishes
+     * Updates the progress bar from the job's real row counts
+     *
+     * @param {Object} job - Job status payload returned when the job started
+     * @returns {Promise<Object>} Final job status payload
+     * @async
+     */
+    async function pollJob(job) {
+        while (job.status === 'queued' || job.status === 'running') {
+            updateJobProgress(job);
+            await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL));
+
+            const response = await fetch(job.status_url);
+            if (!response.ok) {
+                throw new Error(`Job status check failed (HTTP ${response.status})`);
+            }
+            job = await response.json();
+        }
+
+        if (job.status === 'failed') {
+            throw new Error(job.message || 'Job failed');
+        }
+
+        updateJobProgress(job);
+        return job;
+    }
+
+    /**
+     * Show a job's progress in the loading modal
+     *
+     * @param {Object} job - Job status payload
+     */
+    function updateJobProgress(job) {
+        currentProgress = job.percent || 0;
+        updateProgressBar(currentProgress);
+
+        if (job.rows_total) {
+            updateLoadingModal(
+                document.getElementById('loadingText')?.textContent || 'Processing...',
+                `${job.rows_done} of ${job.rows_total} rows processed`
+            );
+        }
+    }
+
     // ==================== PROGRESS MANAGEMENT ====================
 
     /**
@@ -220,41 +317,6 @@ const DataManager = (function() {
         updateProgressBar(0);
     }
 
-    /**
-     * Start animated progress
-     * Gradually increases progress to specified maximum
-     *
-     * @param {number} maxProgress - Maximum progress percentage to reach
-     */
-    function startProgress(maxProgress = 90) {
-        resetProgress();
-
-        // Clear any existing interval
-        if (progressInterval) {
-            clearInterval(progressInterval);
-        }
-
-        // Animate progress bar
-        progressInterval = setInterval(() => {
-            if (currentProgress < maxProgress) {
-                // Slow down as we approach the maximum
-                const increment = Math.max(0.5, (maxProgress - currentProgress) / 10);
-                currentProgress = Math.min(currentProgress + increment, maxProgress);
-                updateProgressBar(currentProgress);
-            }
-        }, 200); // Update every 200ms
-    }
-
-    /**
-     * Stop progress animation
-     */
-    function stopProgress() {
-        if (progressInterval) {
-            clearInterval(progressInterval);
-            progressInterval = null;
-        }
-    }
-
     /**
      * Complete progress to 100% and hide modal
      * Quickly animates to 100% before hiding
@@ -262,8 +324,6 @@ const DataManager = (function() {
      * @param {Function} callback - Optional callback after modal is hidden
      */
     function completeProgressAndHide(callback) {
-        stopProgress();
-
         let fastProgress = currentProgress;
 
         // Quickly complete to 100%
@@ -307,8 +367,6 @@ const DataManager = (function() {
      * Hide loading modal and clean up
      */
     function hideLoadingModal() {
-        stopProgress();
-
         if (loadingModal) {
             loadingModal.hide();
         }
@@ -371,15 +429,15 @@ const DataManager = (function() {
     // ==================== UTILITY FUNCTIONS ====================
 
     /**
-     * Get export URL based on type
+     * Get export job URL based on type
      * URLs are set globally by the template
      *
      * @param {string} type - Export type ('my' or 'all')
-     * @returns {string} Export endpoint URL
+     * @returns {string} Export job endpoint URL
      */
     function getExportUrl(type) {
         // These URLs are set from the template via global variables
-        return type === 'my' ? window.EXPORT_MY_URL : window.EXPORT_ALL_URL;
+        return type === 'my' ? window.EXPORT_MY_JOB_URL : window.EXPORT_ALL_JOB_URL;
     }
 
     /**
@@ -0,0 +1,312 @@
+"""
+Synthetic unit catalogues for scaling tests and benchmarks.
+
+Generates realistic-looking units and learning outcomes with a seeded
+random number generator, so the same seed always produces the same
+catalogue:
+
+    Unit codes      Discipline prefix + level digit + 3 digits (e.g. CITS3042),
+                    never clashing with codes already in the database
+    Levels          1-6, weighted towards the undergraduate years
+    Credit points   6 (most units), 12 or 24
+    Outcomes        As many as the AI settings allow for the credit points
+                    (e.g. 3-6 for 6 points), unless a range is given. Each
+                    starts with a Bloom's verb: mostly from the classes the
+                    settings assign to the unit's level, sometimes from
+                    another class (as real catalogues do), and now and then
+                    with a banned word, so AI evaluation has work to do.
+
+Units are owned by a dedicated unit coordinator account (SYNTHETIC_OWNER)
+so they can be removed again with clear_synthetic().
+
+Functions:
+    generate_units: Build synthetic unit dicts without touching the database
+    insert_units: Bulk insert generated units and their outcomes
+    seed_synthetic: Generate and insert a catalogue
+    clear_synthetic: Delete the synthetic owner's units
+    units_to_csv: Render generated units as an import file
+"""
+
+import csv
+import io
+import random
+
+from werkzeug.security import generate_password_hash
+
+SYNTHETIC_OWNER = 'synthetic-uc'
+
+# Discipline prefixes and the topics their units and outcomes talk about
+DISCIPLINES = {
+    'CITS': ['algorithms', 'data structures', 'software testing', 'network protocols', 'databases',
+             'operating systems', 'machine learning models', 'web applications', 'compilers'],
+    'MATH': ['linear algebra', 'differential equations', 'real analysis', 'probability models',
+             'numerical methods', 'group theory', 'optimisation problems'],
+    'STAT': ['regression models', 'experimental design', 'time series', 'Bayesian inference',
+             'sampling methods', 'survival analysis'],
+    'PHYS': ['classical mechanics', 'electromagnetism', 'quantum systems', 'thermodynamics',
+             'optics', 'particle detectors'],
+    'CHEM': ['organic reactions', 'spectroscopy', 'chemical kinetics', 'analytical techniques',
+             'inorganic compounds'],
+    'BIOL': ['cell biology', 'genetics', 'ecosystems', 'evolutionary processes', 'microbiology'],
+    'ANHB': ['human anatomy', 'physiological systems', 'neuroanatomy', 'musculoskeletal function'],
+    'ENSC': ['engineering design', 'circuit analysis', 'control systems', 'signal processing'],
+    'GENG': ['structural loads', 'fluid mechanics', 'engineering materials', 'project management'],
+    'ECON': ['market structures', 'macroeconomic policy', 'game theory', 'labour markets'],
+    'ACCT': ['financial statements', 'management accounting', 'auditing standards', 'taxation'],
+    'MKTG': ['consumer behaviour', 'brand strategy', 'market research', 'digital marketing'],
+    'LAWS': ['contract law', 'constitutional principles', 'criminal procedure', 'legal research'],
+    'HIST': ['colonial history', 'historical sources', 'twentieth-century conflicts', 'historiography'],
+    'PHIL': ['ethical theories', 'logic', 'philosophy of mind', 'political philosophy'],
+    'PSYC': ['cognitive processes', 'developmental psychology', 'research methods', 'social behaviour'],
+    'LING': ['phonology', 'syntax', 'language acquisition', 'sociolinguistics'],
+    'ENVT': ['environmental impact', 'climate systems', 'water resources', 'land management'],
+    'ARCT': ['architectural design', 'building technology', 'urban spaces', 'design history'],
+    'MUSC': ['music theory', 'performance practice', 'composition techniques', 'music history'],
+}
+
+UNIT_NAME_PATTERNS = [
+    'Introduction to {Topic}', 'Foundations of {Topic}', '{Topic}', 'Advanced {Topic}',
+    '{Topic} in Practice', 'Topics in {Topic}', 'Applied {Topic}', '{Topic} and Society',
+]
+
+OUTCOME_PATTERNS = [
+    '{verb} the key principles of {topic}',
+    '{verb} {topic} in a professional context',
+    '{verb} solutions to problems in {topic} using appropriate methods',
+    '{verb} the strengths and limitations of approaches to {topic}',
+    '{verb} evidence from {topic} to support a reasoned argument',
+    '{verb} a project applying {topic} and {other}',
+    '{verb} how {topic} relates to {other}',
+    '{verb} the ethical implications of {topic}',
+]
+
+ASSESSMENTS = ['Exam', 'Assignment', 'Project', 'Lab report', 'Presentation', 'Quiz', 'Essay', '']
+
+# Relative weights of levels 1-6 and of 6, 12 and 24 credit point units
+LEVEL_WEIGHTS = [30, 28, 25, 9, 5, 3]
+CREDIT_POINTS = [6, 12, 24]
+CREDIT_WEIGHTS = [80, 15, 5]
+
+BLOOM_CLASSES = ['KNOWLEDGE', 'COMPREHENSION', 'APPLICATION', 'ANALYSIS', 'SYNTHESIS', 'EVALUATION']
+
+
+def _level_classes(config, level):
+    """Bloom's classes the AI settings expect for a unit level."""
+    return [name.strip().upper() for name in config[f'Level {level}'].split(',') if name.strip()]
+
+
+def generate_units(count, seed=0, config=None, outcome_range=None, off_level_rate=0.15,
+                   banned_rate=0.03, existing_codes=()):
+    """
+    Build synthetic units without touching the database.
+
+    Args:
+        count: Number of units
+        seed: RNG seed; the same seed gives the same units
+        config: AI settings (Bloom's verbs, level classes, outcome counts);
+                defaults to the current settings
+        outcome_range: (min, max) outcomes per unit, overriding the
+                       per-credit-point ranges in the settings
+        off_level_rate: Share of outcomes using a verb from another class
+        banned_rate: Share of outcomes containing a banned word
+        existing_codes: Unit codes to avoid
+
+    Returns:
+        list: Dicts with unitcode, unitname, level, creditpoints,
+              description and outcomes (list of (description, assessment))
+
+    Raises:
+        ValueError: If count is more than the free unit codes
+    """
+    if config is None:
+        from . import config_manager
+        config = config_manager.getCurrentParams()
+
+    rng = random.Random(seed)
+    verbs = {name: [v.strip() for v in config[name] if v.strip()] for name in BLOOM_CLASSES}
+    banned = [w.strip().lower() for w in config.get('BANNED', []) if w.strip()]
+    used = set(existing_codes)
+    prefixes = list(DISCIPLINES)
+
+    if count > len(prefixes) * 6 * 1000 - len(used):
+        raise ValueError(f"Cannot generate {count} unique unit codes")
+
+    units = []
+    while len(units) < count:
+        prefix = rng.choice(prefixes)
+        level = rng.choices(range(1, 7), LEVEL_WEIGHTS)[0]
+        code = f'{prefix}{level}{rng.randrange(1000):03d}'
+        if code in used:
+            continue
+        used.add(code)
+
+        topics = DISCIPLINES[prefix]
+        topic = rng.choice(topics)
+        creditpoints = rng.choices(CREDIT_POINTS, CREDIT_WEIGHTS)[0]
+        low, high = outcome_range or config[f'{creditpoints} Points']
+        levelClasses = _level_classes(config, level)
+
+        outcomes = []
+        for _ in range(rng.randint(low, high)):
+            if rng.random() < off_level_rate:
+                bloomClass = rng.choice(BLOOM_CLASSES)
+            else:
+                bloomClass = rng.choice(levelClasses)
+            text = rng.choice(OUTCOME_PATTERNS).format(
+                verb=rng.choice(verbs[bloomClass]),
+                topic=rng.choice(topics),
+                other=rng.choice(topics)
+            )
+            if banned and rng.random() < banned_rate:
+                text += f' and {rng.choice(banned)} its importance'
+            outcomes.append((text, rng.choice(ASSESSMENTS)))
+
+        units.append({
+            'unitcode': code,
+            'unitname': rng.choice(UNIT_NAME_PATTERNS).format(Topic=topic[0].upper() + topic[1:])[:64],
+            'level': level,
+            'creditpoints': creditpoints,
+            'description': f'This unit covers {topic} at level {level}.',
+            'outcomes': outcomes,
+        })
+    return units
+
+
+def get_synthetic_owner():
+    """
+    Get (creating if needed) the unit coordinator owning synthetic units.
+
+    Returns:
+        User: The synthetic owner (added to the session, not committed)
+    """
+    from . import db
+    from .models import User, UserType
+
+    owner = db.session.scalar(db.select(User).where(User.username == SYNTHETIC_OWNER))
+    if owner is None:
+        # Random password: the account only owns data and is never used to log in
+        owner = User(
+            username=SYNTHETIC_OWNER,
+            password_hash=generate_password_hash(random.SystemRandom().randbytes(16).hex()),
+            userType=UserType.UC
+        )
+        db.session.add(owner)
+        db.session.flush()
+    return owner
+
+
+def insert_units(units, creatorid, chunk_size=1000):
+    """
+    Bulk insert generated units and their outcomes.
+
+    Uses multi-row INSERTs instead of the ORM unit of work, so a catalogue
+    of tens of thousands of units loads in seconds. Commits per chunk.
+
+    Args:
+        units: Dicts from generate_units()
+        creatorid: ID of the owning user
+        chunk_size: Units per INSERT batch and commit
+
+    Returns:
+        tuple: (units inserted, outcomes inserted)
+    """
+    from . import db
+    from .models import Unit, LearningOutcome
+    from .ordering import spread_keys
+
+    outcomeCount = 0
+    for start in range(0, len(units), chunk_size):
+        chunk = units[start:start + chunk_size]
+        unitRows = [
+            {key: unit[key] for key in ('unitcode', 'unitname', 'level', 'creditpoints', 'description')}
+            | {'creatorid': creatorid}
+            for unit in chunk
+        ]
+        unitIDs = db.session.scalars(
+            db.insert(Unit).returning(Unit.id, sort_by_parameter_order=True),
+            unitRows
+        ).all()
+
+        outcomeRows = []
+        for unitID, unit in zip(unitIDs, chunk):
+            for key, (description, assessment) in zip(spread_keys(len(unit['outcomes'])), unit['outcomes']):
+                outcomeRows.append({
+                    'unit_id': unitID,
+                    'description': description,
+                    'assessment': assessment,
+                    'order_key': key,
+                })
+        if outcomeRows:
+            db.session.execute(db.insert(LearningOutcome), outcomeRows)
+        db.session.commit()
+        outcomeCount += len(outcomeRows)
+    return len(units), outcomeCount
+
+
+def seed_synthetic(count, seed=0, outcome_range=None, chunk_size=1000):
+    """
+    Generate a synthetic catalogue and insert it.
+
+    Args:
+        count: Number of units
+        seed: RNG seed
+        outcome_range: (min, max) outcomes per unit, or None for the
+                       per-credit-point ranges in the AI settings
+        chunk_size: Units per INSERT batch
+
+    Returns:
+        tuple: (units inserted, outcomes inserted)
+    """
+    from . import db
+    from .models import Unit
+
+    owner = get_synthetic_owner()
+    existing = set(db.session.scalars(db.select(Unit.unitcode)))
+    units = generate_units(count, seed=seed, outcome_range=outcome_range, existing_codes=existing)
+    return insert_units(units, owner.id, chunk_size=chunk_size)
+
+
+def clear_synthetic():
+    """
+    Delete all units owned by the synthetic owner, with their outcomes.
+
+    Returns:
+        int: Number of units deleted
+    """
+    from . import db
+    from .models import Unit, LearningOutcome, User
+
+    owner = db.session.scalar(db.select(User).where(User.username == SYNTHETIC_OWNER))
+    if owner is None:
+        return 0
+    unitIDs = db.select(Unit.id).where(Unit.creatorid == owner.id)
+    db.session.execute(db.delete(LearningOutcome).where(LearningOutcome.unit_id.in_(unitIDs)))
+    deleted = db.session.execute(db.delete(Unit).where(Unit.creatorid == owner.id)).rowcount
+    db.session.commit()
+    return deleted
+
+
+def units_to_csv(units):
+    """
+    Render generated units as a CSV import file.
+
+    Args:
+        units: Dicts from generate_units()
+
+    Returns:
+        str: CSV text in the import format
+    """
+    from .routes import expectedIOFormatting as io_format
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow([io_format['code'], io_format['title'], io_format['level'],
+                     io_format['CreditPoints'], io_format['Content'], io_format['Outcomes']])
+    for unit in units:
+        outcomes = ''.join(
+            description + io_format['loAssessmentDelimiter'] + assessment + io_format['loDelimiter']
+            for description, assessment in unit['outcomes']
+        )
+        writer.writerow([unit['unitcode'], unit['unitname'], unit['level'],
+                         unit['creditpoints'], unit['description'], outcomes])
+    return buf.getvalue()
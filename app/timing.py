@@ -0,0 +1,221 @@
+"""
+Per-request timing spans for the Server-Timing header and structured logs.
+
+A slow AI evaluation or search page could have spent its time in SQL,
+building the prompt, waiting for the model, rendering templates or
+encoding JSON. Each of those phases runs inside a span, and for a sampled
+request the spans are reported:
+
+    Server-Timing header    e.g. 'prompt;dur=0.41, llm;dur=8120.55,
+                            json;dur=0.12, total;dur=8127.03', shown in the
+                            browser's network panel (the SQL profiler adds
+                            its own 'db' entry)
+    Log line (TIMING_LOG)   One JSON object per request on the "app.timing"
+                            logger, with the request id, endpoint, status,
+                            spans and SQL totals
+
+Spans:
+    render      render_template / render_template_string (Flask signals)
+    json        jsonify and other JSON responses (app.json provider)
+    prompt      build_prompt() in ai_evaluate.run_eval
+    llm_queue   Waiting for a model call slot
+    llm         The model call itself
+    total       Whole request, until the response is returned
+
+Add another with "with span('name'):" anywhere in request code; outside
+a sampled request a span costs one context check.
+
+Sampling:
+    TIMING_SAMPLE_RATE (0-1) of requests are timed. Every response carries
+    an X-Request-ID (the client's, if it sent a valid one) so a log line
+    can be matched to a request.
+
+Attributes:
+    timing: Shared RequestTiming instance
+"""
+
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+# Request ids accepted from clients or a proxy; anything else is replaced
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def _spans():
+    """Span totals of the current request, or None if it is not timed."""
+    if not has_request_context():
+        return None
+    return g.get('timing_spans')
+
+
+def add_span(name, seconds):
+    """
+    Add time to a span of the current request.
+
+    Args:
+        name: Span name (a Server-Timing metric name: letters, digits, _ and -)
+        seconds: Duration to add
+    """
+    spans = _spans()
+    if spans is None:
+        return
+    entry = spans.get(name)
+    if entry is None:
+        spans[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def span(name):
+    """
+    Time the block as a span of the current request.
+
+    Args:
+        name: Span name; repeated spans with one name are added up
+    """
+    if _spans() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_span(name, time.perf_counter() - start)
+
+
+def request_id():
+    """
+    Id of the current request, as sent in X-Request-ID.
+
+    Returns:
+        str: Request id, or None outside a request
+    """
+    if not has_request_context():
+        return None
+    return g.get('request_id')
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that times encoding as the 'json' span."""
+
+    def dumps(self, obj, **kwargs):
+        with span('json'):
+            return super().dumps(obj, **kwargs)
+
+
+class RequestTiming:
+    """
+    Samples requests and reports their spans.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+
+    Attributes:
+        sample_rate: Fraction of requests timed (0 = none, 1 = all)
+        log_enabled: Also write one JSON log line per timed request
+    """
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.log_enabled = False
+
+    def init_app(self, app):
+        """
+        Bind request timing to a Flask application.
+
+        Args:
+            app: Flask application; reads TIMING_SAMPLE_RATE and TIMING_LOG
+        """
+        self.sample_rate = app.config.get('TIMING_SAMPLE_RATE', self.sample_rate)
+        self.log_enabled = app.config.get('TIMING_LOG', self.log_enabled)
+        app.extensions['timing'] = self
+
+        if self.log_enabled and not logger.handlers:
+            # One JSON object per line on stderr, for the log pipeline
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+        # Time JSON encoding without touching the jsonify call sites
+        if type(app.json) is DefaultJSONProvider:
+            app.json = TimedJSONProvider(app)
+
+        template_rendered.connect(self._template_rendered, app, weak=False)
+        before_render_template.connect(self._before_render, app, weak=False)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _before_render(self, sender, template, context, **extra):
+        if _spans() is not None:
+            g.setdefault('timing_render_starts', []).append(time.perf_counter())
+
+    def _template_rendered(self, sender, template, context, **extra):
+        starts = g.get('timing_render_starts') if has_request_context() else None
+        if starts:
+            add_span('render', time.perf_counter() - starts.pop())
+
+    def _start(self):
+        requestId = request.headers.get('X-Request-ID', '')
+        g.request_id = requestId if _REQUEST_ID_PATTERN.match(requestId) else uuid.uuid4().hex
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            g.timing_start = time.perf_counter()
+            g.timing_spans = {}
+
+    def _finish(self, response):
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        spans = g.get('timing_spans')
+        if spans is None:
+            return response
+        spans['total'] = [time.perf_counter() - g.timing_start, 1]
+
+        entries = []
+        for name, (seconds, count) in spans.items():
+            entry = f'{name};dur={seconds * 1000:.2f}'
+            if count > 1:
+                entry += f';desc="{count}x"'
+            entries.append(entry)
+        response.headers.add('Server-Timing', ', '.join(entries))
+
+        if self.log_enabled:
+            self.log(response, spans)
+        return response
+
+    def log(self, response, spans):
+        """
+        Write the structured log line for a timed request.
+
+        Args:
+            response: Response about to be sent
+            spans: Span name -> [seconds, count]
+        """
+        record = {
+            'request_id': g.request_id,
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'spans_ms': {name: round(seconds * 1000, 2) for name, (seconds, count) in spans.items()},
+        }
+        queries = g.get('sql_queries')
+        if queries is not None:
+            record['db_queries'] = queries.count
+            record['db_ms'] = round(queries.duration * 1000, 2)
+        logger.info(json.dumps(record, sort_keys=True))
+
+
+timing = RequestTiming()
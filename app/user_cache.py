@@ -0,0 +1,198 @@
+"""
+Per-process cache of logged-in user identities.
+
+Flask-Login calls the user loader on every request from a logged-in user,
+including each autosave and reorder request from the outcome editor. The
+loader only needs who the user is and what role they have, so this module
+keeps a small TTL cache of immutable identity snapshots keyed by user ID
+and answers most requests without touching the database.
+
+Invalidation:
+    Updating or deleting a User through the ORM drops its entry once the
+    transaction commits. Each worker process has its own cache, so a change
+    made in another process is picked up when the entry expires; the TTL
+    (USER_CACHE_TTL) bounds how long a stale role can be seen.
+
+Attributes:
+    user_cache: Shared UserCache instance used by the Flask-Login loader
+"""
+
+import threading
+
+from cachetools import TTLCache
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .metrics import CACHE_REQUESTS
+from .prefork import reset_after_fork
+
+# Session.info key holding IDs of users changed in the current transaction
+_DIRTY_KEY = 'user_cache_dirty'
+
+
+class CachedUser(UserMixin):
+    """
+    Read-only snapshot of a user's identity and role.
+
+    Stands in for the User model as Flask-Login's current_user. It has no
+    database session, so code needing the full row (relationships, password
+    hash) must load the User model explicitly.
+
+    Attributes:
+        id: User ID
+        username: Login name
+        userType: Role (UserType)
+    """
+
+    def __init__(self, id, username, userType):
+        self.id = id
+        self.username = username
+        self.userType = userType
+
+    @property
+    def role(self):
+        """
+        Property to access user's role.
+
+        Returns:
+            UserType enum value
+        """
+        return self.userType
+
+    @classmethod
+    def from_user(cls, user):
+        """
+        Take a snapshot of a User model instance.
+
+        Args:
+            user: User model instance
+
+        Returns:
+            CachedUser: Snapshot with the user's id, username and role
+        """
+        return cls(user.id, user.username, user.userType)
+
+    def __repr__(self):
+        return f"<CachedUser {self.id} {self.username!r}>"
+
+
+class UserCache:
+    """
+    Thread-safe TTL cache of CachedUser snapshots keyed by user ID.
+
+    Follows the Flask extension pattern: create the instance at import time
+    and bind it to an application with init_app().
+
+    Attributes:
+        ttl: Seconds an entry is served before being reloaded (0 disables)
+        maxsize: Maximum number of users cached per process
+    """
+
+    def __init__(self, ttl=60, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+        reset_after_fork(self)
+
+    def _after_fork_in_child(self):
+        # The entries are still valid; only the lock may be held by a
+        # thread that does not exist in the child
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Bind the cache to a Flask application.
+
+        Args:
+            app: Flask application; reads USER_CACHE_TTL and USER_CACHE_SIZE
+        """
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.maxsize = app.config.get('USER_CACHE_SIZE', self.maxsize)
+        with self.lock:
+            self._cache = TTLCache(maxsize=self.maxsize, ttl=self.ttl) if self.ttl > 0 else None
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id):
+        """
+        Get a user's identity, loading it from the database on a miss.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            CachedUser: Snapshot of the user, or None if no such user exists
+        """
+        if self._cache is not None:
+            with self.lock:
+                cached = self._cache.get(user_id)
+            if cached is not None:
+                CACHE_REQUESTS.inc('user_cache', 'hit')
+                return cached
+            CACHE_REQUESTS.inc('user_cache', 'miss')
+
+        from . import db
+        from .models import User
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+
+        snapshot = CachedUser.from_user(user)
+        if self._cache is not None:
+            with self.lock:
+                self._cache[user_id] = snapshot
+        return snapshot
+
+    def invalidate(self, user_id):
+        """
+        Drop one user's cached identity.
+
+        Args:
+            user_id: User ID
+        """
+        if self._cache is not None:
+            with self.lock:
+                self._cache.pop(user_id, None)
+
+    def clear(self):
+        """Drop every cached identity."""
+        if self._cache is not None:
+            with self.lock:
+                self._cache.clear()
+
+
+user_cache = UserCache()
+
+
+# ==================== INVALIDATION ====================
+
+def _mark_dirty(mapper, connection, target):
+    # Drop the entry now and again once the change commits, so a request
+    # that reloads the old row before the commit does not keep it cached
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_DIRTY_KEY, set()).add(target.id)
+
+
+def _invalidate_committed(session):
+    for user_id in session.info.pop(_DIRTY_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+def _discard_dirty(session, previous_transaction=None):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def register_user_events(user_model):
+    """
+    Invalidate cached identities when users are updated or deleted.
+
+    Args:
+        user_model: The User model class
+    """
+    event.listen(user_model, 'after_update', _mark_dirty)
+    event.listen(user_model, 'after_delete', _mark_dirty)
+    event.listen(Session, 'after_commit', _invalidate_committed)
+    event.listen(Session, 'after_soft_rollback', _discard_dirty)
@@ -0,0 +1,6 @@
+"""
+Microbenchmarks for the AI Learning Outcome Builder.
+
+Run with "python -m benchmarks" (see benchmarks/__main__.py). The timing
+and baseline code is in harness.py and the benchmarks in bench_hot_paths.py.
+"""
@@ -0,0 +1,104 @@
+"""
+Run the microbenchmarks.
+
+Usage (from the repository root):
+    python -m benchmarks                      Run everything and print timings
+    python -m benchmarks -k build_prompt      Only names containing a substring
+    python -m benchmarks --save before        Save the results as a baseline
+    python -m benchmarks --compare before     Compare with a saved baseline;
+                                              exit status 1 if a benchmark is
+                                              slower than --threshold (20%)
+    python -m benchmarks --quick              Fewer, shorter rounds (smoke test)
+    python -m benchmarks --list               List benchmark names
+
+Typical use for a deployment change:
+    python -m benchmarks --save before
+    ... apply the change ...
+    python -m benchmarks --compare before
+"""
+
+import argparse
+import os
+import sys
+
+from . import harness
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the microbenchmarks.')
+    parser.add_argument('-k', dest='filter', action='append', default=[],
+                        help='run benchmarks whose name contains this (repeatable)')
+    parser.add_argument('--save', metavar='NAME', help='save the results as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='compare with baseline NAME')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown of the median before failing (default 0.2 = 20%%)')
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='minimum seconds per round (default 0.05)')
+    parser.add_argument('--quick', action='store_true', help='3 rounds of at least 5 ms')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        int: Exit status, 1 if a compared benchmark regressed
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    # The app reads app/AIConfig.json relative to the working directory
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from . import bench_hot_paths  # noqa: F401  (registers the benchmarks)
+
+    names = [name for name in harness.REGISTRY
+             if not args.filter or any(f in name for f in args.filter)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        print('No benchmarks match.', file=sys.stderr)
+        return 2
+
+    if args.quick:
+        args.rounds, args.warmup, args.min_time = 3, 1, 0.005
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = harness.load_baseline(args.compare)
+        except FileNotFoundError:
+            print(f"No baseline named {args.compare!r} in {harness.BASELINE_DIR}.", file=sys.stderr)
+            return 2
+
+    results = harness.run(names, rounds=args.rounds, warmup=args.warmup, min_time=args.min_time)
+
+    if args.save:
+        print(f"\nSaved baseline {harness.save_baseline(args.save, results)}")
+
+    if baseline is not None:
+        if baseline['environment'] != harness.environment():
+            print(f"\nWarning: baseline was recorded on {baseline['environment']}, "
+                  "timings may not be comparable.")
+        rows = harness.compare(results, baseline['benchmarks'], args.threshold)
+        print(f"\nCompared with {args.compare} (median, threshold {args.threshold:.0%}):")
+        print(harness.format_comparison(rows))
+        regressed = [row[0] for row in rows if row[4]]
+        if regressed:
+            print(f"\n{len(regressed)} benchmark(s) regressed: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
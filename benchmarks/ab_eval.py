@@ -0,0 +1,462 @@
+"""
+A/B comparison of models and prompt variants for AI evaluation.
+
+Runs several (model, prompt variant) configurations side by side over the
+same sample of units and reports, per configuration:
+
+    calls           Evaluations sent (one per unit) and failed calls
+    latency         p50/p95/p99 of the model call, in ms
+    tokens          Mean prompt (input) and response (output) tokens per call
+    parsed          Share of outcomes that came back with a valid STATUS
+                    (parsed with AIRewriteTester.parse_ai_evaluation)
+    agreement       Share of outcomes given the same STATUS as the
+                    reference configuration, and Cohen's kappa (agreement
+                    corrected for chance), over outcomes both parsed
+
+so the cheapest and fastest configuration that keeps the verdicts of the
+reference can be picked with numbers rather than by feel.
+
+Prompt variants (PROMPT_VARIANTS) are prompt builders with the signature of
+app.ai_evaluate.build_prompt: "app" is the prompt the app sends, "test" the
+copy in tests/ai_testing_evaluate.py and "json" the structured output mode
+(build_json_prompt, answers checked with parse_json_evaluation; a response
+that fails the check counts as unparsed). Register another to try a change.
+
+Usage (from the repository root):
+    python -m benchmarks.ab_eval --csv "tests/AI Testing Files/Input_Files/Sample-Test-Data.csv" \\
+        --sample 0.2 --config gemma-3-27b-it:app --config gemma-3-12b-it:app --config gemma-3-4b-it:app
+    ... --reference gemma-3-27b-it:app       (default: the first --config)
+    ... --save runs/ab.json                  (per-outcome verdicts, for --reference-run)
+    ... --reference-run runs/ab.json:gemma-3-27b-it:app   (compare with a saved run)
+    ... --cassette runs/ab_cassette.jsonl --cassette-mode auto   (record once, rerun offline)
+    ... --fake                               (against benchmarks/fake_gemini.py, no API key)
+
+Without --csv, units come from the synthetic catalogue generator
+(app/synthetic.py) with --units and --seed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(ROOT, 'tests')
+
+STATUSES = ('GOOD', 'NEEDS_REVISION', 'COULD_IMPROVE')
+
+DEFAULT_CONFIGS = ['gemma-3-27b-it:app', 'gemma-3-12b-it:app', 'gemma-3-4b-it:app']
+
+
+def _import_paths():
+    for path in (ROOT, TESTS_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _build_app_prompt(*args):
+    from app.ai_evaluate import build_prompt
+    return build_prompt(*args)
+
+
+def _build_test_prompt(*args):
+    _import_paths()
+    from ai_testing_evaluate import build_prompt_test
+    return build_prompt_test(*args)
+
+
+def _build_json_prompt(*args):
+    from app.ai_evaluate import build_json_prompt
+    return build_json_prompt(*args)
+
+
+PROMPT_VARIANTS = {
+    'app': _build_app_prompt,
+    'test': _build_test_prompt,
+    'json': _build_json_prompt,
+}
+
+# Variants whose responses are JSON rather than free text
+JSON_VARIANTS = {'json'}
+
+
+def parse_config(spec):
+    """
+    Split a "MODEL[:VARIANT]" configuration.
+
+    Returns:
+        tuple: (model, variant), variant defaulting to "app"
+
+    Raises:
+        ValueError: For an unknown prompt variant
+    """
+    model, _, variant = spec.partition(':')
+    variant = variant or 'app'
+    if variant not in PROMPT_VARIANTS:
+        raise ValueError(f"Unknown prompt variant {variant!r} (known: {', '.join(PROMPT_VARIANTS)})")
+    return model, variant
+
+
+# ==================== UNITS ====================
+
+def load_units(csv_path=None, sample=1.0, units=50, seed=42):
+    """
+    The units every configuration evaluates.
+
+    Args:
+        csv_path: Units CSV in the AI tester format (code, title, level,
+                  Outcomes), or None for synthetic units
+        sample: Fraction of the CSV's units to use
+        units: Number of synthetic units
+        seed: Sampling / generation seed
+
+    Returns:
+        list: Dicts with code, name, level, creditpoints, outcomes (texts)
+    """
+    _import_paths()
+    if csv_path:
+        from ai_rewrite_tester import AIRewriteTester
+        import pandas as pd
+
+        df = pd.read_csv(csv_path)
+        df = df[df['Outcomes'].notna() & (df['Outcomes'] != '')]
+        df = df.sample(n=max(1, int(len(df) * sample)), random_state=seed)
+        parser = AIRewriteTester.__new__(AIRewriteTester)
+        result = []
+        for _, row in df.iterrows():
+            outcomes = [outcome['text'] for outcome in parser.parse_outcomes_from_csv(row['Outcomes'])]
+            if outcomes:
+                result.append({'code': row['code'], 'name': row['title'], 'level': int(row['level']),
+                               'creditpoints': int(row['creditpoints']) if 'creditpoints' in row else 6,
+                               'outcomes': outcomes})
+        return result
+
+    from app.synthetic import generate_units
+    return [
+        {'code': unit['unitcode'], 'name': unit['unitname'], 'level': unit['level'],
+         'creditpoints': unit['creditpoints'], 'outcomes': [text for text, _ in unit['outcomes']]}
+        for unit in generate_units(units, seed=seed)
+    ]
+
+
+# ==================== RUNNING ====================
+
+def evaluate_unit(client, model, variant, unit, config, limiter=None):
+    """
+    Evaluate one unit with one configuration.
+
+    Returns:
+        dict: code, latency (s), prompt_tokens, response_tokens, statuses
+              (one per outcome, None where no valid STATUS was parsed) and
+              error (message, or None)
+    """
+    from ai_rewrite_tester import AIRewriteTester
+    from app.ai_evaluate import EvaluationFormatError, generation_config, parse_json_evaluation
+
+    outputFormat = 'json' if variant in JSON_VARIANTS else 'text'
+    record = {'code': unit['code'], 'latency': None, 'prompt_tokens': None, 'response_tokens': None,
+              'statuses': [None] * len(unit['outcomes']), 'error': None}
+    prompt = PROMPT_VARIANTS[variant](unit['level'], unit['name'], unit['creditpoints'], unit['outcomes'], config)
+    if limiter is not None:
+        limiter.acquire()
+    start = time.perf_counter()
+    try:
+        resp = client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=generation_config(model, outputFormat)
+        )
+        text = getattr(resp, 'text', '') or ''
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"[:200]
+        return record
+    record['latency'] = time.perf_counter() - start
+
+    usage = getattr(resp, 'usage_metadata', None)
+    record['prompt_tokens'] = getattr(usage, 'prompt_token_count', None)
+    record['response_tokens'] = getattr(usage, 'candidates_token_count', None)
+
+    if outputFormat == 'json':
+        try:
+            evaluation = parse_json_evaluation(text, len(unit['outcomes']))
+        except EvaluationFormatError:
+            return record
+        record['statuses'] = [result['status'] for result in evaluation['outcomes']]
+        return record
+
+    parser = AIRewriteTester.__new__(AIRewriteTester)
+    for evaluation in parser.parse_ai_evaluation(text, unit['outcomes']):
+        index = evaluation['outcome_index']
+        if 0 <= index < len(unit['outcomes']) and evaluation['status'] in STATUSES:
+            record['statuses'][index] = evaluation['status']
+    return record
+
+
+def run_configs(client, configs, units, config, workers=4, rpm=None):
+    """
+    Evaluate the units with every configuration, configurations in parallel.
+
+    Args:
+        client: genai.Client (or cassette client)
+        configs: (model, variant) pairs
+        units: From load_units()
+        config: AI settings for the prompt
+        workers: Concurrent calls per configuration
+        rpm: Requests per minute per model (each model has its own quota)
+
+    Returns:
+        dict: "model:variant" -> list of records from evaluate_unit(), in unit order
+    """
+    _import_paths()
+    from ai_rewrite_tester import RateLimiter
+
+    limiters = {}
+    for model, _ in configs:
+        limiters.setdefault(model, RateLimiter(rpm))
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers) * len(configs))
+    try:
+        futures = {
+            f'{model}:{variant}': [
+                pool.submit(evaluate_unit, client, model, variant, unit, config, limiters[model])
+                for unit in units
+            ]
+            for model, variant in configs
+        }
+        return {name: [future.result() for future in items] for name, items in futures.items()}
+    finally:
+        pool.shutdown(wait=True)
+
+
+# ==================== ANALYSIS ====================
+
+def cohen_kappa(pairs):
+    """
+    Cohen's kappa for pairs of categorical verdicts.
+
+    Args:
+        pairs: (a, b) verdict pairs
+
+    Returns:
+        float: 1 for perfect agreement, 0 for chance level (None if no pairs)
+    """
+    if not pairs:
+        return None
+    total = len(pairs)
+    observed = sum(a == b for a, b in pairs) / total
+    labels = {label for pair in pairs for label in pair}
+    expected = sum(
+        (sum(a == label for a, _ in pairs) / total) * (sum(b == label for _, b in pairs) / total)
+        for label in labels
+    )
+    if expected == 1:
+        return 1.0
+    return (observed - expected) / (1 - expected)
+
+
+def summarize_config(records, reference=None):
+    """
+    Latency, token, parse and agreement statistics for one configuration.
+
+    Args:
+        records: From evaluate_unit(), one per unit
+        reference: The reference configuration's records (same units), or None
+
+    Returns:
+        dict: Report row
+    """
+    from .http_bench import percentile
+
+    ok = [record for record in records if record['error'] is None]
+    latencies = sorted(record['latency'] for record in ok)
+    outcomes = sum(len(record['statuses']) for record in records)
+    parsed = sum(status is not None for record in ok for status in record['statuses'])
+
+    def mean(values):
+        values = [value for value in values if value is not None]
+        return sum(values) / len(values) if values else None
+
+    row = {
+        'calls': len(records),
+        'errors': len(records) - len(ok),
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+        'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'prompt_tokens': mean(record['prompt_tokens'] for record in ok),
+        'response_tokens': mean(record['response_tokens'] for record in ok),
+        'parse_rate': parsed / outcomes if outcomes else None,
+        'agreement': None,
+        'kappa': None,
+        'compared': 0,
+    }
+
+    if reference is not None:
+        referenceByCode = {record['code']: record for record in reference}
+        pairs = []
+        for record in records:
+            other = referenceByCode.get(record['code'])
+            if other is None:
+                continue
+            pairs += [(a, b) for a, b in zip(record['statuses'], other['statuses'])
+                      if a is not None and b is not None]
+        row['compared'] = len(pairs)
+        if pairs:
+            row['agreement'] = sum(a == b for a, b in pairs) / len(pairs)
+            row['kappa'] = cohen_kappa(pairs)
+    return row
+
+
+def format_report(rows, reference_name):
+    """
+    Comparison table.
+
+    Args:
+        rows: (name, summarize_config() row) pairs
+        reference_name: Label of the reference configuration
+
+    Returns:
+        list: Lines of text
+    """
+    def number(value, spec, width):
+        return format(value, spec).rjust(width) if value is not None else '-'.rjust(width)
+
+    width = max([len(name) for name, _ in rows] + [13])
+    lines = [
+        f"{'configuration':<{width}}  calls err   p50 ms   p95 ms   p99 ms   in tok  out tok  parsed  agree  kappa",
+    ]
+    for name, row in rows:
+        lines.append(
+            f"{name:<{width}}  {row['calls']:>5} {row['errors']:>3} "
+            f"{number(row['p50_ms'], '.0f', 8)} {number(row['p95_ms'], '.0f', 8)} {number(row['p99_ms'], '.0f', 8)} "
+            f"{number(row['prompt_tokens'], '.0f', 8)} {number(row['response_tokens'], '.0f', 8)} "
+            f"{number(row['parse_rate'], '.1%', 7)} {number(row['agreement'], '.1%', 6)} "
+            f"{number(row['kappa'], '.2f', 6)}"
+        )
+    lines.append(f"Agreement is with {reference_name}, over outcomes both configurations parsed.")
+    return lines
+
+
+# ==================== COMMAND LINE ====================
+
+def make_client(args):
+    """GenAI client for the run: API, fake server or cassette."""
+    from google import genai
+    from google.genai import types
+    from app.llm_cassette import wrap_client
+
+    base_url = args.base_url
+    api_key = args.api_key or os.getenv('GOOGLE_API_KEY')
+    if api_key is None:
+        from app import config_manager
+        configured = config_manager.getCurrentParams().get('API_key')
+        api_key = configured if configured and configured != 'environ' else None
+
+    client = None
+    if api_key or base_url:
+        options = types.HttpOptions(base_url=base_url) if base_url else None
+        client = genai.Client(api_key=api_key or 'fake-key', http_options=options)
+    if args.cassette:
+        return wrap_client(client, args.cassette, mode=args.cassette_mode)
+    if client is None:
+        raise SystemExit("No API key: set GOOGLE_API_KEY, pass --api-key, or use --fake or --cassette")
+    return client
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ab_eval',
+                                     description='Compare models and prompt variants for AI evaluation.')
+    parser.add_argument('--config', action='append', default=[], metavar='MODEL[:VARIANT]',
+                        help=f"configuration to run (repeatable; default {' '.join(DEFAULT_CONFIGS)})")
+    parser.add_argument('--reference', default=None, metavar='MODEL[:VARIANT]',
+                        help='configuration the others are compared with (default: the first)')
+    parser.add_argument('--reference-run', default=None, metavar='FILE:MODEL[:VARIANT]',
+                        help='compare with a configuration from a run saved with --save instead')
+    parser.add_argument('--csv', default=None, help='units CSV (AI tester format); default synthetic units')
+    parser.add_argument('--sample', type=float, default=0.1, help='fraction of the CSV units (default 0.1)')
+    parser.add_argument('--units', type=int, default=50, help='synthetic units (without --csv)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=4, help='concurrent calls per configuration')
+    parser.add_argument('--rpm', type=float, default=30, help='requests per minute per model (0 = no limit)')
+    parser.add_argument('--api-key', default=None)
+    parser.add_argument('--base-url', default=None, help='API endpoint (e.g. a fake Gemini server)')
+    parser.add_argument('--fake', action='store_true', help='run a fake Gemini server for this run')
+    parser.add_argument('--cassette', default=None, help='record/replay model calls in this file')
+    parser.add_argument('--cassette-mode', default='auto', choices=('record', 'replay', 'auto'))
+    parser.add_argument('--save', default=None, help='write the per-outcome verdicts and report to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None, report=print):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+        report: Called with each output line
+
+    Returns:
+        dict: "model:variant" -> report row
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    os.chdir(ROOT)
+    _import_paths()
+    from app import config_manager
+
+    configs = [parse_config(spec) for spec in (args.config or DEFAULT_CONFIGS)]
+    names = [f'{model}:{variant}' for model, variant in configs]
+    referenceName = ':'.join(parse_config(args.reference)) if args.reference else names[0]
+
+    # Check the reference before spending a run of model calls
+    reference = None
+    if args.reference_run:
+        path, _, spec = args.reference_run.partition(':')
+        referenceName = ':'.join(parse_config(spec))
+        with open(path) as file:
+            saved = json.load(file)['results']
+        if referenceName not in saved:
+            raise SystemExit(f"Reference {referenceName} is not in {path}")
+        reference = saved[referenceName]
+        referenceName = f'{referenceName} ({os.path.basename(path)})'
+    elif referenceName not in names:
+        raise SystemExit(f"Reference {referenceName} is not one of the configurations")
+
+    fake = None
+    if args.fake:
+        from .fake_gemini import FakeGeminiServer
+        fake = FakeGeminiServer(latency='lognormal:0.2:0.3', seed=args.seed).start()
+        args.base_url = fake.url
+    try:
+        client = make_client(args)
+        units = load_units(args.csv, args.sample, args.units, args.seed)
+        report(f"{len(units)} units, {sum(len(unit['outcomes']) for unit in units)} outcomes, "
+               f"{len(configs)} configurations")
+        start = time.perf_counter()
+        results = run_configs(client, configs, units, config_manager.getCurrentParams(),
+                              workers=args.workers, rpm=args.rpm or None)
+        report(f"Finished in {time.perf_counter() - start:.1f}s")
+    finally:
+        if fake is not None:
+            fake.stop()
+
+    if reference is None:
+        reference = results[referenceName]
+
+    rows = [(name, summarize_config(results[name], reference)) for name in names]
+    for line in format_report(rows, referenceName):
+        report(line)
+
+    if args.save:
+        directory = os.path.dirname(args.save)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.save, 'w') as file:
+            json.dump({'reference': referenceName, 'units': [unit['code'] for unit in units],
+                       'report': dict(rows), 'results': results}, file, indent=1)
+        report(f"Saved to {args.save}")
+    return dict(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Microbenchmarks for the pure-Python hot paths.
+
+    build_prompt[n]             Prompt for an evaluation of n outcomes
+    getBloomsWordList[level]    Suggested verbs for the LO editor
+    createCSVofLOs[n]           CSV export of n units with 6 outcomes each
+                                (in-memory database, one query per unit)
+    parseOutcomeString[n]       Splitting an imported Outcomes cell of n outcomes
+    parse_ai_evaluation[n]      Parsing a model response for n outcomes
+                                (AIRewriteTester)
+    getCurrentParams_contended  8 threads x 1000 reads of the AI settings
+
+Each setup function builds its inputs once and returns the call to time.
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .harness import benchmark
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUTCOME = "Analyse the performance of sorting algorithms using asymptotic notation"
+
+BLOOMS = ['Analyse', 'Evaluate', 'Design', 'Explain', 'Apply', 'Describe']
+
+
+def outcomes(count):
+    """count distinct, realistic learning outcomes."""
+    return [f"{BLOOMS[i % len(BLOOMS)]} topic {i}: {OUTCOME[8:]}" for i in range(count)]
+
+
+@benchmark('build_prompt', params=[1, 10, 50, 200])
+def bench_build_prompt(count):
+    from app import config_manager
+    from app.ai_evaluate import build_prompt
+
+    config = config_manager.getCurrentParams()
+    items = outcomes(count)
+    return lambda: build_prompt(3, 'Algorithms and Data Structures', 12, items, config)
+
+
+@benchmark('getBloomsWordList', params=[1, 6])
+def bench_blooms_word_list(level):
+    from app.routes import getBloomsWordList
+    return lambda: getBloomsWordList(level)
+
+
+@benchmark('createCSVofLOs', params=[50, 500])
+def bench_create_csv(count):
+    os.environ['FLASK_CONFIG'] = 'testing'
+    from app import create_app, db
+    from app.models import Unit, LearningOutcome
+    from app.routes import createCSVofLOs
+
+    app = create_app()
+    context = app.app_context()
+    context.push()
+    for i in range(count):
+        unit = Unit(unitcode=f'BENCH{i:04d}', unitname=f'Benchmark unit {i}', level=2,
+                    creditpoints=6, description='Generated for benchmarking', creatorid=1)
+        db.session.add(unit)
+        db.session.flush()
+        for j, text in enumerate(outcomes(6)):
+            db.session.add(LearningOutcome(description=text, assessment='Exam', unit_id=unit.id))
+    db.session.commit()
+
+    def export():
+        # Drop loaded objects so every run queries the database again
+        db.session.expire_all()
+        return createCSVofLOs()
+
+    def teardown():
+        db.session.remove()
+        context.pop()
+
+    return export, teardown
+
+
+@benchmark('parseOutcomeString', params=[6, 60])
+def bench_parse_outcome_string(count):
+    from app.routes import parseOutcomeString
+    cell = ''.join(f"{text}|Exam {i}|*|" for i, text in enumerate(outcomes(count)))
+    return lambda: parseOutcomeString(cell)
+
+
+@benchmark('parse_ai_evaluation', params=[10, 100])
+def bench_parse_ai_evaluation(count):
+    testsDir = os.path.join(ROOT, 'tests')
+    if testsDir not in sys.path:
+        sys.path.insert(0, testsDir)
+    from ai_rewrite_tester import AIRewriteTester
+
+    items = outcomes(count)
+    statuses = ['GOOD', 'NEEDS_REVISION', 'COULD_IMPROVE']
+    lines = ['**LO Analysis**', '']
+    for i, text in enumerate(items):
+        status = statuses[i % 3]
+        line = f"'{text}' - STATUS:{status} - The outcome uses an appropriate verb for the level."
+        if status != 'GOOD':
+            line += f" SUGGESTION: 'Critically {text.lower()}'"
+        lines += [line, 'It is measurable and aligned with the unit content.', '']
+    lines += ['**SUMMARY**', '', 'The outcomes are broadly appropriate.']
+    response = '\n'.join(lines)
+
+    # Only the parser is timed; skip the constructor's API client setup
+    tester = AIRewriteTester.__new__(AIRewriteTester)
+    return lambda: tester.parse_ai_evaluation(response, items)
+
+
+@benchmark('getCurrentParams_contended')
+def bench_config_contention():
+    from app import config_manager
+
+    threads, calls = 8, 1000
+    pool = ThreadPoolExecutor(max_workers=threads)
+    start = threading.Barrier(threads)
+
+    def reader():
+        start.wait()
+        for _ in range(calls):
+            config_manager.getCurrentParams()
+
+    def contended():
+        for future in [pool.submit(reader) for _ in range(threads)]:
+            future.result()
+
+    return contended, pool.shutdown
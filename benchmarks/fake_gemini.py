@@ -0,0 +1,445 @@
+"""
+Local stand-in for the Gemini generateContent REST API.
+
+Answers POST /v1beta/models/<model>:generateContent (the call the GenAI
+SDK makes for client.models.generate_content) with a well-formed
+evaluation in the format build_prompt() asks for: one
+"'outcome' - STATUS:... - feedback" paragraph per outcome found in the
+prompt, then a summary, plus usageMetadata token counts. Prompts from
+build_json_prompt() (or requests with responseMimeType application/json)
+get the JSON evaluation instead. Point the app at it with GENAI_BASE_URL
+to load-test AI evaluation without quota or network.
+
+Explicit context caching works like the real API: POST /v1beta/cachedContents
+stores a system instruction for a Gemini model until its ttl runs out,
+generateContent accepts "cachedContent" (403 once it is gone) and reports
+the cached share as usageMetadata.cachedContentTokenCount, and DELETE
+removes a cache. Gemma models refuse both caches and system instructions,
+as on the real API.
+
+Behaviour options:
+    latency         Seconds before answering, drawn per request from
+                    "fixed:S", "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA"
+    error_rate      Share of requests answered with 500 INTERNAL
+    burst           "PERIOD:DURATION": for DURATION seconds out of every
+                    PERIOD, every request gets 429 RESOURCE_EXHAUSTED
+    rpm             Requests per minute allowed (sliding window); more get 429
+    seed            RNG seed for latencies, statuses and errors
+
+Usage:
+    python -m benchmarks.fake_gemini --port 8089 --latency lognormal:2:0.5 \\
+        --error-rate 0.01 --burst 60:5
+    GENAI_BASE_URL=http://127.0.0.1:8089 gunicorn -c gunicorn.conf.py webServer:app
+
+    GET /stats returns the request counts by outcome.
+
+In tests and the load driver use FakeGeminiServer directly:
+    with FakeGeminiServer(latency='fixed:0.05') as server:
+        app.config['GENAI_BASE_URL'] = server.url
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_PATH_PATTERN = re.compile(r'^/(v1beta|v1|v1alpha)/models/([^/:]+):generateContent$')
+
+_CACHE_PATTERN = re.compile(r'^/(v1beta|v1|v1alpha)/cachedContents(?:/([^/]+))?$')
+
+# "0: 'outcome'" lines of a JSON-format prompt
+_INDEXED_OUTCOME = re.compile(r"^\d+: '(.*)'$")
+
+STATUS_WEIGHTS = {'GOOD': 50, 'COULD_IMPROVE': 35, 'NEEDS_REVISION': 15}
+
+FEEDBACK = {
+    'GOOD': 'The verb suits the unit level and the outcome is measurable.',
+    'COULD_IMPROVE': 'The outcome is acceptable but could state the context more precisely.',
+    'NEEDS_REVISION': "The verb sits at the wrong Bloom's level for this unit.",
+}
+
+
+SUMMARY = '{count} learning outcomes were evaluated; most align with the expected level.'
+
+
+def parse_latency(spec):
+    """
+    Build a latency sampler from a spec string.
+
+    Args:
+        spec: "fixed:S", "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA"
+
+    Returns:
+        Function taking a random.Random and returning seconds
+
+    Raises:
+        ValueError: For an unknown or malformed spec
+    """
+    kind, *values = spec.split(':')
+    values = [float(value) for value in values]
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'lognormal' and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"bad latency spec {spec!r}: use fixed:S, uniform:MIN:MAX or lognormal:MEDIAN:SIGMA")
+
+
+def extract_outcomes(prompt):
+    """
+    Find the quoted outcomes in an evaluation prompt.
+
+    Args:
+        prompt: Text built by build_prompt() or build_json_prompt()
+
+    Returns:
+        list: Outcome texts without their quotes (or index)
+    """
+    marker = prompt.find('Learning Outcomes to evaluate')
+    end = prompt.find('**SUMMARY**', marker)
+    if marker < 0:
+        return []
+    block = prompt[prompt.find('\n', marker):end if end > 0 else None]
+    outcomes = []
+    for line in block.splitlines():
+        line = line.strip()
+        indexed = _INDEXED_OUTCOME.match(line)
+        if indexed:
+            outcomes.append(indexed.group(1))
+        elif len(line) > 1 and line[0] == "'" and line[-1] == "'" and line != "'(no outcomes provided)'":
+            outcomes.append(line[1:-1])
+    return outcomes
+
+
+def _verdicts(outcomes, rng):
+    # (status, feedback, suggestion or None) for each outcome
+    statuses = list(STATUS_WEIGHTS)
+    for outcome in outcomes:
+        status = rng.choices(statuses, list(STATUS_WEIGHTS.values()))[0]
+        suggestion = None
+        if status != 'GOOD':
+            words = outcome.split()
+            suggestion = f"{'Critically evaluate' if status == 'NEEDS_REVISION' else words[0]} {' '.join(words[1:])}"
+        yield status, FEEDBACK[status], suggestion
+
+
+def evaluation_text(outcomes, rng):
+    """
+    Build a response in the format the prompt asks for.
+
+    Args:
+        outcomes: Outcome texts
+        rng: random.Random for the statuses
+
+    Returns:
+        str: Response text
+    """
+    lines = ['**LO Analysis**', '']
+    for outcome, (status, feedback, suggestion) in zip(outcomes, _verdicts(outcomes, rng)):
+        line = f"'{outcome}' - STATUS:{status} - {feedback}"
+        if suggestion:
+            line += f" SUGGESTION: '{suggestion}'"
+        lines += [line, '']
+    lines += ['**SUMMARY**', '', SUMMARY.format(count=len(outcomes))]
+    return '\n'.join(lines)
+
+
+def evaluation_json(outcomes, rng):
+    """
+    Build a response in the JSON format build_json_prompt() asks for.
+
+    Args:
+        outcomes: Outcome texts
+        rng: random.Random for the statuses
+
+    Returns:
+        str: Response JSON
+    """
+    return json.dumps({
+        'outcomes': [
+            {'i': i, 'status': status, 'feedback': feedback, 'suggestion': suggestion or ''}
+            for i, (status, feedback, suggestion) in enumerate(_verdicts(outcomes, rng))
+        ],
+        'summary': SUMMARY.format(count=len(outcomes)),
+    })
+
+
+def _text(content):
+    # Text of a Content object ({"parts": [{"text": ...}]}) or None
+    return ''.join(part.get('text', '') for part in (content or {}).get('parts', []))
+
+
+def _timestamp(seconds_from_now=0.0):
+    moment = datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now)
+    return moment.isoformat().replace('+00:00', 'Z')
+
+
+def _token_count(text):
+    # Roughly four characters per token, like the real tokenizer on English
+    return max(1, len(text) // 4)
+
+
+class FakeGeminiServer:
+    """
+    Threaded fake Gemini server.
+
+    Attributes:
+        url: Base URL to use as GENAI_BASE_URL
+        stats: Request counts by outcome ('ok', 'error', 'rate_limited',
+               'bad_request', 'cache_miss'), plus 'cache_created'
+        caches: Cached contents by name: (model, text, expiry on the
+                monotonic clock)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency='fixed:0', error_rate=0.0,
+                 burst=None, rpm=None, seed=0):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.burst = tuple(float(value) for value in burst.split(':')) if burst else None
+        self.rpm = rpm
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.recent = deque()
+        self.stats = {'ok': 0, 'error': 0, 'rate_limited': 0, 'bad_request': 0,
+                      'cache_miss': 0, 'cache_created': 0}
+        self.caches = {}
+
+        self.httpd = _HTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.url = f'http://{host}:{self.httpd.server_address[1]}'
+        self._thread = None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == '/stats':
+                    with server.lock:
+                        self._send(200, dict(server.stats))
+                else:
+                    self._send(404, _error(404, 'NOT_FOUND', 'Unknown path'))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if _CACHE_PATTERN.match(self.path.split('?', 1)[0]):
+                    code, payload = server.create_cache(body)
+                else:
+                    code, payload = server.respond(self.path, body)
+                self._send(code, payload)
+
+            def do_DELETE(self):
+                match = _CACHE_PATTERN.match(self.path.split('?', 1)[0])
+                with server.lock:
+                    found = match and server.caches.pop(f'cachedContents/{match.group(2)}', None)
+                if found:
+                    self._send(200, {})
+                else:
+                    self._send(404, _error(404, 'NOT_FOUND', 'CachedContent not found'))
+
+            def _send(self, code, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _decide(self):
+        """Pick latency and outcome for a request (under the lock)."""
+        now = time.monotonic()
+        delay = max(0.0, self.latency(self.rng))
+        if self.burst:
+            period, duration = self.burst
+            if (now - self.started) % period < duration:
+                return delay, 'rate_limited'
+        if self.rpm:
+            while self.recent and now - self.recent[0] > 60:
+                self.recent.popleft()
+            if len(self.recent) >= self.rpm:
+                return delay, 'rate_limited'
+            self.recent.append(now)
+        if self.rng.random() < self.error_rate:
+            return delay, 'error'
+        return delay, 'ok'
+
+    def respond(self, path, body):
+        """
+        Answer one generateContent request.
+
+        Args:
+            path: Request path
+            body: Raw JSON request body
+
+        Returns:
+            tuple: (HTTP status, response JSON)
+        """
+        match = _PATH_PATTERN.match(path.split('?', 1)[0])
+        try:
+            request = json.loads(body or b'{}')
+            prompt = ''.join(_text(content) for content in request.get('contents', []))
+            system = _text(request.get('systemInstruction'))
+        except (ValueError, AttributeError):
+            match = None
+        if not match:
+            with self.lock:
+                self.stats['bad_request'] += 1
+            return 400, _error(400, 'INVALID_ARGUMENT', 'Expected a generateContent request')
+        model = match.group(2)
+        if system and not model.startswith('gemini'):
+            with self.lock:
+                self.stats['bad_request'] += 1
+            return 400, _error(400, 'INVALID_ARGUMENT', f'Developer instruction is not enabled for models/{model}')
+
+        cached = ''
+        if request.get('cachedContent'):
+            with self.lock:
+                entry = self.caches.get(request['cachedContent'])
+                if entry is None or entry[0] != model or entry[2] < time.monotonic():
+                    self.stats['cache_miss'] += 1
+                    return 403, _error(403, 'PERMISSION_DENIED', 'CachedContent not found (or permission denied)')
+            cached = entry[1]
+
+        with self.lock:
+            delay, outcome = self._decide()
+            rng = random.Random(self.rng.random())
+        time.sleep(delay)
+        with self.lock:
+            self.stats[outcome] += 1
+
+        if outcome == 'rate_limited':
+            return 429, _error(429, 'RESOURCE_EXHAUSTED', 'Resource has been exhausted (e.g. check quota).')
+        if outcome == 'error':
+            return 500, _error(500, 'INTERNAL', 'An internal error has occurred.')
+
+        outcomes = extract_outcomes(prompt)
+        wantsJson = (request.get('generationConfig') or {}).get('responseMimeType') == 'application/json'
+        if wantsJson or 'Respond with JSON only' in prompt:
+            text = evaluation_json(outcomes, rng)
+        else:
+            text = evaluation_text(outcomes, rng)
+        promptTokens, responseTokens = _token_count(cached + system + prompt), _token_count(text)
+        usage = {
+            'promptTokenCount': promptTokens,
+            'candidatesTokenCount': responseTokens,
+            'totalTokenCount': promptTokens + responseTokens,
+        }
+        if cached:
+            usage['cachedContentTokenCount'] = _token_count(cached)
+        return 200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+            }],
+            'usageMetadata': usage,
+            'modelVersion': model,
+        }
+
+    def create_cache(self, body):
+        """
+        Answer a cachedContents.create request.
+
+        Args:
+            body: Raw JSON request body
+
+        Returns:
+            tuple: (HTTP status, CachedContent JSON)
+        """
+        try:
+            request = json.loads(body or b'{}')
+            model = request['model'].rpartition('/')[2]
+            text = _text(request.get('systemInstruction')) + ''.join(
+                _text(content) for content in request.get('contents', []))
+            ttl = float(str(request.get('ttl', '3600s')).rstrip('s'))
+        except (ValueError, AttributeError, KeyError, TypeError):
+            with self.lock:
+                self.stats['bad_request'] += 1
+            return 400, _error(400, 'INVALID_ARGUMENT', 'Expected a cachedContents request')
+        if not model.startswith('gemini'):
+            return 400, _error(400, 'INVALID_ARGUMENT', f'models/{model} does not support cached content')
+
+        with self.lock:
+            self.stats['cache_created'] += 1
+            name = f"cachedContents/fake-{self.stats['cache_created']}"
+            self.caches[name] = (model, text, time.monotonic() + ttl)
+        return 200, {
+            'name': name,
+            'model': f'models/{model}',
+            'displayName': request.get('displayName', ''),
+            'createTime': _timestamp(),
+            'updateTime': _timestamp(),
+            'expireTime': _timestamp(ttl),
+            'usageMetadata': {'totalTokenCount': _token_count(text)},
+        }
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-gemini', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under load, which
+    # shows up as client-side connect retries of a second or more
+    request_queue_size = 128
+
+
+def _error(code, status, message):
+    return {'error': {'code': code, 'message': message, 'status': status}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.fake_gemini',
+                                     description='Fake Gemini generateContent server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', default='lognormal:2:0.5',
+                        help='fixed:S, uniform:MIN:MAX or lognormal:MEDIAN:SIGMA (default lognormal:2:0.5)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 500 responses')
+    parser.add_argument('--burst', default=None, metavar='PERIOD:DURATION',
+                        help='429 for DURATION seconds out of every PERIOD')
+    parser.add_argument('--rpm', type=int, default=None, help='requests per minute before 429')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeGeminiServer(args.host, args.port, args.latency, args.error_rate, args.burst, args.rpm, args.seed)
+    print(f"Fake Gemini listening on {server.url} (set GENAI_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""
+Timing, statistics and baseline comparison for the microbenchmarks.
+
+A benchmark is a setup function registered with @benchmark. It prepares
+its inputs and returns the callable to time (optionally with a teardown):
+
+    @benchmark('build_prompt', params=[1, 10, 50])
+    def bench_build_prompt(count):
+        outcomes = [...] * count
+        return lambda: build_prompt(2, 'Unit', 6, outcomes, config)
+
+Measurement (like timeit, with warmup):
+    1. Calibrate: double the loop count until one round of calls takes
+       at least min_time seconds.
+    2. Warm up: run warmup rounds that are not recorded (caches, lazy
+       imports, the specialising interpreter).
+    3. Run rounds, each timing loop calls with the garbage collector off,
+       and record the time per call.
+
+Results report min, median, mean, standard deviation and IQR per call.
+Comparisons use the median, which ignores the odd slow round.
+
+Baselines:
+    Saved as JSON (name -> stats, plus the Python version and machine) in
+    benchmarks/baselines/<name>.json. Timings are only comparable on the
+    same machine and Python, so save a baseline on the machine that will
+    run the comparison (e.g. before a deployment change) rather than
+    committing one from a laptop.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Registered benchmarks: name -> (setup function, parameter or None)
+REGISTRY = {}
+
+
+def benchmark(name, params=None):
+    """
+    Register a benchmark setup function.
+
+    Args:
+        name: Benchmark name
+        params: Values to run the benchmark with; each becomes its own
+                benchmark named "name[value]" and is passed to the setup
+
+    Returns:
+        Decorator for the setup function
+    """
+    def decorator(setup):
+        if params is None:
+            REGISTRY[name] = (setup, None)
+        else:
+            for value in params:
+                REGISTRY[f'{name}[{value}]'] = (setup, value)
+        return setup
+    return decorator
+
+
+def summarize(timings, loops):
+    """
+    Statistics of per-call timings.
+
+    Args:
+        timings: Seconds per call, one value per round
+        loops: Calls per round
+
+    Returns:
+        dict: min, median, mean, stdev, iqr (seconds per call), rounds, loops
+    """
+    ordered = sorted(timings)
+    quartiles = statistics.quantiles(ordered, n=4) if len(ordered) > 1 else [ordered[0]] * 3
+    return {
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'iqr': quartiles[2] - quartiles[0],
+        'rounds': len(ordered),
+        'loops': loops,
+    }
+
+
+def _time_loops(func, loops):
+    gcWasEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gcWasEnabled:
+            gc.enable()
+
+
+def measure(func, rounds=15, warmup=2, min_time=0.05):
+    """
+    Time a callable.
+
+    Args:
+        func: Callable taking no arguments
+        rounds: Recorded rounds
+        warmup: Unrecorded rounds run first
+        min_time: Minimum seconds per round (sets the loop count)
+
+    Returns:
+        dict: Statistics as returned by summarize()
+    """
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= min_time or loops >= 1 << 24:
+            break
+        # Jump close to the target instead of doubling from 1 every time
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+
+    for _ in range(warmup):
+        _time_loops(func, loops)
+    timings = [_time_loops(func, loops) / loops for _ in range(rounds)]
+    return summarize(timings, loops)
+
+
+def run(names, rounds=15, warmup=2, min_time=0.05, report=print):
+    """
+    Run registered benchmarks.
+
+    Args:
+        names: Benchmark names to run, in order
+        rounds, warmup, min_time: Passed to measure()
+        report: Called with one formatted line per finished benchmark
+
+    Returns:
+        dict: Benchmark name -> statistics
+    """
+    results = {}
+    for name in names:
+        setup, param = REGISTRY[name]
+        prepared = setup() if param is None else setup(param)
+        func, teardown = prepared if isinstance(prepared, tuple) else (prepared, None)
+        try:
+            results[name] = measure(func, rounds=rounds, warmup=warmup, min_time=min_time)
+        finally:
+            if teardown is not None:
+                teardown()
+        report(format_result(name, results[name]))
+    return results
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def format_result(name, stats):
+    """
+    One line of benchmark output.
+
+    Args:
+        name: Benchmark name
+        stats: Statistics from measure()
+
+    Returns:
+        str: Formatted line
+    """
+    return (
+        f"{name:<40} median {_format_seconds(stats['median']):>10}  "
+        f"min {_format_seconds(stats['min']):>10}  "
+        f"+/- {_format_seconds(stats['stdev']):>10}  "
+        f"IQR {_format_seconds(stats['iqr']):>10}  "
+        f"({stats['rounds']} x {stats['loops']} calls)"
+    )
+
+
+def environment():
+    """
+    Describe where the benchmarks ran.
+
+    Returns:
+        dict: Python version, implementation and machine
+    """
+    return {
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'machine': platform.machine(),
+        'node': platform.node(),
+    }
+
+
+def baseline_path(name):
+    """Path of a named baseline file."""
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save_baseline(name, results):
+    """
+    Save results as a named baseline.
+
+    Existing benchmarks missing from results are kept, so a filtered run
+    only replaces the benchmarks it ran.
+
+    Args:
+        name: Baseline name
+        results: Benchmark name -> statistics
+
+    Returns:
+        str: Path of the baseline file
+    """
+    path = baseline_path(name)
+    benchmarks = {}
+    if os.path.exists(path):
+        benchmarks = load_baseline(name)['benchmarks']
+    benchmarks.update(results)
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'environment': environment(), 'benchmarks': benchmarks}, file, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(name):
+    """
+    Load a named baseline.
+
+    Args:
+        name: Baseline name
+
+    Returns:
+        dict: 'environment' and 'benchmarks' (name -> statistics)
+
+    Raises:
+        FileNotFoundError: If no baseline of that name was saved
+    """
+    with open(baseline_path(name)) as file:
+        return json.load(file)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    A benchmark regresses when its median is more than threshold (a
+    fraction, e.g. 0.2 for 20%) slower than the baseline median.
+
+    Args:
+        results: Benchmark name -> statistics
+        baseline: Benchmark name -> statistics
+        threshold: Allowed slowdown as a fraction
+
+    Returns:
+        list: (name, baseline median, new median, ratio, regressed) for
+              benchmarks present in both
+    """
+    rows = []
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        ratio = stats['median'] / old['median'] if old['median'] else float('inf')
+        rows.append((name, old['median'], stats['median'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_comparison(rows):
+    """
+    Format a comparison table.
+
+    Args:
+        rows: Output of compare()
+
+    Returns:
+        str: One line per benchmark
+    """
+    lines = []
+    for name, old, new, ratio, regressed in rows:
+        change = (ratio - 1) * 100
+        flag = 'REGRESSED' if regressed else ('faster' if ratio < 1 else '')
+        lines.append(
+            f"{name:<40} {_format_seconds(old):>10} -> {_format_seconds(new):>10}  {change:+6.1f}%  {flag}"
+        )
+    return '\n'.join(lines)
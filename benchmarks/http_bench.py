@@ -0,0 +1,469 @@
+"""
+End-to-end HTTP benchmarks across catalogue sizes.
+
+Times whole requests (routing, SQL, templates, serialisation) for the
+routes whose cost grows with the catalogue, at several catalogue sizes,
+and reports latency percentiles, throughput and peak memory per route:
+
+    search_all      GET /search_unit (every unit)
+    search_name     GET /search_unit?query=<topic>&filter=name
+    search_code     GET /search_unit?query=<prefix>&filter=code
+    view            GET /view/<random unit>
+    export_all      GET /export_all_units (whole streamed CSV)
+    import_100      POST /import-units with 100 new units
+
+Usage (from the repository root):
+    python -m benchmarks.http_bench --sizes 1000,5000,20000
+    python -m benchmarks.http_bench --sizes 20000 --routes view,search_code --concurrency 8
+    python -m benchmarks.http_bench --url http://127.0.0.1:8000 --username admin \\
+        --password ... --pid <gunicorn worker pid>
+    ... --json results.json       (one row per size and route, for plotting)
+
+In-process mode (default) runs the app with the Flask test client on a
+temporary SQLite file that grows to each size in turn with the synthetic
+catalogue generator (app/synthetic.py), so results for the different
+sizes give the scaling curve. Peak RSS is this process's high-water mark
+while the route ran (reset per route where Linux allows it).
+
+Server mode (--url) measures a running server and its existing catalogue
+(fill it with "flask seed-synthetic" first); --pid reports that server
+process's peak RSS instead.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_USER = 'bench-admin'
+BENCH_PASSWORD = 'bench-password'
+
+
+# ==================== MEMORY ====================
+
+def reset_peak_rss(pid='self'):
+    """
+    Reset a process's peak RSS (VmHWM) so the next reading covers only
+    what happens from now on.
+
+    Args:
+        pid: Process id or 'self'
+
+    Returns:
+        bool: False if the kernel or permissions do not allow it
+    """
+    try:
+        with open(f'/proc/{pid}/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb(pid='self'):
+    """
+    Peak resident memory of a process in MB.
+
+    Args:
+        pid: Process id or 'self'
+
+    Returns:
+        float: VmHWM in MB, or None where /proc is not available
+    """
+    try:
+        with open(f'/proc/{pid}/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# ==================== STATISTICS ====================
+
+def percentile(ordered, fraction):
+    """
+    Percentile of sorted values with linear interpolation.
+
+    Args:
+        ordered: Sorted list of values
+        fraction: 0-1, e.g. 0.99 for p99
+
+    Returns:
+        float: Interpolated value
+    """
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies, wall_time, errors):
+    """
+    Latency and throughput statistics for one route.
+
+    Args:
+        latencies: Seconds per request
+        wall_time: Seconds from the first request to the last response
+        errors: Number of responses with an unexpected status
+
+    Returns:
+        dict: requests, errors, p50/p90/p99/max/mean (ms) and rps
+    """
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p90_ms': percentile(ordered, 0.90) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'rps': len(ordered) / wall_time if wall_time > 0 else 0.0,
+    }
+
+
+# ==================== CLIENTS ====================
+
+class TestClientTarget:
+    """
+    In-process target: the Flask test client on a temporary SQLite file.
+
+    Each thread gets its own logged-in test client.
+
+    Args:
+        db_path: SQLite file to use (created if missing)
+        **overrides: Config settings to change, e.g. GENAI_BASE_URL
+    """
+
+    def __init__(self, db_path, **overrides):
+        os.chdir(ROOT)
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        os.environ.pop('FLASK_CONFIG', None)
+
+        from app import create_app, db
+        from app.config import TestingConfig, SQLITE_TUNED_PRAGMAS
+
+        class BenchConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+            SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
+            # Benchmark the production code paths, not the debugging aids
+            TIMING_SAMPLE_RATE = 0.1
+            METRICS_DIR = None
+
+        for name, value in overrides.items():
+            setattr(BenchConfig, name, value)
+
+        self.app = create_app(BenchConfig)
+        self.db = db
+        self._local = threading.local()
+        with self.app.app_context():
+            self._ensure_admin()
+
+    def _ensure_admin(self):
+        from werkzeug.security import generate_password_hash
+        from app.models import User, UserType
+
+        if self.db.session.scalar(self.db.select(User).where(User.username == BENCH_USER)) is None:
+            self.db.session.add(User(
+                username=BENCH_USER,
+                password_hash=generate_password_hash(BENCH_PASSWORD),
+                userType=UserType.ADMIN
+            ))
+            self.db.session.commit()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+            client.post('/login_page', data={'username': BENCH_USER, 'password': BENCH_PASSWORD})
+        return client
+
+    def grow_to(self, size, seed, outcome_range):
+        """
+        Add synthetic units until the catalogue has size units.
+
+        Returns:
+            int: Units in the catalogue
+        """
+        from app.models import Unit
+        from app.synthetic import seed_synthetic
+
+        with self.app.app_context():
+            current = self.db.session.scalar(self.db.select(self.db.func.count(Unit.id)))
+            if size > current:
+                seed_synthetic(size - current, seed=seed + current, outcome_range=outcome_range)
+            return max(size, current)
+
+    def catalogue(self):
+        """Unit ids and codes currently in the database."""
+        from app.models import Unit
+        with self.app.app_context():
+            rows = self.db.session.execute(self.db.select(Unit.id, Unit.unitcode)).all()
+        return [row.id for row in rows], {row.unitcode for row in rows}
+
+    def fetch(self, method, path, files=None):
+        """
+        Send a request and read the whole body.
+
+        Returns:
+            tuple: (status code, body bytes)
+        """
+        kwargs = {}
+        if files:
+            kwargs['data'] = {name: (io.BytesIO(content), filename) for name, (filename, content) in files.items()}
+            kwargs['headers'] = {'X-Requested-With': 'XMLHttpRequest'}
+        response = self._client().open(path, method=method, **kwargs)
+        body = response.get_data()
+        response.close()
+        return response.status_code, body
+
+    def request(self, method, path, data=None, files=None):
+        """
+        Send a request and read the whole body.
+
+        Returns:
+            int: Status code
+        """
+        return self.fetch(method, path, files)[0]
+
+    def peak_pid(self):
+        return 'self'
+
+
+class ServerTarget:
+    """Running server target (server mode), one requests.Session per thread."""
+
+    def __init__(self, url, username, password, pid=None):
+        import requests
+        self.requests = requests
+        self.url = url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.pid = pid
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.requests.Session()
+            session.post(self.url + '/login_page', data={'username': self.username, 'password': self.password})
+        return session
+
+    def catalogue(self):
+        """Unit ids and codes, read from the full CSV export."""
+        import csv
+        text = self._session().get(self.url + '/export_all_units').text
+        rows = list(csv.reader(io.StringIO(text)))[1:]
+        return [int(row[0]) for row in rows if row], {row[1] for row in rows if row}
+
+    def fetch(self, method, path, files=None):
+        kwargs = {}
+        if files:
+            kwargs['files'] = {name: (filename, content) for name, (filename, content) in files.items()}
+            kwargs['headers'] = {'X-Requested-With': 'XMLHttpRequest'}
+        response = self._session().request(method, self.url + path, **kwargs)
+        return response.status_code, response.content
+
+    def request(self, method, path, data=None, files=None):
+        return self.fetch(method, path, files)[0]
+
+    def peak_pid(self):
+        return self.pid
+
+
+# ==================== ROUTES ====================
+
+def route_specs(unit_ids, codes, rng):
+    """
+    The benchmarked routes.
+
+    Args:
+        unit_ids: Existing unit ids (for /view)
+        codes: Existing unit codes (imports must not repeat them)
+        rng: Random generator for picking units and search terms
+
+    Returns:
+        dict: name -> (heavy, function returning (method, path, files))
+    """
+    from app.synthetic import DISCIPLINES, generate_units, units_to_csv
+
+    usedCodes = set(codes)
+    importLock = threading.Lock()
+    topics = [topic.split()[0] for topics in DISCIPLINES.values() for topic in topics]
+
+    def search_all():
+        return 'GET', '/search_unit', None
+
+    def search_name():
+        return 'GET', f'/search_unit?query={rng.choice(topics)}&filter=name', None
+
+    def search_code():
+        return 'GET', f'/search_unit?query={rng.choice(list(DISCIPLINES))}{rng.randint(1, 6)}&filter=code', None
+
+    def view():
+        return 'GET', f'/view/{rng.choice(unit_ids)}', None
+
+    def export_all():
+        return 'GET', '/export_all_units', None
+
+    def import_100():
+        with importLock:
+            units = generate_units(100, seed=rng.randrange(1 << 30), existing_codes=usedCodes)
+            usedCodes.update(unit['unitcode'] for unit in units)
+        return 'POST', '/import-units', {'import_file': ('units.csv', units_to_csv(units).encode())}
+
+    return {
+        'search_all': (False, search_all),
+        'search_name': (False, search_name),
+        'search_code': (False, search_code),
+        'view': (False, view),
+        'export_all': (True, export_all),
+        'import_100': (True, import_100),
+    }
+
+
+def bench_route(target, make_request, count, concurrency, warmup):
+    """
+    Time one route.
+
+    Args:
+        target: TestClientTarget or ServerTarget
+        make_request: Function returning (method, path, files)
+        count: Timed requests
+        concurrency: Requests in flight at once
+        warmup: Untimed requests sent first
+
+    Returns:
+        dict: Statistics from summarize() plus peak_rss_mb
+    """
+    def one():
+        method, path, files = make_request()
+        start = time.perf_counter()
+        status = target.request(method, path, files=files)
+        return time.perf_counter() - start, status
+
+    for _ in range(warmup):
+        one()
+
+    pid = target.peak_pid()
+    if pid is not None:
+        reset_peak_rss(pid)
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: one(), range(count)))
+    else:
+        results = [one() for _ in range(count)]
+    wallTime = time.perf_counter() - start
+
+    # Redirects count as errors: a benchmark of the login page is no use
+    errors = sum(1 for _, status in results if status != 200)
+    stats = summarize([latency for latency, _ in results], wallTime, errors)
+    stats['peak_rss_mb'] = peak_rss_mb(pid) if pid is not None else None
+    return stats
+
+
+def format_row(size, route, stats):
+    rss = f"{stats['peak_rss_mb']:.0f} MB" if stats['peak_rss_mb'] is not None else '-'
+    return (
+        f"{size:>7} {route:<12} {stats['requests']:>5} req  "
+        f"p50 {stats['p50_ms']:>9.1f}  p90 {stats['p90_ms']:>9.1f}  p99 {stats['p99_ms']:>9.1f} ms  "
+        f"{stats['rps']:>8.1f} req/s  peak {rss:>7}"
+        + (f"  {stats['errors']} errors" if stats['errors'] else '')
+    )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.http_bench',
+                                     description='End-to-end HTTP benchmarks across catalogue sizes.')
+    parser.add_argument('--sizes', default='1000,5000,20000',
+                        help='comma-separated catalogue sizes (in-process mode)')
+    parser.add_argument('--routes', default=None, help='comma-separated routes (default: all)')
+    parser.add_argument('--requests', type=int, default=50, help='timed requests per route')
+    parser.add_argument('--heavy-requests', type=int, default=5,
+                        help='timed requests for export_all and import_100')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed requests per route')
+    parser.add_argument('--concurrency', type=int, default=1, help='requests in flight at once')
+    parser.add_argument('--outcomes', default='8-12', metavar='MIN-MAX',
+                        help='outcomes per synthetic unit (default 8-12, ~10 per unit)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', default=None, help='SQLite file to use (default: a temporary file)')
+    parser.add_argument('--url', default=None, help='benchmark a running server instead')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--pid', type=int, default=None, help='server process to read peak RSS from')
+    parser.add_argument('--json', dest='json_path', default=None, help='write the results to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None, report=print):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+        report: Called with each output line
+
+    Returns:
+        list: One dict per size and route (also written to --json)
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    rng = random.Random(args.seed)
+    low, high = (int(part) for part in args.outcomes.split('-', 1))
+
+    if args.url:
+        target = ServerTarget(args.url, args.username, args.password or '', args.pid)
+        sizes = [None]
+    else:
+        dbPath = args.db or os.path.join(tempfile.mkdtemp(prefix='lo-http-bench-'), 'bench.db')
+        target = TestClientTarget(dbPath)
+        sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    rows = []
+    for size in sizes:
+        if size is not None:
+            start = time.perf_counter()
+            target.grow_to(size, args.seed, (low, high))
+            report(f"Catalogue of {size} units ready ({time.perf_counter() - start:.1f}s)")
+        unitIDs, codes = target.catalogue()
+        size = len(unitIDs)
+
+        specs = route_specs(unitIDs, codes, rng)
+        names = args.routes.split(',') if args.routes else list(specs)
+        for name in names:
+            heavy, makeRequest = specs[name]
+            count = args.heavy_requests if heavy else args.requests
+            stats = bench_route(target, makeRequest, count, args.concurrency,
+                                min(args.warmup, 1) if heavy else args.warmup)
+            row = dict(stats, size=size, route=name, concurrency=args.concurrency)
+            rows.append(row)
+            report(format_row(size, name, stats))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as file:
+            json.dump(rows, file, indent=2)
+        report(f"Wrote {len(rows)} results to {args.json_path}")
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Load test of AI evaluation against the fake Gemini server.
+
+N simultaneous unit coordinators each send POST /lo_api/evaluate/<unit>
+for random units, one after another, while the model is played by
+benchmarks/fake_gemini.py. Reports throughput, latency percentiles and
+how each evaluation ended:
+
+    ok              Evaluation text returned
+    busy            Turned away by the per-process limit (LLMLimiter)
+    rate_limited    The API answered 429; the user was asked to retry
+    upstream_error  The API failed (500 from the evaluate route)
+    http_error      Any other response (e.g. a redirect to the login page)
+
+Use it to choose gunicorn threads and LLM_MAX_CONCURRENCY/LLM_MAX_WAITING
+for a given model latency and quota, without network or API quota.
+
+Usage (from the repository root):
+    python -m benchmarks.llm_load --coordinators 40 --duration 30 \\
+        --latency lognormal:2:0.5 --max-concurrency 16 --max-waiting 4
+    python -m benchmarks.llm_load --coordinators 20 --requests 10 --burst 20:5 --rpm 300
+    ... --json results.json
+
+In-process mode (default) runs the app with the Flask test client on a
+temporary SQLite file with a synthetic catalogue, starts the fake server
+itself and points GENAI_BASE_URL at it; --max-concurrency, --max-waiting
+and --queue-timeout set the app's limiter.
+
+Server mode (--url) loads a running server, which must have been started
+with GENAI_BASE_URL pointing at a fake server. --fake-port starts that
+fake server here, with the latency/error options:
+    GENAI_BASE_URL=http://127.0.0.1:8089 gunicorn -c gunicorn.conf.py webServer:app
+    python -m benchmarks.llm_load --url http://127.0.0.1:8000 --password ... --fake-port 8089
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from .fake_gemini import FakeGeminiServer
+from .http_bench import ROOT, ServerTarget, TestClientTarget, percentile
+
+OUTCOMES = ('ok', 'busy', 'rate_limited', 'upstream_error', 'http_error')
+
+
+def classify(status, body):
+    """
+    Name how an evaluation request ended.
+
+    Args:
+        status: HTTP status code
+        body: Response body bytes
+
+    Returns:
+        str: One of OUTCOMES
+    """
+    if status == 500:
+        return 'upstream_error'
+    if status != 200:
+        return 'http_error'
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return 'http_error'
+    text = payload.get('html') or ''
+    if not payload.get('ok'):
+        return 'upstream_error'
+    if 'busy' in text and text.startswith('❌'):
+        return 'busy'
+    if 'rate limit' in text and text.startswith('❌'):
+        return 'rate_limited'
+    if text.startswith('❌'):
+        return 'upstream_error'
+    return 'ok'
+
+
+def run_load(target, unit_ids, coordinators, requests=None, duration=None, think=0.0, seed=0):
+    """
+    Send evaluations from simultaneous coordinators.
+
+    Args:
+        target: TestClientTarget or ServerTarget
+        unit_ids: Units to evaluate (picked at random)
+        coordinators: Coordinator threads sending at once
+        requests: Evaluations per coordinator (if duration is None)
+        duration: Seconds to keep sending
+        think: Seconds each coordinator pauses between evaluations
+        seed: RNG seed for the unit choice
+
+    Returns:
+        tuple: (list of (latency seconds, outcome), wall time seconds)
+    """
+    results = []
+    lock = threading.Lock()
+    start = threading.Barrier(coordinators + 1)
+
+    def coordinator(index):
+        rng = random.Random(seed * 1000 + index)
+        # Log in first: password hashing would otherwise be timed too
+        target.fetch('GET', '/dashboard')
+        start.wait()
+        deadline = time.perf_counter() + duration if duration else None
+        sent = 0
+        while (deadline is None and sent < requests) or (deadline is not None and time.perf_counter() < deadline):
+            began = time.perf_counter()
+            status, body = target.fetch('POST', f'/lo_api/evaluate/{rng.choice(unit_ids)}')
+            outcome = classify(status, body)
+            with lock:
+                results.append((time.perf_counter() - began, outcome))
+            sent += 1
+            if think:
+                time.sleep(think)
+
+    threads = [threading.Thread(target=coordinator, args=(i,), daemon=True) for i in range(coordinators)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - began
+
+
+def summarize_load(results, wall_time):
+    """
+    Throughput, latency percentiles and outcome counts.
+
+    Args:
+        results: (latency, outcome) pairs from run_load()
+        wall_time: Seconds the load ran
+
+    Returns:
+        dict: requests, per-outcome counts, rps, ok_rps and p50/p95/p99/max
+              (ms) for all requests and for successful evaluations
+    """
+    stats = {'requests': len(results), 'wall_s': wall_time}
+    stats.update({outcome: 0 for outcome in OUTCOMES})
+    for _, outcome in results:
+        stats[outcome] += 1
+    stats['rps'] = len(results) / wall_time if wall_time > 0 else 0.0
+    stats['ok_rps'] = stats['ok'] / wall_time if wall_time > 0 else 0.0
+
+    for prefix, latencies in (('all', [lat for lat, _ in results]),
+                              ('ok', [lat for lat, outcome in results if outcome == 'ok'])):
+        ordered = sorted(latencies)
+        for name, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99), ('max', 1.0)):
+            stats[f'{prefix}_{name}_ms'] = percentile(ordered, fraction) * 1000 if ordered else None
+    return stats
+
+
+def format_report(stats):
+    """Human-readable lines for summarize_load() output."""
+    def ms(value):
+        return f'{value:8.0f}' if value is not None else '       -'
+
+    lines = [
+        f"{stats['requests']} evaluations in {stats['wall_s']:.1f}s: "
+        f"{stats['rps']:.2f} req/s, {stats['ok_rps']:.2f} successful evaluations/s",
+        '           p50      p95      p99      max (ms)',
+    ]
+    for prefix in ('all', 'ok'):
+        lines.append(f"  {prefix:<5}" + ' '.join(ms(stats[f'{prefix}_{name}_ms']) for name in ('p50', 'p95', 'p99', 'max')))
+    lines.append('  ' + ', '.join(f"{outcome} {stats[outcome]}" for outcome in OUTCOMES))
+    return lines
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.llm_load',
+                                     description='Load test AI evaluation against a fake Gemini server.')
+    parser.add_argument('--coordinators', type=int, default=20, help='simultaneous coordinators')
+    parser.add_argument('--requests', type=int, default=5, help='evaluations per coordinator')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='send for this many seconds instead of a fixed number of requests')
+    parser.add_argument('--think', type=float, default=0.0, help='seconds between a coordinator\'s evaluations')
+    parser.add_argument('--units', type=int, default=200, help='synthetic units (in-process mode)')
+    parser.add_argument('--seed', type=int, default=1)
+    # Fake model behaviour
+    parser.add_argument('--latency', default='lognormal:2:0.5',
+                        help='fixed:S, uniform:MIN:MAX or lognormal:MEDIAN:SIGMA (default lognormal:2:0.5)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 500 responses from the model')
+    parser.add_argument('--burst', default=None, metavar='PERIOD:DURATION',
+                        help='model answers 429 for DURATION seconds out of every PERIOD')
+    parser.add_argument('--rpm', type=int, default=None, help='model requests per minute before 429')
+    # App limits (in-process mode)
+    parser.add_argument('--max-concurrency', type=int, default=None, help='LLM_MAX_CONCURRENCY')
+    parser.add_argument('--max-waiting', type=int, default=None, help='LLM_MAX_WAITING')
+    parser.add_argument('--queue-timeout', type=int, default=None, help='LLM_QUEUE_TIMEOUT')
+    # Server mode
+    parser.add_argument('--url', default=None, help='load a running server instead')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--fake-port', type=int, default=None,
+                        help='server mode: start the fake Gemini server on this port')
+    parser.add_argument('--json', dest='json_path', default=None, help='write the results to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None, report=print):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+        report: Called with each output line
+
+    Returns:
+        dict: Statistics from summarize_load() plus the fake server's counts
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    fake = None
+    if not args.url or args.fake_port:
+        fake = FakeGeminiServer(port=args.fake_port or 0, latency=args.latency, error_rate=args.error_rate,
+                                burst=args.burst, rpm=args.rpm, seed=args.seed).start()
+    try:
+        if args.url:
+            target = ServerTarget(args.url, args.username, args.password or '')
+            unitIDs, _ = target.catalogue()
+        else:
+            overrides = {'GENAI_BASE_URL': fake.url}
+            for name, value in (('LLM_MAX_CONCURRENCY', args.max_concurrency),
+                                ('LLM_MAX_WAITING', args.max_waiting),
+                                ('LLM_QUEUE_TIMEOUT', args.queue_timeout)):
+                if value is not None:
+                    overrides[name] = value
+            dbPath = os.path.join(tempfile.mkdtemp(prefix='lo-llm-load-'), 'bench.db')
+            target = TestClientTarget(dbPath, **overrides)
+            target.grow_to(args.units, args.seed, None)
+            unitIDs, _ = target.catalogue()
+            limiter = target.app.extensions['llm_limiter']
+            report(f"Limiter: {limiter.max_concurrency} concurrent, {limiter.max_waiting} waiting, "
+                   f"{limiter.queue_timeout}s queue timeout")
+
+        if not unitIDs:
+            report('No units to evaluate.')
+            return {}
+        report(f"{args.coordinators} coordinators, {len(unitIDs)} units, model latency {args.latency}")
+
+        results, wallTime = run_load(target, unitIDs, args.coordinators, requests=args.requests,
+                                     duration=args.duration, think=args.think, seed=args.seed)
+        stats = summarize_load(results, wallTime)
+        if fake is not None:
+            stats['model'] = dict(fake.stats)
+    finally:
+        if fake is not None:
+            fake.stop()
+
+    for line in format_report(stats):
+        report(line)
+    if 'model' in stats:
+        report('  model calls: ' + ', '.join(f'{name} {count}' for name, count in stats['model'].items()))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as file:
+            json.dump(dict(stats, coordinators=args.coordinators, latency=args.latency), file, indent=2)
+        report(f"Wrote results to {args.json_path}")
+    return stats
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Gunicorn configuration for the AI Learning Outcome Builder.
+
+Usage:
+    gunicorn -c gunicorn.conf.py webServer:app
+
+The application is preloaded: it is created once in the master process and
+the workers are forked from it (see app/prefork.py). Workers start almost
+instantly and share the master's memory copy-on-write. Set
+GUNICORN_PRELOAD=0 to load the app separately in every worker instead,
+e.g. to pick up code changes with a graceful reload (HUP), which preloaded
+masters cannot do.
+
+Workers are threaded (gthread). AI evaluations spend seconds waiting on
+the model while page and API requests need milliseconds of CPU, so each
+process runs many threads: up to LLM_MAX_CONCURRENCY of them wait on model
+calls, up to LLM_MAX_WAITING queue for a slot and the rest keep serving
+everything else (further evaluations are told to retry). Capacity for
+concurrent evaluations is workers x LLM_MAX_CONCURRENCY, e.g. 4 x 48 = 192
+with GUNICORN_THREADS=64, LLM_MAX_CONCURRENCY=48 and LLM_MAX_WAITING=8,
+without adding processes.
+
+Environment variables:
+    BIND: Address to listen on (default 0.0.0.0:8000)
+    WEB_CONCURRENCY: Number of worker processes (default CPUs + 1; CPU
+                     bound work is what needs more processes)
+    GUNICORN_THREADS: Threads per worker (default 24). Keep it above
+                      LLM_MAX_CONCURRENCY + LLM_MAX_WAITING (default
+                      16 + 4, see app/config.py)
+    GUNICORN_PRELOAD: 0 disables preloading
+    PRELOAD_HEAVY_IMPORTS: 0 leaves pandas and the GenAI SDK to be imported
+                           by each worker on first use instead of once in
+                           the master
+    METRICS_DIR: Directory where workers share their /metrics values
+                 (default: a new temporary directory per server start)
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# Few processes for CPU, many threads for requests waiting on the model
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 24))
+
+# Evaluations can take up to a minute; let them finish on restarts
+graceful_timeout = 90
+keepalive = 5
+
+# Every worker serves /metrics with the totals of all workers (app/metrics.py).
+# A directory is only made when none is configured, so nothing is left behind
+if not os.environ.get('METRICS_DIR'):
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='lo-builder-metrics-')
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+preload_heavy_imports = os.environ.get('PRELOAD_HEAVY_IMPORTS', '1') != '0'
+
+
+def when_ready(server):
+    """Load shared data in the master once the app is preloaded."""
+    if not server.cfg.preload_app:
+        return
+    from app.prefork import warm_up
+    loaded = warm_up(server.app.wsgi(), import_heavy=preload_heavy_imports)
+    server.log.info("Preloaded %(templates)d templates (heavy imports: %(heavy_imports)s)", loaded)
+
+
+def post_fork(server, worker):
+    """Drop the database pools inherited from the master."""
+    if not server.cfg.preload_app:
+        return
+    from app.prefork import after_fork
+    after_fork(server.app.wsgi())
@@ -0,0 +1,26 @@
+"""add learning outcome version
+
+Revision ID: 4b7e2c91a0d3
+Revises: dc873e90dcd1
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c91a0d3'
+down_revision = 'dc873e90dcd1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,89 @@
+"""replace learning outcome position with fractional order key
+
+Revision ID: 8e3d5f17c2a4
+Revises: 4b7e2c91a0d3
+Create Date: 2026-10-19 11:02:17.554930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.ordering import spread_keys, ORDER_KEY_LENGTH
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3d5f17c2a4'
+down_revision = '4b7e2c91a0d3'
+branch_labels = None
+depends_on = None
+
+
+learning_outcomes = sa.table(
+    'learning_outcomes',
+    sa.column('id', sa.Integer),
+    sa.column('unit_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('order_key', sa.String),
+)
+
+
+def _key_type():
+    # Order keys are compared byte-wise; PostgreSQL needs the "C" collation
+    return sa.String(ORDER_KEY_LENGTH).with_variant(
+        sa.String(ORDER_KEY_LENGTH, collation='C'), 'postgresql'
+    )
+
+
+def _grouped_by_unit(order_column):
+    # Yield the outcome ids of each unit in display order
+    rows = op.get_bind().execute(
+        sa.select(learning_outcomes.c.id, learning_outcomes.c.unit_id)
+        .order_by(learning_outcomes.c.unit_id, order_column, learning_outcomes.c.id)
+    ).all()
+    unitID, ids = None, []
+    for loID, rowUnitID in rows:
+        if rowUnitID != unitID and ids:
+            yield ids
+            ids = []
+        unitID = rowUnitID
+        ids.append(loID)
+    if ids:
+        yield ids
+
+
+def upgrade():
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('order_key', _key_type(), nullable=True))
+
+    # Backfill evenly spaced keys in the existing position order
+    bind = op.get_bind()
+    for ids in _grouped_by_unit(learning_outcomes.c.position):
+        for loID, key in zip(ids, spread_keys(len(ids))):
+            bind.execute(
+                learning_outcomes.update()
+                .where(learning_outcomes.c.id == loID)
+                .values(order_key=key)
+            )
+
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.alter_column('order_key', existing_type=_key_type(), nullable=False)
+        batch_op.drop_column('position')
+
+
+def downgrade():
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('position', sa.Integer(), nullable=True))
+
+    # Restore 1-based positions in the current key order
+    bind = op.get_bind()
+    for ids in _grouped_by_unit(learning_outcomes.c.order_key):
+        for position, loID in enumerate(ids, start=1):
+            bind.execute(
+                learning_outcomes.update()
+                .where(learning_outcomes.c.id == loID)
+                .values(position=position)
+            )
+
+    with op.batch_alter_table('learning_outcomes', schema=None) as batch_op:
+        batch_op.alter_column('position', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('order_key')
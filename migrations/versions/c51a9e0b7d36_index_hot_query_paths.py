@@ -0,0 +1,35 @@
+"""index hot query paths
+
+Revision ID: c51a9e0b7d36
+Revises: 8e3d5f17c2a4
+Create Date: 2026-10-19 13:40:05.218377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c51a9e0b7d36'
+down_revision = '8e3d5f17c2a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Outcome lists are always loaded by unit in order key order
+    op.create_index(
+        'ix_learning_outcomes_unit_id_order_key',
+        'learning_outcomes',
+        ['unit_id', 'order_key']
+    )
+    # Units are filtered by owner for dashboards and exports
+    op.create_index('ix_unit_creatorid', 'unit', ['creatorid'])
+    # Case-insensitive unit code checks and prefix searches
+    op.create_index('ix_unit_unitcode_lower', 'unit', [sa.text('lower(unitcode)')])
+
+
+def downgrade():
+    op.drop_index('ix_unit_unitcode_lower', table_name='unit')
+    op.drop_index('ix_unit_creatorid', table_name='unit')
+    op.drop_index('ix_learning_outcomes_unit_id_order_key', table_name='learning_outcomes')
@@ -0,0 +1,45 @@
+"""add unit revision stamp for http caching
+
+Revision ID: e2f4a8c6b913
+Revises: c51a9e0b7d36
+Create Date: 2026-10-19 15:21:48.630152
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f4a8c6b913'
+down_revision = 'c51a9e0b7d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('unit', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    # SQLite rebuilds the table to drop columns. Dropping the old table with
+    # foreign keys enforced would cascade-delete every learning outcome, and
+    # the pragma cannot change inside a transaction, so refuse rather than
+    # lose data. env.py already runs migrations with foreign keys off and
+    # turns them back on once the migration transaction has ended
+    bind = op.get_bind()
+    foreign_keys = bind.dialect.name == 'sqlite' and bind.exec_driver_sql('PRAGMA foreign_keys').scalar()
+    if foreign_keys:
+        bind.exec_driver_sql('PRAGMA foreign_keys=OFF')
+        if bind.exec_driver_sql('PRAGMA foreign_keys').scalar():
+            raise RuntimeError("Cannot turn off SQLite foreign keys inside a transaction; "
+                               "rebuilding the unit table would delete its learning outcomes")
+
+    # SQLite cannot reflect expression indexes, so the rebuild would lose
+    # this one silently
+    op.drop_index('ix_unit_unitcode_lower', table_name='unit')
+    with op.batch_alter_table('unit', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('revision')
+    op.create_index('ix_unit_unitcode_lower', 'unit', [sa.text('lower(unitcode)')])
@@ -7,15 +7,46 @@ from typing import Optional, Tuple, Dict, List
 import google.genai as genai
 from google.genai import types
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from ai_testing_evaluate import build_prompt_test, run_eval_test
+from ai_testing_evaluate import build_prompt_test, run_eval_test, make_test_client
 from app.ai_handler import ConfigManager
+from app.ai_evaluate import build_json_prompt, generation_config, parse_json_evaluation
+
+class RateLimiter:
+    """
+    Spaces API calls evenly across all worker threads.
+
+    Each acquire() books the next free slot, one every 60 / requests_per_minute
+    seconds, and sleeps until it comes round, so N workers together never
+    exceed the limit (the Gemma API allows 30 requests per minute).
+    """
+
+    def __init__(self, requests_per_minute: Optional[float]):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def acquire(self):
+        """Wait for this caller's slot (returns at once without a limit)."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class AIRewriteTester:
-    def __init__(self, csv_path: str, api_key: str = None, config_path: str = 'app/AIConfig.json'):
+    def __init__(self, csv_path: str, api_key: str = None, config_path: str = 'app/AIConfig.json',
+                 cassette_path: str = None, cassette_mode: str = None, replay_latency: bool = None,
+                 output_format: str = 'text'):
         """
         Initialize the AI Rewrite Tester
         
@@ -23,8 +54,16 @@ class AIRewriteTester:
             csv_path: Path to the Units Outcomes CSV file
             api_key: Google API key (if None, uses environment variable)
             config_path: Path to AI configuration JSON
+            cassette_path: Record/replay model calls in this file (if None,
+                           uses the LLM_CASSETTE environment variable)
+            cassette_mode: 'record', 'replay' or 'auto' (default: the
+                           LLM_CASSETTE_MODE environment variable, or 'replay')
+            replay_latency: Replay with the recorded latencies
+            output_format: 'text' (free-text prompt) or 'json' (structured
+                           output, see app.ai_evaluate.build_json_prompt)
         """
         self.csv_path = csv_path
+        self.output_format = output_format
         self.config_manager = ConfigManager(config_path)
         self.config = self.config_manager.getCurrentParams()
         
@@ -36,17 +75,28 @@ class AIRewriteTester:
         else:
             self.api_key = self.config["API_key"]
             
-        if not self.api_key:
+        cassette_path = cassette_path or os.getenv("LLM_CASSETTE")
+        cassette_mode = cassette_mode or os.getenv("LLM_CASSETTE_MODE", "replay")
+        self.replaying = bool(cassette_path) and cassette_mode == 'replay'
+
+        if not self.api_key and not self.replaying:
             raise ValueError("No API key found. Set GOOGLE_API_KEY environment variable or provide api_key parameter")
         
-        # Configure genai client
-        self.client = genai.Client(api_key=self.api_key)
+        # Configure genai client (record/replay through a cassette if one is set)
+        self.client = make_test_client(self.api_key, cassette_path, cassette_mode, replay_latency)
         self.model_name = self.config["selected_model"]
         
-        # Rate limiting parameters
-        self.delay_between_requests = 2  # seconds
+        # Rate limiting parameters, shared by all worker threads
+        self.requests_per_minute = 30
+        self.max_workers = 4
         self.max_retries = 3
         self.retry_delay = 60  # seconds to wait if rate limited
+
+        # Replayed runs never reach the API, so there is no rate limit to respect
+        if self.replaying:
+            self.requests_per_minute = None
+            self.retry_delay = 0
+        self.rate_limiter = RateLimiter(self.requests_per_minute)
         
     def parse_outcomes_from_csv(self, outcomes_str: str) -> List[Dict]:
         """
@@ -222,6 +272,32 @@ class AIRewriteTester:
         
         return evaluations
     
+    def parse_json_response(self, response_text: str, original_outcomes: List[str]) -> List[Dict]:
+        """
+        Parse a JSON-format evaluation into the shape parse_ai_evaluation returns
+        
+        Args:
+            response_text: AI response JSON
+            original_outcomes: List of original outcome texts (prompt order)
+            
+        Returns:
+            List of parsed evaluations
+            
+        Raises:
+            EvaluationFormatError: If the response fails the schema check
+        """
+        evaluation = parse_json_evaluation(response_text, len(original_outcomes))
+        return [
+            {
+                'outcome_index': idx,
+                'quoted_text': original_outcomes[idx],
+                'status': result['status'],
+                'feedback': result['feedback'],
+                'suggestion': result['suggestion']
+            }
+            for idx, result in enumerate(evaluation['outcomes'])
+        ]
+    
     def evaluate_unit_outcomes(self, unit_code: str, unit_name: str, level: int, 
                                outcomes_list: List[Dict], credit_points: int = 6) -> List[Dict]:
         """
@@ -245,13 +321,17 @@ class AIRewriteTester:
         for attempt in range(self.max_retries):
             try:
                 # Build prompt using existing function with ALL outcomes
-                prompt = build_prompt_test(level, unit_name, credit_points, outcome_texts, self.config)
+                if self.output_format == 'json':
+                    prompt = build_json_prompt(level, unit_name, credit_points, outcome_texts, self.config)
+                else:
+                    prompt = build_prompt_test(level, unit_name, credit_points, outcome_texts, self.config)
                 
                 # Generate response
+                self.rate_limiter.acquire()
                 resp = self.client.models.generate_content(
                     model=self.model_name,
                     contents=prompt,
-                    config=types.GenerateContentConfig(temperature=0.0)
+                    config=generation_config(self.model_name, self.output_format)
                 )
                 
                 response_text = getattr(resp, "text", "")
@@ -261,7 +341,11 @@ class AIRewriteTester:
                     return [{'status': 'ERROR', 'suggestion': None} for _ in outcomes_list]
                 
                 # Parse response for all outcomes
-                evaluations = self.parse_ai_evaluation(response_text, outcome_texts)
+                if self.output_format == 'json':
+                    # A malformed response raises and is retried like a failed call
+                    evaluations = self.parse_json_response(response_text, outcome_texts)
+                else:
+                    evaluations = self.parse_ai_evaluation(response_text, outcome_texts)
                 
                 # Map evaluations back to outcomes
                 results = []
@@ -341,6 +425,7 @@ COMPARISONS:
         
         for attempt in range(self.max_retries):
             try:
+                self.rate_limiter.acquire()
                 resp = self.client.models.generate_content(
                     model=self.model_name,
                     contents=comparison_prompt,
@@ -402,9 +487,6 @@ COMPARISONS:
             outcomes_list=outcomes_list
         )
         
-        # Rate limiting delay
-        time.sleep(self.delay_between_requests)
-        
         # Collect outcomes that need comparison
         comparisons_needed = []
         comparison_indices = []
@@ -426,9 +508,6 @@ COMPARISONS:
                 unit_name=row['title'],
                 level=int(row['level'])
             )
-            
-            # Rate limiting delay
-            time.sleep(self.delay_between_requests)
         
         # Build final results
         results = []
@@ -466,19 +545,62 @@ COMPARISONS:
         
         return results
     
+    @staticmethod
+    def checkpoint_path_for(output_path: str = None) -> str:
+        """Checkpoint file kept next to the results CSV."""
+        if not output_path:
+            return 'results_checkpoint.jsonl'
+        return os.path.splitext(output_path)[0] + '_checkpoint.jsonl'
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path: str) -> Dict[str, List[Dict]]:
+        """
+        Read the units completed in an earlier run
+        
+        Args:
+            checkpoint_path: JSONL checkpoint (one line per completed unit)
+            
+        Returns:
+            Dict of unit code -> result rows (empty if there is no checkpoint)
+        """
+        completed = {}
+        if not os.path.exists(checkpoint_path):
+            return completed
+        with open(checkpoint_path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Last line cut short by a crash; that unit is redone
+                    continue
+                completed[entry['unitcode']] = entry['results']
+        return completed
+
     def run_test(self, output_path: str = None, sample_size: float = 0.2, 
-                 save_incremental: bool = True) -> pd.DataFrame:
+                 save_incremental: bool = True, resume: bool = False,
+                 max_workers: int = None) -> pd.DataFrame:
         """
         Run the complete test
         
+        Units are processed concurrently on max_workers threads, with all API
+        calls going through the shared rate limiter. Each finished unit is
+        appended to a JSONL checkpoint next to the output file and fsynced,
+        so a crash loses at most the units in progress.
+        
         Args:
             output_path: Path to save results CSV
             sample_size: Fraction of units to sample
-            save_incremental: Save progress incrementally
+            save_incremental: Write the per-unit checkpoint
+            resume: Skip units already in the checkpoint of an earlier run
+                    with the same output_path and sample
+            max_workers: Units processed at once (default self.max_workers)
             
         Returns:
             DataFrame with results (one row per outcome)
         """
+        max_workers = max_workers or self.max_workers
+        self.rate_limiter = RateLimiter(self.requests_per_minute)
+
         print("=" * 80)
         print("AI REWRITE QUALITY TESTING (Batch Mode)")
         print("=" * 80)
@@ -486,53 +608,76 @@ COMPARISONS:
         
         # Load and sample units
         df_units = self.load_and_sample_units(sample_size)
-        
-        # Calculate estimates
         total_units = len(df_units)
-        estimated_api_calls = total_units * 2  # One for evaluation, one for comparison per unit
-        estimated_time = estimated_api_calls * (self.delay_between_requests + 3)
+
+        # Units finished by an earlier run
+        checkpoint_path = self.checkpoint_path_for(output_path)
+        completed = self.load_checkpoint(checkpoint_path) if resume else {}
+        if save_incremental and not resume and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        pending = [row for _, row in df_units.iterrows() if row['code'] not in completed]
+        if completed:
+            print(f"Resuming: {total_units - len(pending)} units already done in {checkpoint_path}")
         
+        # Calculate estimates
+        estimated_api_calls = len(pending) * 2  # One for evaluation, one for comparison per unit
         print(f"\nEstimated API calls: {estimated_api_calls} (2 per unit)")
-        print(f"Estimated processing time: {estimated_time/60:.1f} minutes")
+        if self.requests_per_minute:
+            print(f"Rate limit: {self.requests_per_minute} requests/minute "
+                  f"(at least {estimated_api_calls / self.requests_per_minute:.1f} minutes)")
+        print(f"Workers: {max_workers}")
         print("-" * 80)
         
-        # Process each unit
-        all_results = []
+        # Process the units concurrently; results are collected per unit
+        results_by_unit = dict(completed)
+        checkpoint_lock = threading.Lock()
+        checkpoint_file = open(checkpoint_path, 'a', encoding='utf-8') if save_incremental else None
         units_processed = 0
-        
-        for idx, (_, unit_row) in enumerate(df_units.iterrows(), 1):
-            try:
-                # Process all outcomes for this unit
-                unit_results = self.process_unit(unit_row)
-                all_results.extend(unit_results)
+        run_start = time.monotonic()
+
+        def record(unit_code, unit_results):
+            # One JSON line per unit, on disk before the unit counts as done
+            results_by_unit[unit_code] = unit_results
+            if checkpoint_file:
+                line = json.dumps({'unitcode': unit_code, 'results': unit_results}, default=str)
+                with checkpoint_lock:
+                    checkpoint_file.write(line + '\n')
+                    checkpoint_file.flush()
+                    os.fsync(checkpoint_file.fileno())
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {pool.submit(self.process_unit, row): row for row in pending}
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    unit_results = future.result()
+                except Exception as e:
+                    print(f"  Error processing unit {row['code']}: {str(e)}")
+                    continue
+                record(row['code'], unit_results)
                 units_processed += 1
                 
-                # Progress update
-                print(f"  Completed unit {idx}/{total_units}: {len(unit_results)} outcomes processed")
-                
-                # Save incremental results
-                if save_incremental and idx % 5 == 0:
-                    temp_df = pd.DataFrame(all_results)
-                    temp_path = output_path.replace('.csv', '_temp.csv') if output_path else 'temp_results.csv'
-                    temp_df.to_csv(temp_path, index=False)
-                    print(f"  ✓ Saved incremental results ({len(all_results)} outcomes) to {temp_path}")
-                
-                # ETA update
-                if idx % 10 == 0:
-                    elapsed_per_unit = sum(r['processing_time'] for r in all_results) / len(all_results) * \
-                                      (len(all_results) / units_processed)
-                    remaining_units = total_units - idx
-                    eta = remaining_units * elapsed_per_unit
-                    print(f"\n>>> Progress: {idx}/{total_units} units ({idx/total_units*100:.1f}%)")
-                    print(f">>> Total outcomes processed: {len(all_results)}")
-                    print(f">>> ETA: {eta/60:.1f} minutes remaining\n")
-                    
-            except KeyboardInterrupt:
-                print("\n\nTesting interrupted by user")
-                break
-            except Exception as e:
-                print(f"  Error processing unit {unit_row['code']}: {str(e)}")
-                continue
+                # Progress and ETA from the actual completion rate of this run
+                done = len(results_by_unit)
+                elapsed = time.monotonic() - run_start
+                eta = (len(pending) - units_processed) * elapsed / units_processed
+                print(f"  Completed unit {done}/{total_units} ({row['code']}): "
+                      f"{len(unit_results)} outcomes, ETA {eta/60:.1f} minutes")
+        except KeyboardInterrupt:
+            print("\n\nTesting interrupted by user")
+            if save_incremental:
+                print(f"Finished units are saved in {checkpoint_path}; run again with resume=True (--resume)")
+            pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            pool.shutdown(wait=True)
+            if checkpoint_file:
+                checkpoint_file.close()
+
+        # Results in sample order, whatever order the units finished in
+        all_results = []
+        for code in df_units['code']:
+            all_results.extend(results_by_unit.get(code, []))
         
         # Create final DataFrame
         df_results = pd.DataFrame(all_results)
@@ -550,7 +695,7 @@ COMPARISONS:
         print("\n" + "=" * 80)
         print("TESTING COMPLETE")
         print("=" * 80)
-        print(f"Units processed: {units_processed}")
+        print(f"Units processed: {units_processed}" + (f" (+{len(completed)} resumed)" if completed else ""))
         print(f"Total outcomes evaluated: {len(df_results)}")
         print(f"API calls made: ~{units_processed * 2}")
         
@@ -571,42 +716,64 @@ COMPARISONS:
             df_results.to_csv(output_path, index=False)
             print(f"\n📁 Results saved to: {output_path}")
             
-            # Clean up temp file
-            temp_path = output_path.replace('.csv', '_temp.csv')
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            # The checkpoint is only needed until every unit is done
+            if len(results_by_unit) == total_units and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
         
         return df_results
 
 
 # Main execution  
 if __name__ == "__main__":
-    import os
+    import argparse
+    import glob
 
     BASE_DIR = os.path.dirname(__file__)  # folder where the script is
     CSV_PATH = os.path.join(BASE_DIR, 'AI Testing Files', 'Input_Files', 'UnitsOutcomes.csv')
     OUTPUT_DIR = os.path.join(BASE_DIR, 'AI Testing Files', 'Output_Files')
     os.makedirs(OUTPUT_DIR, exist_ok=True)  # make sure folder exists
 
-    OUTPUT_PATH = os.path.join(
-        OUTPUT_DIR,
-        f"ai_rewrite_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    )
+    parser = argparse.ArgumentParser(description="Test the quality of AI outcome rewrites.")
+    parser.add_argument('--sample', type=float, default=0.01, help="fraction of units (default 0.01 = 1%%)")
+    parser.add_argument('--workers', type=int, default=4, help="units processed at once")
+    parser.add_argument('--rpm', type=float, default=30, help="API requests per minute across all workers")
+    parser.add_argument('--output', default=None, help="results CSV (default: timestamped file)")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip units finished by an interrupted run (of --output, or the latest run)")
+    parser.add_argument('--output-format', choices=('text', 'json'), default='text',
+                        help="ask the model for free text or structured JSON")
+    args = parser.parse_args()
+
+    OUTPUT_PATH = args.output
+    if OUTPUT_PATH is None and args.resume:
+        # Continue the most recent run that left a checkpoint behind
+        checkpoints = sorted(glob.glob(os.path.join(OUTPUT_DIR, 'ai_rewrite_test_results_*_checkpoint.jsonl')))
+        if checkpoints:
+            OUTPUT_PATH = checkpoints[-1].replace('_checkpoint.jsonl', '.csv')
+    if OUTPUT_PATH is None:
+        OUTPUT_PATH = os.path.join(
+            OUTPUT_DIR,
+            f"ai_rewrite_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
     
     # Create tester
     tester = AIRewriteTester(
         csv_path=CSV_PATH,
-        api_key=None  # Uses environment variable
+        api_key=None,  # Uses environment variable
+        output_format=args.output_format
     )
     
-    # Adjust rate limiting if needed
-    tester.delay_between_requests = 3
+    # Adjust rate limiting if needed (replayed runs have none)
+    if not tester.replaying:
+        tester.requests_per_minute = args.rpm
     
-    # Run test - now much more efficient!
+    # Run test - units run concurrently under the shared rate limit
     results_df = tester.run_test(
         output_path=OUTPUT_PATH,
-        sample_size=0.01,  # Start with 1% for testing
-        save_incremental=True
+        sample_size=args.sample,
+        save_incremental=True,
+        resume=args.resume,
+        max_workers=args.workers
     )
     
     # Analysis
@@ -615,4 +782,4 @@ if __name__ == "__main__":
     print(level_summary)
     
     print("\n📋 Sample Results:")
-    print(results_df[['unitcode', 'title', 'outcome_number', 'evaluation']].head(10))
\ No newline at end of file
+    print(results_df[['unitcode', 'title', 'outcome_number', 'evaluation']].head(10))
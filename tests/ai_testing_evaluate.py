@@ -1,6 +1,7 @@
 #This file is the same as the AI evaluate except configured to run in a local Python directory instead of running through Flask routes
 
 import json
+import os
 from typing import List
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -14,6 +15,38 @@ import numpy as np
 
 testing_config_manager = ConfigManager('AIConfig.json')
 
+
+def make_test_client(api_key, cassette_path=None, cassette_mode=None, replay_latency=None):
+    """
+    Create a GenAI client, behind a record/replay cassette if one is set.
+
+    The cassette settings default to the LLM_CASSETTE, LLM_CASSETTE_MODE
+    and LLM_CASSETTE_REPLAY_LATENCY environment variables (see
+    app/llm_cassette.py), e.g.
+        LLM_CASSETTE=runs/sample.jsonl LLM_CASSETTE_MODE=record python automated_ai_test.py
+        LLM_CASSETTE=runs/sample.jsonl python automated_ai_test.py   (replays offline)
+
+    Args:
+        api_key: GenAI API key (not needed to replay)
+        cassette_path: Cassette file, or None for the environment setting
+        cassette_mode: 'record', 'replay' or 'auto'
+        replay_latency: Replay with the recorded latencies
+
+    Returns:
+        genai.Client or CassetteClient
+    """
+    from app.llm_cassette import wrap_client
+
+    cassette_path = cassette_path or os.getenv("LLM_CASSETTE")
+    cassette_mode = cassette_mode or os.getenv("LLM_CASSETTE_MODE", "replay")
+    if replay_latency is None:
+        replay_latency = os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "0") == "1"
+
+    if not cassette_path:
+        return genai.Client(api_key=api_key)
+    client = genai.Client(api_key=api_key) if api_key else None
+    return wrap_client(client, cassette_path, mode=cassette_mode, replay_latency=replay_latency)
+
 def build_prompt_test(level: int, unit_name: str, credit_points: int, outcomes: List[str],
                  config) -> str:
     """
@@ -146,7 +179,7 @@ def run_eval_test(level, unit_name, credit_points, outcomes_text):
     else:
         api_key = config["API_key"]
 
-    if not api_key:
+    if not api_key and not os.getenv("LLM_CASSETTE"):
         return "❌ERROR: Missing API key. Set GOOGLE_API_KEY in your environment or put it in AIConfig.json."
 
     try:
@@ -159,8 +192,8 @@ def run_eval_test(level, unit_name, credit_points, outcomes_text):
     prompt = build_prompt_test(level, unit_name, credit_points, outcomes, config)
     # print(prompt)
 
-    # configure SDK
-    client = genai.Client(api_key=api_key)
+    # configure SDK (record/replay if LLM_CASSETTE is set)
+    client = make_test_client(api_key)
 
     resp = client.models.generate_content(
         model=model_name,
@@ -0,0 +1,26 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Testing app with the seeded admin user and CITS3200 unit.
+
+    Test files that need extra data override this fixture, take it as an
+    argument and seed on top of it.
+    """
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    """Test client logged in as the seeded admin."""
+    client = app.test_client()
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+    return client
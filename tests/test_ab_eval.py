@@ -0,0 +1,79 @@
+import pytest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import ab_eval
+
+
+def record(code, statuses, latency=0.1, error=None):
+    return {'code': code, 'latency': latency, 'prompt_tokens': 1000, 'response_tokens': 200,
+            'statuses': statuses, 'error': error}
+
+
+def test_parse_config():
+    assert ab_eval.parse_config('gemma-3-4b-it') == ('gemma-3-4b-it', 'app')
+    assert ab_eval.parse_config('gemma-3-4b-it:test') == ('gemma-3-4b-it', 'test')
+    with pytest.raises(ValueError):
+        ab_eval.parse_config('gemma-3-4b-it:nope')
+
+
+def test_prompt_variants_build_the_same_prompt_today():
+    from app import config_manager
+    args = (2, 'Algorithms', 6, ['Explain recursion'], config_manager.getCurrentParams())
+    assert ab_eval.PROMPT_VARIANTS['app'](*args) == ab_eval.PROMPT_VARIANTS['test'](*args)
+
+
+def test_cohen_kappa():
+    assert ab_eval.cohen_kappa([('GOOD', 'GOOD'), ('COULD_IMPROVE', 'COULD_IMPROVE')]) == 1.0
+    # Always the same verdict on one side: no better than chance
+    assert ab_eval.cohen_kappa([('GOOD', 'GOOD'), ('GOOD', 'COULD_IMPROVE')]) == 0.0
+    assert ab_eval.cohen_kappa([]) is None
+
+
+def test_summary_counts_parse_failures_and_agreement():
+    reference = [record('A', ['GOOD', 'GOOD']), record('B', ['NEEDS_REVISION', 'GOOD'])]
+    candidate = [record('A', ['GOOD', None]), record('B', ['COULD_IMPROVE', 'GOOD']),
+                 record('C', [None], error='ServerError: 500')]
+    row = ab_eval.summarize_config(candidate, reference)
+    assert row['calls'] == 3 and row['errors'] == 1
+    assert row['parse_rate'] == pytest.approx(3 / 5)
+    assert row['compared'] == 3
+    assert row['agreement'] == pytest.approx(2 / 3)
+    assert row['p50_ms'] == pytest.approx(100)
+    assert row['prompt_tokens'] == 1000
+
+
+def test_run_against_fake_server(tmp_path):
+    lines = []
+    saved = str(tmp_path / 'ab.json')
+    rows = ab_eval.main(['--fake', '--units', '8', '--rpm', '0', '--config', 'gemma-3-27b-it:app',
+                         '--config', 'gemma-3-4b-it:test', '--save', saved], report=lines.append)
+
+    reference = rows['gemma-3-27b-it:app']
+    assert reference['calls'] == 8 and reference['errors'] == 0
+    assert reference['parse_rate'] == 1.0
+    assert reference['agreement'] == 1.0
+    assert rows['gemma-3-4b-it:test']['compared'] > 0
+    assert any(line.startswith('gemma-3-4b-it:test') for line in lines)
+
+    with open(saved) as file:
+        data = json.load(file)
+    assert len(data['units']) == 8
+    assert set(data['results']) == {'gemma-3-27b-it:app', 'gemma-3-4b-it:test'}
+
+
+def test_json_variant_parses_structured_responses():
+    rows = ab_eval.main(['--fake', '--units', '4', '--rpm', '0', '--config', 'gemma-3-27b-it:app',
+                         '--config', 'gemini-2.5-flash:json'], report=lambda line: None)
+    assert rows['gemini-2.5-flash:json']['errors'] == 0
+    assert rows['gemini-2.5-flash:json']['parse_rate'] == 1.0
+
+
+def test_unknown_reference_fails_before_any_model_call(monkeypatch):
+    monkeypatch.setattr(ab_eval, 'run_configs', lambda *args, **kwargs: pytest.fail("configurations were run"))
+    with pytest.raises(SystemExit, match='not one of the configurations'):
+        ab_eval.main(['--fake', '--units', '2', '--config', 'gemma-3-27b-it:app',
+                      '--reference', 'gemma-3-4b-it:app'], report=lambda line: None)
@@ -0,0 +1,107 @@
+import pytest
+import json
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from google import genai
+from google.genai import types
+
+from ai_rewrite_tester import AIRewriteTester, RateLimiter
+from benchmarks.fake_gemini import FakeGeminiServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+UNITS = 8
+
+
+@pytest.fixture
+def fake():
+    with FakeGeminiServer(latency='fixed:0.1', seed=2) as server:
+        yield server
+
+
+@pytest.fixture
+def tester(monkeypatch, tmp_path, fake):
+    monkeypatch.chdir(ROOT)
+    csv_path = tmp_path / 'units.csv'
+    lines = ['code,title,level,Outcomes']
+    for i in range(UNITS):
+        lines.append(f'UNIT{i:04d},Unit {i},2,"Explain topic {i}|Exam|*|Describe method {i}|Essay|*|"')
+    csv_path.write_text('\n'.join(lines) + '\n')
+
+    tester = AIRewriteTester(str(csv_path), api_key='fake-key')
+    tester.client = genai.Client(api_key='fake-key', http_options=types.HttpOptions(base_url=fake.url))
+    tester.requests_per_minute = None
+    return tester
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    limiter = RateLimiter(requests_per_minute=1200)  # one per 50 ms
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: limiter.acquire(), range(5)))
+    assert time.monotonic() - start >= 0.2
+    RateLimiter(None).acquire()
+
+
+def test_concurrent_run_checkpoints_every_unit(tester, tmp_path):
+    output = str(tmp_path / 'results.csv')
+    start = time.monotonic()
+    results = tester.run_test(output_path=output, sample_size=1.0, max_workers=4)
+    elapsed = time.monotonic() - start
+
+    assert len(results) == UNITS * 2
+    # Sample order is kept whatever order the units finished in
+    assert list(results['unitcode'].drop_duplicates()) == list(tester.load_and_sample_units(1.0)['code'])
+    # Each unit makes one or two 0.1 s calls; sequentially that is over 0.8 s
+    assert elapsed < UNITS * 0.1
+    assert os.path.exists(output)
+    # A finished run leaves no checkpoint behind
+    assert not os.path.exists(tester.checkpoint_path_for(output))
+
+
+def test_resume_skips_completed_units(tester, tmp_path, fake):
+    output = str(tmp_path / 'results.csv')
+    checkpoint = tester.checkpoint_path_for(output)
+    sampled = list(tester.load_and_sample_units(1.0)['code'])
+    done = sampled[:3]
+    with open(checkpoint, 'w') as file:
+        for code in done:
+            row = {'unitcode': code, 'title': 'x', 'level': 2, 'outcome_number': 1, 'original_outcome': 'old',
+                   'rewritten_outcome': None, 'evaluation': 'ALREADY_GOOD', 'status': 'GOOD',
+                   'feedback': '', 'assessment': '', 'processing_time': 0.0}
+            file.write(json.dumps({'unitcode': code, 'results': [row]}) + '\n')
+        # Line cut short by a crash: that unit is done again
+        file.write('{"unitcode": "' + sampled[3] + '", "res')
+
+    before = fake.stats['ok']
+    results = tester.run_test(output_path=output, sample_size=1.0, resume=True, max_workers=4)
+
+    # Only the remaining units were sent to the model (1-2 calls each)
+    calls = fake.stats['ok'] - before
+    assert UNITS - 3 <= calls <= 2 * (UNITS - 3)
+    assert set(results['unitcode']) == set(sampled)
+    assert (results[results['unitcode'].isin(done)]['original_outcome'] == 'old').all()
+
+
+def test_checkpoint_survives_interrupted_run(tester, tmp_path, monkeypatch):
+    output = str(tmp_path / 'results.csv')
+    processUnit = tester.process_unit
+    calls = []
+
+    def crashing(row):
+        calls.append(row['code'])
+        if len(calls) > 4:
+            raise KeyboardInterrupt()
+        return processUnit(row)
+
+    monkeypatch.setattr(tester, 'process_unit', crashing)
+    # Ctrl-C during the fifth unit stops the run; the finished units are kept
+    tester.run_test(output_path=output, sample_size=1.0, max_workers=1)
+
+    completed = tester.load_checkpoint(tester.checkpoint_path_for(output))
+    assert len(completed) == 4
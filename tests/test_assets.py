@@ -0,0 +1,140 @@
+import gzip
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.assets import AssetPipeline, brotli
+
+
+@pytest.fixture
+def dist_dir(monkeypatch, tmp_path):
+    """Build assets into a temporary directory instead of app/static/dist."""
+    from app.config import TestingConfig
+    monkeypatch.setattr(TestingConfig, 'ASSET_DIST_DIR', str(tmp_path / 'dist'), raising=False)
+
+
+@pytest.fixture
+def app(dist_dir, app):
+    # dist_dir comes first so the directory is set before the app is created
+    return app
+
+
+def built_url(app, filename):
+    with app.test_request_context():
+        from flask import url_for
+        return url_for('static', filename=filename)
+
+
+def test_static_urls_use_fingerprinted_names(app):
+    url = built_url(app, 'js/create_lo.js')
+    assert url.startswith('/static/js/create_lo.')
+    assert url.endswith('.js')
+    assert '?v=' not in url
+
+    manifest = app.extensions['assets'].manifest
+    assert url == '/static/' + manifest['js/create_lo.js']['path']
+    with app.test_request_context():
+        from app.assets import asset_url
+        assert asset_url('js/create_lo.js') == url
+
+
+def test_precompressed_variant_chosen_by_accept_encoding(app):
+    client = app.test_client()
+    url = built_url(app, 'js/create_lo.js')
+    with open(os.path.join(app.static_folder, 'js', 'create_lo.js'), 'rb') as file:
+        source = file.read()
+
+    gz = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert gz.status_code == 200
+    assert gz.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in gz.headers['Vary']
+    assert gz.mimetype in ('text/javascript', 'application/javascript')
+    assert gz.cache_control.immutable
+    assert gz.cache_control.max_age == 365 * 24 * 60 * 60
+    assert len(gzip.decompress(gz.data)) <= len(source)
+
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert gzip.decompress(gz.data) == plain.data
+
+    br = client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+    expected = 'br' if brotli is not None else 'gzip'
+    assert br.headers['Content-Encoding'] == expected
+
+
+def test_text_assets_are_minified_with_brotli_variants(app):
+    from app.assets import minify
+    client = app.test_client()
+    with open(os.path.join(app.static_folder, 'js', 'create_lo.js'), 'rb') as file:
+        source = file.read()
+    url = built_url(app, 'js/create_lo.js')
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert len(plain.data) < len(source)
+    assert b'/**' not in plain.data
+
+    br = client.get(url, headers={'Accept-Encoding': 'br'})
+    assert br.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(br.data) == plain.data
+
+    assert minify('site.css', b'/* theme */\nbody {\n  margin: 0;\n}\n') == b'body{margin:0}'
+
+
+def test_images_are_fingerprinted_but_not_compressed(app):
+    client = app.test_client()
+    url = built_url(app, 'images/logo-uwacrest-white.svg')
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.cache_control.immutable
+
+    entry = app.extensions['assets'].manifest['images/Winthrop.png']
+    assert entry['encodings'] == []
+
+
+def test_unbuilt_names_fall_back_to_static_files(app):
+    client = app.test_client()
+    response = client.get('/static/js/create_lo.js')
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_build_skips_unchanged_files_and_retires_stale(tmp_path):
+    source = tmp_path / 'static'
+    (source / 'js').mkdir(parents=True)
+    script = source / 'js' / 'app.js'
+    script.write_text('var a = 1;\n' * 100)
+
+    pipeline = AssetPipeline()
+    pipeline.source_dir = str(source)
+    pipeline.dist_dir = str(tmp_path / 'dist')
+    first = pipeline.build()['js/app.js']
+    firstPath = tmp_path / 'dist' / first['path']
+    assert firstPath.exists()
+    assert (tmp_path / 'dist' / (first['path'] + '.gz')).exists()
+
+    mtime = firstPath.stat().st_mtime_ns
+    assert pipeline.build()['js/app.js'] == first
+    assert firstPath.stat().st_mtime_ns == mtime
+
+    script.write_text('var b = 2;\n' * 100)
+    second = pipeline.build()['js/app.js']
+    assert second['path'] != first['path']
+    # Pages rendered before the rebuild still link to the old name
+    assert firstPath.exists()
+    assert pipeline.is_built(first['path']) and pipeline.is_built(second['path'])
+
+    with open(tmp_path / 'dist' / 'manifest.json') as file:
+        data = json.load(file)
+    assert data['assets']['js/app.js'] == second
+    assert list(data['retired']) == [first['path']]
+
+    # A restart keeps the retired file until it is past the retention window
+    pipeline.build()
+    assert firstPath.exists()
+    pipeline.retain_seconds = 0
+    pipeline.build()
+    assert not firstPath.exists()
+    assert not (tmp_path / 'dist' / (first['path'] + '.gz')).exists()
+    assert not pipeline.is_built(first['path'])
@@ -0,0 +1,55 @@
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import harness
+from benchmarks.__main__ import main
+
+
+@pytest.fixture
+def baseline_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(harness, 'BASELINE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_measure_reports_per_call_statistics():
+    calls = []
+    stats = harness.measure(lambda: calls.append(1), rounds=5, warmup=1, min_time=0.001)
+    assert stats['rounds'] == 5
+    assert stats['loops'] > 1
+    # Calibration, warmup and the recorded rounds all ran the callable
+    assert len(calls) >= 6 * stats['loops']
+    assert 0 < stats['min'] <= stats['median'] <= max(stats['mean'], stats['median'])
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'gone': {'median': 1.0}}
+    results = {'a': {'median': 1.1}, 'b': {'median': 1.5}, 'new': {'median': 1.0}}
+    rows = {row[0]: row for row in harness.compare(results, baseline, threshold=0.2)}
+    assert set(rows) == {'a', 'b'}
+    assert rows['a'][4] is False
+    assert rows['b'][4] is True
+    assert rows['b'][3] == pytest.approx(1.5)
+
+
+def test_save_and_compare_baseline(baseline_dir, capsys):
+    args = ['--quick', '-k', 'parseOutcomeString[6]']
+    assert main(args + ['--save', 'before']) == 0
+    saved = json.loads((baseline_dir / 'before.json').read_text())
+    assert set(saved['benchmarks']) == {'parseOutcomeString[6]'}
+
+    # Unchanged code is within a generous threshold
+    assert main(args + ['--compare', 'before', '--threshold', '10']) == 0
+
+    # A baseline 1000x faster than reality is a regression
+    saved['benchmarks']['parseOutcomeString[6]']['median'] /= 1000
+    (baseline_dir / 'before.json').write_text(json.dumps(saved))
+    assert main(args + ['--compare', 'before']) == 1
+    assert 'REGRESSED' in capsys.readouterr().out
+
+
+def test_missing_baseline(baseline_dir):
+    assert main(['--quick', '-k', 'parseOutcomeString[6]', '--compare', 'nothing']) == 2
@@ -0,0 +1,89 @@
+import gzip
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, Response
+
+from app import db
+from app.models import Unit, LearningOutcome
+from app.compression import CompressionMiddleware
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        for i in range(40):
+            unit = Unit(unitcode=f"TEST{i:04d}", unitname=f"Unit {i}", level=2,
+                        creditpoints=6, description="A unit description " * 5, creatorid=1)
+            db.session.add(unit)
+            db.session.flush()
+            db.session.add(LearningOutcome(unit_id=unit.id, description="Explain the thing", assessment="Exam"))
+        db.session.commit()
+    return app
+
+
+def test_streamed_export_is_gzipped(client, app):
+    plain = client.get('/export_all_units', headers={'Accept-Encoding': 'identity'})
+    assert plain.status_code == 200
+    assert plain.mimetype == 'text/csv'
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+    text = plain.get_data(as_text=True)
+    assert text.count('\n') == 42  # header + CITS3200 + 40 units
+    assert 'TEST0039' in text
+
+    compressed = client.get('/export_all_units', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in compressed.headers
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) * 5 < len(plain.data)
+
+
+def test_search_page_is_compressed(client):
+    response = client.get('/search_unit', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'TEST0001' in gzip.decompress(response.data)
+
+
+def make_middleware(body, minimum_size=100, **headers):
+    inner = Flask(__name__)
+
+    @inner.route('/')
+    def index():
+        return Response(body, headers=headers)
+
+    inner.wsgi_app = CompressionMiddleware(inner.wsgi_app, minimum_size=minimum_size, flush_size=50)
+    return inner.test_client()
+
+
+def test_small_and_encoded_bodies_pass_through():
+    small = make_middleware('tiny').get('/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    assert small.data == b'tiny'
+
+    encoded = make_middleware('x' * 500, **{'Content-Encoding': 'identity'}).get(
+        '/', headers={'Accept-Encoding': 'gzip'})
+    assert encoded.headers['Content-Encoding'] == 'identity'
+    assert encoded.data == b'x' * 500
+
+
+def test_generator_bodies_stream_and_short_streams_stay_plain():
+    chunks = [('line %d\n' % i) for i in range(200)]
+    streamed = make_middleware(iter(chunks)).get('/', headers={'Accept-Encoding': 'gzip'})
+    assert streamed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(streamed.data).decode() == ''.join(chunks)
+
+    short = make_middleware(iter(['a', 'b'])).get('/', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in short.headers
+    assert short.headers['Content-Length'] == '2'
+    assert short.data == b'ab'
+
+
+def test_strong_etag_becomes_weak():
+    client = make_middleware('y' * 500, ETag='"abc"')
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['ETag'] == 'W/"abc"'
@@ -0,0 +1,156 @@
+import http.cookiejar
+import threading
+import time
+import urllib.parse
+import urllib.request
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from werkzeug.serving import make_server
+
+from app import create_app, db, config_manager
+from app.ai_evaluate import llm_limiter
+from app.config import TestingConfig
+from app.models import Unit, LearningOutcome, User, UserType
+from werkzeug.security import generate_password_hash
+
+MODEL_SECONDS = 0.3
+LIMIT = 4
+
+
+class SlowModel:
+    """Fake GenAI client whose calls wait like a real model would."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.clients = 0
+        self.holding_connection = []
+        self.models = self
+
+    def factory(self, api_key=None):
+        self.clients += 1
+        return self
+
+    def generate_content(self, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # Runs inside the evaluate request; its session must hold no connection
+        self.holding_connection.append(db.session().in_transaction())
+        time.sleep(MODEL_SECONDS)
+        with self.lock:
+            self.active -= 1
+        return type('Response', (), {'text': 'Looks good'})()
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+
+    class ThreadedConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'threads.db')
+        LLM_MAX_CONCURRENCY = LIMIT
+        LLM_MAX_WAITING = 8
+        LLM_QUEUE_TIMEOUT = 10
+
+    app = create_app(ThreadedConfig)
+    with app.app_context():
+        user = User(username='uc', password_hash=generate_password_hash('pw'), userType=UserType.UC)
+        db.session.add(user)
+        db.session.flush()
+        unit = Unit(unitcode='CITS2000', unitname='Threads', level=2, creditpoints=6,
+                    description='d', creatorid=user.id)
+        db.session.add(unit)
+        db.session.flush()
+        db.session.add(LearningOutcome(unit_id=unit.id, description='Explain threads'))
+        db.session.commit()
+        unitID = unit.id
+
+    model = SlowModel()
+    monkeypatch.setattr("app.ai_evaluate.genai.Client", model.factory)
+    params = dict(config_manager.getCurrentParams(), API_key='test-key', selected_model='fake')
+    monkeypatch.setattr("app.ai_evaluate.config_manager.getCurrentParams", lambda: dict(params))
+
+    httpd = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", model, unitID
+    httpd.shutdown()
+    llm_limiter.configure(16, 4, 30)
+
+
+def logged_in_opener(base):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    opener.open(base + '/login_page', data=urllib.parse.urlencode({'username': 'uc', 'password': 'pw'}).encode())
+    return opener
+
+
+def test_evaluations_share_threads_and_leave_room_for_crud(server):
+    base, model, unitID = server
+    opener = logged_in_opener(base)
+    results = []
+
+    def evaluate():
+        request = urllib.request.Request(base + f'/lo_api/evaluate/{unitID}', data=b'', method='POST')
+        with opener.open(request) as response:
+            results.append(response.status)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=evaluate) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+
+    # A normal page is served while every model slot is busy
+    time.sleep(MODEL_SECONDS / 2)
+    crudStart = time.perf_counter()
+    with opener.open(base + f'/view/{unitID}') as response:
+        assert response.status == 200
+    assert time.perf_counter() - crudStart < MODEL_SECONDS
+
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert results == [200] * 12
+    # 12 calls through 4 slots take 3 rounds, not 12 and not 1
+    assert model.peak == LIMIT
+    assert elapsed < MODEL_SECONDS * 12 / 2
+    # One shared client, and no evaluation holds a database connection
+    assert model.clients == 1
+    assert model.holding_connection == [False] * 12
+
+
+def test_evaluations_beyond_the_wait_queue_are_turned_away():
+    from app.ai_evaluate import LLMLimiter, LLMBusy
+    limiter = LLMLimiter(max_concurrency=1, max_waiting=1, queue_timeout=5)
+    release = threading.Event()
+    outcomes = []
+
+    def hold():
+        with limiter.slot():
+            release.wait()
+        outcomes.append('ran')
+
+    running = threading.Thread(target=hold)
+    running.start()
+    time.sleep(0.05)
+    waiting = threading.Thread(target=hold)
+    waiting.start()
+    time.sleep(0.05)
+
+    # One running and one waiting: a third request is refused immediately
+    start = time.perf_counter()
+    with pytest.raises(LLMBusy):
+        with limiter.slot():
+            pass
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    running.join()
+    waiting.join()
+    assert outcomes == ['ran', 'ran']
@@ -0,0 +1,127 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google import genai
+from google.genai import types
+
+from app import create_app, config_manager
+from app.ai_evaluate import RulesCache, build_prompt, build_rules, rules_cache, run_eval, shared_client
+from app.llm_cassette import wrap_client
+from benchmarks.fake_gemini import FakeGeminiServer
+
+OUTCOMES = "Explain the role of recursion in algorithms\nDesign a relational database schema"
+
+
+@pytest.fixture
+def fake():
+    with FakeGeminiServer(seed=5) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake):
+    return genai.Client(api_key='fake-key', http_options=types.HttpOptions(base_url=fake.url))
+
+
+@pytest.fixture
+def app_with(monkeypatch, fake):
+    """Create the app against the fake server with the given model selected."""
+    def make(model):
+        monkeypatch.setenv("FLASK_CONFIG", "testing")
+        from app.config import Config
+        monkeypatch.setattr(Config, 'GENAI_BASE_URL', fake.url)
+        params = dict(config_manager.getCurrentParams(), selected_model=model)
+        monkeypatch.setattr(config_manager, 'getCurrentParams', lambda: params)
+        return create_app()
+    yield make
+    shared_client.base_url = None
+    rules_cache._entries.clear()
+
+
+def test_prompt_without_rules_is_the_tail_of_the_full_prompt():
+    config = config_manager.getCurrentParams()
+    full = build_prompt(2, 'Algorithms', 6, OUTCOMES.splitlines(), config)
+    tail = build_prompt(2, 'Algorithms', 6, OUTCOMES.splitlines(), config, include_rules=False)
+    assert full == build_rules(config) + "\n\n" + tail
+
+
+def test_one_cache_serves_every_call(app_with, fake):
+    app_with('gemini-2.5-flash')
+    first = run_eval(2, 'Algorithms', 6, OUTCOMES)
+    second = run_eval(2, 'Algorithms', 6, OUTCOMES)
+    assert "'Design a relational database schema' - STATUS:" in first and '**SUMMARY**' in second
+    assert fake.stats['cache_created'] == 1 and fake.stats['ok'] == 2
+    assert len(fake.caches) == 1
+
+
+def test_gemma_keeps_the_rules_in_the_prompt(app_with, fake):
+    app_with('gemma-3-27b-it')
+    result = run_eval(2, 'Algorithms', 6, OUTCOMES)
+    assert '**SUMMARY**' in result
+    assert fake.stats['cache_created'] == 0 and fake.stats['bad_request'] == 0
+
+
+def test_changed_settings_replace_the_cache(client, fake):
+    cache = RulesCache(ttl=600)
+    config = config_manager.getCurrentParams()
+    first = cache.attach(client, 'gemini-2.5-flash', config, types.GenerateContentConfig())
+    assert cache.attach(client, 'gemini-2.5-flash', config, types.GenerateContentConfig()) == first
+
+    changed = dict(config, BANNED=config['BANNED'] + ['utilise'])
+    second = cache.attach(client, 'gemini-2.5-flash', changed, types.GenerateContentConfig())
+    assert second != first
+    # The cache of the old rules is deleted
+    assert list(fake.caches) == [second]
+
+
+def test_cache_is_replaced_before_it_expires(client, fake):
+    cache = RulesCache(ttl=600)
+    config = config_manager.getCurrentParams()
+    first = cache.attach(client, 'gemini-2.5-flash', config, types.GenerateContentConfig())
+    cache._entries['gemini-2.5-flash']['refresh_at'] = 0
+    second = cache.attach(client, 'gemini-2.5-flash', config, types.GenerateContentConfig())
+    assert second != first
+    # The old cache is left to expire; calls already using it still work
+    assert set(fake.caches) == {first, second}
+
+
+def test_refused_cache_falls_back_to_a_system_instruction(client, fake, monkeypatch):
+    monkeypatch.setattr(FakeGeminiServer, 'create_cache',
+                        lambda self, body: (400, {'error': {'code': 400, 'message': 'Cached content is too small',
+                                                            'status': 'INVALID_ARGUMENT'}}))
+    cache = RulesCache()
+    gen_config = types.GenerateContentConfig()
+    assert cache.attach(client, 'gemini-2.5-flash', config_manager.getCurrentParams(), gen_config) is None
+    assert gen_config.cached_content is None
+    assert gen_config.system_instruction == build_rules(config_manager.getCurrentParams())
+
+
+def test_lost_cache_is_recreated(app_with, fake):
+    app_with('gemini-2.5-flash')
+    run_eval(2, 'Algorithms', 6, OUTCOMES)
+    # The provider dropped the cache early: that call goes uncached...
+    fake.caches.clear()
+    assert '**SUMMARY**' in run_eval(2, 'Algorithms', 6, OUTCOMES)
+    assert fake.stats['cache_miss'] == 1
+    # ...and the next one makes a new cache
+    run_eval(2, 'Algorithms', 6, OUTCOMES)
+    assert fake.stats['cache_created'] == 2 and len(fake.caches) == 1
+
+
+def test_cassette_replays_cached_calls_offline(client, tmp_path):
+    path = str(tmp_path / 'cached.jsonl')
+    config = config_manager.getCurrentParams()
+    prompt = build_prompt(2, 'Algorithms', 6, OUTCOMES.splitlines(), config, include_rules=False)
+
+    def call(wrapped):
+        gen_config = types.GenerateContentConfig(temperature=0.0)
+        RulesCache().attach(wrapped, 'gemini-2.5-flash', config, gen_config)
+        return wrapped.models.generate_content(model='gemini-2.5-flash', contents=prompt, config=gen_config)
+
+    recorded = call(wrap_client(client, path, mode='record'))
+    assert recorded.usage_metadata.cached_content_token_count > 0
+    replayed = call(wrap_client(None, path, mode='replay'))
+    assert replayed.text == recorded.text
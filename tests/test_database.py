@@ -0,0 +1,143 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.config import DeploymentConfig, databaseURL, engineOptions
+from app.database import apply_sqlite_pragmas
+
+
+def test_deployment_sqlite_profile_applied_on_connect(monkeypatch, tmp_path):
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+
+    class TunedConfig(DeploymentConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'tuned.db')
+        SQLALCHEMY_ENGINE_OPTIONS = engineOptions(SQLALCHEMY_DATABASE_URI)
+        JOB_SPOOL_DIR = str(tmp_path / 'spool')
+
+    app = create_app(TunedConfig)
+    with app.app_context():
+        assert db.engine.pool.size() == TunedConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+        with db.engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == 5000
+            assert pragma("foreign_keys") == 1
+            assert pragma("cache_size") == -64000
+        db.engine.dispose()
+
+
+def test_testing_config_enforces_foreign_keys(monkeypatch):
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    app = create_app()
+    with app.app_context():
+        assert db.session.execute(db.text("PRAGMA foreign_keys")).scalar() == 1
+
+
+def test_database_url_override(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgres://lo:secret@db/lo_builder")
+    url = databaseURL('sqlite:///fallback.db')
+    assert url == "postgresql://lo:secret@db/lo_builder"
+
+    options = engineOptions(url)
+    assert options['pool_pre_ping'] is True
+    assert options['pool_size'] == 10
+
+    monkeypatch.delenv("DATABASE_URL")
+    assert databaseURL('sqlite:///fallback.db') == 'sqlite:///fallback.db'
+    assert engineOptions('sqlite:///:memory:') == {}
+
+
+def test_revision_stamp_downgrade_keeps_unit_code_index(tmp_path):
+    import importlib.util
+    import sqlalchemy as sa
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    def migration(name):
+        path = os.path.join(os.path.dirname(__file__), '..', 'migrations', 'versions', name)
+        spec = importlib.util.spec_from_file_location(name[:-3], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    indexes = migration('c51a9e0b7d36_index_hot_query_paths.py')
+    stamp = migration('e2f4a8c6b913_add_unit_revision_stamp.py')
+    # Connect as the app does, with foreign keys enforced
+    engine = sa.create_engine('sqlite:///' + str(tmp_path / 'migrate.db'))
+    sa.event.listen(engine, 'connect',
+                    lambda conn, record: apply_sqlite_pragmas(conn, DeploymentConfig.SQLITE_PRAGMAS))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE unit (id INTEGER PRIMARY KEY, unitcode VARCHAR(20) UNIQUE,"
+                             " unitname VARCHAR(100), creatorid INTEGER)")
+        conn.exec_driver_sql("CREATE TABLE learning_outcomes (id INTEGER PRIMARY KEY,"
+                             " unit_id INTEGER REFERENCES unit (id) ON DELETE CASCADE, order_key VARCHAR(64))")
+        conn.exec_driver_sql("INSERT INTO unit (id, unitcode) VALUES (1, 'CITS3200')")
+        for key in "FVk":
+            conn.exec_driver_sql(f"INSERT INTO learning_outcomes (unit_id, order_key) VALUES (1, '{key}')")
+
+    with engine.connect() as conn:
+        operations = Operations(MigrationContext.configure(conn))
+        for step in (indexes.upgrade, stamp.upgrade, stamp.downgrade):
+            with Operations.context(operations.migration_context):
+                step()
+        conn.commit()
+        names = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'ix_unit_unitcode_lower' in names
+        # Rebuilding the unit table kept its outcomes
+        assert conn.exec_driver_sql("SELECT count(*) FROM learning_outcomes").scalar() == 3
+        # The rest of the chain still rolls back
+        with Operations.context(operations.migration_context):
+            indexes.downgrade()
+    engine.dispose()
+
+
+def test_batch_migration_keeps_child_rows(monkeypatch, tmp_path):
+    import shutil
+    from flask_migrate import upgrade
+    from app.config import TestingConfig
+    from app.models import LearningOutcome, Unit, User, UserType
+
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+    # env.py applies alembic.ini's logging setup, which disables the app's loggers
+    monkeypatch.setattr('logging.config.fileConfig', lambda *args, **kwargs: None)
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'migrate.db')
+
+    # The real env.py, with one revision that rebuilds the unit table
+    source = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+    directory = tmp_path / 'migrations'
+    (directory / 'versions').mkdir(parents=True)
+    for name in ('env.py', 'alembic.ini', 'script.py.mako'):
+        shutil.copy(os.path.join(source, name), directory / name)
+    (directory / 'versions' / 'a1_rebuild_unit.py').write_text(
+        "from alembic import op\n\n"
+        "revision = 'a1'\ndown_revision = None\nbranch_labels = None\ndepends_on = None\n\n\n"
+        "def upgrade():\n"
+        "    with op.batch_alter_table('unit', recreate='always'):\n"
+        "        pass\n"
+    )
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        user = User(username='uc', password_hash='x', userType=UserType.UC)
+        db.session.add(user)
+        db.session.flush()
+        unit = Unit(unitcode='CITS1001', unitname='Migrating', level=1,
+                    creditpoints=6, description='d', creatorid=user.id)
+        db.session.add(unit)
+        db.session.flush()
+        for text in ("Explain A", "Apply B", "Design C"):
+            db.session.add(LearningOutcome(unit_id=unit.id, description=text))
+        db.session.commit()
+
+        upgrade(directory=str(directory))
+        assert db.session.query(LearningOutcome).count() == 3
+        # The connection goes back to the pool with foreign keys enforced again
+        with db.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        db.engine.dispose()
@@ -0,0 +1,114 @@
+import pytest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, config_manager
+from app.ai_evaluate import build_prompt, shared_client
+from benchmarks.fake_gemini import FakeGeminiServer, extract_outcomes, parse_latency
+from benchmarks.llm_load import classify, run_load, summarize_load
+
+OUTCOMES = ["Explain the role of recursion in algorithms", "Design a relational database schema"]
+
+
+@pytest.fixture
+def fake():
+    with FakeGeminiServer(seed=3) as server:
+        yield server
+
+
+@pytest.fixture
+def client(monkeypatch, fake):
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    # Config reads GENAI_BASE_URL from the environment at import time
+    from app.config import Config
+    monkeypatch.setattr(Config, 'GENAI_BASE_URL', fake.url)
+    app = create_app()
+    client = app.test_client()
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+    yield client
+    shared_client.base_url = None
+
+
+def test_extract_outcomes_from_prompt():
+    prompt = build_prompt(2, 'Algorithms', 6, OUTCOMES, config_manager.getCurrentParams())
+    assert extract_outcomes(prompt) == OUTCOMES
+    empty = build_prompt(2, 'Algorithms', 6, [], config_manager.getCurrentParams())
+    assert extract_outcomes(empty) == []
+
+
+def test_latency_specs():
+    import random
+    rng = random.Random(0)
+    assert parse_latency('fixed:0.5')(rng) == 0.5
+    assert 1 <= parse_latency('uniform:1:2')(rng) <= 2
+    assert parse_latency('lognormal:2:0.5')(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency('normal:1')
+
+
+def test_evaluate_through_fake_server(client, fake):
+    from app import db
+    from app.models import LearningOutcome
+    with client.application.app_context():
+        for text in OUTCOMES:
+            db.session.add(LearningOutcome(description=text, assessment='Exam', unit_id=1))
+        db.session.commit()
+
+    response = client.post('/lo_api/evaluate/1')
+    payload = response.get_json()
+    assert payload['ok'] is True
+    for text in OUTCOMES:
+        assert f"'{text}' - STATUS:" in payload['html']
+    assert '**SUMMARY**' in payload['html']
+    assert fake.stats['ok'] == 1
+
+
+def test_rate_limit_is_reported_not_raised(client, fake):
+    fake.burst = (60.0, 60.0)
+    response = client.post('/lo_api/evaluate/1')
+    payload = response.get_json()
+    assert response.status_code == 200
+    assert 'rate limit' in payload['html']
+    assert classify(response.status_code, response.get_data()) == 'rate_limited'
+    assert fake.stats['rate_limited'] == 1
+
+
+def test_server_error_fails_the_request(client, fake):
+    fake.error_rate = 1.0
+    response = client.post('/lo_api/evaluate/1')
+    assert response.status_code == 500
+    assert classify(response.status_code, response.get_data()) == 'upstream_error'
+
+
+def test_classify():
+    assert classify(200, json.dumps({'ok': True, 'html': 'STATUS:GOOD'}).encode()) == 'ok'
+    busy = "❌ERROR: The AI service is busy with other evaluations. Try again in 1 minute."
+    assert classify(200, json.dumps({'ok': True, 'html': busy}).encode()) == 'busy'
+    assert classify(302, b'') == 'http_error'
+
+
+def test_load_driver_counts_every_request(fake):
+    fake.error_rate = 0.5
+
+    class Target:
+        def fetch(self, method, path, files=None):
+            import urllib.request
+            if method == 'GET':
+                return 200, b''
+            request = urllib.request.Request(fake.url + '/v1beta/models/m:generateContent',
+                                             data=b'{"contents": []}', method='POST')
+            try:
+                with urllib.request.urlopen(request) as response:
+                    return 200, json.dumps({'ok': True, 'html': 'done'}).encode()
+            except urllib.error.HTTPError as e:
+                return e.code, e.read()
+
+    results, wallTime = run_load(Target(), [1, 2, 3], coordinators=4, requests=5)
+    stats = summarize_load(results, wallTime)
+    assert stats['requests'] == 20
+    assert stats['ok'] + stats['upstream_error'] == 20
+    assert stats['ok'] == fake.stats['ok']
+    assert stats['all_p99_ms'] >= stats['all_p50_ms']
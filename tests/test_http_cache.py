@@ -0,0 +1,133 @@
+import pytest
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import db
+from app.models import Unit, LearningOutcome
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(LearningOutcome(unit_id=1, description="Explain A", order_key="V"))
+        db.session.commit()
+    return app
+
+
+def login(client):
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+
+
+def revision(app):
+    with app.app_context():
+        return db.session.get(Unit, 1).revision
+
+
+def test_static_urls_are_fingerprinted_and_long_lived(app):
+    client = app.test_client()
+    page = client.get('/home').get_data(as_text=True)
+    # Built by the asset pipeline under a content-hashed name
+    assert re.search(r'logo-uwacrest-white\.[0-9a-f]{12}\.svg', page)
+
+    with app.test_request_context():
+        from flask import url_for
+        url = url_for('static', filename='js/create_lo.js')
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.cache_control.max_age == 365 * 24 * 60 * 60
+    assert response.cache_control.immutable
+
+    # Stale or missing fingerprints must be revalidated
+    stale = client.get('/static/js/create_lo.js?v=000000000000')
+    assert stale.cache_control.max_age != 365 * 24 * 60 * 60
+
+
+def test_unit_view_revalidates_with_304(app):
+    client = app.test_client()
+    first = client.get('/view/1')
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert first.last_modified is not None
+    assert 'no-cache' in first.headers['Cache-Control']
+    assert 'no-store' not in first.headers['Cache-Control']
+
+    again = client.get('/view/1', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_asset_rebuild_changes_unit_etag(app):
+    from app.http_cache import _build_id
+    client = app.test_client()
+    etag = client.get('/view/1').headers['ETag']
+
+    # A CSS/JS change gives the asset a new built name; cached pages that
+    # link to the old name must not be revalidated
+    assets = app.extensions['assets']
+    manifest, retired = assets.manifest, assets.retired
+    entry = manifest['js/create_lo.js']
+    try:
+        assets._set_manifest(dict(manifest, **{'js/create_lo.js': dict(entry, path='js/create_lo.000000000000.js')}))
+        app.extensions['http_cache_build'] = _build_id(app)
+        response = client.get('/view/1', headers={'If-None-Match': etag})
+    finally:
+        assets._set_manifest(manifest, retired)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_outcome_edit_changes_unit_etag(app):
+    client = app.test_client()
+    etag = client.get('/view/1').headers['ETag']
+    before = revision(app)
+
+    login(client)
+    client.patch('/lo_api/outcomes/1', json={"1": {"version": 1, "description": "Explain B"}})
+    assert revision(app) == before + 1
+    client.post('/lo_api/batch/1', json={"ops": [{"op": "add", "client_id": "n1"}]})
+    assert revision(app) == before + 2
+
+    client.get('/logout')
+    response = client.get('/view/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert b"Explain B" in response.data
+
+
+def test_etag_differs_per_viewer(app):
+    anonymous = app.test_client().get('/view/1').headers['ETag']
+    client = app.test_client()
+    login(client)
+    response = client.get('/view/1', headers={'If-None-Match': anonymous})
+    assert response.status_code == 200
+    assert 'private' in response.headers['Cache-Control']
+
+
+def test_pending_flash_bypasses_cache(app):
+    client = app.test_client()
+    etag = client.get('/view/1').headers['ETag']
+    with client.session_transaction() as sess:
+        sess['_flashes'] = [('success', 'Unit saved')]
+    response = client.get('/view/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert b'Unit saved' in response.data
+    assert response.headers['Cache-Control'] == 'no-store'
+
+
+def test_logged_in_editor_pages_are_not_stored(app):
+    client = app.test_client()
+    login(client)
+    response = client.get('/create_lo/1')
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert 'Expires' not in response.headers
+
+
+def test_anonymous_pages_get_body_etag(app):
+    client = app.test_client()
+    first = client.get('/help')
+    assert first.status_code == 200
+    assert 'public' in first.headers['Cache-Control']
+    again = client.get('/help', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
@@ -0,0 +1,172 @@
+import pytest
+import sys
+import os
+import io
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import job_manager
+from app.models import Unit
+from app.routes import parseOutcomeString
+
+
+CSV_UPLOAD = (
+    "code,title,level,CreditPoints,Content,Outcomes\n"
+    "CITS1001,Intro Programming,1,6,Basics,Write programs|Lab|*|Test code|Exam|*|\n"
+    "CITS3200,Professional Computing,3,6,Duplicate of seeded unit,Work in teams|*|\n"
+    ",No Code,2,6,Skipped,Outcome|*|\n"
+)
+
+
+@pytest.fixture
+def app(app, tmp_path):
+    """Testing app with an isolated job spool directory."""
+    app.config['JOB_SPOOL_DIR'] = str(tmp_path)
+    job_manager.init_app(app)
+    return app
+
+
+def wait_for_job(client, job):
+    """Poll a job's status URL until it is no longer queued or running."""
+    deadline = time.time() + 10
+    while job['status'] in ('queued', 'running'):
+        assert time.time() < deadline, "job did not finish in time"
+        time.sleep(0.05)
+        job = client.get(job['status_url']).get_json()
+    return job
+
+
+def upload(client, content, filename='units.csv'):
+    return client.post(
+        '/jobs/import',
+        data={'import_file': (io.BytesIO(content if isinstance(content, bytes) else content.encode()), filename)},
+        content_type='multipart/form-data'
+    )
+
+
+def test_parseOutcomeString():
+    assert parseOutcomeString("A|x|*|B|*|") == [("A", "x"), ("B", "")]
+    assert parseOutcomeString(float('nan')) == []
+    assert parseOutcomeString("") == []
+
+
+def test_import_job_imports_units_with_progress(app, client):
+    response = upload(client, CSV_UPLOAD)
+    assert response.status_code == 202
+
+    job = wait_for_job(client, response.get_json()['job'])
+    assert job['status'] == 'finished'
+    assert job['rows_done'] == 3
+    assert job['rows_total'] == 3
+    assert job['percent'] == 100
+    assert job['result'] == {'added': 1, 'duplicates': 1, 'missing_code': 1}
+    assert "1 units added successfully" in job['message']
+
+    with app.app_context():
+        unit = Unit.query.filter_by(unitcode='CITS1001').one()
+        assert [lo.description for lo in unit.learning_outcomes] == ['Write programs', 'Test code']
+        assert unit.learning_outcomes[0].assessment == 'Lab'
+
+
+def test_import_job_reads_xlsx(app, client):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    for i, line in enumerate(CSV_UPLOAD.splitlines()):
+        if i == 2:
+            sheet.append([None] * 6)  # blank row, skipped
+        sheet.append([cell or None for cell in line.split(',')])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    response = upload(client, buffer.getvalue(), filename='units.xlsx')
+    assert response.status_code == 202
+    job = wait_for_job(client, response.get_json()['job'])
+    assert job['status'] == 'finished'
+    assert job['result'] == {'added': 1, 'duplicates': 1, 'missing_code': 1}
+
+    with app.app_context():
+        unit = Unit.query.filter_by(unitcode='CITS1001').one()
+        assert unit.level == 1 and unit.creditpoints == 6
+        assert [lo.description for lo in unit.learning_outcomes] == ['Write programs', 'Test code']
+
+
+def test_import_job_detects_duplicate_upload(client):
+    first = upload(client, CSV_UPLOAD).get_json()['job']
+    wait_for_job(client, first)
+
+    second = upload(client, CSV_UPLOAD, filename='renamed.csv')
+    assert second.status_code == 200
+    data = second.get_json()
+    assert data['duplicate'] is True
+    assert data['job']['id'] == first['id']
+
+    # Asked to, the same user can import it again
+    forced = client.post(
+        '/jobs/import',
+        data={'import_file': (io.BytesIO(CSV_UPLOAD.encode()), 'units.csv'), 'force': '1'},
+        content_type='multipart/form-data'
+    )
+    assert forced.status_code == 202
+    assert wait_for_job(client, forced.get_json()['job'])['status'] == 'finished'
+
+
+def test_duplicate_upload_is_per_user(app, client):
+    from werkzeug.security import generate_password_hash
+    from app import db
+    from app.models import User, UserType
+
+    with app.app_context():
+        db.session.add(User(username='uc', password_hash=generate_password_hash('pw'), userType=UserType.UC))
+        db.session.commit()
+    first = wait_for_job(client, upload(client, CSV_UPLOAD).get_json()['job'])
+
+    other = app.test_client()
+    other.post('/login_page', data={'username': 'uc', 'password': 'pw'})
+    response = upload(other, CSV_UPLOAD)
+    # The other user's upload is a new job they can follow
+    assert response.status_code == 202
+    job = response.get_json()['job']
+    assert job['id'] != first['id']
+    assert wait_for_job(other, job)['status'] == 'finished'
+
+
+def test_import_job_ignores_case_of_existing_codes(app, client):
+    content = ("code,title,level,CreditPoints,Content,Outcomes\n"
+               "cits3200,Lower Case Copy,3,6,Dup,Outcome|*|\n"
+               "CITS1001,Intro,1,6,New,Outcome|*|\n"
+               "cits1001,Intro Again,1,6,Dup in file,Outcome|*|\n")
+    job = wait_for_job(client, upload(client, content).get_json()['job'])
+    assert job['result'] == {'added': 1, 'duplicates': 2, 'missing_code': 0}
+    with app.app_context():
+        assert Unit.query.count() == 2
+
+
+def test_import_job_fails_on_missing_columns(client):
+    response = upload(client, "code,title\nCITS1002,Missing Columns\n")
+    job = wait_for_job(client, response.get_json()['job'])
+    assert job['status'] == 'failed'
+    assert "Missing required columns" in job['message']
+
+
+def test_export_job_download(client):
+    response = client.post('/jobs/export/all')
+    assert response.status_code == 202
+
+    job = wait_for_job(client, response.get_json()['job'])
+    assert job['status'] == 'finished'
+    assert job['rows_done'] == 1
+
+    progress = client.get(job['progress_url']).get_json()
+    assert progress == {'status': 'finished', 'rows_done': 1, 'rows_total': 1, 'percent': 100}
+
+    download = client.get(job['download_url'])
+    assert download.status_code == 200
+    assert b"CITS3200" in download.data
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get('/jobs/' + '0' * 32).status_code == 404
+    assert client.get('/jobs/not-a-job').status_code == 404
@@ -0,0 +1,100 @@
+import pytest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app, config_manager
+from app.ai_evaluate import (EvaluationFormatError, build_json_prompt, generation_config,
+                             parse_json_evaluation, render_evaluation_text, shared_client)
+from benchmarks.fake_gemini import FakeGeminiServer, extract_outcomes
+
+OUTCOMES = ["Explain the role of recursion in algorithms", "Design a relational database schema"]
+
+
+def evaluation(*items, summary='Fine overall.'):
+    return json.dumps({'outcomes': list(items), 'summary': summary})
+
+
+def test_json_prompt_numbers_the_outcomes():
+    prompt = build_json_prompt(2, 'Algorithms', 6, OUTCOMES + ['  '], config_manager.getCurrentParams())
+    assert f"0: '{OUTCOMES[0]}'" in prompt and f"1: '{OUTCOMES[1]}'" in prompt
+    assert '2:' not in prompt.split('Learning Outcomes to evaluate')[1]
+    assert 'Respond with JSON only' in prompt
+    assert extract_outcomes(prompt) == OUTCOMES
+
+
+def test_parse_keeps_prompt_order():
+    text = evaluation(
+        {'i': 1, 'status': 'needs_revision', 'feedback': 'Too high.', 'suggestion': 'Describe a schema'},
+        {'i': 0, 'status': 'GOOD', 'feedback': 'Fine.', 'suggestion': ''},
+    )
+    parsed = parse_json_evaluation('```json\n' + text + '\n```', 2)
+    assert [r['status'] for r in parsed['outcomes']] == ['GOOD', 'NEEDS_REVISION']
+    assert parsed['outcomes'][0]['suggestion'] is None
+    assert parsed['outcomes'][1]['suggestion'] == 'Describe a schema'
+    assert parsed['summary'] == 'Fine overall.'
+
+
+@pytest.mark.parametrize('text', [
+    'not json',
+    '{"summary": "no outcomes"}',
+    evaluation({'i': 0, 'status': 'GOOD', 'feedback': ''}),
+    evaluation({'i': 0, 'status': 'GOOD', 'feedback': ''}, {'i': 0, 'status': 'GOOD', 'feedback': ''}),
+    evaluation({'i': 0, 'status': 'GREAT', 'feedback': ''}, {'i': 1, 'status': 'GOOD', 'feedback': ''}),
+    evaluation({'i': 0, 'status': 'GOOD', 'feedback': ''}, {'i': 5, 'status': 'GOOD', 'feedback': ''}),
+])
+def test_parse_rejects_malformed_responses(text):
+    with pytest.raises(EvaluationFormatError):
+        parse_json_evaluation(text, 2)
+
+
+def test_rendered_text_reads_like_a_text_response():
+    from ai_rewrite_tester import AIRewriteTester
+    parsed = parse_json_evaluation(evaluation(
+        {'i': 0, 'status': 'GOOD', 'feedback': 'Fine.'},
+        {'i': 1, 'status': 'COULD_IMPROVE', 'feedback': 'Vague.', 'suggestion': 'Design a normalised schema'},
+    ), 2)
+    text = render_evaluation_text(parsed, OUTCOMES)
+    assert text.endswith('**SUMMARY**\n\nFine overall.')
+    # The free-text parser reads it back to the same verdicts
+    reparsed = AIRewriteTester.__new__(AIRewriteTester).parse_ai_evaluation(text, OUTCOMES)
+    assert [r['status'] for r in reparsed] == ['GOOD', 'COULD_IMPROVE']
+    assert reparsed[1]['suggestion'] == 'Design a normalised schema'
+
+
+def test_schema_only_for_gemini_models():
+    assert generation_config('gemini-2.5-flash', 'json').response_mime_type == 'application/json'
+    assert generation_config('gemini-2.5-flash', 'json').response_schema is not None
+    assert generation_config('gemma-3-27b-it', 'json').response_schema is None
+    assert generation_config('gemini-2.5-flash', 'text').response_mime_type is None
+
+
+@pytest.mark.parametrize('model', ['gemma-3-27b-it', 'gemini-2.5-flash'])
+def test_evaluate_route_in_json_mode(monkeypatch, model):
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    from app.config import Config
+    with FakeGeminiServer(seed=4) as fake:
+        monkeypatch.setattr(Config, 'GENAI_BASE_URL', fake.url)
+        monkeypatch.setattr(Config, 'LLM_OUTPUT_FORMAT', 'json')
+        params = dict(config_manager.getCurrentParams(), selected_model=model)
+        monkeypatch.setattr(config_manager, 'getCurrentParams', lambda: params)
+        app = create_app()
+        client = app.test_client()
+        client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+        from app import db
+        from app.models import LearningOutcome
+        with app.app_context():
+            for text in OUTCOMES:
+                db.session.add(LearningOutcome(description=text, assessment='Exam', unit_id=1))
+            db.session.commit()
+        try:
+            payload = client.post('/lo_api/evaluate/1').get_json()
+        finally:
+            shared_client.base_url = None
+    assert payload['ok'] is True
+    for text in OUTCOMES:
+        assert f"'{text}' - STATUS:" in payload['html']
+    assert '**SUMMARY**' in payload['html']
@@ -0,0 +1,143 @@
+import pytest
+import json
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.ai_evaluate import run_eval, shared_client
+from app.llm_cassette import Cassette, CassetteMiss, request_key, wrap_client
+
+
+class FakeModels:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def generate_content(self, *, model, contents, config=None):
+        self.calls.append(contents)
+        time.sleep(self.delay)
+        return SimpleNamespace(
+            text=f"answer {len(self.calls)} to {contents}",
+            usage_metadata=SimpleNamespace(prompt_token_count=10, candidates_token_count=4)
+        )
+
+
+class FakeClient:
+    def __init__(self, api_key=None, delay=0.0):
+        self.models = FakeModels(delay)
+
+
+def test_request_key_covers_model_prompt_and_config():
+    from google.genai import types
+    base = request_key('m', 'prompt', types.GenerateContentConfig(temperature=0.0))
+    assert base == request_key('m', 'prompt', types.GenerateContentConfig(temperature=0.0))
+    assert base != request_key('m2', 'prompt', types.GenerateContentConfig(temperature=0.0))
+    assert base != request_key('m', 'prompt 2', types.GenerateContentConfig(temperature=0.0))
+    assert base != request_key('m', 'prompt', types.GenerateContentConfig(temperature=0.5))
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    live = FakeClient(delay=0.05)
+    recorder = wrap_client(live, path, mode='record')
+    first = recorder.models.generate_content(model='m', contents='hello')
+    assert first.text == 'answer 1 to hello'
+
+    # A fresh process: the file alone answers, without a client
+    cassette = Cassette(path)
+    assert len(cassette) == 1
+    record = cassette.get(request_key('m', 'hello'))
+    assert record['prompt_tokens'] == 10 and record['response_tokens'] == 4
+    assert record['latency'] >= 0.05
+    assert 'hello' not in json.dumps({k: v for k, v in record.items() if k != 'text'})
+
+    replayed = wrap_client(None, str(tmp_path / 'copy.jsonl'), mode='replay')
+    replayed.cassette.records.update(cassette.records)
+    resp = replayed.models.generate_content(model='m', contents='hello')
+    assert resp.text == 'answer 1 to hello'
+    assert resp.usage_metadata.prompt_token_count == 10
+    assert resp.usage_metadata.total_token_count == 14
+
+    with pytest.raises(CassetteMiss):
+        replayed.models.generate_content(model='m', contents='unrecorded')
+
+
+def test_auto_mode_records_only_missing_requests(tmp_path):
+    live = FakeClient()
+    client = wrap_client(live, str(tmp_path / 'auto.jsonl'), mode='auto')
+    assert client.models.generate_content(model='m', contents='a').text == 'answer 1 to a'
+    assert client.models.generate_content(model='m', contents='a').text == 'answer 1 to a'
+    client.models.generate_content(model='m', contents='b')
+    assert live.models.calls == ['a', 'b']
+    assert client.cassette.hits == 1 and client.cassette.recorded == 2
+
+
+def test_replay_latency_is_reproduced(tmp_path):
+    path = str(tmp_path / 'slow.jsonl')
+    wrap_client(FakeClient(delay=0.1), path, mode='record').models.generate_content(model='m', contents='x')
+
+    fast = Cassette(path)
+    start = time.perf_counter()
+    fast.response(fast.get(request_key('m', 'x')))
+    assert time.perf_counter() - start < 0.05
+
+    slow = Cassette(path, replay_latency=True, latency_factor=0.5)
+    start = time.perf_counter()
+    slow.response(slow.get(request_key('m', 'x')))
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_interrupted_recording_is_tolerated(tmp_path):
+    path = tmp_path / 'cut.jsonl'
+    good = {'key': 'k1', 'model': 'm', 'text': 'ok', 'latency': 0.1}
+    path.write_text(json.dumps(good) + '\n' + '{"key": "k2", "te')
+    assert list(Cassette(str(path)).records) == ['k1']
+
+
+def test_run_eval_replays_through_app_config(monkeypatch, tmp_path):
+    path = str(tmp_path / 'app.jsonl')
+    live = FakeClient()
+    monkeypatch.setattr("app.ai_evaluate.genai.Client", lambda api_key=None: live)
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    from app.config import Config
+    monkeypatch.setattr(Config, 'LLM_CASSETTE', path)
+    monkeypatch.setattr(Config, 'LLM_CASSETTE_MODE', 'auto')
+    create_app()
+    try:
+        first = run_eval(2, 'Algorithms', 6, 'Explain recursion')
+        second = run_eval(2, 'Algorithms', 6, 'Explain recursion')
+        assert first == second
+        assert len(live.models.calls) == 1
+    finally:
+        shared_client.cassette = None
+
+
+def test_rewrite_tester_replays_from_cassette(monkeypatch, tmp_path):
+    from ai_rewrite_tester import AIRewriteTester
+    from ai_testing_evaluate import build_prompt_test
+    from google.genai import types
+
+    monkeypatch.chdir(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    path = str(tmp_path / 'tester.jsonl')
+    config = json.load(open('app/AIConfig.json'))
+    outcomes = ['Explain recursion', 'Design a database']
+    prompt = build_prompt_test(2, 'Algorithms', 6, outcomes, config)
+    cassette = Cassette(path)
+    response = ("'Explain recursion' - STATUS:GOOD - Fine.\n\n"
+                "'Design a database' - STATUS:NEEDS_REVISION - Too high. SUGGESTION: 'Describe a database'\n")
+    cassette.put(request_key(config['selected_model'], prompt, types.GenerateContentConfig(temperature=0.0)),
+                 config['selected_model'], SimpleNamespace(text=response), 1.0)
+
+    tester = AIRewriteTester('unused.csv', api_key='unused', cassette_path=path, cassette_mode='replay')
+    assert tester.replaying and tester.requests_per_minute is None
+    results = tester.evaluate_unit_outcomes(
+        'CITS1001', 'Algorithms', 2,
+        [{'number': i + 1, 'text': text, 'assessment': ''} for i, text in enumerate(outcomes)]
+    )
+    assert [r['status'] for r in results] == ['GOOD', 'NEEDS_REVISION']
+    assert results[1]['suggestion'] == 'Describe a database'
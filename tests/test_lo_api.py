@@ -0,0 +1,208 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import db
+from app.models import LearningOutcome
+
+
+@pytest.fixture
+def app(app):
+    """Testing app with three outcomes on the seeded unit."""
+    with app.app_context():
+        for key, text in zip("FVk", ["Explain A", "Apply B", "Design C"]):
+            db.session.add(LearningOutcome(unit_id=1, description=text, assessment="", order_key=key))
+        db.session.commit()
+    return app
+
+
+def outcomes(app):
+    """Map outcome id to (description, display position, version)."""
+    with app.app_context():
+        ordered = LearningOutcome.query.filter_by(unit_id=1).order_by(LearningOutcome.order_key)
+        return {lo.id: (lo.description, pos, lo.version) for pos, lo in enumerate(ordered, start=1)}
+
+
+def order_keys(app):
+    with app.app_context():
+        return {lo.id: lo.order_key for lo in LearningOutcome.query.filter_by(unit_id=1)}
+
+
+def test_patch_saves_changed_fields_and_bumps_version(app, client):
+    response = client.patch('/lo_api/outcomes/1', json={"1": {"version": 1, "description": "Explain A well"}})
+    assert response.status_code == 200
+    assert response.get_json() == {"ok": True, "versions": {"1": 2}}
+
+    saved = outcomes(app)
+    assert saved[1] == ("Explain A well", 1, 2)
+    # Untouched outcomes keep their version
+    assert saved[2][2] == 1
+
+
+def test_patch_with_stale_version_conflicts(app, client):
+    client.patch('/lo_api/outcomes/1', json={"1": {"version": 1, "description": "First editor"}})
+
+    response = client.patch('/lo_api/outcomes/1', json={
+        "1": {"version": 1, "description": "Second editor"},
+        "2": {"version": 1, "assessment": "Quiz"},
+        "99": {"version": 1, "description": "Deleted"},
+    })
+    assert response.status_code == 409
+    data = response.get_json()
+    assert data["versions"] == {"2": 2}
+    assert data["conflicts"]["1"] == {"description": "First editor", "assessment": "", "version": 2}
+    assert data["conflicts"]["99"] is None
+    assert outcomes(app)[1][0] == "First editor"
+
+
+def test_patch_rejects_malformed_payload(client):
+    assert client.patch('/lo_api/outcomes/1', json={}).status_code == 400
+    assert client.patch('/lo_api/outcomes/1', json={"1": {"description": "no version"}}).status_code == 400
+    assert client.patch('/lo_api/outcomes/1', json={"1": {"version": 1}}).status_code == 400
+    assert client.patch('/lo_api/outcomes/1', json={"1": "Explain A"}).status_code == 400
+    assert client.patch('/lo_api/outcomes/1', json={"1": ["Explain A"]}).status_code == 400
+    response = client.patch('/lo_api/outcomes/1', json={"1": {"version": 1, "description": ["Explain A"]}})
+    assert response.status_code == 400
+    assert "must be a string" in response.get_json()["error"]
+    assert client.patch('/lo_api/outcomes/1', json={"1": {"version": 1, "assessment": 5}}).status_code == 400
+
+
+def test_patch_writes_nothing_if_any_change_is_malformed(app, client):
+    response = client.patch('/lo_api/outcomes/1', json={
+        "1": {"version": 1, "description": "Saved?"},
+        "2": {"version": 1, "description": None},
+    })
+    assert response.status_code == 400
+    assert outcomes(app)[1][0] != "Saved?"
+
+
+def test_reorder_only_rewrites_moved_outcomes(app, client):
+    before = order_keys(app)
+
+    # Move the first outcome to the end; only its key changes
+    response = client.post('/lo_api/reorder/1', json={"order": [2, 3, 1], "unit_id": 1})
+    assert response.get_json() == {"ok": True}
+
+    saved = outcomes(app)
+    assert [saved[i][1] for i in (1, 2, 3)] == [3, 1, 2]
+    after = order_keys(app)
+    assert [i for i in after if after[i] != before[i]] == [1]
+
+
+def test_batch_applies_operations_in_order(app, client):
+    response = client.post('/lo_api/batch/1', json={"ops": [
+        {"op": "add", "client_id": "new-1"},
+        {"op": "update", "id": "new-1", "description": "Evaluate D"},
+        {"op": "move", "id": "new-1", "index": 0},
+        {"op": "delete", "id": 2},
+        {"op": "update", "id": 3, "version": 1, "assessment": "Project"},
+    ]})
+    assert response.status_code == 200
+    data = response.get_json()
+    newID = data["ids"]["new-1"]
+
+    assert [(o["id"], o["position"]) for o in data["outcomes"]] == [(newID, 1), (1, 2), (3, 3)]
+    assert data["outcomes"][0]["description"] == "Evaluate D"
+    assert data["outcomes"][2]["version"] == 2
+
+    saved = outcomes(app)
+    assert set(saved) == {1, 3, newID}
+    assert saved[newID] == ("Evaluate D", 1, 1)
+    # Moved down by one but text untouched, so the version stays
+    assert saved[1] == ("Explain A", 2, 1)
+    # The insert at the front did not rewrite the other outcomes' keys
+    keys = order_keys(app)
+    assert (keys[1], keys[3]) == ("F", "k")
+
+
+def test_batch_rolls_back_on_conflict(app, client):
+    client.patch('/lo_api/outcomes/1', json={"2": {"version": 1, "description": "Other editor"}})
+    before = outcomes(app)
+
+    response = client.post('/lo_api/batch/1', json={"ops": [
+        {"op": "add", "client_id": "new-1", "description": "Should not exist"},
+        {"op": "delete", "id": 1},
+        {"op": "update", "id": 2, "version": 1, "description": "Stale"},
+    ]})
+    assert response.status_code == 409
+    data = response.get_json()
+    assert data["failed_op"] == 2
+    assert data["conflicts"]["2"]["description"] == "Other editor"
+    assert len(data["outcomes"]) == 3
+
+    # Nothing from the batch was applied
+    assert outcomes(app) == before
+
+
+def test_batch_does_not_overwrite_a_concurrent_save(app, client, monkeypatch):
+    import app.routes as routes
+    from sqlalchemy import update
+    keyBetween = routes.key_between
+
+    def save_elsewhere(before, after):
+        # Another batch commits outcome 1 after this one has loaded it
+        db.session.execute(
+            update(LearningOutcome).where(LearningOutcome.id == 1)
+            .values(version=2, description="Other editor"),
+            execution_options={"synchronize_session": False}
+        )
+        return keyBetween(before, after)
+
+    monkeypatch.setattr(routes, 'key_between', save_elsewhere)
+    response = client.post('/lo_api/batch/1', json={"ops": [
+        {"op": "move", "id": 3, "index": 0},
+        {"op": "update", "id": 1, "version": 1, "description": "Stale"},
+    ]})
+    assert response.status_code == 409
+    assert response.get_json()["conflicts"]["1"]["description"] == "Other editor"
+    assert outcomes(app)[1][0] == "Explain A"
+
+
+def test_batch_rejects_non_string_fields(app, client):
+    before = outcomes(app)
+    for value in (None, 5, {"text": "x"}):
+        response = client.post('/lo_api/batch/1', json={"ops": [
+            {"op": "update", "id": 1, "version": 1, "description": value},
+        ]})
+        assert response.status_code == 400
+        assert "must be a string" in response.get_json()["error"]
+    response = client.post('/lo_api/batch/1', json={"ops": [{"op": "add", "client_id": "n1", "assessment": None}]})
+    assert response.status_code == 400
+    assert outcomes(app) == before
+
+
+def test_batch_rejects_malformed_operations(client):
+    assert client.post('/lo_api/batch/1', json={"ops": []}).status_code == 400
+    assert client.post('/lo_api/batch/1', json={"ops": [{"op": "rename", "id": 1}]}).status_code == 400
+    assert client.post('/lo_api/batch/1', json={"ops": [{"op": "update", "id": 1, "description": "x"}]}).status_code == 400
+    assert client.post('/lo_api/batch/404', json={"ops": [{"op": "delete", "id": 1}]}).status_code == 404
+
+
+def test_lo_add_appends_after_last_key(app, client):
+    client.post('/lo_api/add/1')
+    keys = order_keys(app)
+    newID = max(keys)
+    assert keys[newID] > keys[3]
+    assert outcomes(app)[newID][1] == 4
+
+
+def test_long_keys_are_renormalized_in_background(app, client, monkeypatch, tmp_path):
+    from app import job_manager
+    app.config['JOB_SPOOL_DIR'] = str(tmp_path)
+    app.config['ORDER_KEY_RENORMALIZE_LENGTH'] = 3
+    job_manager.init_app(app)
+
+    # Keep dropping outcomes into the same gap until the keys get long
+    ops = [{"op": "move", "id": 3, "index": 1}, {"op": "move", "id": 2, "index": 1}] * 10
+    response = client.post('/lo_api/batch/1', json={"ops": ops})
+    assert response.status_code == 200
+    expected = [o["id"] for o in response.get_json()["outcomes"]]
+
+    job_manager._get_executor().shutdown(wait=True)
+    job_manager._executor = None
+
+    keys = order_keys(app)
+    assert all(len(key) <= 3 for key in keys.values())
+    assert sorted(keys, key=keys.get) == expected
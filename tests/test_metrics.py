@@ -0,0 +1,163 @@
+import json
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import config_manager
+from app import ai_evaluate
+from app.metrics import Registry, registry
+
+REMOTE = {'REMOTE_ADDR': '10.1.2.3'}
+
+
+def sample(text, line_prefix):
+    """Value of the exposition line starting with line_prefix (0 if absent)."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def scrape(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    return response.get_data(as_text=True)
+
+
+def test_request_latency_and_counts(app):
+    client = app.test_client()
+    count = 'http_request_duration_seconds_count{endpoint="main.help_page",method="GET"}'
+    total = 'http_requests_total{endpoint="main.help_page",method="GET",status="200"}'
+    before = scrape(client)
+
+    for _ in range(3):
+        client.get('/help')
+    client.get('/no-such-page')
+
+    after = scrape(client)
+    assert sample(after, count) - sample(before, count) == 3
+    assert sample(after, total) - sample(before, total) == 3
+    assert 'endpoint="unmatched",method="GET",status="404"' in after
+    assert '# TYPE http_request_duration_seconds histogram' in after
+    assert 'http_request_duration_seconds_bucket{endpoint="main.help_page",method="GET",le="+Inf"}' in after
+    # The scrape itself is in flight while it renders
+    assert sample(after, 'http_requests_in_flight{endpoint="metrics"}') == 1
+
+
+def test_metrics_hidden_from_remote_users(app):
+    client = app.test_client()
+    assert client.get('/metrics', environ_base=REMOTE).status_code == 404
+    # A local address behind a reverse proxy is not trusted
+    assert client.get('/metrics', headers={'X-Forwarded-For': '10.1.2.3'}).status_code == 404
+
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'}, environ_base=REMOTE)
+    assert client.get('/metrics', environ_base=REMOTE).status_code == 200
+
+
+def test_page_cache_hits_counted(app):
+    client = app.test_client()
+    hit = 'cache_requests_total{cache="page_cache",result="hit"}'
+    before = sample(scrape(client), hit)
+    client.get('/bloom-guide')
+    client.get('/bloom-guide')
+    assert sample(scrape(client), hit) - before >= 1
+
+
+def test_llm_latency_and_tokens(app, monkeypatch):
+    class FakeModels:
+        def generate_content(self, model, contents, config):
+            usage = SimpleNamespace(prompt_token_count=120, candidates_token_count=30)
+            return SimpleNamespace(text="**LO Analysis**", usage_metadata=usage)
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.models = FakeModels()
+
+    params = dict(config_manager.getCurrentParams(), API_key='test-key', selected_model='fake-model')
+    monkeypatch.setattr(config_manager, 'getCurrentParams', lambda: params)
+    monkeypatch.setattr(ai_evaluate.genai, 'Client', FakeClient)
+
+    client = app.test_client()
+    before = scrape(client)
+    with app.app_context():
+        assert ai_evaluate.run_eval(2, 'Test Unit', 6, 'Explain recursion') == "**LO Analysis**"
+    after = scrape(client)
+
+    count = 'llm_request_duration_seconds_count{model="fake-model",outcome="ok"}'
+    assert sample(after, count) - sample(before, count) == 1
+    prompt = 'llm_prompt_tokens_total{model="fake-model"}'
+    response = 'llm_response_tokens_total{model="fake-model"}'
+    assert sample(after, prompt) - sample(before, prompt) == 120
+    assert sample(after, response) - sample(before, response) == 30
+
+
+def test_streamed_export_rows_counted(app):
+    client = app.test_client()
+    rows = 'rows_processed_total{operation="export"}'
+    before = sample(scrape(client), rows)
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+    response = client.get('/export_all_units')
+    assert response.status_code == 200
+    response.get_data()
+    response.close()
+    assert sample(scrape(client), rows) - before == 1
+
+
+def test_workers_are_added_up(tmp_path):
+    reg = Registry()
+    reg.directory = str(tmp_path)
+    requests = reg.counter('requests_total', 'Requests.', ('endpoint',))
+    inflight = reg.gauge('in_flight', 'In flight.', ('endpoint',))
+    latency = reg.histogram('latency_seconds', 'Latency.', ('endpoint',), buckets=(0.1, 1.0))
+
+    requests.inc('home', amount=2)
+    inflight.inc('home')
+    latency.observe(0.05, 'home')
+
+    # Another live worker (the parent process) and one that has exited
+    other = {
+        'requests_total': [[['home'], 3]],
+        'in_flight': [[['home'], 4]],
+        'latency_seconds': [[['home'], [[0, 1, 0], 0.5, 1]]],
+    }
+    for pid, name in ((os.getppid(), 'live'), (2 ** 22 + 12345, 'dead')):
+        (tmp_path / f'{name}.json').write_text(json.dumps({'pid': pid, 'metrics': other}))
+
+    text = reg.render()
+    assert sample(text, 'requests_total{endpoint="home"}') == 8
+    # Gauges of exited workers are dropped
+    assert sample(text, 'in_flight{endpoint="home"}') == 5
+    assert sample(text, 'latency_seconds_bucket{endpoint="home",le="0.1"}') == 1
+    assert sample(text, 'latency_seconds_bucket{endpoint="home",le="1"}') == 3
+    assert sample(text, 'latency_seconds_bucket{endpoint="home",le="+Inf"}') == 3
+    assert sample(text, 'latency_seconds_count{endpoint="home"}') == 3
+    assert os.path.exists(reg.path)
+
+
+def test_reused_pid_keeps_the_exited_workers_counts(tmp_path):
+    reg = Registry()
+    reg.directory = str(tmp_path)
+    requests = reg.counter('requests_total', 'Requests.', ('endpoint',))
+    inflight = reg.gauge('in_flight', 'In flight.', ('endpoint',))
+    requests.inc('home', amount=2)
+    inflight.inc('home')
+
+    # An exited worker had this process's PID before it was reused
+    earlier = {'requests_total': [[['home'], 5]], 'in_flight': [[['home'], 3]]}
+    (tmp_path / f'{os.getpid()}-1.json').write_text(
+        json.dumps({'pid': os.getpid(), 'started': 1, 'metrics': earlier}))
+
+    text = reg.render()
+    assert os.path.exists(tmp_path / f'{os.getpid()}-1.json')
+    assert sample(text, 'requests_total{endpoint="home"}') == 7
+    # Its gauges are dropped although the PID is alive again
+    assert sample(text, 'in_flight{endpoint="home"}') == 1
+
+
+def test_duplicate_metric_rejected():
+    with pytest.raises(ValueError):
+        registry.counter('http_requests_total', 'Duplicate.')
@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ordering import key_between, keys_between, rekey_for_order, spread_keys
+
+
+def test_key_between_sorts_between_neighbours():
+    random.seed(0)
+    keys = [key_between(None, None)]
+    for _ in range(2000):
+        i = random.randint(0, len(keys))
+        before = keys[i - 1] if i > 0 else None
+        after = keys[i] if i < len(keys) else None
+        key = key_between(before, after)
+        assert (before is None or before < key) and (after is None or key < after)
+        assert not key.endswith('0')
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+
+
+def test_key_between_appends_stay_short():
+    key = None
+    for _ in range(100):
+        key = key_between(key, None)
+    assert len(key) <= 4
+
+
+def test_key_between_rejects_bad_bounds():
+    with pytest.raises(ValueError):
+        key_between("b", "a")
+    with pytest.raises(ValueError):
+        key_between("a0", None)
+
+
+def test_keys_between_and_spread_keys_are_ordered():
+    for n in (1, 2, 61, 62, 500):
+        for keys in (keys_between("A", "B", n), spread_keys(n)):
+            assert keys == sorted(keys)
+            assert len(set(keys)) == n
+    assert max(len(key) for key in spread_keys(1000)) == 2
+
+
+def test_rekey_for_order_changes_only_moved_item():
+    keys = spread_keys(10)
+    moved = keys[:2] + keys[3:7] + [keys[2]] + keys[7:]
+    changes = rekey_for_order(moved)
+    assert list(changes) == [6]
+    result = [changes.get(i, key) for i, key in enumerate(moved)]
+    assert result == sorted(result)
+
+
+def test_renormalize_order_command(monkeypatch):
+    monkeypatch.setenv("FLASK_CONFIG", "testing")
+    from app import create_app, db
+    from app.models import LearningOutcome
+
+    app = create_app()
+    with app.app_context():
+        for key in ("V", "VV", "VVV", "VVVV"):
+            db.session.add(LearningOutcome(unit_id=1, description=key, order_key=key))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["renormalize-order", "--force"])
+    assert "4 outcome order keys rewritten" in result.output
+
+    with app.app_context():
+        ordered = LearningOutcome.query.filter_by(unit_id=1).order_by(LearningOutcome.order_key).all()
+        assert [lo.description for lo in ordered] == ["V", "VV", "VVV", "VVVV"]
+        assert all(len(lo.order_key) == 1 for lo in ordered)
@@ -0,0 +1,64 @@
+import gzip
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import config_manager
+from app.page_cache import page_cache
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count template renders done by the routes module."""
+    import app.routes as routes
+    calls = []
+    original = routes.render_template
+
+    def counting_render(template, **kwargs):
+        calls.append(template)
+        return original(template, **kwargs)
+
+    monkeypatch.setattr(routes, "render_template", counting_render)
+    return calls
+
+
+def test_anonymous_pages_render_once(app, renders):
+    client = app.test_client()
+    first = client.get('/help', headers={'Accept-Encoding': 'identity'})
+    second = client.get('/help', headers={'Accept-Encoding': 'identity'})
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert renders.count('help_page.html') == 1
+
+    # A stored encoding is served without going through the middleware
+    compressed = client.get('/help', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == first.data
+    assert renders.count('help_page.html') == 1
+
+    revalidated = client.get('/help', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+
+
+def test_config_change_invalidates_bloom_guide(app, renders, monkeypatch):
+    client = app.test_client()
+    client.get('/bloom-guide')
+    client.get('/bloom-guide')
+    assert renders.count('bloom_guide.html') == 1
+
+    # Saving settings bumps the version; no file is written by this test
+    monkeypatch.setattr(config_manager, 'version', config_manager.version + 1)
+    client.get('/bloom-guide')
+    assert renders.count('bloom_guide.html') == 2
+
+
+def test_logged_in_users_are_not_served_cached_pages(app, renders):
+    client = app.test_client()
+    client.get('/help')
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+    page = client.get('/help')
+    assert renders.count('help_page.html') == 2
+    assert b'admin' in page.data
+    assert len(page_cache) == 1
@@ -0,0 +1,85 @@
+import gc
+import os
+import runpy
+import pytest
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db, job_manager
+from app.config import TestingConfig
+from app.models import Unit, User, UserType
+from app.prefork import warm_up, after_fork
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    # A file database, as in deployment; an in-memory one is lost on dispose
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'prefork.db')
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        user = User(username='uc', password_hash='x', userType=UserType.UC)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Unit(unitcode='CITS1001', unitname='Forking', level=1,
+                            creditpoints=6, description='d', creatorid=user.id))
+        db.session.commit()
+    return app
+
+
+def test_warm_up_compiles_templates_and_closes_connections(app):
+    try:
+        loaded = warm_up(app)
+    finally:
+        gc.unfreeze()
+    assert loaded['templates'] > 0
+    assert app.jinja_env.cache
+    with app.app_context():
+        assert db.engine.pool.checkedin() == 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_forked_worker_gets_fresh_pool_and_locks(app):
+    with app.app_context():
+        # The parent holds a pooled connection across the fork
+        assert db.session.scalar(db.select(db.func.count(Unit.id))) == 1
+        job_manager._get_executor()
+        job_manager.lock.acquire()
+        try:
+            pid = os.fork()
+            if pid == 0:
+                ok = False
+                try:
+                    after_fork(app)
+                    # Not deadlocked on the lock held by the parent, no inherited pool
+                    ok = job_manager.lock.acquire(timeout=1) and job_manager._executor is None
+                    with app.app_context():
+                        ok = ok and db.session.scalar(db.select(db.func.count(Unit.id))) == 1
+                        db.session.remove()
+                finally:
+                    os._exit(0 if ok else 1)
+        finally:
+            job_manager.lock.release()
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        # The parent's connection still works after the child disposed its pool
+        assert db.session.scalar(db.select(db.func.count(Unit.id))) == 1
+
+
+def test_gunicorn_config_preloads(monkeypatch, tmp_path):
+    import tempfile
+    monkeypatch.setenv('METRICS_DIR', str(tmp_path))
+    # A configured metrics directory is used as it is
+    monkeypatch.setattr(tempfile, 'mkdtemp', lambda **kwargs: pytest.fail("made a temporary directory"))
+    config = runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    assert os.environ['METRICS_DIR'] == str(tmp_path)
+    assert config['preload_app'] is True
+    assert callable(config['post_fork'])
+    assert callable(config['when_ready'])
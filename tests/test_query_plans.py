@@ -0,0 +1,86 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app import db
+from app.models import Unit, LearningOutcome
+from app.routes import findUnitByCode, searchUnitsByCode
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        for key in "FVk":
+            db.session.add(LearningOutcome(unit_id=1, description=key, order_key=key))
+        db.session.commit()
+    return app
+
+
+def query_plans(func):
+    """
+    Run func and return the SQLite query plan of every SELECT it executed.
+
+    Returns:
+        list: One plan string per statement, each detail line joined by ' | '
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    plans = []
+    for statement, parameters in statements:
+        rows = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+def test_outcome_list_uses_unit_order_key_index(app):
+    with app.app_context():
+        unit = db.session.get(Unit, 1)
+        plans = query_plans(lambda: list(unit.learning_outcomes))
+        assert len(plans) == 1
+        assert "ix_learning_outcomes_unit_id_order_key" in plans[0]
+        # Rows come out of the index already ordered
+        assert "TEMP B-TREE" not in plans[0]
+
+
+def test_units_by_creator_use_creatorid_index(app):
+    with app.app_context():
+        plans = query_plans(lambda: Unit.query.filter_by(creatorid=1).all())
+        assert "ix_unit_creatorid" in plans[0]
+
+
+def test_unit_code_lookups_use_lower_index(app):
+    with app.app_context():
+        plans = query_plans(lambda: findUnitByCode(" cits3200 "))
+        assert "ix_unit_unitcode_lower" in plans[0]
+        assert findUnitByCode(" cits3200 ").id == 1
+
+        plans = query_plans(lambda: searchUnitsByCode("cits32"))
+        assert "ix_unit_unitcode_lower" in plans[0]
+        assert [u.unitcode for u in searchUnitsByCode("cits32")] == ["CITS3200"]
+
+
+def test_code_search_matches_prefixes_only(app):
+    with app.app_context():
+        db.session.add(Unit(unitcode='ITS1001', unitname='IT Skills', level=1, creditpoints=6, creatorid=1))
+        db.session.commit()
+        assert [u.unitcode for u in searchUnitsByCode("its")] == ["ITS1001"]
+        assert [u.unitcode for u in searchUnitsByCode(" Cits ")] == ["CITS3200"]
+        assert searchUnitsByCode("3200") == []
+        assert searchUnitsByCode("math") == []
+
+        # Only the indexed range scan runs
+        plans = query_plans(lambda: searchUnitsByCode("its"))
+        assert len(plans) == 1 and "ix_unit_unitcode_lower" in plans[0]
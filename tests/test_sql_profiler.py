@@ -0,0 +1,92 @@
+import logging
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import db
+from app.models import Unit, LearningOutcome
+from app.sql_profiler import QueryBudgetExceeded, query_budget
+
+
+def add_units(app, count, outcomes=3, prefix='TEST'):
+    """Add units owned by the seeded admin, each with a few outcomes."""
+    with app.app_context():
+        for i in range(count):
+            unit = Unit(unitcode=f'{prefix}{i:04d}', unitname=f'Unit {i}', level=2,
+                        creditpoints=6, description='Budget test', creatorid=1)
+            db.session.add(unit)
+            db.session.flush()
+            for j in range(outcomes):
+                db.session.add(LearningOutcome(description=f'Outcome {j}', assessment='Exam', unit_id=unit.id))
+        db.session.commit()
+
+
+@pytest.fixture
+def client(app, client):
+    add_units(app, 10)
+    # Load the logged-in user into the user cache, as on a warm worker
+    client.get('/dashboard')
+    return client
+
+
+def get(client, url):
+    response = client.get(url)
+    response.get_data()
+    response.close()
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize('url,budget', [
+    ('/view/2', 3),
+    ('/create_lo/2', 2),
+    ('/unit/2/edit_unit', 1),
+    ('/search_unit', 1),
+    ('/export_all_units', 2),
+    ('/export_my_units', 2),
+])
+def test_route_query_budgets(client, url, budget):
+    with query_budget(max_queries=budget, max_repeats=1):
+        get(client, url)
+
+
+def test_export_queries_do_not_grow_with_units(app, client):
+    with query_budget() as small:
+        get(client, '/export_all_units')
+    add_units(app, 40, prefix='MORE')
+    with query_budget() as large:
+        get(client, '/export_all_units')
+    assert large.count == small.count
+
+
+def test_budget_catches_lazy_loading_loop(app):
+    add_units(app, 3)
+    with app.app_context():
+        with pytest.raises(QueryBudgetExceeded, match='probable N\\+1') as error:
+            with query_budget(max_repeats=1):
+                for unit in Unit.query.all():
+                    [lo.description for lo in unit.learning_outcomes]
+    # The message lists the repeated statement with its count
+    assert '4 x SELECT' in str(error.value)
+
+
+def test_server_timing_header(client):
+    response = get(client, '/view/2')
+    timing = [value for value in response.headers.getlist('Server-Timing') if value.startswith('db;')]
+    assert len(timing) == 1
+    assert 'desc="3 queries"' in timing[0]
+
+
+def test_repeated_statement_logged(app, caplog):
+    def lazy_view():
+        # A page touching each unit's outcomes lazily
+        return str(sum(len(unit.learning_outcomes) for unit in Unit.query.all()))
+
+    app.add_url_rule('/lazy-view', 'lazy_view', lazy_view)
+    app.config['SQL_N_PLUS_ONE_THRESHOLD'] = 2
+    add_units(app, 3)
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        get(app.test_client(), '/lazy-view')
+    assert 'Probable N+1 query in lazy_view' in caplog.text
@@ -0,0 +1,61 @@
+import json
+import subprocess
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.lazy import LazyModule
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules only the import/export routes and AI evaluation need
+HEAVY_MODULES = ['pandas', 'numpy', 'google.genai', 'openpyxl']
+
+# Peak RSS of a freshly started app; measured at about 100 MB, and 150 MB
+# once pandas and the GenAI SDK are loaded
+RSS_BUDGET_MB = int(os.environ.get('STARTUP_RSS_BUDGET_MB', 140))
+
+PROFILE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+# Peak RSS of this process image (ru_maxrss would include the forking parent)
+with open('/proc/self/status') as status:
+    peak = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'rss_mb': peak / 1024,
+    'modules': sorted(sys.modules),
+}))
+"""
+
+
+@pytest.fixture(scope='module')
+def profile():
+    if not os.path.exists('/proc/self/status'):
+        pytest.skip('needs /proc to measure peak RSS')
+    env = dict(os.environ, FLASK_CONFIG='testing')
+    result = subprocess.run(
+        [sys.executable, '-c', PROFILE_SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_startup_does_not_import_heavy_modules(profile):
+    loaded = [name for name in HEAVY_MODULES if name in profile['modules']]
+    assert loaded == [], f"imported at startup: {loaded}"
+
+
+def test_startup_memory_budget(profile):
+    assert profile['rss_mb'] < RSS_BUDGET_MB, f"startup RSS {profile['rss_mb']:.0f} MB"
+
+
+def test_lazy_module_imports_on_first_use():
+    module = LazyModule('json')
+    assert not module.is_loaded
+    assert module.loads('[1]') == [1]
+    assert module.is_loaded
@@ -0,0 +1,100 @@
+import sys
+import os
+from io import BytesIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import config_manager, db
+from app.models import Unit, LearningOutcome, User
+from app.synthetic import (SYNTHETIC_OWNER, BLOOM_CLASSES, generate_units, units_to_csv, _level_classes)
+
+
+def test_generation_is_repeatable():
+    first = generate_units(50, seed=7)
+    assert first == generate_units(50, seed=7)
+    assert first != generate_units(50, seed=8)
+
+
+def test_generated_units_are_realistic():
+    config = config_manager.getCurrentParams()
+    units = generate_units(400, seed=3, existing_codes={'CITS3200'})
+    codes = [unit['unitcode'] for unit in units]
+    assert len(set(codes)) == len(codes)
+    assert 'CITS3200' not in codes
+
+    onLevel = total = 0
+    for unit in units:
+        code = unit['unitcode']
+        assert len(code) == 8 and code[:4].isalpha() and code[4:].isdigit()
+        assert int(code[4]) == unit['level']
+        low, high = config[f"{unit['creditpoints']} Points"]
+        assert low <= len(unit['outcomes']) <= high
+
+        levelVerbs = {verb.strip() for name in _level_classes(config, unit['level']) for verb in config[name]}
+        for description, assessment in unit['outcomes']:
+            total += 1
+            onLevel += description.split()[0] in levelVerbs
+    # Most outcomes use a verb the settings expect for the unit's level
+    assert 0.75 < onLevel / total < 1
+
+
+def test_outcome_range_override():
+    units = generate_units(20, seed=1, outcome_range=(10, 10))
+    assert all(len(unit['outcomes']) == 10 for unit in units)
+
+
+def test_seed_synthetic_command(app):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['seed-synthetic', '--units', '120', '--outcomes', '2-4', '--seed', '5'])
+    assert result.exit_code == 0, result.output
+    assert 'Added 120 units' in result.output
+
+    with app.app_context():
+        owner = User.query.filter_by(username=SYNTHETIC_OWNER).one()
+        units = Unit.query.filter_by(creatorid=owner.id).all()
+        assert len(units) == 120
+        assert all(2 <= len(unit.learning_outcomes) <= 4 for unit in units)
+        # Outcomes keep their generated order
+        keys = [lo.order_key for lo in units[0].learning_outcomes]
+        assert keys == sorted(keys)
+
+    result = runner.invoke(args=['seed-synthetic', '--units', '10', '--clear'])
+    assert 'Deleted 120 synthetic units' in result.output
+    with app.app_context():
+        assert Unit.query.count() == 11  # the seeded CITS3200 and the new 10
+
+
+def test_seed_synthetic_rejects_bad_range(app):
+    result = app.test_cli_runner().invoke(args=['seed-synthetic', '--outcomes', '5'])
+    assert result.exit_code != 0
+    assert 'MIN-MAX' in result.output
+
+
+def test_csv_is_importable(app):
+    units = generate_units(15, seed=2)
+    client = app.test_client()
+    client.post('/login_page', data={'username': 'admin', 'password': 'password'})
+    response = client.post(
+        '/import-units',
+        data={'import_file': (BytesIO(units_to_csv(units).encode()), 'units.csv')},
+        headers={'X-Requested-With': 'XMLHttpRequest'}
+    )
+    assert response.get_json()['units_added'] == 15
+    with app.app_context():
+        assert LearningOutcome.query.count() == sum(len(unit['outcomes']) for unit in units)
+
+
+def test_http_bench_smoke(tmp_path, monkeypatch):
+    from benchmarks.http_bench import main
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+    lines = []
+    rows = main(['--sizes', '20,40', '--requests', '2', '--heavy-requests', '1', '--warmup', '0',
+                 '--db', str(tmp_path / 'bench.db'), '--json', str(tmp_path / 'out.json')],
+                report=lines.append)
+    assert {row['route'] for row in rows} == {
+        'search_all', 'search_name', 'search_code', 'view', 'export_all', 'import_100'}
+    # Sizes are the real catalogue size (the first import added 100 units)
+    assert [row['size'] for row in rows if row['route'] == 'view'] == [20, 120]
+    assert all(row['errors'] == 0 for row in rows)
+    assert all(row['p50_ms'] <= row['p99_ms'] for row in rows)
+    assert os.path.exists(tmp_path / 'out.json')
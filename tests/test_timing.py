@@ -0,0 +1,86 @@
+import json
+import logging
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import config_manager
+from app import ai_evaluate
+from app.timing import timing
+
+
+def spans(response):
+    """Span name -> duration (ms) from the timing Server-Timing header."""
+    result = {}
+    for header in response.headers.getlist('Server-Timing'):
+        for entry in header.split(', '):
+            name, *params = entry.split(';')
+            result[name] = float(params[0].split('=')[1])
+    return result
+
+
+def test_page_render_timed(client):
+    response = client.get('/view/1')
+    assert response.status_code == 200
+    timed = spans(response)
+    assert {'render', 'total', 'db'} <= set(timed)
+    assert timed['render'] <= timed['total']
+
+
+def test_evaluation_phases_timed(client, monkeypatch):
+    class FakeModels:
+        def generate_content(self, model, contents, config):
+            return SimpleNamespace(text="**LO Analysis**")
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.models = FakeModels()
+
+    params = dict(config_manager.getCurrentParams(), API_key='test-key')
+    monkeypatch.setattr(config_manager, 'getCurrentParams', lambda: params)
+    monkeypatch.setattr(ai_evaluate.genai, 'Client', FakeClient)
+
+    response = client.post('/lo_api/evaluate/1')
+    assert response.get_json()['ok'] is True
+    assert {'prompt', 'llm_queue', 'llm', 'json', 'total'} <= set(spans(response))
+
+
+def test_unsampled_requests_only_get_request_id(app, client, monkeypatch):
+    monkeypatch.setattr(timing, 'sample_rate', 0.0)
+    response = client.get('/view/1')
+    assert 'total' not in spans(response)
+    assert len(response.headers['X-Request-ID']) == 32
+
+
+def test_request_id_from_client(client):
+    assert client.get('/help', headers={'X-Request-ID': 'lb-1234.abc'}).headers['X-Request-ID'] == 'lb-1234.abc'
+    # Ids that could break log lines or headers are replaced
+    replaced = client.get('/help', headers={'X-Request-ID': 'bad id"\x7f'}).headers['X-Request-ID']
+    assert replaced != 'bad id"\x7f' and len(replaced) == 32
+
+
+def test_structured_log_line(client, monkeypatch):
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    handler = Collect()
+    logger = logging.getLogger('app.timing')
+    logger.addHandler(handler)
+    monkeypatch.setattr(logger, 'level', logging.INFO)
+    monkeypatch.setattr(timing, 'log_enabled', True)
+    try:
+        client.get('/view/1', headers={'X-Request-ID': 'trace-42'})
+    finally:
+        logger.removeHandler(handler)
+
+    line = json.loads(records[-1])
+    assert line['request_id'] == 'trace-42'
+    assert line['endpoint'] == 'main.view'
+    assert line['status'] == 200
+    assert line['db_queries'] >= 1
+    assert 'render' in line['spans_ms'] and 'total' in line['spans_ms']
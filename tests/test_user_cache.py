@@ -0,0 +1,83 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app import db, user_cache
+from app.models import User, UserType
+from app.user_cache import CachedUser
+
+
+def user_queries(app, func):
+    """Count SELECTs against the user table while running func."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM user' in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return len(statements)
+
+
+def test_logged_in_requests_do_not_reload_user(app, client):
+    # First request after login fills the cache
+    client.post('/lo_api/batch/1', json={"ops": [{"op": "add", "client_id": "new-1"}]})
+
+    count = user_queries(app, lambda: [
+        client.post('/lo_api/batch/1', json={"ops": [{"op": "add", "client_id": f"new-{i}"}]})
+        for i in range(5)
+    ])
+    assert count == 0
+
+
+def test_user_update_invalidates_cached_identity(app):
+    with app.app_context():
+        cached = user_cache.get(1)
+        assert isinstance(cached, CachedUser)
+        assert cached.role == UserType.ADMIN
+        assert user_cache.get(1) is cached
+
+        user = db.session.get(User, 1)
+        user.userType = UserType.UC
+        db.session.commit()
+
+        assert user_cache.get(1).role == UserType.UC
+
+
+def test_user_delete_logs_out(app):
+    from werkzeug.security import generate_password_hash
+    with app.app_context():
+        db.session.add(User(username='uc', password_hash=generate_password_hash('pw'), userType=UserType.UC))
+        db.session.commit()
+
+    client = app.test_client()
+    client.post('/login_page', data={'username': 'uc', 'password': 'pw'})
+    assert client.get('/main_page').status_code == 200
+
+    with app.app_context():
+        user = User.query.filter_by(username='uc').one()
+        userID = user.id
+        db.session.delete(user)
+        db.session.commit()
+        assert user_cache.get(userID) is None
+
+    assert client.get('/main_page').status_code == 302
+
+    response = client.get('/main_page')
+    assert response.status_code == 302
+    assert '/login' in response.headers['Location']
+
+
+def test_zero_ttl_disables_cache(app):
+    app.config['USER_CACHE_TTL'] = 0
+    user_cache.init_app(app)
+    with app.app_context():
+        assert user_cache.get(1) is not user_cache.get(1)
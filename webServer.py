@@ -7,7 +7,8 @@ settings and can be used by WSGI servers like Gunicorn or uWSGI.
 
 Usage:
     Development: Use 'flask run' command instead of this file
-    Production: python webServer.py or use with WSGI server
+    Production: gunicorn -c gunicorn.conf.py webServer:app
+                (preloads the app and forks the workers from it)
 
 Note: The recommended way to run in development is using 'flask run' command
       which provides better debugging and auto-reload capabilities.
@@ -28,7 +29,7 @@ if __name__ == "__main__":
     not when imported by a WSGI server.
 
     For production deployment, use a proper WSGI server like:
-    - Gunicorn: gunicorn webServer:app
+    - Gunicorn: gunicorn -c gunicorn.conf.py webServer:app
     - uWSGI: uwsgi --http :5000 --module webServer:app
 
     Note: Debug mode is enabled here for convenience but should